@@ -1,14 +1,42 @@
 import mysql.connector
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from tkinter import messagebox
 import bcrypt
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from utils.db_pool import ConnectionPool
+from utils.schema_migrations import run_migrations
+from utils.pagination import encode_cursor, decode_cursor
+from utils.query_cache import QueryCache
+from utils.query_stats import QueryStats, estimate_result_bytes
+from utils.search_index import SearchIndex
+from utils.fulltext_search import split_search_terms, boolean_mode_query, EXACT_MATCH_SCORE
+from utils.date_ranges import start_of_day, start_of_next_day, day_range
+from utils.signatures import SignatureCache, encode_signature, decode_signature
+from utils.activity_log import ActivityLogWriter, BATCH_SIZE, FLUSH_INTERVAL_MS
+from utils.activity_archive import ActivityLogArchive, month_start
+from utils.report_cache import ReportCache, REPORT_CACHE_BYTES, REPORT_CACHE_TTL
+from utils.report_dataset import ReportDataset, REPORT_TYPES
 
 
 # Define the path for the database file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
+LOGS_DIR = os.path.join(BASE_DIR, 'logs')
+SLOW_QUERY_LOG = os.path.join(LOGS_DIR, 'slow_queries.log')
+# Activity log entries that could not be written yet; replayed once MySQL is back.
+ACTIVITY_LOG_SPOOL = os.path.join(LOGS_DIR, 'activity_log_spool.jsonl')
+# Months of activity logs past the retention period, one compressed file per month;
+# only seen on this workstation unless activity_log_archive_dir points at a shared folder.
+ACTIVITY_LOG_ARCHIVE_DIR = os.path.join(LOGS_DIR, 'activity_archive')
+# Advisory lock so only one app instance archives at a time, and the rows deleted per statement.
+ACTIVITY_ARCHIVE_LOCK_NAME = 'rems_activity_log_archive'
+ACTIVITY_ARCHIVE_DELETE_CHUNK = 5000
+# Sales report rows and PDFs served again while their tables are unchanged (see get_report_data).
+REPORT_CACHE_DIR = os.path.join(REPORTS_DIR, 'cache')
 
 # MySQL database configuration
 db_config = {
@@ -18,12 +46,101 @@ db_config = {
     'database': 'real_estate_db'
 }
 
+# Connection pool defaults; each can be overridden from the system_settings table.
+POOL_SETTINGS = {
+    'db_pool_max_size': (5, "Maximum number of pooled MySQL connections."),
+    'db_pool_idle_timeout': (300, "Seconds an idle pooled connection is kept before it is closed."),
+    'db_pool_health_check_interval': (30, "Seconds of idleness after which a pooled connection is pinged before reuse."),
+    'db_pool_acquire_timeout': (10, "Seconds to wait for a free pooled connection before giving up."),
+}
+
+# Seconds the dashboard KPIs are served from memory before MySQL is asked again.
+# Writes to the underlying tables invalidate the cached snapshot immediately.
+DASHBOARD_CACHE_TTL = 30
+DASHBOARD_TABLES = ('properties', 'transactions', 'clients', 'service_jobs')
+
+# Tables whose version is the change marker of the survey search indexes. Client files
+# and survey clients are insert-only, so new jobs never depend on their other rows.
+SURVEY_FILE_TABLES = ('client_files', 'service_clients')
+SURVEY_JOB_TABLES = ('service_jobs', 'service_payments')
+# The in-memory search indexes only see writes made by this process. They ask MySQL for
+# rows added or removed from other workstations at most every INDEX_CHECK_SECONDS, and
+# reload in full once INDEX_MAX_AGE_SECONDS old to pick up rows edited there.
+INDEX_CHECK_SECONDS = 2
+INDEX_MAX_AGE_SECONDS = 300
+
+# Tables read by the sales reports (see get_report_dataset).
+REPORT_TABLES = ('transactions', 'properties', 'clients', 'projects')
+
+# Query instrumentation settings, also editable from the system_settings table.
+QUERY_STATS_SETTINGS = {
+    'slow_query_threshold_ms': (500, "Queries slower than this many milliseconds are written to logs/slow_queries.log."),
+}
+
+# Background activity log writer settings, also editable from the system_settings table.
+ACTIVITY_LOG_SETTINGS = {
+    'activity_log_batch_size': (BATCH_SIZE, "Activity log entries written to MySQL in one INSERT."),
+    'activity_log_flush_interval_ms': (FLUSH_INTERVAL_MS, "Milliseconds a queued activity log entry waits for others to batch with."),
+    'activity_log_retention_months': (12, "Months of activity logs kept in MySQL; older months move to the activity log archive. 0 keeps everything."),
+}
+
+# Activity log archive settings, also editable from the system_settings table.
+ACTIVITY_ARCHIVE_SETTINGS = {
+    'activity_log_archive_dir': ('', "Folder for archived activity log months, e.g. a network share every workstation can read. Empty keeps them in logs/activity_archive on the computer that archived them."),
+}
+
+# Report cache settings, also editable from the system_settings table.
+REPORT_CACHE_SETTINGS = {
+    'report_cache_max_mb': (REPORT_CACHE_BYTES // (1024 * 1024), "Disk space, in MB, for cached report data and PDFs under reports/cache."),
+    'report_cache_ttl_seconds': (REPORT_CACHE_TTL, "Seconds a cached report is reused at most; payments and sales in its period refresh it at once."),
+}
+
+class SaleError(Exception):
+    """Raised inside record_sale when a step fails, so the whole sale is rolled back."""
+
+
 class DatabaseManager:
     """
     Manages all interactions with the MySQL database for the Real Estate Management System.
     """
+    # Shared by every DatabaseManager in the process so a write through one instance
+    # invalidates results cached by another.
+    _query_cache = QueryCache(default_ttl=DASHBOARD_CACHE_TTL)
+    # Per-method timings, also process-wide so the admin screen sees every instance's calls.
+    _query_stats = QueryStats(SLOW_QUERY_LOG, slow_threshold_ms=QUERY_STATS_SETTINGS['slow_query_threshold_ms'][0])
+    # Search-as-you-type index over active clients, kept current by the client CRUD methods.
+    _client_index = SearchIndex('client_id', ('name', 'telephone_number', 'email', 'client_id', 'added_by_username'),
+                                sort_field='name')
+    # Survey-side indexes over client files and jobs, refreshed incrementally (see get_survey_job_index).
+    _survey_file_index = SearchIndex('file_id', ('client_name', 'file_name', 'telephone_number'),
+                                     sort_field='client_name')
+    _survey_job_index = SearchIndex('job_id', ('title_number', 'title_name', 'client_name', 'file_name',
+                                               'telephone_number'), sort_field='timestamp', descending=True)
+    _survey_job_changes = {'job_ids': set(), 'payment_ids': set()}
+    _survey_job_changes_lock = threading.Lock()
+    # Dispatch signatures, read only when a user saves one and kept decoded for repeat saves.
+    _signature_cache = SignatureCache()
+    # Background writer shared by every instance; created by the first one (see _write_activity_batch).
+    _activity_log = None
+    # Activity log months already moved out of MySQL (see archive_activity_logs).
+    _activity_archive = ActivityLogArchive(ACTIVITY_LOG_ARCHIVE_DIR)
+    # Sales report rows and rendered PDFs on disk, keyed by period and table versions.
+    _report_cache = ReportCache(REPORT_CACHE_DIR)
+
     def __init__(self, db_config=db_config):
         self.db_config = db_config
+        self._uow_state = threading.local()  # Connection of the unit_of_work open on this thread
+        self._explain_state = threading.local()  # Plans collected by check_report_query_plans
+        self._pool = ConnectionPool(
+            self.db_config,
+            max_size=POOL_SETTINGS['db_pool_max_size'][0],
+            idle_timeout=POOL_SETTINGS['db_pool_idle_timeout'][0],
+            health_check_interval=POOL_SETTINGS['db_pool_health_check_interval'][0],
+            acquire_timeout=POOL_SETTINGS['db_pool_acquire_timeout'][0],
+        )
+        self.activity_log_retention_months = ACTIVITY_LOG_SETTINGS['activity_log_retention_months'][0]
+        if DatabaseManager._activity_log is None:
+            DatabaseManager._activity_log = ActivityLogWriter(self._write_activity_batch, ACTIVITY_LOG_SPOOL)
         self._create_reports_directory()
         self._ensure_database_and_user() 
         self._create_tables() 
@@ -42,8 +159,8 @@ class DatabaseManager:
         """
         try:
             # First, try connecting to the database directly
-            conn = mysql.connector.connect(**self.db_config)
-            conn.close()
+            conn = self._pool.acquire()
+            self._pool.release(conn)
             return True
         except mysql.connector.Error as err:
             print(f"Database/user missing or inaccessible: {err}")
@@ -84,438 +201,315 @@ class DatabaseManager:
                 return False
     def _get_connection(self):
         """
-        Returns a connection object to the database.
+        Checks a connection out of the pool.
+        Every connection obtained here must be handed back with _release_connection().
         """
         try:
-            conn = mysql.connector.connect(**self.db_config)
-            return conn
+            return self._pool.acquire()
         except mysql.connector.Error as err:
             print(f"Error connecting to MySQL database: {err}")
             return None
-        
-    
-    
+
+    def _release_connection(self, conn):
+        """
+        Returns a connection to the pool instead of closing it.
+        """
+        self._pool.release(conn)
+
+    def _active_uow(self):
+        """Returns the unit_of_work state for this thread, or None outside a unit of work."""
+        state = self._uow_state
+        return state if getattr(state, 'conn', None) is not None else None
+
+    def _finish_write(self, conn, query):
+        """Commits a write, or defers the commit to the enclosing unit_of_work."""
+        uow = self._active_uow()
+        if uow is not None:
+            uow.writes.append(query)
+            return
+        conn.commit()
+        self._query_cache.note_write(query)
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Runs every DatabaseManager call made inside the `with` block on one pooled
+        connection and in one transaction. The transaction commits when the block
+        finishes and rolls back if it raises. Inside the block, database errors are
+        raised instead of being printed and swallowed. A nested unit_of_work joins
+        the outer one.
+
+        Usage:
+            with db_manager.unit_of_work():
+                transaction_id = db_manager.add_transaction(...)
+                db_manager.update_property(property_id, status='Sold')
+        """
+        if self._active_uow() is not None:
+            yield self
+            return
+
+        conn = self._pool.acquire()
+        state = self._uow_state
+        try:
+            conn.start_transaction()
+            state.conn = conn
+            state.writes = []
+            state.after_commit = []
+            yield self
+            conn.commit()
+            for query in state.writes:
+                self._query_cache.note_write(query)
+            after_commit = state.after_commit
+        except BaseException:
+            try:
+                conn.rollback()
+            except mysql.connector.Error as err:
+                print(f"Error rolling back unit of work: {err}", file=sys.stderr)
+            raise
+        finally:
+            state.conn = None
+            state.writes = None
+            state.after_commit = None
+            self._release_connection(conn)
+        # Follow-up work such as refreshing search indexes runs once the connection is back.
+        for callback in after_commit:
+            callback()
+
+    def get_pool_stats(self):
+        """
+        Returns the connection pool metrics (checkouts, wait times, connections created/closed).
+        """
+        return self._pool.stats()
+
+    def get_query_stats(self, limit=20):
+        """
+        Returns the instrumented query metrics as a dict with the `slowest` and
+        `most_frequent` DatabaseManager methods (up to `limit` each), the slow query
+        threshold and the path of the slow query log.
+        """
+        return {
+            'slowest': self._query_stats.top_slowest(limit),
+            'most_frequent': self._query_stats.most_frequent(limit),
+            'slow_query_threshold_ms': self._query_stats.slow_threshold_ms,
+            'slow_query_log': self._query_stats.slow_log_path,
+        }
+
+    def reset_query_stats(self):
+        """Clears the collected query metrics."""
+        self._query_stats.reset()
+
+    def check_report_query_plans(self, start_date=None, end_date=None):
+        """
+        EXPLAINs the date-filtered report queries, without running them, and reports whether
+        MySQL reads the date-filtered table with an index range scan. The optimizer picks plans
+        from table statistics, so the check is only meaningful on a realistically sized
+        database. The range defaults to the last 30 days.
+        Returns: A list of dicts, one per report query, with report, table, access_type, key,
+        estimated rows and uses_range_scan.
+        """
+        end_date = end_date or datetime.now().date()
+        start_date = start_date or end_date - timedelta(days=30)
+        start_text, end_text = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        date_filters = {'from_date': start_date, 'to_date': end_date}
+
+        # (report method, alias of the table holding the filtered date column, call)
+        reports = [
+            ('get_transactions_with_details', 't',
+             lambda: self.get_transactions_with_details(start_date=start_text, end_date=end_text)),
+            ('get_sold_properties_paginated', 't',
+             lambda: self.get_sold_properties_paginated(20, 0, start_date=start_text, end_date=end_text)),
+            ('get_total_sales_for_date_range', 't',
+             lambda: self.get_total_sales_for_date_range(start_text, end_text)),
+            ('get_report_dataset', 't',
+             lambda: self.get_report_dataset(start_text, end_text)),
+            ('get_filtered_payments', 'sp',
+             lambda: self.get_filtered_payments(dict(date_filters))),
+            ('get_service_sales_summary', 'sp',
+             lambda: self.get_service_sales_summary('custom', start_text, end_text)),
+            ('get_service_jobs_for_report', 'sp',
+             lambda: self.get_service_jobs_for_report(start_text, end_text)),
+            ('get_dispatch_records', 'sd',
+             lambda: self.get_dispatch_records(dict(date_filters))),
+            ('get_filtered_cancelled_jobs', 'cj',
+             lambda: self.get_filtered_cancelled_jobs(dict(date_filters))),
+            ('get_activity_logs', 'l',
+             lambda: self.get_activity_logs(start_date=start_text, end_date=end_text)),
+            ('get_total_activity_logs_count', 'activity_logs',
+             lambda: self.get_total_activity_logs_count(start_date=start_text, end_date=end_text)),
+            ('get_daily_clients', 'dc',
+             lambda: self.get_daily_clients(start_date=start_text, end_date=end_text)),
+            ('get_daily_client_visits', 'dc',
+             lambda: self.get_daily_client_visits(end_date)),
+        ]
+
+        results = []
+        for report, table, run_report in reports:
+            plans = self._explain_state.plans = []
+            try:
+                run_report()
+            finally:
+                self._explain_state.plans = None
+            for _, plan in plans:
+                row = next((r for r in plan if r.get('table') == table), None)
+                if row is None:
+                    continue  # e.g. a query of the report that does not filter on the date
+                results.append({
+                    'report': report,
+                    'table': table,
+                    'access_type': row.get('type'),
+                    'key': row.get('key'),
+                    'rows': row.get('rows'),
+                    'uses_range_scan': row.get('type') == 'range' and row.get('key') is not None,
+                })
+        return results
+
     def _execute_query(self, query, params=(), fetch_one=False, fetch_all=False):
         """
         A helper method to execute SQL queries.
         Can fetch one, fetch all, or just execute (for INSERT, UPDATE, DELETE).
         Returns dictionary-like objects for SELECT queries.
+        Every call is timed and attributed to the DatabaseManager method that made it.
         """
-        conn = self._get_connection()
+        caller = sys._getframe(1).f_code.co_name
+        started = time.perf_counter()
+        uow = self._active_uow()
+        conn = uow.conn if uow is not None else self._get_connection()
+        acquire_time = time.perf_counter() - started
         if not conn:
             return None
 
+        rows = 0
+        bytes_fetched = 0
+        failed = False
         try:
             with conn.cursor(buffered=True, dictionary=True) as cursor:
+                plans = getattr(self._explain_state, 'plans', None)
+                if plans is not None:
+                    # check_report_query_plans: collect the plan instead of running the query.
+                    if query.strip().upper().startswith("SELECT"):
+                        cursor.execute("EXPLAIN " + query, params)
+                        plans.append((caller, cursor.fetchall()))
+                    return [] if fetch_all else None
+
                 cursor.execute(query, params)
                 
                 # Check if the query is a SELECT statement and fetch results
                 if query.strip().upper().startswith("INSERT"):
-                    conn.commit()
+                    self._finish_write(conn, query)
+                    rows = cursor.rowcount
                     return cursor.lastrowid
                 
                 if query.strip().upper().startswith(("UPDATE", "DELETE")):
-                    conn.commit()
+                    self._finish_write(conn, query)
+                    rows = cursor.rowcount
                     return cursor.rowcount > 0
                 
                 # For SELECT, fetch and return the results
                 if fetch_one:
-                    return cursor.fetchone()
+                    result = cursor.fetchone()
+                    rows = 1 if result else 0
+                    bytes_fetched = estimate_result_bytes(result)
+                    return result
                 
                 if fetch_all:
-                    return cursor.fetchall()
+                    result = cursor.fetchall()
+                    rows = len(result)
+                    bytes_fetched = estimate_result_bytes(result)
+                    return result
                 
                 return None
         except mysql.connector.Error as err:
+            failed = True
             print(f"Database error: {err}", file=sys.stderr)
+            if uow is not None:
+                raise
             return None
         except Exception as e:
+            failed = True
             print(f"An unexpected error occurred in _execute_query: {e}", file=sys.stderr)
+            if uow is not None:
+                raise
             return None
         finally:
-            if conn and conn.is_connected():
-                conn.close()
+            if uow is None:
+                self._release_connection(conn)
+            self._query_stats.record(
+                caller, time.perf_counter() - started, acquire_time,
+                rows=rows, bytes_fetched=bytes_fetched, query=query, params=params, error=failed
+            )
 
     def _execute_transaction(self, *queries_and_params):
+        caller = sys._getframe(1).f_code.co_name
+        started = time.perf_counter()
+        acquire_time = 0.0
+        rows = 0
+        failed = True
         conn = None
+        uow = self._active_uow()
         try:
+            if uow is not None:
+                # Already inside a transaction; errors propagate so the unit of work rolls back.
+                with uow.conn.cursor() as cursor:
+                    for query, params in queries_and_params:
+                        cursor.execute(query, params)
+                        rows += max(cursor.rowcount, 0)
+                uow.writes.extend(query for query, _ in queries_and_params)
+                failed = False
+                return True
+
             conn = self._get_connection()
+            acquire_time = time.perf_counter() - started
             if not conn:
                 return False
             with conn.cursor() as cursor:
                 for query, params in queries_and_params:
                     cursor.execute(query, params)
+                    rows += max(cursor.rowcount, 0)
                 conn.commit()
-                return True
+            for query, _ in queries_and_params:
+                self._query_cache.note_write(query)
+            failed = False
+            return True
         except mysql.connector.Error as err:
+            if uow is not None:
+                raise
             print(f"Database transaction error: {err}", file=sys.stderr)
             if conn:
                 conn.rollback()
             return False
         except Exception as e:
+            if uow is not None:
+                raise
             print(f"An unexpected error occurred in _execute_transaction: {e}", file=sys.stderr)
             if conn:
                conn.rollback()
             return False
         finally:
-            if conn and conn.is_connected():
-                conn.close()
+            if conn:
+                self._release_connection(conn)
+            self._query_stats.record(
+                caller, time.perf_counter() - started, acquire_time, rows=rows,
+                query="; ".join(query for query, _ in queries_and_params),
+                params=[params for _, params in queries_and_params], error=failed
+            )
 
     def _create_tables(self):
-
-        # Check if the database already exists and is accessible
-        try:
-            conn = mysql.connector.connect(**self.db_config)
-            conn.close()
-            # If we reached here, the connection was successful.
-            print("Database connection successful.")
-        except mysql.connector.Error as err:
-            print(f"Error connecting to MySQL database: {err}")
-            # Do not proceed with creating tables if the connection failed
+        """Brings the schema up to date by running any pending migrations."""
+        conn = self._get_connection()
+        if not conn:
+            # Do not proceed with migrating the schema if the connection failed
             return False
-        """Initializes the database by creating tables if they don't exist."""
+        print("Database connection successful.")
         try:
-            queries = [
-                '''
-                CREATE TABLE IF NOT EXISTS system_settings (
-                    setting_id INT AUTO_INCREMENT PRIMARY KEY,
-                    setting_name VARCHAR(255) UNIQUE NOT NULL,
-                    setting_value VARCHAR(255),
-                    description TEXT,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    updated_by_user_id VARCHAR(255),
-                    updated_by_username VARCHAR(255)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INT PRIMARY KEY AUTO_INCREMENT,
-                    username VARCHAR(255) NOT NULL UNIQUE,
-                    password_hash VARCHAR(255) NOT NULL,
-                    is_agent VARCHAR(255) DEFAULT 'no',
-                    role VARCHAR(255) DEFAULT 'user'
-                    
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS user_permissions (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT NOT NULL,
-                    permission_name VARCHAR(255) NOT NULL,
-                    is_granted BOOLEAN DEFAULT FALSE,
-                    UNIQUE (user_id, permission_name),
-                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS properties (
-                    property_id INT PRIMARY KEY AUTO_INCREMENT,
-                    property_type VARCHAR(255) NOT NULL,
-                    title_deed_number VARCHAR(255) NOT NULL,
-                    location VARCHAR(255) NOT NULL,
-                    size FLOAT NOT NULL,
-                    description TEXT,
-                    owner VARCHAR(255) NOT NULL,
-                    telephone_number VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL,
-                    price FLOAT NOT NULL,
-                    project_no VARCHAR(255) NOT NULL,
-                    image_paths TEXT,
-                    title_image_paths TEXT,
-                    status VARCHAR(255) NOT NULL DEFAULT 'Available',
-                    added_by_user_id INT,
-                    project_id INT NOT NULL,
-                    FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS propertiesForTransfer (
-                    property_id INT PRIMARY KEY AUTO_INCREMENT,
-                    title_deed_number VARCHAR(255) NOT NULL,
-                    location VARCHAR(255) NOT NULL,
-                    size FLOAT NOT NULL,
-                    description TEXT,
-                    owner VARCHAR(255) NOT NULL,
-                    telephone_number VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL,
-                    image_paths TEXT,
-                    title_image_paths TEXT,
-                    added_by_user_id INT,
-                    FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS clients (
-                    client_id INT PRIMARY KEY AUTO_INCREMENT,
-                    name VARCHAR(255) NOT NULL,
-                    telephone_number VARCHAR(255) NOT NULL UNIQUE,
-                    email VARCHAR(255) NOT NULL,
-                    status VARCHAR(255) NOT NULL DEFAULT 'active',
-                    added_by_user_id INT,
-                    FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS projects (
-                    project_id INT PRIMARY KEY AUTO_INCREMENT,
-                    name VARCHAR(255) NOT NULL,
-                    added_by_user_id INT,
-                    status VARCHAR(255) NOT NULL DEFAULT 'active',
-                    sale_status VARCHAR(50) DEFAULT 'Available',
-                    FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS daily_clients (
-                visit_id INT PRIMARY KEY AUTO_INCREMENT,
-                client_id INT NOT NULL,
-                purpose VARCHAR(255),
-                reason VARCHAR(255),
-                brought_by VARCHAR(255),
-                added_by_user_id INT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (client_id) REFERENCES clients(client_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS transactions (
-                    transaction_id INT PRIMARY KEY AUTO_INCREMENT,
-                    property_id INT NOT NULL,
-                    client_id INT NOT NULL,
-                    payment_mode VARCHAR(255) NOT NULL,
-                    total_amount_paid DECIMAL(15, 2) NOT NULL,
-                    discount DECIMAL(15, 2) DEFAULT 0.0,
-                    balance DECIMAL(15, 2) DEFAULT 0.0,
-                    brought_by VARCHAR(255),
-                    transaction_date DATETIME NOT NULL,
-                    receipt_path TEXT,
-                    added_by_user_id INT,
-                    FOREIGN KEY (property_id) REFERENCES properties(property_id),
-                    FOREIGN KEY (client_id) REFERENCES clients(client_id),
-                    FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
-                )
-                ''',
-                
-                '''
-                CREATE TABLE IF NOT EXISTS proposed_lots (
-                    lot_id INT PRIMARY KEY AUTO_INCREMENT,
-                    parent_block_id INT NOT NULL,
-                    size FLOAT NOT NULL,
-                    location VARCHAR(255) NOT NULL,
-                    surveyor_name VARCHAR(255) NOT NULL,
-                    created_by VARCHAR(255) NOT NULL,
-                    title_deed_number VARCHAR(255),
-                    price VARCHAR(255) DEFAULT '0.0',
-                    status VARCHAR(255) NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS property_transfers (
-                    transfer_id INT PRIMARY KEY AUTO_INCREMENT,
-                    property_id INT NOT NULL,
-                    from_client_id INT,
-                    to_client_id INT NOT NULL,
-                    transfer_price FLOAT NOT NULL,
-                    transfer_date DATE NOT NULL,
-                    executed_by_user_id INT NOT NULL,
-                    supervising_agent_id INT,
-                    transfer_document_path TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (property_id) REFERENCES properties(property_id),
-                    FOREIGN KEY (from_client_id) REFERENCES clients(client_id),
-                    FOREIGN KEY (to_client_id) REFERENCES clients(client_id),
-                    FOREIGN KEY (executed_by_user_id) REFERENCES users(user_id),
-                    FOREIGN KEY (supervising_agent_id) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS agents (
-                    agent_id INT PRIMARY KEY AUTO_INCREMENT,
-                    name VARCHAR(255) NOT NULL,
-                    status VARCHAR(255) DEFAULT 'active',
-                    added_by VARCHAR(255) NOT NULL,
-                    timestamp DATETIME NOT NULL
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS payment_plans (
-                    plan_id INT PRIMARY KEY AUTO_INCREMENT,
-                    name VARCHAR(255) NOT NULL,
-                    deposit_percentage FLOAT NOT NULL,
-                    duration_months INT NOT NULL,
-                    interest_rate FLOAT NOT NULL,
-                    created_by VARCHAR(255) NOT NULL
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS installment_plans (
-                plan_instance_id INT PRIMARY KEY AUTO_INCREMENT,
-                transaction_id INT NOT NULL,
-                payment_plan_id INT NOT NULL,
-                total_balance DECIMAL(15, 2) NOT NULL,
-                monthly_installment_amount DECIMAL(15, 4) NOT NULL,
-                start_date DATE NOT NULL,
-                FOREIGN KEY (transaction_id) REFERENCES transactions(transaction_id),
-                FOREIGN KEY (payment_plan_id) REFERENCES payment_plans(plan_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS installment_payments (
-                installment_id INT PRIMARY KEY AUTO_INCREMENT,
-                plan_instance_id INT NOT NULL,
-                due_date DATE NOT NULL,
-                due_amount DECIMAL(15, 2) NOT NULL,
-                paid_date DATETIME,
-                paid_amount DECIMAL(15, 2),
-                payment_status VARCHAR(50) NOT NULL DEFAULT 'Scheduled',
-                FOREIGN KEY (plan_instance_id) REFERENCES installment_plans(plan_instance_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS transactions_history (
-                    history_id INT PRIMARY KEY AUTO_INCREMENT,
-                    transaction_id INT NOT NULL,
-                    installment_id INT NULL,
-                    payment_amount DECIMAL(15, 2) NOT NULL,
-                    payment_mode VARCHAR(255),
-                    payment_reason VARCHAR(255),
-                    payment_date DATETIME NOT NULL,
-                    FOREIGN KEY (transaction_id) REFERENCES transactions(transaction_id),
-                    FOREIGN KEY (installment_id) REFERENCES installment_payments(installment_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS service_clients (
-                    client_id INT PRIMARY KEY AUTO_INCREMENT,
-                    name VARCHAR(255) NOT NULL,
-                    telephone_number VARCHAR(255) NOT NULL UNIQUE,
-                    email VARCHAR(255) NOT NULL,
-                    brought_by VARCHAR(255),
-                    added_by VARCHAR(255) NOT NULL,
-                    timestamp DATETIME NOT NULL
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS client_files (
-                    file_id INT PRIMARY KEY AUTO_INCREMENT,
-                    client_id INT NOT NULL,
-                    file_name VARCHAR(255) NOT NULL,
-                    added_by VARCHAR(255) NOT NULL,
-                    timestamp DATETIME NOT NULL,
-                    FOREIGN KEY (client_id) REFERENCES service_clients(client_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS service_jobs (
-                    job_id INT PRIMARY KEY AUTO_INCREMENT,
-                    file_id INT NOT NULL,
-                    job_description TEXT,
-                    title_name VARCHAR(255) NOT NULL,
-                    title_number VARCHAR(255) NOT NULL,
-                    fee FLOAT NOT NULL,
-                    status VARCHAR(255) NOT NULL DEFAULT 'Ongoing',
-                    added_by VARCHAR(255) NOT NULL,
-                    brought_by VARCHAR(255) DEFAULT 'self',
-                    assigned_to VARCHAR(255) NOT NULL,
-                    task_type  VARCHAR(255) NOT NULL,
-                    timestamp DATETIME NOT NULL,
-                    FOREIGN KEY (file_id) REFERENCES client_files(file_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS service_payments (
-                    payment_id INT PRIMARY KEY AUTO_INCREMENT,
-                    job_id INT NOT NULL UNIQUE,
-                    fee FLOAT NOT NULL,
-                    amount FLOAT NOT NULL,
-                    balance FLOAT NOT NULL,
-                    payment_date VARCHAR(255) NOT NULL,
-                    status VARCHAR(255) DEFAULT 'unpaid',
-                    FOREIGN KEY (job_id) REFERENCES service_jobs(job_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS service_payments_history (
-                    history_id INT PRIMARY KEY AUTO_INCREMENT,
-                    payment_id INT NOT NULL,
-                    payment_amount FLOAT NOT NULL,
-                    payment_type VARCHAR(255),
-                    payment_reason VARCHAR(255),
-                    payment_date VARCHAR(255) NOT NULL,
-                    FOREIGN KEY (payment_id) REFERENCES service_payments(payment_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS service_dispatch (
-                    dispatch_id INT PRIMARY KEY AUTO_INCREMENT,
-                    job_id INT NOT NULL,
-                    dispatch_date DATE NOT NULL,
-                    reason_for_dispatch TEXT,
-                    collected_by VARCHAR(255),
-                    collector_phone VARCHAR(255),
-                    sign BLOB,
-                    FOREIGN KEY (job_id) REFERENCES service_jobs(job_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS cancelled_jobs (
-                    cancellation_id INT PRIMARY KEY AUTO_INCREMENT,
-                    job_id INT NOT NULL,
-                    reason TEXT NOT NULL,
-                    refund_amount FLOAT NOT NULL,
-                    cancelled_by INT NOT NULL,
-                    cancellation_date DATETIME NOT NULL,
-                    FOREIGN KEY (job_id) REFERENCES service_jobs(job_id),
-                    FOREIGN KEY (cancelled_by) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS activity_logs (
-                    log_id INT PRIMARY KEY AUTO_INCREMENT,
-                    timestamp DATETIME NOT NULL,
-                    user_id INT NOT NULL,
-                    action_type VARCHAR(255) NOT NULL,
-                    details TEXT,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS dispatch_titles (
-                    dispatch_id INT AUTO_INCREMENT PRIMARY KEY,
-                    property_id INT NOT NULL,
-                    dispatch_date DATETIME NOT NULL,
-                    reason_for_dispatch VARCHAR(255),
-                    collected_by VARCHAR(255),
-                    collector_phone VARCHAR(50),
-                    sign LONGBLOB,
-                    FOREIGN KEY (property_id) REFERENCES properties(property_id)
-                )
-                ''',
-                '''
-                CREATE TABLE IF NOT EXISTS title_movements (
-                    movement_id INT PRIMARY KEY AUTO_INCREMENT,
-                    property_id INT NOT NULL,
-                    movement_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    movement_stage ENUM('Lawyer', 'Office', 'Dispatch') NOT NULL,
-                    status VARCHAR(100) DEFAULT 'Pending',
-                    lawyer_name VARCHAR(255),
-                    remarks TEXT,
-                    handled_by_user_id INT,
-                    FOREIGN KEY (property_id) REFERENCES properties(property_id),
-                    FOREIGN KEY (handled_by_user_id) REFERENCES users(user_id)
-                )
-                '''
-            ]
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                for query in queries:
-                    cursor.execute(query)
-                conn.commit()
-            print("Database initialized successfully.")
+            applied = run_migrations(conn)
+            if applied:
+                print(f"Database schema migrated to version {applied[-1]}.")
+            else:
+                print("Database schema is up to date.")
         except mysql.connector.Error as err:
-            print(f"Error creating tables: {err}")
+            print(f"Error migrating database schema: {err}")
+        finally:
+            self._release_connection(conn)
 
     ## User Management Methods
     def add_user(self, username, password, is_agent='no',role='user'):
@@ -804,22 +798,7 @@ class DatabaseManager:
         result_row = self._execute_query(query, fetch_one=True)
         return result_row['COUNT(*)'] if result_row else 0
 
-    def get_all_properties_paginated(
-        self,
-        limit=None,
-        offset=None,
-        search_query=None,
-        min_size=None,
-        max_size=None,
-        status=None,
-        project_name=None  # 👈 Added parameter
-    ):
-        """
-        Fetches properties with optional search, size filters, status, project filter, and pagination.
-        Includes the username of the user who added the property and the project name.
-        Returns properties ordered by property_id DESC (newest first).
-        """
-        query = """
+    _PROPERTY_LIST_COLUMNS = """
         SELECT
             p.property_id,
             p.project_no,
@@ -838,18 +817,112 @@ class DatabaseManager:
             p.added_by_user_id,
             p.owner,
             u.username AS added_by_username
+    """
+
+    _PROPERTY_LIST_FROM = """
         FROM
             properties p
         LEFT JOIN
             projects pr ON p.project_id = pr.project_id
         LEFT JOIN
             users u ON p.added_by_user_id = u.user_id
-        WHERE 1=1
+    """
+
+    # Column lists of the FULLTEXT indexes added by schema migration 3. MATCH() only uses
+    # an index when it names exactly the indexed columns.
+    _PROPERTY_SEARCH_COLUMNS = "title_deed_number, location, project_no, owner, description"
+    _TRANSFER_SEARCH_COLUMNS = "title_deed_number, location, owner, description"
+
+    # Columns the property list can be ordered by, mapped to the SQL sort expression.
+    # FLOAT columns are compared as DECIMAL so the keyset equality test is exact, and
+    # joined names are COALESCEd so NULLs do not fall out of the range comparison.
+    PROPERTY_SORT_COLUMNS = {
+        'property_id': 'p.property_id',
+        'project_no': 'p.project_no',
+        'project_name': "COALESCE(pr.name, '')",
+        'property_type': 'p.property_type',
+        'title_deed_number': 'p.title_deed_number',
+        'location': 'p.location',
+        'price': 'CAST(p.price AS DECIMAL(20, 2))',
+        'size': 'CAST(p.size AS DECIMAL(20, 4))',
+        'status': 'p.status',
+        'telephone_number': 'p.telephone_number',
+        'added_by_username': "COALESCE(u.username, '')",
+        'owner': 'p.owner',
+        # Only available while searching; ranks the best FULLTEXT matches first.
+        'relevance': 'CAST(ft.score AS DECIMAL(20, 6))',
+    }
+
+    def _property_search_join(self, terms, search_query):
+        """
+        Builds a join onto the properties matching every search term, found through the
+        FULLTEXT indexes on the property fields and on project names. An all-digit search
+        also matches the project with that ID. Each hit carries its relevance as ft.score.
+        Returns: (sql_fragment, params)
+        """
+        against = boolean_mode_query(terms)
+        match_property = f"MATCH({self._PROPERTY_SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)"
+        match_project = "MATCH(sp.name) AGAINST (%s IN BOOLEAN MODE)"
+        query = f"""
+        JOIN (
+            SELECT property_id, MAX(score) AS score
+            FROM (
+                SELECT property_id, {match_property} AS score
+                FROM properties
+                WHERE {match_property}
+                UNION ALL
+                SELECT spp.property_id, {match_project} AS score
+                FROM projects sp
+                JOIN properties spp ON spp.project_id = sp.project_id
+                WHERE {match_project}
+        """
+        params = [against] * 4
+        if search_query.isdigit():
+            query += """
+                UNION ALL
+                SELECT property_id, %s AS score
+                FROM properties
+                WHERE project_id = %s
+            """
+            params.extend([EXACT_MATCH_SCORE, int(search_query)])
+        query += """
+            ) AS hits
+            GROUP BY property_id
+        ) AS ft ON ft.property_id = p.property_id
+        """
+        return query, params
+
+    def _build_property_filters(self, search_query=None, min_size=None, max_size=None, status=None, project_name=None):
+        """
+        Builds the FROM ... WHERE part shared by the property list queries.
+        Searches are answered from the FULLTEXT indexes: a property matches when every word
+        of the search (or the start of it) appears in its title deed, location, project
+        number, owner or description, or in its project's name.
+        Returns: (sql_fragment, params, ranked). When ranked is True the matches are joined
+        in as `ft` and can be ordered by relevance.
         """
+        query = self._PROPERTY_LIST_FROM
         params = []
 
+        indexed_terms, short_terms = split_search_terms(search_query) if search_query else ([], [])
+        ranked = bool(indexed_terms)
+        if ranked:
+            join_sql, join_params = self._property_search_join(indexed_terms, search_query)
+            query += join_sql
+            params.extend(join_params)
+        query += " WHERE 1=1"
+
         # 🔎 Multi-field search filter
-        if search_query:
+        if ranked:
+            # Words too short for the FULLTEXT index only narrow down the indexed matches.
+            for term in short_terms:
+                query += """
+                    AND CONCAT_WS(' ', p.title_deed_number, p.location, p.project_no,
+                                  p.owner, p.description, pr.name) LIKE %s
+                """
+                params.append(f"%{term}%")
+        elif search_query:
+            # Nothing the FULLTEXT index can look up (e.g. "12"): fall back to a scan.
             if search_query.isdigit():
                 query += """
                     AND (
@@ -893,8 +966,34 @@ class DatabaseManager:
             query += " AND pr.name = %s"
             params.append(project_name)
 
-        # 🧭 Sort by newest first
-        query += " ORDER BY p.property_id DESC"
+        return query, params, ranked
+
+    def get_all_properties_paginated(
+        self,
+        limit=None,
+        offset=None,
+        search_query=None,
+        min_size=None,
+        max_size=None,
+        status=None,
+        project_name=None  # 👈 Added parameter
+    ):
+        """
+        Fetches properties with optional search, size filters, status, project filter, and pagination.
+        Includes the username of the user who added the property and the project name.
+        Returns properties ordered by property_id DESC (newest first), or best match first
+        when searching.
+        For paging through large result sets prefer get_properties_page, which does not slow
+        down as the offset grows.
+        """
+        from_sql, params, ranked = self._build_property_filters(search_query, min_size, max_size, status, project_name)
+        query = self._PROPERTY_LIST_COLUMNS + from_sql
+
+        # 🧭 Sort by relevance when searching, then newest first
+        if ranked:
+            query += " ORDER BY ft.score DESC, p.property_id DESC"
+        else:
+            query += " ORDER BY p.property_id DESC"
 
         # 📄 Pagination
         if limit is not None:
@@ -907,6 +1006,79 @@ class DatabaseManager:
 
         return self._execute_query(query, tuple(params), fetch_all=True)
 
+    def count_properties(self, search_query=None, min_size=None, max_size=None, status=None, project_name=None):
+        """
+        Counts the properties matching the same filters as get_all_properties_paginated.
+        Returns: The number of matching properties (0 on error).
+        """
+        from_sql, params, _ = self._build_property_filters(search_query, min_size, max_size, status, project_name)
+        query = "SELECT COUNT(*) AS total" + from_sql
+        result = self._execute_query(query, tuple(params), fetch_one=True)
+        return result['total'] if result else 0
+
+    def get_properties_page(
+        self,
+        page_size=20,
+        cursor=None,
+        sort_by='property_id',
+        descending=True,
+        search_query=None,
+        min_size=None,
+        max_size=None,
+        status=None,
+        project_name=None
+    ):
+        """
+        Fetches one page of properties using keyset (seek) pagination, so every page costs
+        the same no matter how deep into the list it is.
+
+        `cursor` is the opaque value returned with the previous page (None for the first page),
+        `sort_by` is a key of PROPERTY_SORT_COLUMNS; property_id breaks ties. Sorting by
+        'relevance' (descending puts the best matches first) needs a search_query and
+        falls back to property_id without one.
+        Returns: (properties, next_cursor). next_cursor is None on the last page.
+        """
+        from_sql, params, ranked = self._build_property_filters(search_query, min_size, max_size, status, project_name)
+        if sort_by not in self.PROPERTY_SORT_COLUMNS or (sort_by == 'relevance' and not ranked):
+            sort_by = 'property_id'
+        sort_expr = self.PROPERTY_SORT_COLUMNS[sort_by]
+        direction = "DESC" if descending else "ASC"
+        comparison = "<" if descending else ">"
+
+        query = self._PROPERTY_LIST_COLUMNS + f", {sort_expr} AS sort_key" + from_sql
+
+        position = decode_cursor(cursor, sort_by, descending)
+        if position is not None:
+            last_value, last_id = position
+            if sort_by == 'property_id':
+                query += f" AND p.property_id {comparison} %s"
+                params.append(last_id)
+            else:
+                query += f" AND ({sort_expr} {comparison} %s OR ({sort_expr} = %s AND p.property_id {comparison} %s))"
+                params.extend([last_value, last_value, last_id])
+
+        if sort_by == 'property_id':
+            query += f" ORDER BY p.property_id {direction}"
+        else:
+            query += f" ORDER BY {sort_expr} {direction}, p.property_id {direction}"
+
+        # Fetch one extra row to know whether another page follows.
+        query += " LIMIT %s"
+        params.append(page_size + 1)
+
+        rows = self._execute_query(query, tuple(params), fetch_all=True)
+        if not rows:
+            return [], None
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last_row = rows[-1]
+            next_cursor = encode_cursor(sort_by, descending, last_row['sort_key'], last_row['property_id'])
+        for row in rows:
+            row.pop('sort_key', None)
+        return rows, next_cursor
+
     def add_buyer(self, name, contact, added_by_user_id=None):
         query = "INSERT INTO buyers (name, contact, added_by_user_id) VALUES (%s, %s, %s)"
         return self._execute_query(query, (name, contact, added_by_user_id))
@@ -927,13 +1099,17 @@ class DatabaseManager:
             if current_status == 'inactive':
                 update_query = "UPDATE clients SET name = %s, email = %s,  status = 'active',  added_by_user_id = %s WHERE client_id = %s"
                 self._execute_query(update_query, (name, email, added_by_user_id, client_id))
+                self._refresh_client_index(client_id)
                 return client_id
             else:
                 print(f"Error: A client with the telephone number {telephone_number} already exists and is active.")
                 return None
         else:
             query = "INSERT INTO clients (name, telephone_number, email,  status,  added_by_user_id) VALUES (%s, %s, %s, %s, %s)"
-            return self._execute_query(query, (name, telephone_number, email,  status,  added_by_user_id))
+            client_id = self._execute_query(query, (name, telephone_number, email,  status,  added_by_user_id))
+            if client_id:
+                self._refresh_client_index(client_id)
+            return client_id
 
     def get_client(self, client_id):
         """
@@ -959,12 +1135,7 @@ class DatabaseManager:
         query = "SELECT * FROM clients WHERE telephone_number = %s AND email = %s"
         return self._execute_query(query, (telephone_number, email), fetch_one=True)
     
-    def get_all_clients(self):
-        """
-        Retrieves all clients from the database, including the username of the user who added them.
-        Returns: A list of dictionaries representing clients.
-        """
-        query = """
+    _CLIENT_LIST_QUERY = """
         SELECT
             c.client_id,
             c.name,
@@ -977,12 +1148,105 @@ class DatabaseManager:
             clients c
         LEFT JOIN
             users u ON c.added_by_user_id = u.user_id
+    """
+
+    def get_all_clients(self):
+        """
+        Retrieves all clients from the database, including the username of the user who added them.
+        Returns: A list of dictionaries representing clients.
+        """
+        query = self._CLIENT_LIST_QUERY + """
         WHERE
             c.status = 'active'
         ORDER BY c.name ASC
         """
         return self._execute_query(query, fetch_all=True)
 
+    def get_client_search_index(self):
+        """
+        Returns the shared SearchIndex over active clients (see get_all_clients).
+        It is loaded on first use and then kept current by add_client, update_client
+        and delete_client. Clients added or removed from another workstation are
+        picked up by comparing the index with MySQL's count and highest client_id
+        (see _index_needs_reload); other changes make it reload.
+        """
+        index = self._client_index
+        version = self._query_cache.table_versions(('clients',))[0]
+        if index.loaded and index.version == version and not self._index_needs_reload(
+                index, "SELECT COUNT(*) AS row_count, MAX(client_id) AS last_id FROM clients WHERE status = 'active'",
+                self._CLIENT_LIST_QUERY + " WHERE c.status = 'active' AND c.client_id > %s"):
+            return index
+        clients = self.get_all_clients()
+        if clients is not None:
+            index.load(clients, version=version)
+        return index
+
+    def _index_is_due(self, index):
+        """
+        True when a loaded search index should be compared with MySQL again, at most
+        every INDEX_CHECK_SECONDS so searching as the user types stays in memory.
+        """
+        now = time.time()
+        if index.checked_at is not None and now - index.checked_at < INDEX_CHECK_SECONDS:
+            return False
+        index.checked_at = now
+        return True
+
+    def _index_needs_reload(self, index, marker_query, new_rows_query):
+        """
+        Checks a loaded search index against MySQL for rows written from other workstations.
+        `marker_query` returns row_count and last_id for the indexed rows; while they match
+        the index's own size and highest id nothing changed. Otherwise the rows with ids
+        past the index's highest (`new_rows_query`, one %s) are added, and the index needs
+        a full reload only if the counts still differ (rows were removed).
+        Returns: True when the index is too old or out of step and must be reloaded.
+        """
+        if index.loaded_at is None or time.time() - index.loaded_at >= INDEX_MAX_AGE_SECONDS:
+            return True
+        if not self._index_is_due(index):
+            return False
+        marker = self._execute_query(marker_query, fetch_one=True)
+        if marker is None:
+            return False
+        last_id = index.max_id()
+        if (marker['row_count'], marker['last_id'] or 0) == (len(index), last_id):
+            return False
+        if (marker['last_id'] or 0) > last_id:
+            new_rows = self._execute_query(new_rows_query, (last_id,), fetch_all=True)
+            if new_rows is None:
+                return True
+            for row in new_rows:
+                index.upsert(row)
+        return marker['row_count'] != len(index)
+
+    def search_clients(self, term, limit=None):
+        """
+        Searches active clients by name, telephone number, email or ID without querying
+        the database. Prefix matches come first. Lists pass a `limit` (see
+        SEARCH_DISPLAY_LIMIT): broad terms match most clients.
+        Returns: A list of client dicts shaped like get_all_clients rows.
+        """
+        return self.get_client_search_index().search(term, limit)
+
+    def _refresh_client_index(self, client_id):
+        """Re-reads one client into the search index once its write is committed."""
+        uow = self._active_uow()
+        if uow is not None:
+            uow.after_commit.append(lambda: self._refresh_client_index(client_id))
+            return
+        index = self._client_index
+        if not index.loaded:
+            return
+        version = self._query_cache.table_versions(('clients',))[0]
+        client = self._execute_query(self._CLIENT_LIST_QUERY + " WHERE c.client_id = %s", (client_id,),
+                                     fetch_one=True)
+        if client is None:
+            index.invalidate()
+        elif client['status'] == 'active':
+            index.upsert(client, version=version)
+        else:
+            index.remove(client['client_id'], version=version)
+
     def get_all_clients_fortransferform(self):
         """
         Retrieves all clients from the database, including the username of the user who added them.
@@ -1022,7 +1286,10 @@ class DatabaseManager:
 
         params.append(client_id)
         query = f"UPDATE clients SET {', '.join(set_clauses)} WHERE client_id = %s"
-        return self._execute_query(query, params)
+        updated = self._execute_query(query, params)
+        if updated:
+            self._refresh_client_index(client_id)
+        return updated
 
     def delete_client(self, client_id):
         """s
@@ -1030,7 +1297,10 @@ class DatabaseManager:
         Returns: True if deletion was successful, False otherwise.
         """
         query = "UPDATE clients SET status = 'inactive' WHERE client_id = %s"
-        return self._execute_query(query, (client_id,))
+        deleted = self._execute_query(query, (client_id,))
+        if deleted:
+            self._refresh_client_index(client_id)
+        return deleted
 
     def get_total_clients(self):
         """
@@ -1194,7 +1464,19 @@ class DatabaseManager:
         return self._execute_query(query, params, fetch_one=True)
 
 
-    def get_transactions_with_details(
+    _TRANSACTION_DETAILS_FROM = """
+        FROM
+            transactions t
+        JOIN
+            clients c ON t.client_id = c.client_id
+        JOIN
+            properties p ON t.property_id = p.property_id
+        LEFT JOIN
+            projects pr ON p.project_id = pr.project_id
+        WHERE 1=1
+        """
+
+    def _build_transaction_details_filters(
         self,
         status=None,
         start_date=None,
@@ -1205,39 +1487,10 @@ class DatabaseManager:
         client_contact_search=None
     ):
         """
-        Retrieves transactions with full details from linked properties, clients, and projects.
-        Supports filters for status, date range, payment mode, client name, contact, and property search.
-        """
-        query = """
-        SELECT
-            t.transaction_id,
-            t.transaction_date,
-            t.payment_mode,
-            t.total_amount_paid,
-            t.discount,
-            t.balance,
-            t.receipt_path,
-            c.name AS client_name,
-            c.telephone_number AS client_contact_info,
-            p.property_id,
-            p.project_id,
-            p.project_no AS project_no,        -- ✅ from properties table
-            pr.name AS project_name,           -- ✅ from projects table
-            p.title_deed_number,
-            p.location,
-            p.size,
-            p.price AS property_price,
-            p.status AS property_status
-        FROM
-            transactions t
-        JOIN
-            clients c ON t.client_id = c.client_id
-        JOIN
-            properties p ON t.property_id = p.property_id
-        LEFT JOIN
-            projects pr ON p.project_id = pr.project_id
-        WHERE 1=1
+        Builds the WHERE conditions shared by get_transactions_with_details and its paginated variant.
+        Returns: (sql_fragment, params)
         """
+        query = ""
         params = []
 
         # ✅ Status filters
@@ -1249,10 +1502,10 @@ class DatabaseManager:
         # ✅ Date filters
         if start_date:
             query += " AND t.transaction_date >= %s"
-            params.append(f"{start_date} 00:00:00")
+            params.append(start_of_day(start_date))
         if end_date:
-            query += " AND t.transaction_date <= %s"
-            params.append(f"{end_date} 23:59:59")
+            query += " AND t.transaction_date < %s"
+            params.append(start_of_next_day(end_date))
 
         # ✅ Payment mode filter
         if payment_mode:
@@ -1280,10 +1533,90 @@ class DatabaseManager:
             query += " AND c.telephone_number LIKE %s"
             params.append(f"%{client_contact_search}%")
 
+        return query, params
+
+    _TRANSACTION_DETAILS_COLUMNS = """
+        SELECT
+            t.transaction_id,
+            t.transaction_date,
+            t.payment_mode,
+            t.total_amount_paid,
+            t.discount,
+            t.balance,
+            t.receipt_path,
+            c.name AS client_name,
+            c.telephone_number AS client_contact_info,
+            p.property_id,
+            p.project_id,
+            p.project_no AS project_no,        -- ✅ from properties table
+            pr.name AS project_name,           -- ✅ from projects table
+            p.title_deed_number,
+            p.location,
+            p.size,
+            p.price AS property_price,
+            p.status AS property_status
+        """
+
+    def get_transactions_with_details(
+        self,
+        status=None,
+        start_date=None,
+        end_date=None,
+        payment_mode=None,
+        client_name_search=None,
+        property_search=None,
+        client_contact_search=None
+    ):
+        """
+        Retrieves transactions with full details from linked properties, clients, and projects.
+        Supports filters for status, date range, payment mode, client name, contact, and property search.
+        """
+        where_sql, params = self._build_transaction_details_filters(
+            status, start_date, end_date, payment_mode,
+            client_name_search, property_search, client_contact_search
+        )
+        query = self._TRANSACTION_DETAILS_COLUMNS + self._TRANSACTION_DETAILS_FROM + where_sql
+
         # ✅ Sorting
         query += " ORDER BY pr.name ASC, t.transaction_date DESC"
 
         return self._execute_query(query, tuple(params), fetch_all=True)
+
+    def get_transactions_with_details_paginated(
+        self,
+        page=1,
+        page_size=20,
+        status=None,
+        start_date=None,
+        end_date=None,
+        payment_mode=None,
+        client_name_search=None,
+        property_search=None,
+        client_contact_search=None
+    ):
+        """
+        Same filters as get_transactions_with_details, but only fetches one page.
+        Returns: (list of transaction dicts for the page, total number of matching transactions)
+        """
+        where_sql, params = self._build_transaction_details_filters(
+            status, start_date, end_date, payment_mode,
+            client_name_search, property_search, client_contact_search
+        )
+
+        count_query = "SELECT COUNT(*) AS total" + self._TRANSACTION_DETAILS_FROM + where_sql
+        count_result = self._execute_query(count_query, tuple(params), fetch_one=True)
+        total_count = count_result['total'] if count_result else 0
+        if total_count == 0:
+            return [], 0
+
+        data_query = (
+            self._TRANSACTION_DETAILS_COLUMNS + self._TRANSACTION_DETAILS_FROM + where_sql
+            # transaction_id breaks ties so rows never repeat or vanish between pages.
+            + " ORDER BY pr.name ASC, t.transaction_date DESC, t.transaction_id DESC LIMIT %s OFFSET %s"
+        )
+        offset = (max(page, 1) - 1) * page_size
+        rows = self._execute_query(data_query, tuple(params + [page_size, offset]), fetch_all=True)
+        return rows if rows else [], total_count
     
     def get_transaction_history(self, user_id):
         """
@@ -1370,10 +1703,10 @@ class DatabaseManager:
         params = []
         if start_date:
             query += " AND t.transaction_date >= %s"
-            params.append(f"{start_date} 00:00:00")
+            params.append(start_of_day(start_date))
         if end_date:
-            query += " AND t.transaction_date <= %s"
-            params.append(f"{end_date} 23:59:59")
+            query += " AND t.transaction_date < %s"
+            params.append(start_of_next_day(end_date))
         result_row = self._execute_query(query, params, fetch_one=True)
         return result_row['COUNT(*)'] if result_row else 0
 
@@ -1416,10 +1749,10 @@ class DatabaseManager:
         # Optional date filters
         if start_date:
             query += " AND t.transaction_date >= %s"
-            params.append(f"{start_date} 00:00:00")
+            params.append(start_of_day(start_date))
         if end_date:
-            query += " AND t.transaction_date <= %s"
-            params.append(f"{end_date} 23:59:59")
+            query += " AND t.transaction_date < %s"
+            params.append(start_of_next_day(end_date))
 
         query += """
         ORDER BY pr.name ASC, t.transaction_date DESC, p.title_deed_number ASC
@@ -1447,24 +1780,59 @@ class DatabaseManager:
         query = ''' INSERT INTO client_files (client_id, file_name, added_by, timestamp) VALUES (%s, %s, %s, %s) '''
         return self._execute_query(query, (client_id, file_name, added_by, timestamp))
 
+    _CLIENT_FILE_LIST_QUERY = """ SELECT cf.file_id, cf.file_name, sc.name AS client_name, sc.telephone_number AS telephone_number FROM client_files cf JOIN service_clients sc ON cf.client_id = sc.client_id """
+
     def get_all_client_files(self):
         """ Retrieves all client files from the database, joining with the service_clients table to include client names and contact info. """
-        query = """ SELECT cf.file_id, cf.file_name, sc.name AS client_name, sc.telephone_number AS telephone_number FROM client_files cf JOIN service_clients sc ON cf.client_id = sc.client_id ORDER BY sc.name """
+        query = self._CLIENT_FILE_LIST_QUERY + " ORDER BY sc.name "
         return self._execute_query(query, fetch_all=True)
 
+    def get_survey_file_index(self):
+        """
+        Returns the shared SearchIndex over client files (see get_all_client_files).
+        Files are only ever added, so when the change marker moves only the files
+        newer than the last indexed file_id are fetched. Files added from another
+        workstation are picked up the same way (see _index_needs_reload).
+        """
+        index = self._survey_file_index
+        versions = self._query_cache.table_versions(SURVEY_FILE_TABLES)
+        new_files_query = self._CLIENT_FILE_LIST_QUERY + " WHERE cf.file_id > %s"
+        if index.loaded and index.version != versions:
+            new_files = self._execute_query(new_files_query, (index.max_id(),), fetch_all=True)
+            if new_files is not None:
+                for file in new_files:
+                    index.upsert(file)
+                index.version = versions
+
+        if index.loaded and index.version == versions and not self._index_needs_reload(
+                index, "SELECT COUNT(*) AS row_count, MAX(cf.file_id) AS last_id FROM client_files cf "
+                       "JOIN service_clients sc ON cf.client_id = sc.client_id", new_files_query):
+            return index
+        files = self.get_all_client_files()
+        if files is not None:
+            index.load(files, version=versions)
+        return index
+
+    def search_client_files(self, term, limit=None):
+        """ Searches client files by client name, file name or telephone number without querying MySQL. """
+        return self.get_survey_file_index().search(term, limit)
+
     def get_client_file_details(self, file_id):
         """ Retrieves a single client file's details. """
         query = "SELECT * FROM client_files WHERE file_id = %s"
         return self._execute_query(query, (file_id,), fetch_one=True)
 
-    def add_service_job(self, file_id, job_description, title_name, title_number, fee, status, added_by, brought_by):
+    def add_service_job(self, file_id, job_description, title_name, title_number, fee, status, added_by_user_id, brought_by):
         """ Adds a new job for a client's file. """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         query = '''
-            INSERT INTO service_jobs (file_id, job_description, title_name, title_number, fee, status, added_by, brought_by, timestamp)
+            INSERT INTO service_jobs (file_id, job_description, title_name, title_number, fee, status, added_by_user_id, brought_by, timestamp)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         '''
-        return self._execute_query(query, (file_id, job_description, title_name, title_number, fee, status, added_by, brought_by, timestamp))
+        job_id = self._execute_query(query, (file_id, job_description, title_name, title_number, fee, status, added_by_user_id, brought_by, timestamp))
+        if job_id:
+            self._note_survey_job_change(job_id=job_id)
+        return job_id
 
     def get_service_job_by_file_id(self, file_id):
         """ Retrieves all jobs related to a specific file. """
@@ -1475,11 +1843,12 @@ class DatabaseManager:
         """ Retrieves paginated list of all service jobs with client details. """
         query = """
             SELECT
-                sj.job_id, sj.job_description, sj.title_name, sj.title_number, sj.fee, sj.status, sj.added_by, sj.brought_by, sj.timestamp,
+                sj.job_id, sj.job_description, sj.title_name, sj.title_number, sj.fee, sj.status, ab.username AS added_by, sj.brought_by, sj.timestamp,
                 cf.file_name, sc.name as client_name, sc.telephone_number
             FROM service_jobs sj
             JOIN client_files cf ON sj.file_id = cf.file_id
             JOIN service_clients sc ON cf.client_id = sc.client_id
+            LEFT JOIN users ab ON sj.added_by_user_id = ab.user_id
             WHERE 1=1
         """
         params = []
@@ -1506,7 +1875,10 @@ class DatabaseManager:
             VALUES (%s, %s, %s, %s, %s)
         '''
         params = (job_id, amount, fee, balance, payment_date)
-        return self._execute_query(query, params)
+        payment_id = self._execute_query(query, params)
+        if payment_id:
+            self._note_survey_job_change(job_id=job_id)
+        return payment_id
     
 
     def get_service_payment_by_job_id(self, job_id):
@@ -1528,7 +1900,10 @@ class DatabaseManager:
         
         params.append(payment_id)
         query = f"UPDATE service_payments SET {', '.join(set_clauses)} WHERE payment_id = %s"
-        return self._execute_query(query, params)
+        updated = self._execute_query(query, params)
+        if updated:
+            self._note_survey_job_change(payment_id=payment_id)
+        return updated
 
     def add_payment_history(self, payment_id, payment_amount, payment_type):
         """ Adds a payment history entry for a service payment. """
@@ -1599,7 +1974,7 @@ class DatabaseManager:
             INSERT INTO service_dispatch (job_id, dispatch_date, reason_for_dispatch, collected_by, collector_phone, sign)
             VALUES (%s, %s, %s, %s, %s, %s)
         '''
-        return self._execute_query(query, (job_id, dispatch_date, reason_for_dispatch, collected_by, collector_phone, sign))
+        return self._execute_query(query, (job_id, dispatch_date, reason_for_dispatch, collected_by, collector_phone, encode_signature(sign)))
 
     def get_service_dispatch_by_job_id(self, job_id):
         """ Retrieves a dispatch record for a specific job ID. """
@@ -1611,12 +1986,16 @@ class DatabaseManager:
         result_row = self._execute_query(query, fetch_one=True)
         return result_row['COUNT(*)'] if result_row else 0
     
+    # Agents with the name of the user who added them.
+    _AGENT_COLUMNS = """
+        SELECT a.agent_id, a.name, a.status, u.username AS added_by, a.timestamp
+        FROM agents a
+        LEFT JOIN users u ON a.added_by_user_id = u.user_id
+    """
+
     def get_all_agents(self):
         try:
-            rows = self._execute_query(
-                "SELECT agent_id, name, status, added_by, timestamp FROM agents",
-                fetch_all=True
-            )
+            rows = self._execute_query(self._AGENT_COLUMNS, fetch_all=True)
             if rows:
                 return rows
             return []
@@ -1624,7 +2003,7 @@ class DatabaseManager:
            print(f"Error fetching all agents: {e}")
            return []
         
-    def add_agent(self, name, added_by):
+    def add_agent(self, name, added_by_user_id):
         try:
             existing_agent = self._execute_query(
                 "SELECT agent_id FROM agents WHERE name = %s",
@@ -1636,8 +2015,8 @@ class DatabaseManager:
                 return False
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             return self._execute_query(
-                "INSERT INTO agents (name, status, added_by, timestamp) VALUES (%s, %s, %s, %s)",
-                (name, 'active', added_by, timestamp)
+                "INSERT INTO agents (name, status, added_by_user_id, timestamp) VALUES (%s, %s, %s, %s)",
+                (name, 'active', added_by_user_id, timestamp)
             )
         except Exception as e:
             print(f"Error adding new agent: {e}")
@@ -1663,7 +2042,7 @@ class DatabaseManager:
         
     def get_agent_by_name(self, agent_name):
         try:
-            query = "SELECT agent_id, name, status, added_by, timestamp FROM agents WHERE name = %s"
+            query = self._AGENT_COLUMNS + " WHERE a.name = %s"
             row = self._execute_query(query, (agent_name,), fetch_one=True)
             return row
         except Exception as e:
@@ -1686,8 +2065,25 @@ class DatabaseManager:
         return self._execute_query(query, tuple(params))
         
     def get_all_propertiesForTransfer_paginated(self, limit=None, offset=None, search_query=None, min_size=None, max_size=None, status=None):
+        """
+        Fetches properties from both the main and the transfer property tables.
+        Searches go through the FULLTEXT index of each table: every word of the search (or
+        the start of it) must appear in the title deed, location, owner or description, and
+        the best matches come first. Otherwise the newest properties come first.
+        """
         params = []
-        main_props_query = """
+        indexed_terms, short_terms = split_search_terms(search_query) if search_query else ([], [])
+        if indexed_terms:
+            against = boolean_mode_query(indexed_terms)
+            main_match = f"MATCH({self._PROPERTY_SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)"
+            transfer_match = f"MATCH({self._TRANSFER_SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)"
+            main_search = (f", {main_match} AS score", f"WHERE {main_match}")
+            transfer_search = (f", {transfer_match} AS score", f"WHERE {transfer_match}")
+            params.extend([against] * 4)
+        else:
+            main_search = transfer_search = ("", "")
+
+        main_props_query = f"""
         SELECT
             p.property_id,
             p.title_deed_number,
@@ -1703,10 +2099,12 @@ class DatabaseManager:
             p.owner,
             u.username AS added_by_username,
             'Main' AS source_table
+            {main_search[0]}
         FROM properties p
         LEFT JOIN users u ON p.added_by_user_id = u.user_id
+        {main_search[1]}
         """
-        transfer_props_query = """
+        transfer_props_query = f"""
         SELECT
             pt.property_id,
             pt.title_deed_number,
@@ -1722,13 +2120,21 @@ class DatabaseManager:
             pt.owner,
             u.username AS added_by_username,
             'Transfer' AS source_table
+            {transfer_search[0]}
         FROM propertiesForTransfer pt
         LEFT JOIN users u ON pt.added_by_user_id = u.user_id
+        {transfer_search[1]}
         """
 
         combined_query = f"({main_props_query}) UNION ALL ({transfer_props_query})"
         full_query = f"SELECT * FROM ({combined_query}) AS combined_results WHERE 1=1"
-        if search_query:
+        if indexed_terms:
+            # Words too short for the FULLTEXT index only narrow down the indexed matches.
+            for term in short_terms:
+                full_query += " AND CONCAT_WS(' ', title_deed_number, location, owner, description) LIKE %s"
+                params.append(f"%{term}%")
+        elif search_query:
+            # Nothing the FULLTEXT index can look up (e.g. "12"): fall back to a scan.
             full_query += " AND (title_deed_number LIKE %s OR location LIKE %s OR description LIKE %s)"
             params.extend([f"%{search_query}%", f"%{search_query}%", f"%{search_query}%"])
 
@@ -1744,7 +2150,10 @@ class DatabaseManager:
             full_query += " AND (status = %s OR status IS NULL)"
             params.append(status)
 
-        full_query += " ORDER BY property_id DESC"
+        if indexed_terms:
+            full_query += " ORDER BY score DESC, property_id DESC"
+        else:
+            full_query += " ORDER BY property_id DESC"
 
         if limit is not None:
             full_query += " LIMIT %s"
@@ -1791,16 +2200,17 @@ class DatabaseManager:
                 pl.size,
                 pl.location,
                 pl.surveyor_name,
-                pl.created_by,
+                u.username AS created_by,
                 pl.status
             FROM proposed_lots pl
             INNER JOIN properties p ON pl.parent_block_id = p.property_id
+            LEFT JOIN users u ON pl.created_by_user_id = u.user_id
         '''
         return self._execute_query(query, fetch_all=True)
     
     def propose_new_lot(self, proposed_lot_data):
         query = '''
-            INSERT INTO proposed_lots (parent_block_id, size, location, surveyor_name, created_by, title_deed_number, price, status)
+            INSERT INTO proposed_lots (parent_block_id, size, location, surveyor_name, created_by_user_id, title_deed_number, price, status)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         '''
         params = (
@@ -1808,7 +2218,7 @@ class DatabaseManager:
             proposed_lot_data['size'],
             proposed_lot_data['location'],
             proposed_lot_data['surveyor_name'],
-            proposed_lot_data['created_by'],
+            proposed_lot_data['created_by_user_id'],
             proposed_lot_data.get('title_deed_number', 'N/A'),
             str(proposed_lot_data.get('price', 0)),
             proposed_lot_data.get('status', 'Proposed')
@@ -1883,8 +2293,7 @@ class DatabaseManager:
         '''
         return self._execute_query(query, fetch_all=True)
     
-    def get_all_jobs(self):
-        query = """
+    _JOB_LIST_QUERY = """
             SELECT
                 sj.*,
                 cf.file_name,
@@ -1892,7 +2301,8 @@ class DatabaseManager:
                 sc.telephone_number AS telephone_number,
                 sp.amount AS amount_paid,
                 sp.balance AS balance,
-                u.username AS assigned_username   -- ✅ NEW: readable username
+                u.username AS assigned_username,  -- ✅ NEW: readable username
+                ab.username AS added_by
             FROM
                 service_jobs sj
             JOIN
@@ -1902,12 +2312,82 @@ class DatabaseManager:
             LEFT JOIN
                 service_payments sp ON sj.job_id = sp.job_id
             LEFT JOIN
-                users u ON sj.assigned_to = u.user_id   -- ✅ This links it
+                users u ON sj.assigned_to = u.user_id   -- ✅ This links it (both INT, uses the primary key)
+            LEFT JOIN
+                users ab ON sj.added_by_user_id = ab.user_id
+    """
+
+    def get_all_jobs(self):
+        query = self._JOB_LIST_QUERY + """
             ORDER BY
                 sj.timestamp DESC
         """
         return self._execute_query(query, fetch_all=True)
 
+    def get_survey_job_index(self):
+        """
+        Returns the shared SearchIndex over jobs (see get_all_jobs).
+        The job and payment write methods queue the ids they touch; when the change
+        marker moves, only those jobs are re-read. A write nobody queued falls back to
+        a full reload. Jobs added or removed from another workstation are picked up by
+        comparing the index with MySQL (see _index_needs_reload); payments recorded
+        there show once the index reaches INDEX_MAX_AGE_SECONDS and reloads.
+        """
+        index = self._survey_job_index
+        versions = self._query_cache.table_versions(SURVEY_JOB_TABLES)
+        if index.loaded and index.version == versions:
+            if not self._index_needs_reload(
+                    index, "SELECT COUNT(*) AS row_count, MAX(sj.job_id) AS last_id FROM service_jobs sj "
+                           "JOIN client_files cf ON sj.file_id = cf.file_id "
+                           "JOIN service_clients sc ON cf.client_id = sc.client_id",
+                    self._JOB_LIST_QUERY + " WHERE sj.job_id > %s"):
+                return index
+            index.invalidate()
+
+        with self._survey_job_changes_lock:
+            job_ids = self._survey_job_changes['job_ids']
+            payment_ids = self._survey_job_changes['payment_ids']
+            self._survey_job_changes['job_ids'] = set()
+            self._survey_job_changes['payment_ids'] = set()
+
+        if index.loaded and (job_ids or payment_ids):
+            conditions = []
+            params = []
+            if job_ids:
+                conditions.append(f"sj.job_id IN ({', '.join(['%s'] * len(job_ids))})")
+                params.extend(job_ids)
+            if payment_ids:
+                conditions.append(f"sp.payment_id IN ({', '.join(['%s'] * len(payment_ids))})")
+                params.extend(payment_ids)
+            jobs = self._execute_query(self._JOB_LIST_QUERY + " WHERE " + " OR ".join(conditions),
+                                       tuple(params), fetch_all=True)
+            if jobs is not None:
+                for job in jobs:
+                    index.upsert(job)
+                index.version = versions
+                return index
+
+        jobs = self.get_all_jobs()
+        if jobs is not None:
+            index.load(jobs, version=versions)
+        return index
+
+    def search_jobs(self, term, limit=None):
+        """ Searches jobs by title number, title name, client name, file name or telephone without querying MySQL. """
+        return self.get_survey_job_index().search(term, limit)
+
+    def _note_survey_job_change(self, job_id=None, payment_id=None):
+        """Queues a job for the next incremental refresh of the survey job index."""
+        uow = self._active_uow()
+        if uow is not None:
+            uow.after_commit.append(lambda: self._note_survey_job_change(job_id, payment_id))
+            return
+        with self._survey_job_changes_lock:
+            if job_id:
+                self._survey_job_changes['job_ids'].add(job_id)
+            if payment_id:
+                self._survey_job_changes['payment_ids'].add(payment_id)
+
     
     def get_file_by_id(self, file_id):
         query = "SELECT * FROM client_files WHERE file_id = %s"
@@ -1944,11 +2424,8 @@ class DatabaseManager:
         if 'from_date' in filters and filters['to_date']:
             from_date = filters['from_date']
             to_date = filters['to_date']
-            from_date_str = from_date.strftime('%Y-%m-%d 00:00:00')
-            to_date_str = to_date.strftime('%Y-%m-%d 23:59:59')
-            conditions.append("sp.payment_date BETWEEN %s AND %s")
-            params.append(from_date_str)
-            params.append(to_date_str)
+            conditions.append("sp.payment_date >= %s AND sp.payment_date < %s")
+            params.extend(day_range(from_date, to_date))
 
         where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
         count_query = f"SELECT COUNT(*) {base_query}{where_clause}"
@@ -2016,7 +2493,10 @@ class DatabaseManager:
                  (job_id, refund_amount, payment_type, payment_reason, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
             ]
             # Step 3: Execute the transaction using your helper method
-            return self._execute_transaction(*queries_and_params)
+            cancelled = self._execute_transaction(*queries_and_params)
+            if cancelled:
+                self._note_survey_job_change(job_id=job_id)
+            return cancelled
         except Exception as e:
             print(f"An error occurred in cancel_job_with_refund: {e}", file=sys.stderr)
             return False
@@ -2045,6 +2525,7 @@ class DatabaseManager:
         if not update_successful:
             print("Update failed, returning early.")
             return False
+        self._note_survey_job_change(payment_id=payment_id)
         
         insert_query = "INSERT INTO service_payments_history (payment_id, payment_amount, payment_type, payment_reason, payment_date) VALUES (%s, %s, %s, %s, %s)"
         payment_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -2077,26 +2558,33 @@ class DatabaseManager:
             INSERT INTO service_dispatch (job_id, dispatch_date, reason_for_dispatch, collected_by, collector_phone, sign)
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        insert_params = (job_id, dispatch_date, reason, collected_by, phone, sign_blob)
+        insert_params = (job_id, dispatch_date, reason, collected_by, phone, encode_signature(sign_blob))
         update_query = """
             UPDATE service_jobs
             SET status = 'Dispatched'
             WHERE job_id = %s
         """
         update_params = (job_id,)
-        return self._execute_transaction((insert_query, insert_params), (update_query, update_params))
+        dispatched = self._execute_transaction((insert_query, insert_params), (update_query, update_params))
+        if dispatched:
+            self._note_survey_job_change(job_id=job_id)
+        return dispatched
 
 
 
     
-    def add_job(self, file_id, job_description, title_name, title_number, fee, added_by, brought_by,task_type,assigned_to):
+    def add_job(self, file_id, job_description, title_name, title_number, fee, added_by_user_id, brought_by,task_type,assigned_to):
+        """ Adds a job; added_by_user_id and assigned_to are users.user_id values. """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         query = '''
-            INSERT INTO service_jobs (file_id, job_description, title_name, title_number, fee, added_by, brought_by, task_type,assigned_to,timestamp)
+            INSERT INTO service_jobs (file_id, job_description, title_name, title_number, fee, added_by_user_id, brought_by, task_type,assigned_to,timestamp)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s,%s)
         '''
-        params = (file_id, job_description, title_name, title_number, fee, added_by, brought_by, task_type, assigned_to,timestamp)
-        return self._execute_query(query, params)
+        params = (file_id, job_description, title_name, title_number, fee, added_by_user_id, brought_by, task_type, assigned_to,timestamp)
+        job_id = self._execute_query(query, params)
+        if job_id:
+            self._note_survey_job_change(job_id=job_id)
+        return job_id
 
     def update_job_status(self, job_id, new_status):
         """
@@ -2122,7 +2610,10 @@ class DatabaseManager:
         values = list(new_data.values())
         values.append(job_id)
         query = f'UPDATE service_jobs SET {set_clause} WHERE job_id = %s'
-        return self._execute_query(query, tuple(values))
+        updated = self._execute_query(query, tuple(values))
+        if updated:
+            self._note_survey_job_change(job_id=job_id)
+        return updated
     
     def get_jobs_by_file_id(self, file_id):
         query = "SELECT * FROM service_jobs WHERE file_id = %s"
@@ -2196,11 +2687,100 @@ class DatabaseManager:
         results_rows = self._execute_query(query, fetch_all=True)
         return {row['status']: row['count'] for row in results_rows} if results_rows else {}
 
+    def get_dashboard_snapshot(self):
+        """
+        Returns every dashboard KPI from a single round trip:
+        sold_properties, available_properties, total_properties, total_clients,
+        total_survey_jobs and survey_job_status_counts ({status: count}).
+        Results are cached for DASHBOARD_CACHE_TTL seconds or until one of the
+        underlying tables is written to.
+        """
+        cached = self._query_cache.get('dashboard_snapshot', DASHBOARD_TABLES)
+        if cached is not None:
+            return dict(cached, survey_job_status_counts=dict(cached['survey_job_status_counts']))
+
+        versions = self._query_cache.table_versions(DASHBOARD_TABLES)
+        query = """
+            SELECT 'sold_properties' AS metric, NULL AS status, COUNT(*) AS count
+            FROM properties p JOIN transactions t ON p.property_id = t.property_id
+            WHERE p.status = 'Sold'
+            UNION ALL
+            SELECT 'available_properties', NULL, COUNT(*) FROM properties WHERE status = 'Available'
+            UNION ALL
+            SELECT 'total_clients', NULL, COUNT(*) FROM clients WHERE status = 'active'
+            UNION ALL
+            SELECT 'survey_job_status', status, COUNT(*) FROM service_jobs GROUP BY status
+        """
+        rows = self._execute_query(query, fetch_all=True)
+
+        snapshot = {
+            'sold_properties': 0,
+            'available_properties': 0,
+            'total_clients': 0,
+            'survey_job_status_counts': {},
+        }
+        for row in rows or []:
+            if row['metric'] == 'survey_job_status':
+                snapshot['survey_job_status_counts'][row['status']] = row['count']
+            else:
+                snapshot[row['metric']] = row['count']
+        snapshot['total_properties'] = snapshot['sold_properties'] + snapshot['available_properties']
+        snapshot['total_survey_jobs'] = sum(snapshot['survey_job_status_counts'].values())
+
+        # Only cache real results; a failed query should be retried on the next refresh.
+        if rows is not None:
+            self._query_cache.set('dashboard_snapshot', snapshot, DASHBOARD_TABLES, versions=versions)
+        return dict(snapshot, survey_job_status_counts=dict(snapshot['survey_job_status_counts']))
+
     def add_activity_log(self, user_id, action_type, details=None):
-        """ Logs a user activity. """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        query = "INSERT INTO activity_logs (timestamp, user_id, action_type, details) VALUES (%s, %s, %s, %s)"
-        self._execute_query(query, (timestamp, user_id, action_type, details))
+        """ Logs a user activity. The entry is written in the background (see log_activity). """
+        self.log_activity(action_type, details, user_id)
+
+    def _write_activity_batch(self, entries):
+        """
+        Writes a batch of queued activity log entries with one multi-row INSERT.
+        Called from the activity log writer thread. Raises if MySQL cannot be reached,
+        so the writer spools the batch; rows MySQL rejects (e.g. a deleted user) are
+        dropped one by one instead of blocking the rest of the batch.
+        """
+        started = time.perf_counter()
+        conn = self._pool.acquire()
+        acquire_time = time.perf_counter() - started
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(entries))
+        query = f"INSERT INTO activity_logs (timestamp, user_id, action_type, details) VALUES {placeholders}"
+        params = [value for entry in entries for value in entry]
+        failed = False
+        try:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute(query, params)
+                except (mysql.connector.IntegrityError, mysql.connector.DataError) as err:
+                    conn.rollback()
+                    print(f"Activity log batch rejected ({err}); writing entries one by one.", file=sys.stderr)
+                    single_query = "INSERT INTO activity_logs (timestamp, user_id, action_type, details) VALUES (%s, %s, %s, %s)"
+                    for entry in entries:
+                        try:
+                            cursor.execute(single_query, entry)
+                        except (mysql.connector.IntegrityError, mysql.connector.DataError) as entry_err:
+                            print(f"Dropping activity log entry {entry!r}: {entry_err}", file=sys.stderr)
+                conn.commit()
+                self._query_cache.note_write(query)
+        except mysql.connector.Error:
+            failed = True
+            raise
+        finally:
+            self._release_connection(conn)
+            self._query_stats.record(
+                '_write_activity_batch', time.perf_counter() - started, acquire_time,
+                rows=len(entries), query=query, params=f"{len(entries)} entries", error=failed
+            )
+
+    def flush_activity_log(self, timeout=5.0):
+        """
+        Waits until the activity log entries queued so far are written (or spooled
+        if MySQL is unreachable). Returns: True if that happened within `timeout` seconds.
+        """
+        return self._activity_log.flush(timeout)
             
     def get_activity_logs(self, limit=100, offset=0, user_id=None, action_type=None, start_date=None, end_date=None):
         """
@@ -2231,10 +2811,10 @@ class DatabaseManager:
             params.append(action_type)
         if start_date:
             query += " AND l.timestamp >= %s"
-            params.append(f"{start_date} 00:00:00")
+            params.append(start_of_day(start_date))
         if end_date:
-            query += " AND l.timestamp <= %s"
-            params.append(f"{end_date} 23:59:59")
+            query += " AND l.timestamp < %s"
+            params.append(start_of_next_day(end_date))
 
         query += " ORDER BY l.timestamp DESC"
 
@@ -2247,11 +2827,161 @@ class DatabaseManager:
             params.append(offset)
 
         return self._execute_query(query, tuple(params), fetch_all=True)
+
+    def get_activity_logs_page(self, page_size=20, cursor=None, user_id=None, action_type=None,
+                               start_date=None, end_date=None, include_archived=False):
+        """
+        Fetches one page of activity logs, newest first, using keyset pagination on
+        (timestamp, log_id) so deep pages cost the same as the first one.
+
+        `cursor` is the value returned with the previous page (None for the first page).
+        With `include_archived`, the listing continues past the rows still in MySQL into
+        the months moved to the compressed archive by archive_activity_logs; archived
+        entries are always older than the ones in the table.
+        Returns: (logs, next_cursor). next_cursor is None on the last page.
+        """
+        query = """
+        SELECT
+            l.log_id,
+            l.timestamp,
+            l.user_id,
+            l.action_type,
+            l.details,
+            u.username
+        FROM
+            activity_logs l
+        LEFT JOIN
+            users u ON l.user_id = u.user_id
+        WHERE 1=1
+        """
+        params = []
+        start = start_of_day(start_date) if start_date else None
+        end = start_of_next_day(end_date) if end_date else None
+
+        if user_id:
+            query += " AND l.user_id = %s"
+            params.append(user_id)
+        if action_type:
+            query += " AND l.action_type = %s"
+            params.append(action_type)
+        if start:
+            query += " AND l.timestamp >= %s"
+            params.append(start)
+        if end:
+            query += " AND l.timestamp < %s"
+            params.append(end)
+
+        position = decode_cursor(cursor, 'timestamp', True)
+        if position is not None:
+            last_timestamp, last_id = position
+            query += " AND (l.timestamp < %s OR (l.timestamp = %s AND l.log_id < %s))"
+            params.extend([last_timestamp, last_timestamp, last_id])
+
+        # Fetch one extra row to know whether another page follows.
+        query += " ORDER BY l.timestamp DESC, l.log_id DESC LIMIT %s"
+        params.append(page_size + 1)
+
+        logs = self._execute_query(query, tuple(params), fetch_all=True) or []
+        if include_archived and len(logs) <= page_size:
+            if logs:
+                before = (logs[-1]['timestamp'], logs[-1]['log_id'])
+            else:
+                before = position
+            logs += self._activity_archive.search(
+                page_size + 1 - len(logs), user_id=user_id, action_type=action_type,
+                start=start, end=end, before=before
+            )
+
+        next_cursor = None
+        if len(logs) > page_size:
+            logs = logs[:page_size]
+            next_cursor = encode_cursor('timestamp', True, logs[-1]['timestamp'], logs[-1]['log_id'])
+        return logs, next_cursor
+
+    def get_activity_log_archive_months(self):
+        """Returns the months (first-of-month datetimes, newest first) held in the activity log archive."""
+        return self._activity_archive.months()
+
+    def get_activity_log_archive_location(self):
+        """
+        Returns (archive_dir, shared): shared is False while the archive is the local
+        logs/activity_archive, which other workstations cannot see.
+        """
+        archive_dir = self._activity_archive.archive_dir
+        return archive_dir, archive_dir != ACTIVITY_LOG_ARCHIVE_DIR
+
+    def archive_activity_logs(self, retention_months=None):
+        """
+        Moves activity logs older than the retention period out of MySQL.
+
+        Every whole month before the cutoff is written to a compressed file in the
+        archive folder (the activity_log_archive_dir setting, logs/activity_archive
+        when empty) and then deleted from activity_logs in chunks, so the
+        table only holds the last `retention_months` months (the
+        activity_log_retention_months setting by default; 0 keeps everything).
+        Entries that arrive for an archived month later, e.g. replayed from the
+        activity log spool, are added to its file on the next run.
+        Returns: A dict mapping each archived month ('YYYY-MM') to the rows moved.
+        """
+        retention = self.activity_log_retention_months if retention_months is None else retention_months
+        if not retention:
+            return {}
+        cutoff = month_start(datetime.now(), retention)
+
+        conn = self._get_connection()
+        if not conn:
+            return {}
+        archived = {}
+        try:
+            with conn.cursor(buffered=True, dictionary=True) as cursor:
+                cursor.execute("SELECT GET_LOCK(%s, 0) AS locked", (ACTIVITY_ARCHIVE_LOCK_NAME,))
+                if not cursor.fetchone()['locked']:
+                    return {}  # Another instance is archiving
+                try:
+                    cursor.execute("SELECT MIN(timestamp) AS oldest FROM activity_logs WHERE timestamp < %s", (cutoff,))
+                    oldest = cursor.fetchone()['oldest']
+                    month = month_start(oldest) if oldest else cutoff
+                    while month < cutoff:
+                        next_month = month_start(month, -1)
+                        cursor.execute("""
+                            SELECT l.log_id, l.timestamp, l.user_id, l.action_type, l.details, u.username
+                            FROM activity_logs l
+                            LEFT JOIN users u ON l.user_id = u.user_id
+                            WHERE l.timestamp >= %s AND l.timestamp < %s
+                        """, (month, next_month))
+                        rows = cursor.fetchall()
+                        if rows:
+                            self._activity_archive.write_month(month, rows)
+                            # Only rows now in the file are deleted, even if more arrived meanwhile.
+                            last_id = max(row['log_id'] for row in rows)
+                            while True:
+                                cursor.execute(
+                                    "DELETE FROM activity_logs WHERE timestamp >= %s AND timestamp < %s "
+                                    "AND log_id <= %s LIMIT %s",
+                                    (month, next_month, last_id, ACTIVITY_ARCHIVE_DELETE_CHUNK)
+                                )
+                                deleted = cursor.rowcount
+                                conn.commit()
+                                if deleted < ACTIVITY_ARCHIVE_DELETE_CHUNK:
+                                    break
+                            archived[f"{month:%Y-%m}"] = len(rows)
+                        month = next_month
+                finally:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (ACTIVITY_ARCHIVE_LOCK_NAME,))
+                    cursor.fetchall()
+        except (mysql.connector.Error, OSError) as err:
+            print(f"Error archiving activity logs: {err}", file=sys.stderr)
+        finally:
+            self._release_connection(conn)
+            if archived:
+                self._query_cache.invalidate_tables(('activity_logs',))
+                print(f"Archived activity logs: {archived}")
+        return archived
     
     def get_dispatch_records(self, filters=None):
         """
         Fetches dispatch records from the database, joining with service_jobs to get job details.
-        Applies filters if they are provided.
+        Applies filters if they are provided. Signatures are left out; use get_signature_by_job_id.
         Returns: A list of dictionaries, each representing a dispatch record.
         """
         query = """
@@ -2263,8 +2993,7 @@ class DatabaseManager:
                 sj.job_description,
                 sd.collected_by,
                 sd.collector_phone,
-                sd.reason_for_dispatch,
-                sd.sign
+                sd.reason_for_dispatch
             FROM
                 service_dispatch AS sd
             INNER JOIN
@@ -2275,11 +3004,11 @@ class DatabaseManager:
         
         if filters:
             if 'from_date' in filters and filters['from_date']:
-                query += " AND DATE(sd.dispatch_date) >= %s"
-                params.append(filters['from_date'])
+                query += " AND sd.dispatch_date >= %s"
+                params.append(start_of_day(filters['from_date']))
             if 'to_date' in filters and filters['to_date']:
-                query += " AND DATE(sd.dispatch_date) <= %s"
-                params.append(filters['to_date'])
+                query += " AND sd.dispatch_date < %s"
+                params.append(start_of_next_day(filters['to_date']))
             if 'title_number' in filters and filters['title_number']:
                 query += " AND sj.title_number LIKE %s"
                 params.append(f"%{filters['title_number']}%")
@@ -2291,16 +3020,25 @@ class DatabaseManager:
 
     def get_signature_by_job_id(self, job_id):
         """
-        Retrieves the signature BLOB for a given job ID.
+        Retrieves the signature file for a given job ID, decompressed and cached.
         Returns: A dictionary with the signature data, or None.
         """
-        query = "SELECT sign FROM service_dispatch WHERE job_id = %s"
-        params = (job_id,)
-        return self._execute_query(query, params=params, fetch_one=True)
+        cache_key = ('service_dispatch', str(job_id))
+        versions = self._query_cache.table_versions(('service_dispatch',))
+        sign = self._signature_cache.get(cache_key, versions)
+        if sign is None:
+            query = "SELECT sign FROM service_dispatch WHERE job_id = %s"
+            row = self._execute_query(query, params=(job_id,), fetch_one=True)
+            if not row:
+                return None
+            sign = decode_signature(row['sign'])
+            if sign:
+                self._signature_cache.set(cache_key, sign, versions)
+        return {'sign': sign}
     
     def create_payment_plan(self, plan_data):
         sql = """
-        INSERT INTO payment_plans (name, deposit_percentage, duration_months, interest_rate, created_by)
+        INSERT INTO payment_plans (name, deposit_percentage, duration_months, interest_rate, created_by_user_id)
         VALUES (%s, %s, %s, %s, %s)
         """
         params = (
@@ -2308,16 +3046,23 @@ class DatabaseManager:
             plan_data['deposit_percentage'],
             plan_data['duration_months'],
             plan_data['interest_rate'],
-            plan_data['created_by']
+            plan_data['created_by_user_id']
         )
         return self._execute_query(sql, params)
     
+    # Payment plans with the name of the user who created them.
+    _PAYMENT_PLAN_COLUMNS = """
+        SELECT pp.plan_id, pp.name, pp.deposit_percentage, pp.duration_months, pp.interest_rate,
+               u.username AS created_by
+        FROM payment_plans pp
+        LEFT JOIN users u ON pp.created_by_user_id = u.user_id
+    """
+
     def get_payment_plans(self):
-        sql = "SELECT plan_id, name, deposit_percentage, duration_months, interest_rate, created_by FROM payment_plans;"
-        return self._execute_query(sql, fetch_all=True)
+        return self._execute_query(self._PAYMENT_PLAN_COLUMNS, fetch_all=True)
     
     def get_plan_by_id(self, plan_id):
-        sql = "SELECT plan_id, name, deposit_percentage, duration_months, interest_rate, created_by FROM payment_plans WHERE plan_id = %s;"
+        sql = self._PAYMENT_PLAN_COLUMNS + " WHERE pp.plan_id = %s"
         return self._execute_query(sql, (plan_id,), fetch_one=True)
 
     def update_payment_plan(self, plan_id, plan_data):
@@ -2359,6 +3104,50 @@ class DatabaseManager:
         params = (plan_instance_id, due_date, due_amount)
     # This might not return an ID, so just check for success
         return self._execute_query(query, params, fetch_all=False) is not None
+
+    def schedule_installments_bulk(self, plan_instance_id, schedule):
+        """
+        Inserts a whole installment schedule with one multi-row INSERT and a single commit.
+        `schedule` is a list of (due_date, due_amount) tuples, e.g. from generate_installment_schedule.
+        Returns: True if every row was inserted, False otherwise (nothing is inserted on error).
+        """
+        if not schedule:
+            return True
+
+        query = """
+        INSERT INTO installment_payments 
+        (plan_instance_id, due_date, due_amount) 
+        VALUES (%s, %s, %s)
+        """
+        rows = [(plan_instance_id, due_date, due_amount) for due_date, due_amount in schedule]
+
+        started = time.perf_counter()
+        uow = self._active_uow()
+        conn = uow.conn if uow is not None else self._get_connection()
+        acquire_time = time.perf_counter() - started
+        if not conn:
+            return False
+        failed = True
+        try:
+            with conn.cursor() as cursor:
+                # executemany rewrites a simple INSERT ... VALUES into one multi-row statement
+                cursor.executemany(query, rows)
+            self._finish_write(conn, query)
+            failed = False
+            return True
+        except mysql.connector.Error as err:
+            print(f"Database error while scheduling installments: {err}", file=sys.stderr)
+            if uow is not None:
+                raise
+            conn.rollback()
+            return False
+        finally:
+            if uow is None:
+                self._release_connection(conn)
+            self._query_stats.record(
+                'schedule_installments_bulk', time.perf_counter() - started, acquire_time,
+                rows=len(rows), query=query, params=rows[:3], error=failed
+            )
     
     def get_installment_payments(self, transaction_id):
     
@@ -2413,10 +3202,10 @@ class DatabaseManager:
         params = []
         if start_date:
             query += " AND dc.timestamp >= %s"
-            params.append(f"{start_date} 00:00:00")
+            params.append(start_of_day(start_date))
         if end_date:
-            query += " AND dc.timestamp <= %s"
-            params.append(f"{end_date} 23:59:59")
+            query += " AND dc.timestamp < %s"
+            params.append(start_of_next_day(end_date))
         if purpose:
             query += " AND dc.purpose = %s"
             params.append(purpose)
@@ -2428,10 +3217,16 @@ class DatabaseManager:
     def log_activity(self, action_type, details, user_id):
         """
         Logs a user action in the activity_logs table.
+        Returns immediately; the entry is queued and written by the background
+        activity log writer in a batch with other entries. Inside a unit_of_work
+        the entry is only queued once the transaction commits.
         """
-        query = "INSERT INTO activity_logs (timestamp, user_id, action_type, details) VALUES (%s, %s, %s, %s)"
-        params = (datetime.now(), user_id, action_type, details)
-        self._execute_query(query, params)
+        entry = (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), user_id, action_type, details)
+        uow = self._active_uow()
+        if uow is not None:
+            uow.after_commit.append(lambda: self._activity_log.enqueue(entry))
+            return
+        self._activity_log.enqueue(entry)
 
     def get_all_daily_clients_survey(self):
         """
@@ -2455,20 +3250,20 @@ class DatabaseManager:
             params = []
 
             if user_id:
-                query += " AND user_id = ?"
+                query += " AND user_id = %s"
                 params.append(user_id)
             if action_type:
-                query += " AND action_type = ?"
+                query += " AND action_type = %s"
                 params.append(action_type)
             if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date} 00:00:00")
+                query += " AND timestamp >= %s"
+                params.append(start_of_day(start_date))
             if end_date:
-                query += " AND timestamp <= ?"
-                params.append(f"{end_date} 23:59:59")
+                query += " AND timestamp < %s"
+                params.append(start_of_next_day(end_date))
 
-            result_row = self._execute_query(query, params, fetch_one=True)
-            return result_row[0] if result_row else 0
+            result_row = self._execute_query(query, tuple(params), fetch_one=True)
+            return result_row['COUNT(*)'] if result_row else 0
     
     def get_total_sales_for_date_range(self, start_date, end_date):
         """
@@ -2483,9 +3278,9 @@ class DatabaseManager:
                 FROM 
                     transactions t
                 WHERE 
-                    t.transaction_date BETWEEN ? AND ? || ' 23:59:59'
+                    t.transaction_date >= %s AND t.transaction_date < %s
             """
-            result_row = self._execute_query(query, (start_date, end_date), fetch_one=True)
+            result_row = self._execute_query(query, day_range(start_date, end_date), fetch_one=True)
             
             return {
                 'total_revenue': result_row['total_revenue'] if result_row and result_row['total_revenue'] is not None else 0.0,
@@ -2495,135 +3290,41 @@ class DatabaseManager:
             print(f"Error in get_total_sales_for_date_range: {e}")
             return {'total_revenue': 0.0, 'total_properties_sold': 0}
 
-    def get_detailed_sales_transactions_for_date_range(self, start_date, end_date):
-        """
-        Retrieves detailed sales transactions for the accounting-style report,
-        including completed, ongoing, deposit-paid, and ongoing payments.
-        """
-        try:
-            start_datetime_obj = datetime.strptime(start_date, '%Y-%m-%d')
-            end_datetime_obj = datetime.strptime(end_date, '%Y-%m-%d')
-            end_datetime_full = datetime.combine(end_datetime_obj, datetime.max.time())
-
-            query = """
-                    SELECT 
-                        p.project_id AS project_id,
-                        pr.name AS project_name,
-                        p.title_deed_number AS title_deed_number,
-                        p.price AS actual_price,
-                        t.total_amount_paid AS amount_paid,
-                        t.balance AS balance,
-                        p.property_type AS property_type,
-                        c.name AS client_name,
-                        t.transaction_date AS transaction_date,
-                        CASE
-                            WHEN t.balance <= 0 THEN 'Completed'
-                            WHEN t.total_amount_paid = 0 THEN 'Unpaid'
-                            WHEN t.total_amount_paid > 0 AND t.balance > 0 THEN 'Ongoing'
-                            ELSE 'Unknown'
-                        END AS status
-                    FROM 
-                        transactions t
-                    JOIN 
-                        properties p ON t.property_id = p.property_id
-                    JOIN 
-                        clients c ON t.client_id = c.client_id
-                    JOIN
-                        projects pr ON p.project_id = pr.project_id
-                    WHERE 
-                        DATE(t.transaction_date) BETWEEN %s AND %s
-                    ORDER BY 
-                        p.project_id ASC, t.transaction_date ASC
-                """
-
-            result_rows = self._execute_query(query, (start_datetime_obj, end_datetime_full), fetch_all=True)
-
-            if not result_rows:
-                print(f"[DEBUG] No sales records found between {start_date} and {end_date}.")
-                return []
-
-            normalized_results = [{k.lower(): v for k, v in dict(row).items()} for row in result_rows]
-            print(f"[DEBUG] Retrieved {len(normalized_results)} sales transaction(s). Sample:", normalized_results[0])
-
-            return normalized_results
-
-        except Exception as e:
-            print(f"[ERROR] get_detailed_sales_transactions_for_date_range failed: {e}")
-            return []
-
-
-
-
-
-    def get_sold_properties_for_date_range_detailed(self, start_date, end_date):
-        """
-        Retrieves detailed information about properties sold within a specified date range,
-        grouped by project_id — ONLY fully cleared (balance = 0).
-        """
-        try:
-            start_datetime_obj = datetime.strptime(start_date, '%Y-%m-%d')
-            end_datetime_obj = datetime.strptime(end_date, '%Y-%m-%d')
-            end_datetime_full = datetime.combine(end_datetime_obj, datetime.max.time())
-
-            query = """
-                SELECT 
-                    p.project_id AS project_id,
-                    pr.name AS project_name,
-                    p.title_deed_number, 
-                    p.location, 
-                    p.size, 
-                    t.transaction_date AS date_sold,
-                    t.total_amount_paid,
-                    t.balance,
-                    c.name AS client_name
-                FROM 
-                    transactions t
-                JOIN 
-                    properties p ON t.property_id = p.property_id
-                JOIN 
-                    clients c ON t.client_id = c.client_id
-                JOIN
-                    projects pr ON p.project_id = pr.project_id
-                WHERE 
-                    p.status = 'Sold'
-                    AND t.balance = 0      -- ✅ ONLY FULLY CLEARED SALES
-                    AND t.transaction_date BETWEEN %s AND %s
-                ORDER BY 
-                    p.project_id ASC, t.transaction_date ASC
-            """
-
-            result_rows = self._execute_query(query, (start_datetime_obj, end_datetime_full), fetch_all=True)
-            return [dict(row) for row in result_rows] if result_rows else []
-
-        except Exception as e:
-            print(f"[ERROR] get_sold_properties_for_date_range_detailed failed: {e}")
-            return []
-
-    def get_active_ongoing_payments_for_date_range(self, start_date, end_date):
+    def get_report_dataset(self, start_date, end_date):
         """
-        Retrieves transactions where the client has already paid something (total_amount_paid > 0)
-        but still has a balance (balance > 0) — i.e., active ongoing payments — within the given date range.
-        Returns a list of dict rows grouped by project (caller will group if needed).
+        Fetches, in one pass, the joined transaction facts every sales report is derived
+        from: each transaction in the date range with its property, client and project.
+        Projects are LEFT JOINed, has_project telling the rows the inner-joining reports skip.
+        Returns: A ReportDataset (empty on errors).
         """
         try:
-            start_datetime_obj = datetime.strptime(start_date, '%Y-%m-%d')
-            end_datetime_obj = datetime.strptime(end_date, '%Y-%m-%d')
-            end_datetime_full = datetime.combine(end_datetime_obj, datetime.max.time())
+            range_start, range_end = day_range(start_date, end_date)
 
             query = """
                 SELECT
-                    p.project_id AS project_id,
-                    pr.name AS project_name,
                     t.transaction_id,
                     t.transaction_date,
                     t.total_amount_paid,
                     t.discount,
                     t.balance,
+                    t.payment_mode,
+                    p.project_id AS project_id,
+                    pr.name AS project_name,
+                    pr.project_id IS NOT NULL AS has_project,
                     p.title_deed_number,
-                    p.price AS original_price,
+                    p.location,
+                    p.size,
+                    p.price,
+                    p.property_type,
+                    p.status AS property_status,
                     c.name AS client_name,
                     c.telephone_number AS client_contact_info,
-                    t.payment_mode
+                    CASE
+                        WHEN t.balance <= 0 THEN 'Completed'
+                        WHEN t.total_amount_paid = 0 THEN 'Unpaid'
+                        WHEN t.total_amount_paid > 0 AND t.balance > 0 THEN 'Ongoing'
+                        ELSE 'Unknown'
+                    END AS status
                 FROM
                     transactions t
                 JOIN
@@ -2633,71 +3334,88 @@ class DatabaseManager:
                 LEFT JOIN
                     projects pr ON p.project_id = pr.project_id
                 WHERE
-                    t.balance > 0
-                    AND t.total_amount_paid > 0
-                    AND t.payment_mode = 'installments'
-                    AND t.transaction_date BETWEEN %s AND %s
+                    t.transaction_date >= %s AND t.transaction_date < %s
                 ORDER BY
                     p.project_id ASC, t.transaction_date ASC
             """
 
-            result_rows = self._execute_query(query, (start_datetime_obj, end_datetime_full), fetch_all=True)
-            # Return list of dicts (cursor already uses dictionary=True)
-            return [dict(row) for row in result_rows] if result_rows else []
+            result_rows = self._execute_query(query, (range_start, range_end), fetch_all=True)
+            return ReportDataset.from_rows(result_rows or [])
 
         except Exception as e:
-            print(f"[ERROR] get_active_ongoing_payments_for_date_range failed: {e}")
-            return []
+            print(f"[ERROR] get_report_dataset failed: {e}")
+            return ReportDataset()
+
+    def _report_data_version(self, start_date, end_date):
+        """
+        A cheap MySQL-side version of the report data for a period, so writes made from
+        other workstations also miss the report cache: the count, highest id and money
+        totals of the period's transactions (new sales and payments change them) and the
+        latest payment history id. Returns: A tuple, or None when MySQL could not be asked.
+        """
+        range_start, range_end = day_range(start_date, end_date)
+        totals = self._execute_query("""
+            SELECT COUNT(*) AS row_count, MAX(transaction_id) AS last_id,
+                   SUM(total_amount_paid) AS total_paid, SUM(balance) AS total_balance,
+                   SUM(discount) AS total_discount
+            FROM transactions
+            WHERE transaction_date >= %s AND transaction_date < %s
+        """, (range_start, range_end), fetch_one=True)
+        payments = self._execute_query("SELECT MAX(history_id) AS last_id FROM transactions_history",
+                                       fetch_one=True)
+        if totals is None or payments is None:
+            return None
+        return (totals['row_count'], totals['last_id'], str(totals['total_paid']), str(totals['total_balance']),
+                str(totals['total_discount']), payments['last_id'])
+
+    def get_report_data(self, report_type, start_date, end_date):
+        """
+        Returns (groups, cache_key, as_of) for one of the sales reports ('sales',
+        'sold_properties', 'ongoing_payments' or 'pending_instalments'; see REPORT_TYPES).
+        `groups` holds the report's rows grouped by project with per-project totals (see
+        ReportDataset.project_groups); `as_of` is when the rows were read from MySQL.
+
+        The groups are derived from the period's get_report_dataset, fetched once and shared
+        through the report cache by all four reports while none of REPORT_TABLES changes
+        here and _report_data_version is unchanged in MySQL. Empty datasets are not cached,
+        since the query also comes back empty on errors. Pass cache_key to
+        get_cached_report_pdf / cache_report_pdf to reuse the PDF rendered from these rows;
+        it is None when the data version could not be read, and nothing is cached then.
+        """
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Unknown report type: {report_type}")
+        # Versions are read before the query so a write landing meanwhile is not masked.
+        data_version = self._report_data_version(start_date, end_date)
+        if data_version is None:
+            dataset = self.get_report_dataset(start_date, end_date)
+            return dataset.project_groups(report_type), None, dataset.fetched_at
+        versions = self._query_cache.table_versions(REPORT_TABLES) + data_version
+        cache_key = self._report_cache.key(report_type, start_date, end_date, versions)
+        dataset_key = self._report_cache.key('dataset', start_date, end_date, versions)
+        dataset = self._report_cache.get_rows(dataset_key)
+        if dataset is None:
+            dataset = self.get_report_dataset(start_date, end_date)
+            if len(dataset):
+                self._report_cache.put_rows(dataset_key, dataset)
+        # The rows are shared by the four reports; each report's PDF lives as long as they do.
+        self._report_cache.link(cache_key, dataset_key)
+        return dataset.project_groups(report_type), cache_key, dataset.fetched_at
+
+    def get_cached_report_pdf(self, cache_key):
+        """Returns the path of the PDF cached for a get_report_data result, or None."""
+        if cache_key is None:
+            return None
+        return self._report_cache.get_pdf(cache_key)
 
-        
-    
-    def get_pending_instalments_for_date_range(self, start_date, end_date):
-        """
-        Retrieves transactions with a balance due within the given date range,
-        grouped by project_id.
-        """
+    def cache_report_pdf(self, cache_key, pdf_path):
+        """Keeps a copy of the PDF rendered from a get_report_data result."""
+        if cache_key is None:
+            return
         try:
-            start_datetime_obj = datetime.strptime(start_date, '%Y-%m-%d')
-            end_datetime_obj = datetime.strptime(end_date, '%Y-%m-%d')
-            end_datetime_full = datetime.combine(end_datetime_obj, datetime.max.time())
+            self._report_cache.put_pdf(cache_key, pdf_path)
+        except OSError as e:
+            print(f"Could not cache report PDF {pdf_path}: {e}")
 
-            query = """
-                SELECT 
-                    p.project_id AS project_id,
-                    pr.name AS project_name,
-                    t.transaction_id,
-                    t.transaction_date,
-                    t.total_amount_paid,
-                    t.discount,
-                    t.balance,
-                    p.title_deed_number,
-                    p.price AS original_price,
-                    c.name AS client_name,
-                    c.telephone_number AS client_contact_info
-                FROM 
-                    transactions t
-                JOIN 
-                    properties p ON t.property_id = p.property_id
-                JOIN 
-                    clients c ON t.client_id = c.client_id
-                JOIN
-                    projects pr ON p.project_id = pr.project_id
-                WHERE 
-                    t.balance > 0 
-                    AND t.transaction_date BETWEEN %s AND %s
-                    AND t.payment_mode = 'installments'
-                ORDER BY 
-                    p.project_id ASC, t.transaction_date ASC
-            """
-
-            result_rows = self._execute_query(query, (start_datetime_obj, end_datetime_full), fetch_all=True)
-            return [dict(row) for row in result_rows] if result_rows else []
-
-        except Exception as e:
-            print(f"[ERROR] get_pending_instalments_for_date_range failed: {e}")
-            return []
-
-       
     def get_service_sales_summary(self, period="daily", start_date=None, end_date=None):
         """
         Get total gross and net service sales from service_payments.
@@ -2740,11 +3458,11 @@ class DatabaseManager:
                     SUM(sp.fee) AS total_gross,
                     SUM(amount) AS total_net
                 {base_join_and_filter}
-                AND payment_date BETWEEN %s AND %s
+                AND sp.payment_date >= %s AND sp.payment_date < %s
                 GROUP BY DATE(payment_date)
                 ORDER BY DATE(payment_date) DESC
             """
-            params = [f"{start_date} 00:00:00", f"{end_date} 23:59:59"]
+            params = list(day_range(start_date, end_date))
         else:
             raise ValueError("Invalid period. Use 'daily', 'monthly', or 'custom' with start_date & end_date.")
 
@@ -2771,20 +3489,24 @@ class DatabaseManager:
             sp.balance,
             sp.fee AS agreed_fee,
             sp.payment_date,
-            sp.status AS payment_status
+            sp.status AS payment_status,
+            au.username AS assigned_username,
+            ab.username AS added_by
         FROM service_jobs sj
         LEFT JOIN service_payments sp ON sj.job_id = sp.job_id
+        LEFT JOIN users au ON sj.assigned_to = au.user_id
+        LEFT JOIN users ab ON sj.added_by_user_id = ab.user_id
         WHERE sj.status IN ('ongoing', 'completed', 'dispatched')
         """
         params = []
 
         if start_date:
-            query += " AND DATE(sp.payment_date) >= %s"
-            params.append(start_date)
+            query += " AND sp.payment_date >= %s"
+            params.append(start_of_day(start_date))
 
         if end_date:
-            query += " AND DATE(sp.payment_date) <= %s"
-            params.append(end_date)
+            query += " AND sp.payment_date < %s"
+            params.append(start_of_next_day(end_date))
 
         if status:
             query += " AND sj.status = %s"
@@ -2796,11 +3518,79 @@ class DatabaseManager:
     
     def load_settings(self):
         """Loads system settings from the database and updates the configuration."""
+        self._ensure_default_settings()
+        pool_options = {}
+        for setting_name, (default, _description) in POOL_SETTINGS.items():
+            setting = self.get_setting(setting_name)
+            try:
+                pool_options[setting_name] = float(setting['setting_value']) if setting else default
+            except (TypeError, ValueError):
+                print(f"Invalid value for setting '{setting_name}', using default {default}.")
+                pool_options[setting_name] = default
+        self._pool.configure(
+            max_size=int(pool_options['db_pool_max_size']),
+            idle_timeout=pool_options['db_pool_idle_timeout'],
+            health_check_interval=pool_options['db_pool_health_check_interval'],
+            acquire_timeout=pool_options['db_pool_acquire_timeout'],
+        )
+
+        threshold_setting = self.get_setting('slow_query_threshold_ms')
+        try:
+            if threshold_setting:
+                self._query_stats.slow_threshold_ms = float(threshold_setting['setting_value'])
+        except (TypeError, ValueError):
+            print("Invalid value for setting 'slow_query_threshold_ms', keeping the current threshold.")
+
+        for setting_name, (default, _description) in ACTIVITY_LOG_SETTINGS.items():
+            setting = self.get_setting(setting_name)
+            try:
+                value = int(float(setting['setting_value'])) if setting else default
+            except (TypeError, ValueError):
+                print(f"Invalid value for setting '{setting_name}', using default {default}.")
+                value = default
+            if setting_name == 'activity_log_batch_size':
+                self._activity_log.batch_size = max(1, value)
+            elif setting_name == 'activity_log_flush_interval_ms':
+                self._activity_log.flush_interval = max(0, value) / 1000
+            else:
+                self.activity_log_retention_months = max(0, value)
+
+        archive_dir_setting = self.get_setting('activity_log_archive_dir')
+        archive_dir = (archive_dir_setting['setting_value'] or '').strip() if archive_dir_setting else ''
+        self._activity_archive.archive_dir = archive_dir or ACTIVITY_LOG_ARCHIVE_DIR
+
+        for setting_name, (default, _description) in REPORT_CACHE_SETTINGS.items():
+            setting = self.get_setting(setting_name)
+            try:
+                value = float(setting['setting_value']) if setting else default
+            except (TypeError, ValueError):
+                print(f"Invalid value for setting '{setting_name}', using default {default}.")
+                value = default
+            if setting_name == 'report_cache_max_mb':
+                self._report_cache.max_bytes = int(max(0, value) * 1024 * 1024)
+            else:
+                self._report_cache.ttl = max(0, value)
+
         host_setting = self.get_setting("database_host")
-        if host_setting:
+        if host_setting and host_setting['setting_value'] != self.db_config['host']:
             self.db_config['host'] = host_setting['setting_value']
+            # Pooled connections still point at the old host.
+            self._pool.reset(self.db_config)
             print(f"Database host updated to: {self.db_config['host']}")
 
+    def _ensure_default_settings(self):
+        """Seeds the connection pool and query instrumentation settings so they show up in System Settings."""
+        query = """
+        INSERT IGNORE INTO system_settings (setting_name, setting_value, description, updated_by_username)
+        VALUES (%s, %s, %s, 'system')
+        """
+        self._execute_transaction(*[
+            (query, (setting_name, str(default), description))
+            for setting_name, (default, description)
+            in {**POOL_SETTINGS, **QUERY_STATS_SETTINGS, **ACTIVITY_LOG_SETTINGS, **ACTIVITY_ARCHIVE_SETTINGS,
+                **REPORT_CACHE_SETTINGS}.items()
+        ])
+
     def get_setting(self, setting_name):
         """Retrieves a single setting by name."""
         query = "SELECT * FROM system_settings WHERE setting_name = %s"
@@ -2850,9 +3640,8 @@ class DatabaseManager:
         if filters.get('from_date') and filters.get('to_date'):
             from_date = filters['from_date']
             to_date = filters['to_date']
-            conditions.append("cj.cancellation_date BETWEEN %s AND %s")
-            params.append(from_date.strftime('%Y-%m-%d 00:00:00'))
-            params.append(to_date.strftime('%Y-%m-%d 23:59:59'))
+            conditions.append("cj.cancellation_date >= %s AND cj.cancellation_date < %s")
+            params.extend(day_range(from_date, to_date))
 
         where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
         query = f"{base_query}{where_clause} ORDER BY cj.cancellation_date DESC"
@@ -2860,6 +3649,90 @@ class DatabaseManager:
 
 
 
+    def record_sale(
+        self,
+        property_id,
+        buyer_name,
+        buyer_contact,
+        payment_mode,
+        amount_paid,
+        balance,
+        discount=0.0,
+        brought_by=None,
+        added_by_user_id=None,
+        property_status='Sold',
+        visit_id=None,
+        installment_plan=None,
+        payment_reason="Initial Property Purchase Payment"
+    ):
+        """
+        Records a complete property sale atomically: finds or creates the buyer, adds the
+        transaction and its first payment history row, creates the installment plan and its
+        schedule (when `installment_plan` is given), updates the property status and clears
+        the daily visit. Either every step is saved or none is.
+
+        `installment_plan` is a dict with payment_plan_id, total_balance,
+        monthly_installment_amount, start_date and schedule (a list of (due_date, due_amount)).
+        Returns: The new transaction ID, or None if the sale could not be recorded.
+        """
+        try:
+            with self.unit_of_work():
+                client_data = self.get_client_by_contact_info(buyer_contact)
+                if client_data:
+                    client_id = client_data['client_id']
+                    if client_data['name'] != buyer_name:
+                        self.update_client(client_id, name=buyer_name)
+                else:
+                    client_id = self.add_client(buyer_name, buyer_contact, '', 'active', added_by_user_id)
+                    if not client_id:
+                        raise SaleError("Failed to add new client.")
+
+                transaction_id = self.add_transaction(
+                    property_id,
+                    client_id,
+                    payment_mode,
+                    amount_paid,
+                    brought_by,
+                    discount,
+                    balance,
+                    added_by_user_id=added_by_user_id
+                )
+                if not transaction_id:
+                    raise SaleError("Failed to add the transaction.")
+
+                if not self.add_transaction_history(
+                    transaction_id,
+                    None,  # installment_id (not applicable to the initial payment)
+                    amount_paid,
+                    payment_mode,
+                    payment_reason,
+                    datetime.now()
+                ):
+                    raise SaleError("Failed to record the payment history.")
+
+                if installment_plan:
+                    plan_instance_id = self.add_installment_plan(
+                        transaction_id,
+                        installment_plan['payment_plan_id'],
+                        installment_plan['total_balance'],
+                        installment_plan['monthly_installment_amount'],
+                        installment_plan['start_date']
+                    )
+                    if not plan_instance_id:
+                        raise SaleError("Failed to add the installment plan.")
+                    self.schedule_installments_bulk(plan_instance_id, installment_plan.get('schedule', []))
+
+                if not self.update_property(property_id, status=property_status):
+                    raise SaleError(f"Property {property_id} could not be marked as {property_status}.")
+
+                if visit_id:
+                    self.delete_daily_client(visit_id)
+
+            return transaction_id
+        except (SaleError, mysql.connector.Error) as err:
+            print(f"Sale of property {property_id} was rolled back: {err}", file=sys.stderr)
+            return None
+
     def delete_daily_client(self, visit_id):
         try:
             query = "DELETE FROM daily_clients WHERE visit_id = %s"
@@ -2895,15 +3768,18 @@ class DatabaseManager:
     
     def get_projects_data(self):
         """
-        Fetches all active projects, their property count, and dynamic sale status.
+        Fetches all active projects, their property counts, and dynamic sale status.
+        The total, sold and available counts for every project come from a single grouped query.
         """
-        # Step 1: Get all active projects with the number of properties
+        # Step 1: Get all active projects with their property counts
         query = """
             SELECT
                 p.project_id,
                 p.name AS project_name,
                 u.username AS added_by_username,
-                COUNT(prop.property_id) AS num_properties
+                COUNT(prop.property_id) AS num_properties,
+                COALESCE(SUM(CASE WHEN prop.status = 'sold' THEN 1 ELSE 0 END), 0) AS sold_properties,
+                COALESCE(SUM(CASE WHEN prop.status = 'available' THEN 1 ELSE 0 END), 0) AS available_properties
             FROM projects AS p
             JOIN users AS u ON p.added_by_user_id = u.user_id
             LEFT JOIN properties AS prop ON p.project_id = prop.project_id
@@ -2916,13 +3792,15 @@ class DatabaseManager:
         if not projects:
             return []
 
-        # Step 2: Loop through each project to determine the dynamic sale status
-        final_projects = []
+        # Step 2: Derive the sale status from the counts already fetched
         for project in projects:
-            project['sale_status'] = self._get_sale_status_for_project(project['project_id'])
-            final_projects.append(project)
+            project['sold_properties'] = int(project['sold_properties'])
+            project['available_properties'] = int(project['available_properties'])
+            project['sale_status'] = self._sale_status_from_counts(
+                project['num_properties'], project['sold_properties']
+            )
 
-        return final_projects
+        return projects
 
     def _get_sale_status_for_project(self, project_id):
         """
@@ -2936,11 +3814,17 @@ class DatabaseManager:
         """
         result = self._execute_query(query, (project_id,), fetch_one=True)
 
-        if not result or result['total_properties'] == 0:
+        if not result:
             return 'Available'
+        return self._sale_status_from_counts(result['total_properties'], result['sold_properties'] or 0)
 
-        total_properties = result['total_properties']
-        sold_properties = result['sold_properties']
+    @staticmethod
+    def _sale_status_from_counts(total_properties, sold_properties):
+        """
+        Maps a project's total and sold property counts to its sale status bucket.
+        """
+        if not total_properties:
+            return 'Available'
 
         if sold_properties == total_properties:
             return 'Sold Out'
@@ -3038,7 +3922,7 @@ class DatabaseManager:
                 (property_id, dispatch_date, reason_for_dispatch, collected_by, collector_phone, sign)
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        params = (property_id, dispatch_date, reason, collected_by, phone, signature_data)
+        params = (property_id, dispatch_date, reason, collected_by, phone, encode_signature(signature_data))
 
         return bool(self._execute_query(query, params))
     
@@ -3058,12 +3942,21 @@ class DatabaseManager:
         
     def get_signature_by_dispatch_id(self, dispatch_id):
         """
-        Retrieves the digital signature file data from dispatch_titles.
+        Retrieves the digital signature file data from dispatch_titles, decompressed and cached.
         Returns: A dictionary containing the signature data, or None if not found.
         """
-        query = "SELECT sign FROM dispatch_titles WHERE dispatch_id = %s"
-        params = (dispatch_id,)
-        return self._execute_query(query, params, fetch_one=True)
+        cache_key = ('dispatch_titles', str(dispatch_id))
+        versions = self._query_cache.table_versions(('dispatch_titles',))
+        sign = self._signature_cache.get(cache_key, versions)
+        if sign is None:
+            query = "SELECT sign FROM dispatch_titles WHERE dispatch_id = %s"
+            row = self._execute_query(query, (dispatch_id,), fetch_one=True)
+            if not row:
+                return None
+            sign = decode_signature(row['sign'])
+            if sign:
+                self._signature_cache.set(cache_key, sign, versions)
+        return {'sign': sign}
 
     
     # === BOOKING HELPERS ===
@@ -3184,10 +4077,10 @@ class DatabaseManager:
                 dc.timestamp
             FROM daily_clients dc
             JOIN clients c ON dc.client_id = c.client_id
-            WHERE DATE(dc.timestamp) = %s
+            WHERE dc.timestamp >= %s AND dc.timestamp < %s
             ORDER BY dc.timestamp ASC
         """
-        return self._execute_query(query, (target_date,), fetch_all=True)
+        return self._execute_query(query, day_range(target_date, target_date), fetch_all=True)
 
     def process_refund_and_reset(self, title_deed):
         """
@@ -3336,12 +4229,11 @@ class DatabaseManager:
 
     def close(self):
         """
-        Closes the database connection.
+        Writes out the queued activity log entries, then closes all pooled database connections.
         """
-        if self.conn and self.conn.is_connected():
-            self.cursor.close()
-            self.conn.close()
-            print("Database connection closed.")
+        self._activity_log.close()
+        self._pool.close_all()
+        print("Database connections closed.")
 
 
     
@@ -4,6 +4,7 @@ import os
 from PIL import Image, ImageTk
 from tkcalendar import DateEntry  # For date pickers
 from datetime import datetime, timedelta
+from utils.background import run_in_background, get_executor, set_loading
 
 # Define paths relative to the project root for icon loading
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -14,7 +15,8 @@ ICONS_DIR = os.path.join(ASSETS_DIR, 'icons')
 class ActivityLogViewerForm(tk.Toplevel):
     """
     A Toplevel window for viewing system activity logs.
-    Allows filtering by user, action type, and date range, and supports pagination.
+    Allows filtering by user, action type, and date range, and pages through the logs
+    with keyset cursors, optionally continuing into the archived months.
     """
 
     def __init__(self, parent, db_manager, parent_icon_loader=None):
@@ -41,8 +43,7 @@ class ActivityLogViewerForm(tk.Toplevel):
 
         self.current_page = 1
         self.page_size = 20  # Number of logs per page
-        self.total_logs = 0
-        self.total_pages = 1
+        self.page_cursors = [None]  # page_cursors[n - 1] is the cursor that fetches page n
 
         self._create_widgets()
         self.load_logs()
@@ -142,6 +143,13 @@ class ActivityLogViewerForm(tk.Toplevel):
                                          image=self.clear_filter_icon, compound=tk.LEFT)
         clear_filter_button.grid(row=1, column=4, padx=10, pady=5)
 
+        self.include_archived_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="Include archived months", variable=self.include_archived_var,
+                        command=self._apply_filters).grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
+        self.archive_info_label = ttk.Label(filter_frame, text="")
+        self.archive_info_label.grid(row=2, column=2, columnspan=3, sticky=tk.W, padx=5, pady=2)
+        self._update_archive_info()
+
         # Log List (Treeview)
         log_list_frame = ttk.LabelFrame(main_frame, text="Activity Log Entries", padding="10")
         log_list_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -201,52 +209,79 @@ class ActivityLogViewerForm(tk.Toplevel):
         self.action_type_filter_combobox['values'] = action_types
         self.action_type_filter_combobox.set("All Actions")
 
-    def load_logs(self):
-        for item in self.log_tree.get_children():
-            self.log_tree.delete(item)
+    def _update_archive_info(self):
+        months = self.db_manager.get_activity_log_archive_months()
+        _archive_dir, shared = self.db_manager.get_activity_log_archive_location()
+        if months:
+            text = f"Archived: {months[-1]:%Y-%m} to {months[0]:%Y-%m} ({len(months)} months)"
+        else:
+            text = "No archived months"
+        if not shared:
+            # Months archived by another workstation are only listed once the archive is on a share.
+            text += " on this computer (set activity_log_archive_dir to share the archive)"
+        self.archive_info_label.config(text=text)
 
+    def load_logs(self):
+        """Loads the current page of logs in the background; a newer request supersedes an older one."""
         selected_user = self.user_filter_combobox.get()
         selected_action_type = self.action_type_filter_combobox.get()
         start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d') if self.start_date_entry.get_date() else None
         end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d') if self.end_date_entry.get_date() else None
 
+        action_type_filter = None
+        if selected_action_type != "All Actions":
+            action_type_filter = selected_action_type
+
+        self.page_info_label.config(text="Loading logs...")
+        self.prev_button.config(state="disabled")
+        self.next_button.config(state="disabled")
+        set_loading(self, True)
+
+        run_in_background(
+            self,
+            self._fetch_logs,
+            selected_user,
+            action_type_filter,
+            start_date,
+            end_date,
+            self.include_archived_var.get(),
+            self.current_page,
+            key="load_logs",
+            on_success=self._display_logs,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load activity logs: {e}", parent=self),
+            on_finally=lambda: set_loading(self, False)
+        )
+
+    def _fetch_logs(self, selected_user, action_type_filter, start_date, end_date, include_archived, requested_page):
+        """Runs on a worker thread: resolves the user filter and fetches one page."""
         user_id_filter = None
         if selected_user != "All Users":
             user_data = self.db_manager.get_user_by_username(selected_user)
             if user_data:
                 user_id_filter = user_data['user_id']
 
-        action_type_filter = None
-        if selected_action_type != "All Actions":
-            action_type_filter = selected_action_type
-
-        # Get total count for pagination
-        self.total_logs = self.db_manager.get_total_activity_logs_count(
+        page = min(max(requested_page, 1), len(self.page_cursors))
+        logs, next_cursor = self.db_manager.get_activity_logs_page(
+            page_size=self.page_size,
+            cursor=self.page_cursors[page - 1],
             user_id=user_id_filter,
             action_type=action_type_filter,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            include_archived=include_archived
         )
-        self.total_pages = (self.total_logs + self.page_size - 1) // self.page_size
-        if self.total_pages == 0:  # Handle case with no logs
-            self.total_pages = 1
-
-        # Ensure current_page is within valid bounds
-        if self.current_page > self.total_pages:
-            self.current_page = self.total_pages
-        if self.current_page < 1:
-            self.current_page = 1
+        return page, logs, next_cursor
 
-        offset = (self.current_page - 1) * self.page_size
+    def _display_logs(self, result):
+        """Runs on the Tk thread with the result of _fetch_logs."""
+        self.current_page, logs, next_cursor = result
+        # Remember where the following page starts; drop cursors past the end if the data shrank
+        del self.page_cursors[self.current_page:]
+        if next_cursor:
+            self.page_cursors.append(next_cursor)
 
-        logs = self.db_manager.get_activity_logs(
-            limit=self.page_size,
-            offset=offset,
-            user_id=user_id_filter,
-            action_type=action_type_filter,
-            start_date=start_date,
-            end_date=end_date
-        )
+        for item in self.log_tree.get_children():
+            self.log_tree.delete(item)
 
         if logs:
             for log in logs:
@@ -258,12 +293,13 @@ class ActivityLogViewerForm(tk.Toplevel):
                     log['details']
                 ))
 
-        self.page_info_label.config(text=f"Page {self.current_page} of {self.total_pages} ({self.total_logs} logs)")
+        self.page_info_label.config(text=f"Page {self.current_page}")
         self.prev_button.config(state="normal" if self.current_page > 1 else "disabled")
-        self.next_button.config(state="normal" if self.current_page < self.total_pages else "disabled")
+        self.next_button.config(state="normal" if next_cursor else "disabled")
 
     def _apply_filters(self):
         self.current_page = 1  # Reset to first page when applying filters
+        self.page_cursors = [None]
         self.load_logs()
 
     def _clear_filters(self):
@@ -271,7 +307,9 @@ class ActivityLogViewerForm(tk.Toplevel):
         self.action_type_filter_combobox.set("All Actions")
         self.start_date_entry.set_date(None)  # Clear date
         self.end_date_entry.set_date(None)  # Clear date
+        self.include_archived_var.set(False)
         self.current_page = 1
+        self.page_cursors = [None]
         self.load_logs()
 
     def _prev_page(self):
@@ -280,12 +318,13 @@ class ActivityLogViewerForm(tk.Toplevel):
             self.load_logs()
 
     def _next_page(self):
-        if self.current_page < self.total_pages:
+        if self.current_page < len(self.page_cursors):
             self.current_page += 1
             self.load_logs()
 
     def _on_closing(self):
         """Handle the window close button (X)."""
+        get_executor().cancel_all(self)
         self.grab_release()
         self.destroy()
 
@@ -149,7 +149,7 @@ class CreatePaymentPlanForm(tk.Toplevel):
             "deposit_percentage": deposit_percentage,
             "duration_months": duration,
             "interest_rate": interest_rate,
-            "created_by": username
+            "created_by_user_id": self.user_id
         }
 
         try:
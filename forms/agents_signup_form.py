@@ -183,16 +183,16 @@ class AgentSignupForm(tk.Toplevel):
             messagebox.showwarning("Signup Failed", f"Agent '{agent_name}' already exists. Please choose a different name.", parent=self)
             return
 
-        # Now, get the username from the user ID before adding the agent
+        # Make sure the current user still exists before recording them as the agent's creator
         added_by_username = self.db_manager.get_username_by_id(self.added_by_user_id)
 
         if not added_by_username:
             messagebox.showerror("Error", "Could not find the username for the current user.", parent=self)
             return
 
-        # Call the correct database function for adding an agent, passing the username
+        # Call the correct database function for adding an agent, passing the user ID
         try:
-            success = self.db_manager.add_agent(agent_name, added_by_username)
+            success = self.db_manager.add_agent(agent_name, self.added_by_user_id)
 
             if success:
                 messagebox.showinfo("Success",
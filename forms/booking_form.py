@@ -9,7 +9,7 @@ except ImportError:
     has_ctypes = False
 
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
+from utils.installment_schedule import generate_installment_schedule
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image as RLImage
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -961,77 +961,48 @@ class InstallmentPaymentWindow(tk.Toplevel):
             return
         # 4. Business logic validation
         
-        # 5. Get or add client
-        client_data = self.db_manager.get_client_by_contact_info(buyer_contact)
-        if client_data:
-            client_id = client_data['client_id']
-            if client_data['name'] != buyer_name:
-                self.db_manager.update_client(client_id, name=buyer_name)
-        else:
-            client_id = self.db_manager.add_client(buyer_name, buyer_contact, client_status, added_by_user_id)
-            if not client_id:
-                messagebox.showerror("Database Error", "Failed to add new client.", parent=self)
-                return
-        # 6. Prepare sale details for database transaction
+        # 5. Prepare sale details for database transaction
         total_payable = float(self._total_amount_paid_var.get().strip().replace(',', ''))
         balance = total_payable - amount_paid
-        # 7. Record the sale in the database
-        transaction_id = self.db_manager.add_transaction(
-            self.selected_property['property_id'],
-            client_id,
-            payment_mode,
-            amount_paid,
-            self.brought_by,
-            0.0,
-            balance
+
+        # Retrieve the selected payment plan details
+        selected_plan_str = self.payment_plan_combobox.get()
+        plan_name = selected_plan_str.split(' (')[0]
+        selected_plan = self._all_payment_plans.get(plan_name)
+
+        # 6. Calculate the installment plan details and its monthly schedule
+        total_balance = total_payable - amount_paid
+        duration_months = selected_plan.get('duration_months', 0)
+        if duration_months > 0:
+            monthly_installment_amount = total_balance / duration_months
+        else:
+            monthly_installment_amount = 0.0
+        start_date = datetime.now().date()
+
+        # 7. Record the client, sale, plan, schedule and property status in one transaction
+        transaction_id = self.db_manager.record_sale(
+            property_id=self.selected_property['property_id'],
+            buyer_name=buyer_name,
+            buyer_contact=buyer_contact,
+            payment_mode=payment_mode,
+            amount_paid=amount_paid,
+            balance=balance,
+            discount=0.0,
+            brought_by=self.brought_by,
+            added_by_user_id=added_by_user_id,
+            property_status='unvailable',
+            visit_id=self.visit_id,
+            installment_plan={
+                'payment_plan_id': selected_plan['plan_id'],
+                'total_balance': total_balance,
+                'monthly_installment_amount': monthly_installment_amount,
+                'start_date': start_date,
+                'schedule': generate_installment_schedule(start_date, duration_months, monthly_installment_amount),
+            }
         )
-        if transaction_id:
-            # Add a new payment history record for the initial transaction
-            payment_reason = "Initial Property Purchase Payment"
-            self.db_manager.add_transaction_history(
-                transaction_id,
-                installment_id=None,
-                payment_amount=amount_paid,
-                payment_mode=payment_mode,
-                payment_reason=payment_reason,
-                payment_date=datetime.now()
-            )
-            # Retrieve the selected payment plan details
-            selected_plan_str = self.payment_plan_combobox.get()
-            plan_name = selected_plan_str.split(' (')[0]
-            selected_plan = self._all_payment_plans.get(plan_name)
-            # 8. Calculate and record the installment plan details
-            total_balance = total_payable - amount_paid
-            duration_months = selected_plan.get('duration_months', 0)
-            if duration_months > 0:
-                monthly_installment_amount = total_balance / duration_months
-            else:
-                monthly_installment_amount = 0.0
-            # Add the installment plan instance to the database
-            plan_instance_id = self.db_manager.add_installment_plan(
-                transaction_id,
-                selected_plan['plan_id'],
-                total_balance,
-                monthly_installment_amount,
-                datetime.now().date()
-            )
-            if plan_instance_id:
-                # 9. Schedule the future monthly payments
-                current_date = datetime.now().date()
-                for i in range(duration_months):
-                    due_date = current_date + relativedelta(months=i + 1)
-                    self.db_manager.schedule_installment_payment(
-                        plan_instance_id,
-                        due_date,
-                        monthly_installment_amount
-                    )
 
         if transaction_id:
-            # 8. Update property status
-            self.db_manager.update_property(self.selected_property['property_id'], status='unvailable')
-            if self.visit_id:
-                self.db_manager.delete_daily_client(self.visit_id)
-            # 9. Ask user if they want to generate a receipt and call the receipt function
+            # 8. Ask user if they want to generate a receipt and call the receipt function
             if messagebox.askyesno("Generate Receipt?", "Installment plan recorded. Do you want to generate a receipt for the initial payment?"):
                 self._save_receipt(
                     transaction_id=transaction_id,
@@ -3,6 +3,9 @@ from tkinter import ttk, messagebox
 import os
 import platform
 from database import DatabaseManager
+from utils.background import Debouncer
+from utils.treeview_sync import reconcile_treeview
+from utils.search_index import SEARCH_DISPLAY_LIMIT
 from PIL import Image, ImageTk, ImageDraw
 
 try:
@@ -160,7 +163,11 @@ class ClientForm(BaseForm):
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        self.search_entry.bind("<KeyRelease>", self._filter_clients)
+        self._search_debouncer = Debouncer(self, self._filter_clients)
+        self.search_entry.bind("<KeyRelease>", self._search_debouncer)
+        # Shown when more clients match than are listed
+        self.search_limit_label = ttk.Label(search_frame, text="", foreground="gray")
+        self.search_limit_label.pack(side=tk.LEFT, padx=(5, 0))
 
         # Add New Client Button
         self.add_client_button = ttk.Button(top_controls_frame, text="Add New Client",
@@ -257,28 +264,22 @@ class ClientForm(BaseForm):
 
     def _load_clients(self):
         """Clears and re-populates the client Treeview."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        clients = self.db_manager.get_all_clients()
-        if clients:
-            for client in clients:
-                self.tree.insert("", "end", values=(client['client_id'], client['name'], client['telephone_number'],
-                                                    client['email'], client['purpose'], client['added_by_username']))
+        self._search_debouncer.cancel()
+        self._filter_clients()
         self._clear_associated_data()
 
-    def _filter_clients(self, event):
-        """Filters the client list in real-time based on search input."""
-        search_term = self.search_var.get().lower()
-        self.tree.delete(*self.tree.get_children())
-        clients = self.db_manager.get_all_clients()
-
-        if clients:
-            for client in clients:
-                client_id, name, telephone, email, purpose, user_id = client['client_id'], client['name'], client[
-                    'telephone_number'], client['email'], client['purpose'], client['added_by_username']
-                if search_term in str(
-                        client_id).lower() or search_term in name.lower() or search_term in telephone.lower() or search_term in email.lower() or search_term in purpose.lower() or search_term in user_id.lower():
-                    self.tree.insert("", "end", values=(client_id, name, telephone, email, purpose, user_id))
+    def _filter_clients(self, event=None):
+        """Shows the clients matching the search input, looked up in the in-memory client index."""
+        # One extra row tells whether the list had to be cut short
+        clients = self.db_manager.search_clients(self.search_var.get(), limit=SEARCH_DISPLAY_LIMIT + 1)
+        self.search_limit_label.config(
+            text=f"Showing the first {SEARCH_DISPLAY_LIMIT}, refine your search" if len(clients) > SEARCH_DISPLAY_LIMIT else "")
+        clients = clients[:SEARCH_DISPLAY_LIMIT]
+        reconcile_treeview(self.tree, (
+            (client['client_id'], (client['client_id'], client['name'], client['telephone_number'],
+                                   client['email'], client.get('purpose', ''), client['added_by_username']))
+            for client in clients
+        ))
 
     def _open_add_client_form(self):
         """Opens a new modal window for adding a client."""
@@ -20,6 +20,7 @@ class DashboardForm(ttk.Frame):
         # Keep references to chart canvases to prevent them from being garbage collected
         self.prop_chart_canvas = None
         self.survey_chart_canvas = None
+        self._last_snapshot = None  # Snapshot currently drawn, so unchanged data is not redrawn
 
         self._create_widgets()
         self.populate_dashboard()
@@ -82,20 +83,22 @@ class DashboardForm(ttk.Frame):
     def populate_dashboard(self):
         """Fetches data from the database and updates the dashboard UI."""
 
-        num_sold = self.db_manager.get_total_sold_properties_count()
-        num_available = self.db_manager.count_available_properties()
-        num_total_properties = num_sold + num_available
-        num_clients = self.db_manager.get_total_clients()
-        num_survey_jobs = self.db_manager.get_total_survey_jobs()
+        snapshot = self.db_manager.get_dashboard_snapshot()
+        if snapshot == self._last_snapshot:
+            return  # Nothing changed since the last refresh; keep the existing charts
+        self._last_snapshot = snapshot
 
-        self.labels["Total Properties"].config(text=str(num_total_properties))
+        num_sold = snapshot['sold_properties']
+        num_available = snapshot['available_properties']
+
+        self.labels["Total Properties"].config(text=str(snapshot['total_properties']))
         self.labels["Sold Properties"].config(text=str(num_sold))
         self.labels["Available Properties"].config(text=str(num_available))
-        self.labels["Total Clients"].config(text=str(num_clients))
-        self.labels["Total Survey Jobs"].config(text=str(num_survey_jobs))
+        self.labels["Total Clients"].config(text=str(snapshot['total_clients']))
+        self.labels["Total Survey Jobs"].config(text=str(snapshot['total_survey_jobs']))
 
         self._create_property_status_chart(num_available, num_sold)
-        self._create_survey_jobs_chart()
+        self._create_survey_jobs_chart(snapshot['survey_job_status_counts'])
 
     def _create_property_status_chart(self, available, sold):
         """Creates and displays a pie chart for property status."""
@@ -130,13 +133,11 @@ class DashboardForm(ttk.Frame):
 
         plt.close(fig)
 
-    def _create_survey_jobs_chart(self):
+    def _create_survey_jobs_chart(self, status_counts):
         """Creates and displays a bar chart for survey job status."""
         for widget in self.survey_chart_frame.winfo_children():
             widget.destroy()
 
-        status_counts = self.db_manager.get_survey_job_status_counts()
-
         if not status_counts:
             ttk.Label(self.survey_chart_frame, text="No survey data available.",
                       anchor="center").pack(expand=True)
@@ -13,6 +13,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from tkcalendar import DateEntry
 from utils.tooltips import ToolTip
+from utils.virtual_treeview import VirtualTreeview
+from utils.treeview_sync import reconcile_treeview
 
 # Assuming database.py is in the same directory or accessible via PYTHONPATH
 # The DatabaseManager class is now fully functional
@@ -352,7 +354,7 @@ class DispatchJobsView(FormBase):
         table_frame.pack(fill="both", expand=True)
 
         columns = ("job_id", "date", "task_type", "title_name", "title_number", "file_name", "client_name", "status")
-        self.completed_jobs_tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+        self.completed_jobs_tree = VirtualTreeview(table_frame, columns=columns, show="headings")
         
         self.completed_jobs_tree.heading("job_id", text="Job ID")
         self.completed_jobs_tree.heading("date", text="Date")
@@ -371,6 +373,7 @@ class DispatchJobsView(FormBase):
         self.completed_jobs_tree.column("file_name", width=100, anchor=tk.W)
         self.completed_jobs_tree.column("client_name", width=150, anchor=tk.W)
         self.completed_jobs_tree.column("status", width=100, anchor=tk.W)
+        self.completed_jobs_tree.enable_sorting()
         
         scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.completed_jobs_tree.yview)
         self.completed_jobs_tree.configure(yscrollcommand=scrollbar.set)
@@ -460,9 +463,10 @@ class DispatchJobsView(FormBase):
             "job_id", "dispatch_date", "title_name", "title_number", "task_type", 
             "collected_by", "collector_phone", "reason_for_dispatch"
         )
-        self.dispatch_records_tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+        self.dispatch_records_tree = VirtualTreeview(table_frame, columns=columns, show="headings")
         
         self.dispatch_records_tree.column("job_id", width=0, stretch=tk.NO)
+        self.dispatch_records_tree.enable_sorting()
 
         self.dispatch_records_tree.heading("dispatch_date", text="Date")
         self.dispatch_records_tree.heading("title_name", text="Title Name")
@@ -508,10 +512,8 @@ class DispatchJobsView(FormBase):
 
     def _filter_and_populate_table(self, search_text=""):
         """Filters the completed jobs and populates the table based on search criteria."""
-        for item in self.completed_jobs_tree.get_children():
-            self.completed_jobs_tree.delete(item)
-        
         lower_search_text = search_text.lower()
+        rows = []
         
         for job in self.all_completed_jobs:
             search_data = [
@@ -544,7 +546,10 @@ class DispatchJobsView(FormBase):
                     str(job.get('client_name', '')).upper(),
                     job_status
                 )
-                self.completed_jobs_tree.insert("", tk.END, values=values, tags=(tag,))
+                rows.append((job.get('job_id', ''), values, (tag,)))
+
+        # Keyed by job_id: only jobs that appeared, changed or were filtered out are redrawn
+        reconcile_treeview(self.completed_jobs_tree, rows)
             
     def populate_dispatch_records_table(self):
         """Populates the 'Dispatch Records' table with dispatched jobs."""
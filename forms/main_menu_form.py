@@ -18,6 +18,7 @@ try:
     from forms.activity_log_viewer_form import ActivityLogViewerForm
     from forms.projects_form import ProjectsPanel
     from forms.system_settings_form import SystemSettingsForm
+    from forms.query_stats_form import QueryStatsForm
 except ImportError as e:
     messagebox.showerror("Import Error", f"Could not import required modules. "
                                          f"Please ensure admin_panel.py and signup_form.py are in the 'forms' directory. Error: {e}")
@@ -57,7 +58,7 @@ class MainMenuForm(tk.Toplevel):
         self.icon_images = {}
 
         # Set the window properties and create the custom title bar
-        self._set_window_properties(600, 350, "admin_panel.png")
+        self._set_window_properties(600, 420, "admin_panel.png")
         self._customize_title_bar()
 
         # Create and place widgets based on the new layout
@@ -216,6 +217,7 @@ class MainMenuForm(tk.Toplevel):
         self.logs_icon = self._load_icon_for_button("activity_logs.png")
         self.admin_menu_icon = self._load_icon_for_button("manage_agents.png") # Assuming a new icon for the main menu
         self.payment_icon = self._load_icon_for_button("payment.png") # Assuming a new icon for payment plans
+        self.query_stats_icon = self._load_icon_for_button("report.png")
 
         # Button 1: Main Admin Panel
         btn_main_admin = ttk.Button(
@@ -283,6 +285,17 @@ class MainMenuForm(tk.Toplevel):
             style=button_style,
         )
         btn_payment_plans.grid(row=2, column=1, padx=5, pady=5, ipadx=button_padding, ipady=button_padding, sticky=button_sticky)
+
+        # Button 7: Query performance (slow and frequent database calls)
+        btn_query_stats = ttk.Button(
+            button_container,
+            text="Query Performance",
+            image=self.query_stats_icon,
+            compound=tk.LEFT,
+            command=self._open_query_stats,
+            style=button_style,
+        )
+        btn_query_stats.grid(row=3, column=0, padx=5, pady=5, ipadx=button_padding, ipady=button_padding, sticky=button_sticky)
     
     def _open_admin_manage_users_panel(self):
         """Opens the AdminPanel window."""
@@ -317,3 +330,7 @@ class MainMenuForm(tk.Toplevel):
         """Opens the ActivityLogViewerForm window."""
         ActivityLogViewerForm(self, self.db_manager, parent_icon_loader=self._load_icon)
 
+    def _open_query_stats(self):
+        """Opens the QueryStatsForm window."""
+        QueryStatsForm(self, self.db_manager, parent_icon_loader=self._load_icon)
+
@@ -9,12 +9,11 @@ import re
 from collections import defaultdict
 import webbrowser
 from pdf2image import convert_from_bytes
-import fitz
 import io
 import webbrowser
 import tempfile
 from io import BytesIO
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.platypus import Image as RLImage, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
@@ -23,8 +22,15 @@ from reportlab.lib.units import inch
 from tkcalendar import DateEntry # Import DateEntry for the date picker
 from reportlab.lib.enums import TA_CENTER
 from utils.tooltips import ToolTip
+from utils.installment_schedule import generate_installment_schedule
+from utils.background import run_in_background, set_loading
+from utils.report_jobs import get_report_service, ReportProgressBar
+from utils.report_renderers import render_sales_report_pdf, render_payment_statement_pdf, \
+    render_sales_report_chunk, render_payment_statement_chunk, sales_report_chunks, payment_statement_chunks, \
+    merge_pdf_chunks, discard_pdf_chunk, LARGE_REPORT_ROWS, SALES_BOTTOM_MARGIN, STATEMENT_BOTTOM_MARGIN
+from utils.virtual_treeview import VirtualTreeview
+from utils.pdf_preview import PdfPreviewCanvas
 from datetime import datetime, date
-from dateutil.relativedelta import relativedelta
 from decimal import Decimal, InvalidOperation, getcontext
 
 
@@ -1584,90 +1590,48 @@ class InstallmentPaymentWindow(tk.Toplevel):
             messagebox.showerror("Validation Error", "Initial payment cannot be less than the required deposit.", parent=self)
             return
         
-        # 5. Get or add client
-        client_data = self.db_manager.get_client_by_contact_info(buyer_contact)
-        if client_data:
-            client_id = client_data['client_id']
-            if client_data['name'] != buyer_name:
-                self.db_manager.update_client(client_id, name=buyer_name)
-        else:
-            client_id = self.db_manager.add_client(buyer_name, buyer_contact, client_status, added_by_user_id)
-            if not client_id:
-                messagebox.showerror("Database Error", "Failed to add new client.", parent=self)
-                return
-        
-        # 6. Prepare sale details for database transaction
+        # 5. Prepare sale details for database transaction
         total_payable = Decimal(self._total_amount_paid_var.get().strip().replace(',', ''))
         balance = total_payable - amount_paid
-        
-        # 7. Record the sale in the database
-        transaction_id = self.db_manager.add_transaction(
-            self.selected_property['property_id'],
-            client_id,
-            payment_mode,
-            amount_paid,
-            self.brought_by,  # Assuming no discount for installments
-            Decimal('0.0'),
-            balance # Pass the brought_by data to the add_transaction method
-        )
-
-        if transaction_id:
-            # Add a new payment history record for the initial transaction
-            payment_reason = "Initial Property Purchase Payment"
-            self.db_manager.add_transaction_history(
-                transaction_id,
-                installment_id=None,
-                payment_amount=amount_paid,
-                payment_mode=payment_mode,
-                payment_reason=payment_reason,
-                payment_date=datetime.now()
-            )
-
-            # Retrieve the selected payment plan details
-            selected_plan_str = self.payment_plan_combobox.get()
-            plan_name = selected_plan_str.split(' (')[0]
-            selected_plan = self._all_payment_plans.get(plan_name)
-
-            # 8. Calculate and record the installment plan details
-            total_balance = total_payable - amount_paid
-            duration_months = selected_plan.get('duration_months', 0)
-
 
-            if duration_months > 0:
-                monthly_installment_amount = total_balance / duration_months
-            else:
-                monthly_installment_amount = Decimal('0.0')
-
-
-            # Add the installment plan instance to the database
-            plan_instance_id = self.db_manager.add_installment_plan(
-                transaction_id,
-                selected_plan['plan_id'],
-                total_balance,
-                monthly_installment_amount,
-                datetime.now().date()
-            )
-
-            if plan_instance_id:
-                # 9. Schedule the future monthly payments
-                current_date = datetime.now().date()
-                for i in range(duration_months):
-                    due_date = current_date + relativedelta(months=i + 1)
-                    self.db_manager.schedule_installment_payment(
-                        plan_instance_id,
-                        due_date,
-                        monthly_installment_amount
-                    )
+        # Retrieve the selected payment plan details
+        selected_plan_str = self.payment_plan_combobox.get()
+        plan_name = selected_plan_str.split(' (')[0]
+        selected_plan = self._all_payment_plans.get(plan_name)
 
+        # 6. Calculate the installment plan details and its monthly schedule
+        total_balance = total_payable - amount_paid
+        duration_months = selected_plan.get('duration_months', 0)
+        if duration_months > 0:
+            monthly_installment_amount = total_balance / duration_months
+        else:
+            monthly_installment_amount = Decimal('0.0')
+        start_date = datetime.now().date()
+
+        # 7. Record the client, sale, plan, schedule and property status in one transaction
+        transaction_id = self.db_manager.record_sale(
+            property_id=self.selected_property['property_id'],
+            buyer_name=buyer_name,
+            buyer_contact=buyer_contact,
+            payment_mode=payment_mode,
+            amount_paid=amount_paid,
+            balance=balance,
+            discount=Decimal('0.0'),
+            brought_by=self.brought_by,
+            added_by_user_id=added_by_user_id,
+            property_status='Sold',
+            visit_id=self.visit_id,
+            installment_plan={
+                'payment_plan_id': selected_plan['plan_id'],
+                'total_balance': total_balance,
+                'monthly_installment_amount': monthly_installment_amount,
+                'start_date': start_date,
+                'schedule': generate_installment_schedule(start_date, duration_months, monthly_installment_amount),
+            }
+        )
 
         if transaction_id:
-            # 8. Update property status
-            self.db_manager.update_property(self.selected_property['property_id'], status='Sold')
-
-            if self.visit_id:
-                self.db_manager.delete_daily_client(self.visit_id)
-            
-            # 9. Ask user if they want to generate a receipt and call the receipt function
+            # 8. Ask user if they want to generate a receipt and call the receipt function
             if messagebox.askyesno("Generate Receipt?", "Installment plan recorded. Do you want to generate a receipt for the initial payment?"):
                 self._save_receipt(
                     transaction_id=transaction_id,
@@ -2111,49 +2075,22 @@ class CashPaymentWindow(tk.Toplevel):
             messagebox.showerror("Calculation Error", f"Error calculating sale details: {e}")
             return
 
-        # The following logic is necessary to get a client ID for the transaction record.
-        # It ensures that a client record exists or is created before a transaction is logged.
-        client_data = self.db_manager.get_client_by_contact_info(buyer_contact)
-        if client_data:
-            client_id = client_data['client_id']
-            if client_data['name'] != buyer_name:
-                self.db_manager.update_client(client_id, name=buyer_name)
-        else:
-            client_id = self.db_manager.add_buyer(buyer_name, buyer_contact, added_by_user_id)
-            if not client_id:
-                messagebox.showerror("Database Error", "Failed to add new client.")
-                return
-
-        # Pass the new 'brought by' data to the transaction record method
-        transaction_id = self.db_manager.add_transaction(
-            self.selected_property['property_id'],
-            client_id,
-            payment_mode,
-            amount_paid_to_record,
-            brought_by_name,
-            discount,
-            balance # New: Pass the 'brought by' data here
+        # Record the client, transaction, payment history and property status in one transaction
+        transaction_id = self.db_manager.record_sale(
+            property_id=self.selected_property['property_id'],
+            buyer_name=buyer_name,
+            buyer_contact=buyer_contact,
+            payment_mode=payment_mode,
+            amount_paid=amount_paid_to_record,
+            balance=balance,
+            discount=discount,
+            brought_by=brought_by_name,
+            added_by_user_id=added_by_user_id,
+            property_status='Sold',
+            visit_id=self.visit_id
         )
 
         if transaction_id:
-            # Add a new payment history record for the initial transaction
-            payment_reason = "Initial Property Purchase Payment"
-            self.db_manager.add_transaction_history(
-                transaction_id,
-                None,  # installment_id (not applicable here)
-                amount_paid_to_record,
-                payment_mode,
-                payment_reason,
-                datetime.now()
-            )
-
-        if transaction_id:
-            self.db_manager.update_property(self.selected_property['property_id'], status='Sold')
-
-            if self.visit_id:
-                self.db_manager.delete_daily_client(self.visit_id)
-
-
             # New logic: Prompt user to save the receipt
             self._save_receipt(
                 transaction_id=transaction_id,
@@ -2741,8 +2678,27 @@ class SellPropertyFormLot(tk.Toplevel):
         self.geometry(f'+{x}+{y}')
 
     def _populate_property_list(self, search_query="", min_size=None, max_size=None):
+        """Fetches the available lots in the background; a newer search supersedes a pending one."""
         self.property_listbox.delete(0, tk.END)
-        self.available_properties_data = self.db_manager.get_all_properties_lots(status='Available',property_type='Lot')
+        self.available_properties_data = []
+        self.property_listbox.insert(tk.END, "LOADING PROPERTIES...")
+        set_loading(self, True)
+
+        run_in_background(
+            self,
+            self.db_manager.get_all_properties_lots,
+            status='Available',
+            property_type='Lot',
+            key="property_list",
+            on_success=lambda properties: self._display_property_list(properties, search_query, min_size, max_size),
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load properties: {e}", parent=self),
+            on_finally=lambda: set_loading(self, False)
+        )
+
+    def _display_property_list(self, properties, search_query="", min_size=None, max_size=None):
+        """Filters the fetched lots and fills the listbox; runs on the Tk thread."""
+        self.property_listbox.delete(0, tk.END)
+        self.available_properties_data = properties or []
 
         if not self.available_properties_data:
             self.property_listbox.insert(tk.END, "NO AVAILABLE PROPERTIES FOUND.")
@@ -3950,7 +3906,8 @@ class TrackPaymentsForm(tk.Toplevel):
         self.current_page = 1
         self.items_per_page = 12 # You can adjust this as needed
         self.total_pages = 1
-        self.current_transactions_data = [] # To store filtered data for pagination
+        self.current_transactions_data = [] # Rows of the page currently shown
+        self.current_filters = {} # Filters passed to the paginated query for every page
 
         # Set window properties (size, position, icon)
         self._set_window_properties(1300, 650, window_icon_name, parent_icon_loader) # Increased height for new filters
@@ -4273,8 +4230,8 @@ class TrackPaymentsForm(tk.Toplevel):
         db_property_search = property_search if property_search else None
         db_phone_number_search = phone_number_search if phone_number_search else None # New filter parameter
 
-        # Fetch all matching transactions based on filters, then paginate locally
-        self.current_transactions_data = self.db_manager.get_transactions_with_details(
+        # Only the filters are kept here; each page is fetched from the database on demand
+        self.current_filters = dict(
             status=db_status,
             start_date=start_date if start_date else None,
             end_date=end_date if end_date else None,
@@ -4283,12 +4240,6 @@ class TrackPaymentsForm(tk.Toplevel):
             property_search=db_property_search,
             client_contact_search=db_phone_number_search # Pass the new filter
         )
-        
-        # Calculate total pages based on fetched data
-        total_items = len(self.current_transactions_data)
-        self.total_pages = (total_items + self.items_per_page - 1) // self.items_per_page
-        if self.total_pages == 0:
-            self.total_pages = 1
 
         self._load_page(1) # Load the first page of filtered data
 
@@ -4308,20 +4259,30 @@ class TrackPaymentsForm(tk.Toplevel):
         self._apply_filters() # Reapply filters to show all data
 
     def _load_page(self, page_number):
-        """Loads data for the specified page number into the Treeview."""
+        """Fetches the specified page from the database and loads it into the Treeview."""
         if page_number < 1:
             page_number = 1
-        elif page_number > self.total_pages:
+
+        page_data, total_items = self.db_manager.get_transactions_with_details_paginated(
+            page=page_number,
+            page_size=self.items_per_page,
+            **self.current_filters
+        )
+
+        # Calculate total pages based on the total count returned with the page
+        self.total_pages = max(1, (total_items + self.items_per_page - 1) // self.items_per_page)
+        if page_number > self.total_pages:
+            # The data shrank (e.g. after a payment); fetch the last page that still exists
+            page_data, total_items = self.db_manager.get_transactions_with_details_paginated(
+                page=self.total_pages,
+                page_size=self.items_per_page,
+                **self.current_filters
+            )
             page_number = self.total_pages
 
         self.current_page = page_number
-        
-        start_index = (self.current_page - 1) * self.items_per_page
-        end_index = start_index + self.items_per_page
-        
-        # Get the slice of data for the current page
-        page_data = self.current_transactions_data[start_index:end_index]
-        
+        self.current_transactions_data = page_data
+
         self._populate_transactions_treeview(page_data)
         self._update_pagination_buttons()
         self.selected_job_data = None
@@ -4675,6 +4636,7 @@ class PaymentHistoryForm(tk.Toplevel, CustomTitleBarMixin):
         self._window_icon_ref = None
         self.parent_icon_loader = parent_icon_loader
         self.callback_on_close = None
+        self._statement_job = None  # Statement PDF rendering in a report worker process
 
         self._set_window_properties(850, 500, window_icon_name, parent_icon_loader)
         self._customize_title_bar()
@@ -4721,6 +4683,8 @@ class PaymentHistoryForm(tk.Toplevel, CustomTitleBarMixin):
         )
         statements_btn.pack(side="right", padx=5, pady=10)
 
+        self.statement_progress = ReportProgressBar(btn_frame, pack_options={'side': 'left', 'fill': 'x', 'expand': True, 'padx': 5})
+
     # ----------------------------------------------------------------------
 
     def _safe_decimal(self, value, default="0.00"):
@@ -4862,164 +4826,85 @@ class PaymentHistoryForm(tk.Toplevel, CustomTitleBarMixin):
         return final_list        
     
     def _generate_statements_pdf(self):
-        """Generates a detailed payment statement (PDF) with full payment breakdown and running balances."""
-        try:
-            # --- 1. Fetch transaction + history ---
-            details = self.db_manager.get_transaction_details_full(self.transaction_id)
-            if not details:
-                messagebox.showerror("Error", "Transaction details not found.")
-                return
+        """
+        Generates a detailed payment statement (PDF) with full payment breakdown and running balances.
+        The data is loaded on a worker thread and the PDF rendered in a report worker process.
+        """
+        if self._statement_job is not None:
+            return  # A statement is already being generated
+        run_in_background(
+            self, self._fetch_statement_data, key="statement_data",
+            on_success=self._save_statement,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to generate statement:\n{e}", parent=self)
+        )
 
-            history_data = self.db_manager.get_payment_history_for_transaction(self.transaction_id) or []
+    def _fetch_statement_data(self):
+        """Runs on a worker thread: returns the transaction details and its aggregated payment history."""
+        details = self.db_manager.get_transaction_details_full(self.transaction_id)
+        if not details:
+            return None, []
 
-            # Normalize and sort by date
-            for r in history_data:
-                if isinstance(r.get("payment_date"), str):
-                    try:
-                        r["payment_date"] = datetime.fromisoformat(r["payment_date"])
-                    except Exception:
-                        pass
+        history_data = self.db_manager.get_payment_history_for_transaction(self.transaction_id) or []
 
-            history_data = self._aggregate_history_data(history_data)
+        # Normalize and sort by date
+        for r in history_data:
+            if isinstance(r.get("payment_date"), str):
+                try:
+                    r["payment_date"] = datetime.fromisoformat(r["payment_date"])
+                except Exception:
+                    pass
 
+        return details, self._aggregate_history_data(history_data)
 
-            # --- 2. Ask where to save ---
-            default_name = f"Payment_Statement_{self.transaction_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            file_path = filedialog.asksaveasfilename(
-                title="Save Payment Statement As",
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                initialfile=default_name
-            )
-            if not file_path:
-                return
+    def _save_statement(self, result):
+        """Asks where to save the statement and starts rendering it."""
+        details, history_data = result
+        if not details:
+            messagebox.showerror("Error", "Transaction details not found.", parent=self)
+            return
 
-            # --- 3. PDF setup ---
-            doc = SimpleDocTemplate(file_path, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-            styles = getSampleStyleSheet()
-            wrap_style = ParagraphStyle(
-                name="WrapStyle",
-                parent=styles["Normal"],
-                fontSize=9,
-                leading=11,
-                wordWrap="CJK",
-            )
-            elements = []
+        default_name = f"Payment_Statement_{self.transaction_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        file_path = filedialog.asksaveasfilename(
+            title="Save Payment Statement As",
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            initialfile=default_name
+        )
+        if not file_path:
+            return
 
-            # --- 4. Header with logo ---
-            logo_path = os.path.join(ICONS_DIR, "NEWCITY.png")
-            if os.path.exists(logo_path):
-                logo = RLImage(logo_path)
-                logo._restrictSize(1.0 * inch, 1.0 * inch)
-            else:
-                logo = Paragraph("<b>NEW CITY REAL ESTATE</b>", styles["Normal"])
+        def on_finally():
+            self._statement_job = None
+            self.statement_progress.finish()
 
-            header_table = Table(
-                [[logo,
-                Paragraph("<b>NEW CITY REAL ESTATE</b>", styles["Title"]),
-                Paragraph(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), styles["Normal"])]],
-                colWidths=[80, 300, 120],
+        callbacks = dict(
+            on_progress=self.statement_progress.update_progress,
+            on_success=self._on_statement_saved,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to generate statement:\n{e}", parent=self),
+            on_finally=on_finally
+        )
+        if len(history_data) > LARGE_REPORT_ROWS:
+            self._statement_job = get_report_service().submit_chunked(
+                self, render_payment_statement_chunk,
+                payment_statement_chunks(self.transaction_id, details, history_data),
+                merge_pdf_chunks, file_path, bottom_margin=STATEMENT_BOTTOM_MARGIN,
+                discard_chunk=discard_pdf_chunk, **callbacks
             )
-            header_table.setStyle(TableStyle([
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("ALIGN", (2, 0), (2, 0), "RIGHT"),
-            ]))
-            elements.append(header_table)
-            elements.append(Spacer(1, 15))
-
-            # --- 5. Transaction summary ---
-            elements.append(Paragraph("<b>PAYMENT STATEMENT</b>", styles["Title"]))
-            elements.append(Spacer(1, 8))
-            elements.append(Paragraph(f"<b>Transaction ID:</b> {self.transaction_id}", styles["Normal"]))
-            elements.append(Paragraph(f"<b>Client Name:</b> {details.get('client_name', 'N/A')}", styles["Normal"]))
-            elements.append(Paragraph(f"<b>Contact:</b> {details.get('client_contact', 'N/A')}", styles["Normal"]))
-            elements.append(Paragraph(f"<b>Property:</b> {details.get('title_deed_number','')} — {details.get('location','')}", styles["Normal"]))
-            if details.get("project_name"):
-                elements.append(Paragraph(f"<b>Project:</b> {details['project_name']} (PLOT NO: {details.get('project_id')})", styles["Normal"]))
-            elements.append(Spacer(1, 10))
-
-            # --- 6. Payment table with running balance ---
-            table_data = [[
-                Paragraph("<b>Date</b>", wrap_style),
-                Paragraph("<b>Payment Mode</b>", wrap_style),
-                Paragraph("<b>Payment Reason</b>", wrap_style),
-                Paragraph("<b>Amount Paid (KES)</b>", wrap_style),
-                Paragraph("<b>Running Balance (KES)</b>", wrap_style),
-            ]]
-
-            total_paid = Decimal("0.00")
-            total_price = Decimal(str(details.get("price") or details.get("total_price") or 0))
-            discount = Decimal(str(details.get("discount") or 0))
-            net_price = total_price - discount
-            running_balance = net_price
-
-            # Loop through all payments (oldest first)
-            for rec in history_data:
-                amt = Decimal(str(rec.get("payment_amount", 0)))
-                total_paid += amt
-                running_balance -= amt
-
-                date_str = rec.get("payment_date")
-                if isinstance(date_str, datetime):
-                    date_str = date_str.strftime("%Y-%m-%d %H:%M:%S")
-
-                table_data.append([
-                    date_str or "—",
-                    rec.get("payment_mode", ""),
-                    rec.get("payment_reason", ""),
-                    f"{float(amt):,.2f}",
-                    f"{float(running_balance):,.2f}",
-                ])
-
-            # --- 7. Table styling ---
-            table = Table(table_data, colWidths=[120, 100, 160, 100, 100])
-            table.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2E86C1")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (3, 1), (4, -1), "RIGHT"),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-            ]))
-            elements.append(table)
-            elements.append(Spacer(1, 15))
-
-            # --- 8. Totals / Summary section ---
-            balance = running_balance
-            summary_data = [
-                ["", "Total Property Price:", f"{float(total_price):,.2f} KES"],
-                ["", "Discounts Applied:", f"{float(discount):,.2f} KES"],
-                ["", "Net Payable:", f"{float(net_price):,.2f} KES"],
-                ["", "Total Amount Paid:", f"{float(total_paid):,.2f} KES"],
-                ["", "Outstanding Balance:", f"{float(balance):,.2f} KES"],
-            ]
-
-            summary_table = Table(summary_data, colWidths=[100, 200, 150])
-            summary_table.setStyle(TableStyle([
-                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                ("FONTNAME", (1, 0), (-1, -1), "Helvetica-Bold"),
-                ("FONTSIZE", (1, 0), (-1, -1), 10),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-            ]))
-            elements.append(summary_table)
-            elements.append(Spacer(1, 25))
-
-            elements.append(Paragraph(
-                "<i>This is a system-generated statement showing all payments made to date.</i>",
-                styles["Normal"]
-            ))
-
-            # --- 9. Build and open ---
-            doc.build(elements)
-            open_now = messagebox.askyesno(
-                "Statement Generated",
-                f"Statement saved successfully as:\n\n{os.path.basename(file_path)}\n\nWould you like to open it now?"
+        else:
+            self._statement_job = get_report_service().submit(
+                self, render_payment_statement_pdf, file_path, self.transaction_id, details, history_data, **callbacks
             )
-            if open_now:
-                webbrowser.open_new(file_path)
+        self.statement_progress.start(self._statement_job, "Generating statement...")
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate statement:\n{e}")
+    def _on_statement_saved(self, file_path):
+        open_now = messagebox.askyesno(
+            "Statement Generated",
+            f"Statement saved successfully as:\n\n{os.path.basename(file_path)}\n\nWould you like to open it now?",
+            parent=self
+        )
+        if open_now:
+            webbrowser.open_new(file_path)
+    
     
 
 
@@ -5434,7 +5319,12 @@ class ViewAllPropertiesForm(tk.Toplevel):
         self.current_page = 1
         self.items_per_page = 20 # Display first 10 newest properties (determined by id)
         self.total_pages = 1
-        self.all_properties_data = [] # To store all filtered properties for pagination
+        self.total_items = 0
+        self.all_properties_data = [] # Properties on the page currently shown
+        self.current_filters = {} # Filters passed to the keyset page query
+        self.page_cursors = [None] # page_cursors[n - 1] is the cursor that fetches page n
+        self.sort_by = 'property_id' # Newest first until a column header is clicked
+        self.sort_descending = True
 
         self.selected_property_data = None # Store data of the currently selected property in Treeview
 
@@ -5580,10 +5470,11 @@ class ViewAllPropertiesForm(tk.Toplevel):
         filter_search_frame.columnconfigure(1, weight=1) # Make search entry expandable
         filter_search_frame.columnconfigure(4, weight=1) # Make size entries work nicely
 
-        ttk.Label(filter_search_frame, text="Search (Title/Location):").grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        ttk.Label(filter_search_frame, text="Search (Title/Location/Owner/Project):").grid(row=0, column=0, padx=5, pady=2, sticky="w")
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(filter_search_frame, textvariable=self.search_var, width=50)
         self.search_entry.grid(row=0, column=1, padx=5, pady=2, sticky="ew")
+        self.search_entry.bind("<Return>", lambda e: self._apply_filters())
 
         ttk.Label(filter_search_frame, text="Size (Hectares) Min:").grid(row=0, column=2, padx=5, pady=2, sticky="w")
         self.min_size_entry = ttk.Entry(filter_search_frame, width=10)
@@ -5641,7 +5532,7 @@ class ViewAllPropertiesForm(tk.Toplevel):
         # UPDATED: Added "Added By" column
         columns = ("Project No", "Project", "Property Type", "Title Deed", "Location", "Price", "Size", "Status", "telephone_number", "Added By", "Owner")
 
-        self.properties_tree = ttk.Treeview(main_frame, columns=columns, show="headings", style='Treeview') # Default style
+        self.properties_tree = VirtualTreeview(main_frame, columns=columns, show="headings", style='Treeview') # Default style
 
         self.properties_tree.heading("Project No", text="Project No")
         self.properties_tree.heading("Project", text="Project Name")
@@ -5802,24 +5693,27 @@ class ViewAllPropertiesForm(tk.Toplevel):
             db_status = "unvailable"   # match DB exactly
         # If "All", db_status remains None, fetching all properties
 
-        # Fetch all matching properties based on filters, then paginate locally
-        self.all_properties_data = self.db_manager.get_all_properties_paginated(
-            limit=None, # Fetch all for local pagination
-            offset=None, # Fetch all for local pagination
+        # Only the filters are kept; pages are fetched from the database with keyset cursors
+        self.current_filters = dict(
             search_query=search_query if search_query else None,
             min_size=min_size,
             max_size=max_size,
             status=db_status,
             project_name=project_filter
         )
-        
-        # Sort by property_id to get newest first (assuming higher ID means newer)
-        self.all_properties_data.sort(key=lambda x: x.get('property_id', 0), reverse=True)
-
-
-        # Calculate total pages based on fetched data
-        total_items = len(self.all_properties_data)
-        self.total_pages = (total_items + self.items_per_page - 1) // self.items_per_page
+        self.page_cursors = [None]
+
+        # Searches list the best matches first until a column header is clicked
+        if search_query and self.sort_by == 'property_id':
+            self.sort_by = 'relevance'
+            self.sort_descending = True
+        elif not search_query and self.sort_by == 'relevance':
+            self.sort_by = 'property_id'
+            self.sort_descending = True
+
+        # Calculate total pages from a count of the matching properties
+        self.total_items = self.db_manager.count_properties(**self.current_filters)
+        self.total_pages = (self.total_items + self.items_per_page - 1) // self.items_per_page
         if self.total_pages == 0:
             self.total_pages = 1
 
@@ -5836,20 +5730,32 @@ class ViewAllPropertiesForm(tk.Toplevel):
         self._apply_filters() # Re-apply to show all properties
 
     def _load_page(self, page_number):
-        """Loads data for the specified page number into the Treeview."""
+        """Fetches the specified page from the database and loads it into the Treeview."""
         if page_number < 1:
             page_number = 1
         elif page_number > self.total_pages:
             page_number = self.total_pages
+        # Pages are reached one step at a time, so only pages with a known cursor can be loaded
+        page_number = min(page_number, len(self.page_cursors))
+
+        page_data, next_cursor = self.db_manager.get_properties_page(
+            page_size=self.items_per_page,
+            cursor=self.page_cursors[page_number - 1],
+            sort_by=self.sort_by,
+            descending=self.sort_descending,
+            **self.current_filters
+        )
+
+        # Remember where the following page starts; drop cursors past the end if the data shrank
+        del self.page_cursors[page_number:]
+        if next_cursor:
+            self.page_cursors.append(next_cursor)
+        elif page_number < self.total_pages:
+            self.total_pages = page_number
 
         self.current_page = page_number
-        
-        start_index = (self.current_page - 1) * self.items_per_page
-        end_index = start_index + self.items_per_page
-        
-        # Get the slice of data for the current page
-        page_data = self.all_properties_data[start_index:end_index]
-        
+        self.all_properties_data = page_data
+
         self._populate_properties_treeview(page_data)
         self._update_pagination_buttons()
         self.selected_property_data = None # Clear selection on page change
@@ -5901,38 +5807,43 @@ class ViewAllPropertiesForm(tk.Toplevel):
 
     def _update_total_label(self):
         """Updates the Total Properties (Filtered) label based on the current filtered dataset."""
-        try:
-            count = len(self.all_properties_data) if self.all_properties_data is not None else 0
-        except Exception:
-            count = 0
-        self.total_label.config(text=f"Total Properties (Filtered): {count}")
-
+        self.total_label.config(text=f"Total Properties (Filtered): {self.total_items}")
+
+
+    # Treeview column -> sort key understood by DatabaseManager.get_properties_page
+    SORT_KEYS = {
+        "Project No": "project_no",
+        "Project": "project_name",
+        "Property Type": "property_type",
+        "Title Deed": "title_deed_number",
+        "Location": "location",
+        "Price": "price",
+        "Size": "size",
+        "Status": "status",
+        "telephone_number": "telephone_number",
+        "Added By": "added_by_username",
+        "Owner": "owner",
+    }
 
     def _sort_treeview_by_column(self, col, reverse):
-        """Sorts the Treeview rows by the specified column."""
+        """Sorts the whole filtered result by the specified column and reloads the first page."""
         try:
-            # Build a list of (column_value, item_id)
-            data = [(self.properties_tree.set(k, col), k) for k in self.properties_tree.get_children('')]
-
-            # Function to normalize numeric / currency values for comparison
-            def convert(value):
-                try:
-                    if isinstance(value, str) and value.upper().startswith("KES"):
-                        value = value.replace("KES", "").replace(",", "").strip()
-                    return float(value)
-                except (ValueError, TypeError):
-                    return value.lower() if isinstance(value, str) else value
-
-            # Sort data
-            data.sort(key=lambda t: convert(t[0]), reverse=reverse)
-
-            # Reorder Treeview rows
-            for index, (val, k) in enumerate(data):
-                self.properties_tree.move(k, '', index)
+            # Clear the arrow from the previously sorted column
+            for other_col in self.properties_tree["columns"]:
+                text = self.properties_tree.heading(other_col)['text']
+                if text.endswith(" ▲") or text.endswith(" ▼"):
+                    self.properties_tree.heading(other_col, text=text[:-2])
+
+            # Sorting happens in the database so paging stays in sort order
+            self.sort_by = self.SORT_KEYS.get(col, 'property_id')
+            self.sort_descending = reverse
+            self.page_cursors = [None]
+            self._load_page(1)
 
             # Update header with arrow indicator and toggle sort order
             arrow = "▲" if reverse else "▼"
-            self.properties_tree.heading(col, text=f"{col} {arrow}",
+            text = self.properties_tree.heading(col)['text']
+            self.properties_tree.heading(col, text=f"{text} {arrow}",
                 command=lambda: self._sort_treeview_by_column(col, not reverse))
 
         except Exception as e:
@@ -6199,8 +6110,8 @@ class SalesReportsForm(tk.Toplevel):
         self.ongoing_payments_export_btn = None
         self.pending_instalments_export_btn = None
         
-        self.rendered_pdf_images = []
         self._temp_report_path = None
+        self._report_job = None  # PDF currently rendering in a report worker process
 
         self._start_x = 0
         self._start_y = 0
@@ -6212,6 +6123,7 @@ class SalesReportsForm(tk.Toplevel):
 
     def _on_closing(self):
         """Handle window closing protocol to un-grab the master window and clean up temp file."""
+        get_report_service().cancel_all(self)
         if self._temp_report_path and os.path.exists(self._temp_report_path):
             os.remove(self._temp_report_path)
         self.destroy()
@@ -6258,6 +6170,9 @@ class SalesReportsForm(tk.Toplevel):
         close_btn.image = self._close_icon
         close_btn.pack(pady=10)
 
+        # Shown while a report renders in the background
+        self.report_progress = ReportProgressBar(content_frame, pack_options={'fill': 'x', 'pady': (10, 0), 'before': close_btn})
+
     def _create_sales_report_tab(self, notebook):
         frame = ttk.Frame(notebook, padding="10")
         notebook.add(frame, text="Sales Report")
@@ -6367,7 +6282,7 @@ class SalesReportsForm(tk.Toplevel):
         canvas_container = ttk.Frame(report_preview_frame)
         canvas_container.pack(fill="both", expand=True)
         
-        canvas = tk.Canvas(canvas_container, bg='white', relief='sunken', borderwidth=1)
+        canvas = PdfPreviewCanvas(canvas_container, bg='white', relief='sunken', borderwidth=1)
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         report_scroll_y = ttk.Scrollbar(canvas_container, orient="vertical", command=canvas.yview)
@@ -6439,383 +6354,64 @@ class SalesReportsForm(tk.Toplevel):
         except ValueError:
             return False
 
-    def _generate_pdf_report(self, report_name, content, report_type, start_date, end_date, file_path=None):
-        """Generates PDF report using ReportLab, grouped by project_id (with project_name if available)."""
-        if not _REPORTLAB_AVAILABLE:
-            return None
-
-        from itertools import groupby
-
-        # --- File selection ---
-        if file_path is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            period_suffix = ""
-            if report_type == "daily":
-                period_suffix = f"_{start_date}"
-            elif report_type == "monthly":
-                period_suffix = f"_{datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y-%m')}"
-            elif report_type == "custom":
-                period_suffix = f"_{start_date}_to_{end_date}"
-            default_filename = f"{report_name.replace(' ', '_')}{period_suffix}_{timestamp}.pdf"
-
-            file_path = filedialog.asksaveasfilename(
-                parent=self,
-                defaultextension=".pdf",
-                initialfile=default_filename,
-                filetypes=[("PDF files", "*.pdf")],
-                title="Save Report As"
-            )
-            if not file_path:
-                return None
+    def _ask_report_path(self, report_name, report_type, start_date, end_date):
+        """Asks where to save an exported report. Returns: The chosen path, or None."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        period_suffix = ""
+        if report_type == "daily":
+            period_suffix = f"_{start_date}"
+        elif report_type == "monthly":
+            period_suffix = f"_{datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y-%m')}"
+        elif report_type == "custom":
+            period_suffix = f"_{start_date}_to_{end_date}"
+        default_filename = f"{report_name.replace(' ', '_')}{period_suffix}_{timestamp}.pdf"
 
-        try:
-            # --- Initialize PDF ---
-            doc = SimpleDocTemplate(file_path, pagesize=letter, topMargin=40, bottomMargin=40, leftMargin=40, rightMargin=40)
-            styles = getSampleStyleSheet()
-            story = []
+        file_path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".pdf",
+            initialfile=default_filename,
+            filetypes=[("PDF files", "*.pdf")],
+            title="Save Report As"
+        )
+        return file_path or None
 
-            wrap_style = ParagraphStyle(
-                name="Wrapped",
-                fontName="Helvetica",
-                fontSize=8,
-                leading=10,
-                alignment=0  # Left align
+    def _start_pdf_job(self, report_name, groups, start_date, end_date, file_path, on_success, on_error, as_of=None):
+        """
+        Renders the report PDF (grouped by project) to `file_path` in a report worker
+        process, replacing any report of this window still running. Progress is shown
+        under the tabs; on_success(file_path) or on_error(exception) runs on the Tk thread.
+        `as_of`, when the rows were read, is printed in the header.
+        Reports over LARGE_REPORT_ROWS rows are rendered in parts, in parallel, and merged.
+        """
+        if self._report_job is not None:
+            self._report_job.cancel()
+
+        def on_finally():
+            if self._report_job is job:
+                self._report_job = None
+                self.report_progress.finish()
+
+        callbacks = dict(on_progress=self.report_progress.update_progress,
+                         on_success=on_success, on_error=on_error, on_finally=on_finally)
+        if sum(len(group['rows']) for group in groups) > LARGE_REPORT_ROWS:
+            job = get_report_service().submit_chunked(
+                self, render_sales_report_chunk,
+                sales_report_chunks(report_name, {'groups': groups, 'as_of': as_of}, start_date, end_date),
+                merge_pdf_chunks, file_path, bottom_margin=SALES_BOTTOM_MARGIN,
+                discard_chunk=discard_pdf_chunk, **callbacks
             )
-
-            # --- Header ---
-            logo_path = os.path.join(ICONS_DIR, "NEWCITY.png")
-            if os.path.exists(logo_path):
-                logo = RLImage(logo_path)
-                logo._restrictSize(1.2 * inch, 1.2 * inch)
-            else:
-                logo = Paragraph("NEW CITY REAL ESTATE", styles['Normal'])
-
-            header_table_data = [
-                [logo, "NEW CITY REAL ESTATE", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-            ]
-            header_table = Table(header_table_data, colWidths=[2.5 * inch, 2 * inch, 2 * inch])
-            header_table.setStyle(TableStyle([
-                ('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (1, 0), (1, 0), 14),
-                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-                ('FONTSIZE', (2, 0), (2, 0), 10),
-                ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ]))
-            story.append(header_table)
-            story.append(Spacer(1, 8))
-
-            # --- Report Title ---
-            story.append(Paragraph(f"<b>{report_name.upper()}</b>", styles['Heading2']))
-            story.append(Paragraph(f"Period: {start_date} to {end_date}", styles['Normal']))
-            story.append(Spacer(1, 12))
-
-            # === SALES REPORT ===
-            if "SALES" in report_name.upper():
-                sorted_data = sorted(content.get('data', []),
-                                     key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or ''))
-                overall_gross, overall_net = Decimal('0.0'), Decimal('0.0')
-
-                for (project_id, project_name), group in groupby(sorted_data,
-                    key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or '')):
-                    project_header = f"Project ID: {project_id}"
-                    if project_name:
-                        project_header += f" — Project Name: {project_name}"
-                    story.append(Paragraph(f"<b>{project_header}</b>", styles['Heading3']))
-                    story.append(Spacer(1, 6))
-
-                    table_data = [["Client", "Title Deed", "Actual Price", "Amount Paid", "Balance", "Status"]]
-                    project_gross, project_net = Decimal('0.0'), Decimal('0.0')
-
-                    for item in group:
-                        actual_price = Decimal(item.get('actual_price') or 0)
-                        amount_paid = Decimal(item.get('amount_paid') or 0)
-                        balance = Decimal(item.get('balance') or 0)
-                        client_name = item.get('client_name', 'N/A')
-                        status = item.get('status', 'N/A')
-
-                        table_data.append([
-                            Paragraph(client_name, wrap_style),
-                            Paragraph(item.get('title_deed_number', 'N/A'), wrap_style),
-                            Paragraph(f"KES {actual_price:,.2f}", wrap_style),
-                            Paragraph(f"KES {amount_paid:,.2f}", wrap_style),
-                            Paragraph(f"KES {balance:,.2f}", wrap_style),
-                            Paragraph(status.title(), wrap_style),
-                        ])
-                        project_gross += actual_price
-                        project_net += amount_paid
-
-                    overall_gross += project_gross
-                    overall_net += project_net
-                    project_pending = project_gross - project_net
-
-                    table = Table(table_data, repeatRows=1, colWidths=[1.3 * inch, 1.2 * inch, 1.0 * inch, 1.0 * inch, 1.0 * inch, 1.0 * inch])
-                    table.setStyle(TableStyle([
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 8),
-                        ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                    ]))
-                    story.append(table)
-                    story.append(Spacer(1, 6))
-
-                    # Per-project summary
-                    project_total_properties = len(table_data) - 1
-                    summary_data = [
-                    ["Total Properties:", f"{project_total_properties}"],
-                    ["Gross Sales:", f"KES {project_gross:,.2f}"],
-                    ["Net Sales:", f"KES {project_net:,.2f}"],
-                    ["Pending:", f"KES {project_pending:,.2f}"]
-                    ]
-                    summary_table = Table(summary_data, colWidths=[1.5 * inch, 1.5 * inch])
-                    summary_table.setStyle(TableStyle([
-                        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-                        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                        ('TOPPADDING', (0, 0), (-1, -1), 4),
-                    ]))
-                    story.append(summary_table)
-                    story.append(Spacer(1, 10))
-
-                # Overall summary
-                story.append(Paragraph("<b>Overall Summary</b>", styles['Heading3']))
-                total_pending = overall_gross - overall_net
-                overall_summary = [
-                    ["Total Gross Sales:", f"KES {overall_gross:,.2f}"],
-                    ["Total Net Sales:", f"KES {overall_net:,.2f}"],
-                    ["Total Pending:", f"KES {total_pending:,.2f}"]
-                ]
-                overall_table = Table(overall_summary, colWidths=[1.8 * inch, 1.5 * inch])
-                overall_table.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-                    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                    ('BACKGROUND', (0, 0), (-1, -1), colors.beige),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ]))
-                story.append(overall_table)
-
-            # === SOLD PROPERTIES REPORT ===
-            elif "SOLD" in report_name.upper():
-                if content.get('data'):
-                    sorted_data = sorted(content['data'],
-                                        key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or ''))
-
-                    overall_total_paid = Decimal('0.0')
-
-                    for (project_id, project_name), group in groupby(sorted_data,
-                        key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or '')):
-                        project_header = f"Project ID: {project_id}"
-                        if project_name:
-                            project_header += f" — Project Name: {project_name}"
-                        story.append(Paragraph(f"<b>{project_header}</b>", styles['Heading3']))
-                        story.append(Spacer(1, 6))
-
-                        headers = ["Date", "Title Deed", "Location", "Size (Ha)", "Client", "Paid", "Balance"]
-                        table_data = [headers]
-
-                        project_total_paid = Decimal('0.0')
-
-                        # group is an iterator; convert to list to iterate twice safely
-                        project_items = list(group)
-
-                        for prop in project_items:
-                            date_value = prop.get('date_sold')
-                            date_part = date_value.strftime("%Y-%m-%d") if isinstance(date_value, datetime) else (
-                                date_value.split(' ')[0] if isinstance(date_value, str) else "N/A"
-                            )
-                            paid_amt = Decimal(prop.get('total_amount_paid') or 0)
-                            balance_amt = Decimal(prop.get('balance') or 0)
-                            table_data.append([
-                                Paragraph(date_part, wrap_style),
-                                Paragraph(prop.get('title_deed_number', 'N/A'), wrap_style),
-                                Paragraph(prop.get('location', 'N/A'), wrap_style),
-                                Paragraph(f"{prop.get('size', 0):.4f}", wrap_style),
-                                Paragraph(prop.get('client_name', 'N/A'), wrap_style),
-                                Paragraph(f"KES {paid_amt:,.2f}", wrap_style),
-                                Paragraph(f"KES {balance_amt:,.2f}", wrap_style),
-                            ])
-                            project_total_paid += paid_amt
-
-                        overall_total_paid += project_total_paid
-
-                        t = Table(table_data, repeatRows=1, colWidths=[0.8 * inch, 1.1 * inch, 1.1 * inch, 0.7 * inch, 1.3 * inch, 1 * inch, 1 * inch])
-                        t.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 8),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ]))
-                        story.append(t)
-                        story.append(Spacer(1, 6))
-
-                        # Insert per-project total (Total Paid)
-                        # Per-project summary (stacked)
-                        project_total_properties = len(table_data) - 1
-                        project_total_pending = sum(Decimal(item.get('balance') or 0) for item in project_items)
-
-                        summary_data = [
-                            ["Total Properties:", f"{project_total_properties}"],
-                            ["Total Paid:", f"KES {project_total_paid:,.2f}"],
-                            ["Total Pending:", f"KES {project_total_pending:,.2f}"]
-                        ]
-
-                        summary_table = Table(summary_data, colWidths=[1.8 * inch, 1.5 * inch])
-                        summary_table.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-                            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                            ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
-                            ('TOPPADDING', (0, 0), (-1, -1), 6),
-                        ]))
-                        story.append(summary_table)
-                        story.append(Spacer(1, 10))
-
-
-                    # After all projects, add overall total
-                    story.append(Spacer(1, 6))
-                    story.append(Paragraph("<b>========================================</b>", styles['Normal']))
-                    story.append(Spacer(1, 6))
-                    story.append(Paragraph(f"<b>Overall Total Paid: KES {overall_total_paid:,.2f}</b>", styles['Heading3']))
-                    story.append(Spacer(1, 10))
-                else:
-                    story.append(Paragraph("No properties sold in this period.", styles['Normal']))
-
-            # === ONGOING PAYMENTS REPORT ===
-            elif "ONGOING" in report_name.upper() or "ONGOING PAYMENTS" in report_name.upper():
-                if content.get('data'):
-                    sorted_data = sorted(content['data'],
-                                        key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or ''))
-                    for (project_id, project_name), group in groupby(sorted_data,
-                        key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or '')):
-                        project_header = f"Project ID: {project_id}"
-                        if project_name:
-                            project_header += f" — Project Name: {project_name}"
-                        story.append(Paragraph(f"<b>{project_header}</b>", styles['Heading3']))
-                        story.append(Spacer(1, 6))
-
-                        headers = ["Date", "Client", "Title Deed", "Original Price", "Paid", "Balance"]
-                        table_data = [headers]
-                        project_gross, project_net = Decimal('0.0'), Decimal('0.0')
-
-                        for rec in group:
-                            date_value = rec.get('transaction_date')
-                            date_part = date_value.strftime("%Y-%m-%d") if isinstance(date_value, datetime) else (
-                                date_value.split(' ')[0] if isinstance(date_value, str) else "N/A"
-                            )
-                            original_price = Decimal(rec.get('original_price') or 0)
-                            paid = Decimal(rec.get('total_amount_paid') or rec.get('amount_paid') or 0)
-                            balance = Decimal(rec.get('balance') or 0)
-
-                            table_data.append([
-                                Paragraph(date_part, wrap_style),
-                                Paragraph(rec.get('client_name', 'N/A'), wrap_style),
-                                Paragraph(rec.get('title_deed_number', 'N/A'), wrap_style),
-                                Paragraph(f"KES {original_price:,.2f}", wrap_style),
-                                Paragraph(f"KES {paid:,.2f}", wrap_style),
-                                Paragraph(f"KES {balance:,.2f}", wrap_style),
-                            ])
-
-                            project_gross += original_price
-                            project_net += paid
-
-                        t = Table(table_data, repeatRows=1, colWidths=[0.8 * inch, 1.4 * inch, 1.1 * inch, 1 * inch, 1 * inch, 1 * inch])
-                        t.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 8),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ]))
-                        story.append(t)
-                        story.append(Spacer(1, 10))
-
-                        # Per-project summary
-                        project_pending = project_gross - project_net
-                        project_total_properties = len(table_data) - 1
-                        summary_data = [
-                        ["Total Properties:", f"{project_total_properties}"],
-                        ["Gross Sales:", f"KES {project_gross:,.2f}"],
-                        ["Net Sales:", f"KES {project_net:,.2f}"],
-                        ["Pending:", f"KES {project_pending:,.2f}"]
-                        ]
-                        summary_table = Table(summary_data, colWidths=[1.8 * inch, 1.5 * inch])
-                        summary_table.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-                            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                            ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
-                            ('TOPPADDING', (0, 0), (-1, -1), 6),
-                        ]))
-                        story.append(summary_table)
-                        story.append(Spacer(1, 12))
-
-                    # Overall summary across projects
-                    # (compute by summing project_gross/project_net while iterating — you can slightly adapt if you prefer)
-                    # For brevity, the existing "SALES" overall summary style can be mirrored here.
-                else:
-                    story.append(Paragraph("No ongoing payments found in this period.", styles['Normal']))
-
-
-            # === PENDING INSTALMENTS REPORT ===
-            elif "PENDING" in report_name.upper() or "INSTALMENT" in report_name.upper():
-                if content.get('data'):
-                    sorted_data = sorted(content['data'],
-                                         key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or ''))
-                    for (project_id, project_name), group in groupby(sorted_data,
-                        key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or '')):
-                        project_header = f"Project ID: {project_id}"
-                        if project_name:
-                            project_header += f" — Project Name: {project_name}"
-                        story.append(Paragraph(f"<b>{project_header}</b>", styles['Heading3']))
-                        story.append(Spacer(1, 6))
-
-                        headers = ["Date", "Client", "Title Deed", "Original Price", "Paid", "Balance Due"]
-                        table_data = [headers]
-
-                        for inst in group:
-                            date_value = inst.get('transaction_date')
-                            date_part = date_value.strftime("%Y-%m-%d") if isinstance(date_value, datetime) else (
-                                date_value.split(' ')[0] if isinstance(date_value, str) else "N/A"
-                            )
-                            table_data.append([
-                                Paragraph(date_part, wrap_style),
-                                Paragraph(inst.get('client_name', 'N/A'), wrap_style),
-                                Paragraph(inst.get('title_deed_number', 'N/A'), wrap_style),
-                                Paragraph(f"KES {inst.get('original_price', 0):,.2f}", wrap_style),
-                                Paragraph(f"KES {inst.get('total_amount_paid', 0):,.2f}", wrap_style),
-                                Paragraph(f"KES {inst.get('balance', 0):,.2f}", wrap_style),
-                            ])
-
-                        t = Table(table_data, repeatRows=1, colWidths=[0.8 * inch, 1.4 * inch, 1.1 * inch, 1 * inch, 1 * inch, 1 * inch])
-                        t.setStyle(TableStyle([
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 8),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ]))
-                        story.append(t)
-                        story.append(Spacer(1, 10))
-                else:
-                    story.append(Paragraph("No pending instalments found in this period.", styles['Normal']))
-
-            # --- Build PDF ---
-            doc.build(story)
-            print(f"[DEBUG] PDF successfully generated: {file_path}")
-            return file_path
-
-        except Exception as e:
-            print(f"PDF generation failed: {e}")
-            return None
+        else:
+            job = get_report_service().submit(
+                self, render_sales_report_pdf, file_path, report_name, {'groups': groups, 'as_of': as_of},
+                start_date, end_date,
+                **callbacks
+            )
+        self._report_job = job
+        self.report_progress.start(job, f"Generating {report_name}...")
 
     def _show_pdf_preview(self, pdf_path, canvas):
-        """Displays the full PDF content on a canvas."""
+        """Displays the PDF on a PdfPreviewCanvas, which renders pages as they scroll into view."""
         canvas.delete("all")
-        self.rendered_pdf_images = []
         canvas.config(scrollregion=(0, 0, 0, 0))
         
         if not pdf_path or not os.path.exists(pdf_path):
@@ -6826,44 +6422,28 @@ class SalesReportsForm(tk.Toplevel):
             )
             return
         try:
-            doc = fitz.open(pdf_path)
-            y_offset = 0
-            canvas_width = canvas.winfo_width() - 20
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap(alpha=False)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                ratio = canvas_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((canvas_width, new_height), Image.LANCZOS)
-                photo_image = ImageTk.PhotoImage(image=img)
-                self.rendered_pdf_images.append(photo_image)
-                canvas.create_image(0, y_offset, image=photo_image, anchor=tk.NW)
-                y_offset += new_height + 5
-            doc.close()
-            canvas.config(scrollregion=canvas.bbox("all"))
+            canvas.show_pdf(pdf_path)
         except Exception as e:
             messagebox.showerror("Preview Error", f"Failed to render PDF preview: {e}")
             canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, 
                                text=f"Error displaying PDF: {e}", justify=tk.CENTER, fill="red")
 
-    def _get_active_tab_data(self, report_title, report_type):
-        """Helper to get data for the active tab."""
-        start_date_str, end_date_str = self._get_report_dates(report_type)
-        if start_date_str is None:
-            return None, None, None, None
-        
-        report_data = None
+    def _fetch_report_data(self, report_title, start_date_str, end_date_str):
+        """
+        Runs on a worker thread: fetches the rows of the report shown in the given tab.
+        Returns: (groups, cache_key, as_of) as DatabaseManager.get_report_data does.
+        """
         if "Sales" in report_title:
-            report_data = self.db_manager.get_detailed_sales_transactions_for_date_range(start_date_str, end_date_str)
+            report_type = 'sales'
         elif "Sold Properties" in report_title:
-            report_data = self.db_manager.get_sold_properties_for_date_range_detailed(start_date_str, end_date_str)
+            report_type = 'sold_properties'
         elif "Ongoing Payments" in report_title:
-            report_data = self.db_manager.get_active_ongoing_payments_for_date_range(start_date_str, end_date_str)
+            report_type = 'ongoing_payments'
         elif "Pending Instalments" in report_title:
-            report_data = self.db_manager.get_pending_instalments_for_date_range(start_date_str, end_date_str)
-        
-        return report_data, report_title, report_type, (start_date_str, end_date_str)
+            report_type = 'pending_instalments'
+        else:
+            return None, None, None
+        return self.db_manager.get_report_data(report_type, start_date_str, end_date_str)
 
     def _export_report(self, report_title, report_type):
         """Saves a report to a user-selected file path."""
@@ -6871,237 +6451,188 @@ class SalesReportsForm(tk.Toplevel):
             messagebox.showerror("PDF Error", "ReportLab library is not installed. Exporting is not available.")
             return
 
-        report_data, _, _, (start_date_str, end_date_str) = self._get_active_tab_data(report_title, report_type)
-        if not report_data:
-            messagebox.showinfo("No Data", "No data found for the selected period. Nothing to export.")
+        start_date_str, end_date_str = self._get_report_dates(report_type)
+        if start_date_str is None:
             return
 
-        pdf_path = self._generate_pdf_report(
-            report_title,
-            {'data': report_data},
-            report_type,
-            start_date_str,
-            end_date_str
-        )
+        def show_exported():
+            SuccessMessage(self, success=True, message=f"{report_title} PDF exported successfully!",
+                           parent_icon_loader=self.parent_icon_loader_ref)
 
-        if pdf_path:
-            SuccessMessage(self, success=True, message=f"{report_title} PDF exported successfully!", parent_icon_loader=self.parent_icon_loader_ref)
-        else:
-            SuccessMessage(self, success=False, message=f"Export of {report_title} PDF failed!", parent_icon_loader=self.parent_icon_loader_ref)
+        def on_exported(file_path, cache_key):
+            self.db_manager.cache_report_pdf(cache_key, file_path)
+            show_exported()
+
+        def on_export_failed(e):
+            SuccessMessage(self, success=False, message=f"Export of {report_title} PDF failed!",
+                           parent_icon_loader=self.parent_icon_loader_ref)
+
+        def on_data(result):
+            groups, cache_key, as_of = result
+            if not groups:
+                messagebox.showinfo("No Data", "No data found for the selected period. Nothing to export.", parent=self)
+                return
+            file_path = self._ask_report_path(report_title, report_type, start_date_str, end_date_str)
+            if not file_path:
+                return
+            cached_pdf = self.db_manager.get_cached_report_pdf(cache_key)
+            if cached_pdf:
+                try:
+                    shutil.copyfile(cached_pdf, file_path)
+                except OSError as e:
+                    on_export_failed(e)
+                    return
+                show_exported()
+                return
+            self._start_pdf_job(
+                report_title, groups, start_date_str, end_date_str, file_path,
+                on_success=lambda path: on_exported(path, cache_key), on_error=on_export_failed, as_of=as_of,
+            )
+
+        run_in_background(
+            self, self._fetch_report_data, report_title, start_date_str, end_date_str,
+            key="report_data", on_success=on_data,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load report data: {e}", parent=self)
+        )
 
     # --- Report Generation Functions (updated to use direct button references) ---
     def _generate_sales_report(self, report_type):
         """Generates sales report preview and enables the export button."""
-        canvas = self.sales_report_canvas
-        if not _REPORTLAB_AVAILABLE:
-            messagebox.showerror("PDF Error", "ReportLab library is not installed.")
-            return
-        
-        canvas.delete("all")
-        canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="Generating report, please wait...", justify=tk.CENTER)
-        self.update_idletasks()
-        
-        # FIX: Use the direct reference instead of the unreliable master chain
-        export_btn = self.sales_export_btn
-        
-        report_data, report_title, _, (start_date_str, end_date_str) = self._get_active_tab_data("Sales Report", report_type)
+        self._generate_report_preview("Sales Report", report_type, self.sales_report_canvas,
+                                      self.sales_export_btn, "No sales data found for the selected period.")
 
-        if not report_data:
-            messagebox.showinfo("No Data", "No sales data found for the selected period.")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="No data to preview.", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
-            return
-
-        try:
-            self._temp_report_path = os.path.join(tempfile.gettempdir(), f"temp_{report_title.replace(' ', '_')}_{os.getpid()}.pdf")
-            pdf_path = self._generate_pdf_report(report_title, {'data': report_data}, report_type, start_date_str, end_date_str, self._temp_report_path)
-            
-            if pdf_path:
-                self._show_pdf_preview(pdf_path, canvas)
-                export_btn.config(state=tk.NORMAL)
-            else:
-                self._show_pdf_preview(None, canvas)
-                export_btn.config(state=tk.DISABLED)
-        except Exception as e:
-            messagebox.showerror("Report Generation Error", f"An error occurred: {e}")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text=f"Error: {e}", fill="red", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
-            
     def _generate_sold_properties_report(self, report_type):
         """Generates sold properties report preview and enables the export button."""
-        canvas = self.sold_properties_canvas
+        self._generate_report_preview("Sold Properties Report", report_type, self.sold_properties_canvas,
+                                      self.sold_properties_export_btn,
+                                      "No sold properties data found for the selected period.",
+                                      on_pdf_failed=self._show_sold_properties_text_preview)
+
+    def _generate_ongoing_payments_report(self, report_type):
+        """Generates ongoing payments report preview and enables the export button."""
+        self._generate_report_preview("Ongoing Payments Report", report_type, self.ongoing_payments_canvas,
+                                      self.ongoing_payments_export_btn,
+                                      "No ongoing payments data found for the selected period.")
+
+    def _generate_pending_instalments_report(self, report_type):
+        """Generates pending instalments report preview and enables the export button."""
+        self._generate_report_preview("Pending Instalments Report", report_type, self.pending_instalments_canvas,
+                                      self.pending_instalments_export_btn,
+                                      "No pending instalments data found for the selected period.")
+
+    def _generate_report_preview(self, report_title, report_type, canvas, export_btn, no_data_message, on_pdf_failed=None):
+        """
+        Fetches the report rows in the background, renders the PDF in a report worker
+        process and shows it on `canvas`. `on_pdf_failed(canvas, groups)`, if given,
+        draws a fallback preview when rendering fails.
+        """
         if not _REPORTLAB_AVAILABLE:
             messagebox.showerror("PDF Error", "ReportLab library is not installed.")
             return
 
+        start_date_str, end_date_str = self._get_report_dates(report_type)
+        if start_date_str is None:
+            return
+
         canvas.delete("all")
         canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="Generating report, please wait...", justify=tk.CENTER)
-        self.update_idletasks()
-
-        # Direct reference to export button
-        export_btn = self.sold_properties_export_btn
-
-        report_data, report_title, _, (start_date_str, end_date_str) = self._get_active_tab_data("Sold Properties Report", report_type)
+        export_btn.config(state=tk.DISABLED)
 
-        if not report_data:
-            messagebox.showinfo("No Data", "No sold properties data found for the selected period.")
+        def show_error(e):
+            messagebox.showerror("Report Generation Error", f"An error occurred: {e}", parent=self)
             canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="No data to preview.", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
-            return
-
-        try:
-            # create temp pdf and render it to preview (pdf contains totals now)
-            self._temp_report_path = os.path.join(tempfile.gettempdir(), f"temp_{report_title.replace(' ', '_')}_{os.getpid()}.pdf")
-            pdf_path = self._generate_pdf_report(report_title, {'data': report_data}, report_type, start_date_str, end_date_str, self._temp_report_path)
+            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text=f"Error: {e}", fill="red", justify=tk.CENTER)
 
-            if pdf_path and os.path.exists(pdf_path):
-                # primary flow: preview the PDF (will include per-project + overall totals)
-                self._show_pdf_preview(pdf_path, canvas)
-                export_btn.config(state=tk.NORMAL)
+        def on_pdf_error(e, groups):
+            if on_pdf_failed is None:
+                print(f"PDF generation failed: {e}")
+                self._show_pdf_preview(None, canvas)
                 return
-            else:
-                # fallback: if PDF couldn't be generated for preview, draw a textual preview with totals
+            on_pdf_failed(canvas, groups)
+            export_btn.config(state=tk.NORMAL)
+
+        def on_pdf_ready(pdf_path):
+            self._show_pdf_preview(pdf_path, canvas)
+            export_btn.config(state=tk.NORMAL)
+
+        def on_data(result):
+            groups, cache_key, as_of = result
+            if not groups:
+                messagebox.showinfo("No Data", no_data_message, parent=self)
                 canvas.delete("all")
-                x = 10
-                y = 10
-                line_height = 16
-                canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="PDF preview not available. Showing textual preview.", justify=tk.CENTER)
-                self.update_idletasks()
-
-                # Build grouped presentation and compute totals
-                from itertools import groupby
-                sorted_data = sorted(report_data, key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or ''))
-                overall_total_paid = Decimal('0.0')
-
-                for (project_id, project_name), group in groupby(sorted_data, key=lambda x: (x.get('project_id') or 'Unknown', x.get('project_name') or '')):
-                    proj_header = f"Project ID: {project_id}"
-                    if project_name:
-                        proj_header += f" — Project Name: {project_name}"
-
-                    canvas.create_text(x + 5, y, anchor='nw', text=proj_header, font=('Helvetica', 10, 'bold'))
-                    y += line_height + 4
-
-                    project_total_paid = Decimal('0.0')
-                    # group is iterator -> make list
-                    project_items = list(group)
-                    for prop in project_items:
-                        date_value = prop.get('date_sold')
-                        date_part = date_value.strftime("%Y-%m-%d") if isinstance(date_value, datetime) else (
-                            date_value.split(' ')[0] if isinstance(date_value, str) else "N/A"
-                        )
-                        paid_amt = Decimal(prop.get('total_amount_paid') or 0)
-                        canvas.create_text(x + 10, y, anchor='nw',
-                                        text=f"{date_part} | {prop.get('title_deed_number','N/A')} | {prop.get('client_name','N/A')} | KES {paid_amt:,.2f}",
-                                        font=('Helvetica', 9))
-                        y += line_height
-                        project_total_paid += paid_amt
-
-                    # per-project total
-                    canvas.create_text(x + 10, y + 4, anchor='nw', text=f"Total Paid: KES {project_total_paid:,.2f}", font=('Helvetica', 10, 'bold'))
-                    y += line_height + 12
-                    overall_total_paid += project_total_paid
-
-                    # add a separator line if space allows
-                    canvas.create_line(x + 5, y, canvas.winfo_width() - 10, y)
-                    y += 8
-
-                    # if y exceeds canvas, increase scrollregion
-                    canvas.config(scrollregion=(0, 0, 0, max(y + 20, canvas.winfo_height())))
-
-                # overall total
-                canvas.create_text(x + 5, y + 6, anchor='nw', text="========================================", font=('Helvetica', 10))
-                y += line_height
-                canvas.create_text(x + 5, y + 6, anchor='nw', text=f"Overall Total Paid: KES {overall_total_paid:,.2f}", font=('Helvetica', 11, 'bold'))
-                canvas.config(scrollregion=(0, 0, 0, y + 40))
-                export_btn.config(state=tk.NORMAL)
+                canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="No data to preview.", justify=tk.CENTER)
+                return
+            # The period was rendered before and none of its tables changed since.
+            cached_pdf = self.db_manager.get_cached_report_pdf(cache_key)
+            if cached_pdf:
+                on_pdf_ready(cached_pdf)
                 return
 
-        except Exception as e:
-            messagebox.showerror("Report Generation Error", f"An error occurred: {e}")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text=f"Error: {e}", fill="red", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
+            def on_rendered(pdf_path):
+                self.db_manager.cache_report_pdf(cache_key, pdf_path)
+                on_pdf_ready(pdf_path)
 
-    def _generate_ongoing_payments_report(self, report_type):
-        """Generates ongoing payments report preview and enables the export button."""
-        canvas = self.ongoing_payments_canvas
-        if not _REPORTLAB_AVAILABLE:
-            messagebox.showerror("PDF Error", "ReportLab library is not installed.")
-            return
+            self._temp_report_path = os.path.join(tempfile.gettempdir(), f"temp_{report_title.replace(' ', '_')}_{os.getpid()}.pdf")
+            self._start_pdf_job(
+                report_title, groups, start_date_str, end_date_str, self._temp_report_path,
+                on_success=on_rendered, on_error=lambda e: on_pdf_error(e, groups), as_of=as_of
+            )
+
+        run_in_background(
+            self, self._fetch_report_data, report_title, start_date_str, end_date_str,
+            key="report_data", on_success=on_data, on_error=show_error
+        )
 
+    def _show_sold_properties_text_preview(self, canvas, groups):
+        """Draws a textual sold properties preview with totals when the PDF could not be generated."""
         canvas.delete("all")
-        canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="Generating report, please wait...", justify=tk.CENTER)
+        x = 10
+        y = 10
+        line_height = 16
+        canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="PDF preview not available. Showing textual preview.", justify=tk.CENTER)
         self.update_idletasks()
 
-        export_btn = self.ongoing_payments_export_btn
+        # The rows come grouped by project, with each project's totals
+        overall_total_paid = Decimal('0.0')
 
-        report_data, report_title, _, (start_date_str, end_date_str) = self._get_active_tab_data("Ongoing Payments Report", report_type)
+        for group in groups:
+            project_id, project_name = group['project_id'], group['project_name']
+            proj_header = f"Project ID: {project_id}"
+            if project_name:
+                proj_header += f" — Project Name: {project_name}"
 
-        if not report_data:
-            messagebox.showinfo("No Data", "No ongoing payments data found for the selected period.")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="No data to preview.", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
-            return
-
-        try:
-            self._temp_report_path = os.path.join(tempfile.gettempdir(), f"temp_{report_title.replace(' ', '_')}_{os.getpid()}.pdf")
-            pdf_path = self._generate_pdf_report(report_title, {'data': report_data}, report_type, start_date_str, end_date_str, self._temp_report_path)
-
-            if pdf_path:
-                self._show_pdf_preview(pdf_path, canvas)
-                export_btn.config(state=tk.NORMAL)
-            else:
-                self._show_pdf_preview(None, canvas)
-                export_btn.config(state=tk.DISABLED)
-        except Exception as e:
-            messagebox.showerror("Report Generation Error", f"An error occurred: {e}")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text=f"Error: {e}", fill="red", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
+            canvas.create_text(x + 5, y, anchor='nw', text=proj_header, font=('Helvetica', 10, 'bold'))
+            y += line_height + 4
 
+            for prop in group['rows']:
+                date_value = prop.get('date_sold')
+                date_part = date_value.strftime("%Y-%m-%d") if isinstance(date_value, datetime) else (
+                    date_value.split(' ')[0] if isinstance(date_value, str) else "N/A"
+                )
+                paid_amt = Decimal(prop.get('total_amount_paid') or 0)
+                canvas.create_text(x + 10, y, anchor='nw',
+                                text=f"{date_part} | {prop.get('title_deed_number','N/A')} | {prop.get('client_name','N/A')} | KES {paid_amt:,.2f}",
+                                font=('Helvetica', 9))
+                y += line_height
 
-    def _generate_pending_instalments_report(self, report_type):
-        """Generates pending instalments report preview and enables the export button."""
-        canvas = self.pending_instalments_canvas
-        if not _REPORTLAB_AVAILABLE:
-            messagebox.showerror("PDF Error", "ReportLab library is not installed.")
-            return
-        
-        canvas.delete("all")
-        canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="Generating report, please wait...", justify=tk.CENTER)
-        self.update_idletasks()
-        
-        # FIX: Use the direct reference instead of the unreliable master chain
-        export_btn = self.pending_instalments_export_btn
+            # per-project total
+            project_total_paid = group['totals']['paid']
+            canvas.create_text(x + 10, y + 4, anchor='nw', text=f"Total Paid: KES {project_total_paid:,.2f}", font=('Helvetica', 10, 'bold'))
+            y += line_height + 12
+            overall_total_paid += project_total_paid
 
-        report_data, report_title, _, (start_date_str, end_date_str) = self._get_active_tab_data("Pending Instalments Report", report_type)
+            # add a separator line if space allows
+            canvas.create_line(x + 5, y, canvas.winfo_width() - 10, y)
+            y += 8
 
-        if not report_data:
-            messagebox.showinfo("No Data", "No pending instalments data found for the selected period.")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text="No data to preview.", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
-            return
+            # if y exceeds canvas, increase scrollregion
+            canvas.config(scrollregion=(0, 0, 0, max(y + 20, canvas.winfo_height())))
 
-        try:
-            self._temp_report_path = os.path.join(tempfile.gettempdir(), f"temp_{report_title.replace(' ', '_')}_{os.getpid()}.pdf")
-            pdf_path = self._generate_pdf_report(report_title, {'data': report_data}, report_type, start_date_str, end_date_str, self._temp_report_path)
-            
-            if pdf_path:
-                self._show_pdf_preview(pdf_path, canvas)
-                export_btn.config(state=tk.NORMAL)
-            else:
-                self._show_pdf_preview(None, canvas)
-                export_btn.config(state=tk.DISABLED)
-        except Exception as e:
-            messagebox.showerror("Report Generation Error", f"An error occurred: {e}")
-            canvas.delete("all")
-            canvas.create_text(canvas.winfo_width() / 2, canvas.winfo_height() / 2, text=f"Error: {e}", fill="red", justify=tk.CENTER)
-            export_btn.config(state=tk.DISABLED)
+        # overall total
+        canvas.create_text(x + 5, y + 6, anchor='nw', text="========================================", font=('Helvetica', 10))
+        y += line_height
+        canvas.create_text(x + 5, y + 6, anchor='nw', text=f"Overall Total Paid: KES {overall_total_paid:,.2f}", font=('Helvetica', 11, 'bold'))
+        canvas.config(scrollregion=(0, 0, 0, y + 40))
 
 class BookLandForm(tk.Toplevel):
     def __init__(self, master, db_manager, user_id, refresh_callback, parent_icon_loader=None, sell_block_form=None, sell_lot_form=None):
@@ -0,0 +1,180 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import os
+from PIL import Image, ImageTk
+
+# Define paths relative to the project root for icon loading
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
+ICONS_DIR = os.path.join(ASSETS_DIR, 'icons')
+
+
+class QueryStatsForm(tk.Toplevel):
+    """
+    A Toplevel window showing database query performance.
+    Lists the slowest and most frequently called DatabaseManager methods together
+    with the connection pool counters, and points to the slow query log.
+    """
+
+    COLUMNS = ("Method", "Calls", "Avg (ms)", "P95 (ms)", "Max (ms)", "Total (ms)",
+               "Avg Rows", "Avg KB", "Conn Wait (ms)", "Errors")
+    PLAN_COLUMNS = ("Report", "Table", "Access", "Index", "Est. Rows", "Range Scan")
+
+    def __init__(self, parent, db_manager, parent_icon_loader=None):
+        """
+        Initializes the QueryStatsForm window.
+
+        Args:
+            parent: The parent Tkinter window.
+            db_manager: An instance of DatabaseManager for database interactions.
+            parent_icon_loader: A callable to load icons, typically from the main app.
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.db_manager = db_manager
+        self.parent_icon_loader = parent_icon_loader
+
+        self.title("Query Performance")
+        self.geometry("1100x650")
+        self.transient(parent)
+        self.grab_set()
+
+        self._set_window_icon()
+        self.icons = {}  # To store PhotoImage references for buttons
+
+        self._create_widgets()
+        self.refresh_stats()
+
+        self.protocol("WM_DELETE_WINDOW", self._on_closing)
+
+    def _set_window_icon(self):
+        """Sets the window icon from the activity logs icon."""
+        png_path = os.path.join(ICONS_DIR, "activity_logs.png")
+        if os.path.exists(png_path):
+            try:
+                img = Image.open(png_path)
+                photo = ImageTk.PhotoImage(img)
+                self.tk.call('wm', 'iconphoto', self._w, photo)
+                self.icon_photo_ref = photo
+            except Exception as e:
+                print(f"Error loading .png icon for QueryStatsForm: {e}")
+
+    def _create_widgets(self):
+        main_frame = ttk.Frame(self, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Top N selector and actions
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.pack(fill="x", pady=(0, 10))
+
+        ttk.Label(controls_frame, text="Show top:").pack(side=tk.LEFT, padx=(0, 5))
+        self.top_n_var = tk.StringVar(value="20")
+        top_n_spinbox = ttk.Spinbox(controls_frame, from_=5, to=200, increment=5, width=5,
+                                    textvariable=self.top_n_var, command=self.refresh_stats)
+        top_n_spinbox.pack(side=tk.LEFT)
+
+        ttk.Button(controls_frame, text="Refresh", command=self.refresh_stats).pack(side=tk.LEFT, padx=10)
+        ttk.Button(controls_frame, text="Reset Counters", command=self._reset_stats).pack(side=tk.LEFT)
+        ttk.Button(controls_frame, text="Check Report Plans", command=self._check_report_plans).pack(side=tk.LEFT, padx=10)
+
+        self.slow_log_label = ttk.Label(controls_frame, text="")
+        self.slow_log_label.pack(side=tk.RIGHT)
+
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = notebook
+
+        self.slowest_tree = self._create_stats_tree(notebook)
+        notebook.add(self.slowest_tree.master, text="Slowest (by average)")
+        self.frequent_tree = self._create_stats_tree(notebook)
+        notebook.add(self.frequent_tree.master, text="Most Frequent")
+        self.plans_tree = self._create_stats_tree(notebook, self.PLAN_COLUMNS)
+        self.plans_tree.column("Report", width=320, anchor="w")
+        self.plans_tree.tag_configure("no_range", foreground="red")
+        notebook.add(self.plans_tree.master, text="Report Query Plans")
+
+        # Connection pool summary
+        pool_frame = ttk.LabelFrame(main_frame, text="Connection Pool", padding="10")
+        pool_frame.pack(fill="x", pady=(10, 0))
+        self.pool_label = ttk.Label(pool_frame, text="")
+        self.pool_label.pack(anchor=tk.W)
+
+    def _create_stats_tree(self, parent, columns=COLUMNS):
+        frame = ttk.Frame(parent, padding="5")
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=90, anchor="e")
+        tree.column(columns[0], width=260, anchor="w")
+
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        return tree
+
+    def refresh_stats(self):
+        try:
+            limit = max(1, int(self.top_n_var.get()))
+        except ValueError:
+            limit = 20
+            self.top_n_var.set("20")
+
+        stats = self.db_manager.get_query_stats(limit)
+        self._fill_tree(self.slowest_tree, stats['slowest'])
+        self._fill_tree(self.frequent_tree, stats['most_frequent'])
+        self.slow_log_label.config(
+            text=f"Slow query log (> {stats['slow_query_threshold_ms']:g} ms): {stats['slow_query_log']}"
+        )
+
+        pool = self.db_manager.get_pool_stats()
+        self.pool_label.config(text=(
+            f"In use: {pool['in_use']}   Idle: {pool['idle']}   Max: {pool['max_size']}   "
+            f"Checkouts: {pool['checkouts']}   Waits: {pool['waits']}   "
+            f"Avg wait: {pool['avg_wait_time'] * 1000:.1f} ms   Max wait: {pool['max_wait_time'] * 1000:.1f} ms   "
+            f"Timeouts: {pool['timeouts']}   Created: {pool['connections_created']}   "
+            f"Churn: {pool['churn_ratio']:.1%}"
+        ))
+
+    def _fill_tree(self, tree, rows):
+        for item in tree.get_children():
+            tree.delete(item)
+        for row in rows:
+            tree.insert("", tk.END, values=(
+                row['method'],
+                row['calls'],
+                f"{row['avg_ms']:.1f}",
+                f"{row['p95_ms']:.1f}",
+                f"{row['max_ms']:.1f}",
+                f"{row['total_ms']:.0f}",
+                f"{row['avg_rows']:.1f}",
+                f"{row['avg_bytes'] / 1024:.1f}",
+                f"{row['avg_acquire_ms']:.1f}",
+                row['errors'],
+            ))
+
+    def _check_report_plans(self):
+        """EXPLAINs the date-filtered report queries and lists the ones that do not use a range scan in red."""
+        plans = self.db_manager.check_report_query_plans()
+        for item in self.plans_tree.get_children():
+            self.plans_tree.delete(item)
+        for plan in plans:
+            self.plans_tree.insert("", tk.END, values=(
+                plan['report'],
+                plan['table'],
+                plan['access_type'] or "",
+                plan['key'] or "",
+                plan['rows'] if plan['rows'] is not None else "",
+                "Yes" if plan['uses_range_scan'] else "No",
+            ), tags=() if plan['uses_range_scan'] else ("no_range",))
+        self.notebook.select(self.plans_tree.master)
+
+    def _reset_stats(self):
+        if messagebox.askyesno("Reset Counters", "Clear all collected query statistics?", parent=self):
+            self.db_manager.reset_query_stats()
+            self.refresh_stats()
+
+    def _on_closing(self):
+        """Handle the window close button (X)."""
+        self.grab_release()
+        self.destroy()
@@ -575,15 +575,13 @@ class subdividelandForm(tk.Toplevel):
             if not confirmation:
                 return
             
-            created_by_username = self.db_manager.get_username_by_id(self.user_id)
-
             # This is where you would call your db_manager to create the new proposed lot record
             proposed_lot_data = {
                 'parent_block_id': parent_block_id,
                 'size': new_lot_size,
                 'location': parent_location,
                 'surveyor_name': surveyor_name,
-                'created_by': created_by_username if created_by_username else self.user_id, # Use username if found, otherwise fall back to ID
+                'created_by_user_id': self.user_id,
                 'title_deed_number': title_deed_number, 
                 'price': 0, 
                 'status': 'Proposed'
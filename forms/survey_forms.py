@@ -2,23 +2,26 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta,date
 from utils.tooltips import ToolTip
+from utils.background import run_in_background, set_loading, Debouncer
+from utils.virtual_treeview import VirtualTreeview
+from utils.treeview_sync import reconcile_treeview
+from utils.pdf_preview import PdfPreviewCanvas
+from utils.report_jobs import get_report_service, ReportProgressBar
+from utils.report_renderers import render_jobs_report_pdf, render_payment_summary_pdf, render_jobs_report_chunk, \
+    jobs_report_chunks, merge_pdf_chunks, discard_pdf_chunk, LARGE_REPORT_ROWS
 
 
 import os
 import sys
-from PIL import Image, ImageTk
 import shutil
 import io
 from pdf2image import convert_from_bytes
-import fitz
 import io
 import webbrowser
-from io import BytesIO
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate,Image as RLImage, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 from tkcalendar import DateEntry
 
@@ -46,10 +49,9 @@ except ImportError:
 
 # Import ReportLab components for PDF generation
 try:
-    from reportlab.lib.pagesizes import letter
     from reportlab.lib import colors
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.styles import getSampleStyleSheet
     from reportlab.lib.units import inch
 
     _REPORTLAB_AVAILABLE = True
@@ -325,13 +327,12 @@ class AddNewTaskForm(FormBase):
             if amountpaid_val < 0: messagebox.showerror("Input Error","Amount paid must be positive"); return
         except ValueError:
             messagebox.showerror("Input Error","Amount paid must be a valid number"); return
-        added_by = self.db_manager.get_username_by_id(self.user_id) or "Unknown User"
         balance_val = price_val - amountpaid_val
         # get selected surveyor id if needed later
         selected_user = self.assigned_to_entry.get()
         assigned_user_id = self._surveyor_map.get(selected_user)
         success = self.db_manager.add_job(file_id=self.client_data['file_id'], job_description=job_description,
-            title_name=title_name, title_number=title_number, fee=price_val, added_by=added_by,
+            title_name=title_name, title_number=title_number, fee=price_val, added_by_user_id=self.user_id,
             brought_by=self.client_data['brought_by'], task_type=task_type, assigned_to=assigned_user_id)
         if success:
             payment_success = self.db_manager.add_payment(job_id=success, fee=price_val, amount=amountpaid_val, balance=balance_val)
@@ -936,7 +937,7 @@ class TrackJobsView(FormBase):
         self.refresh_callback = refresh_callback
         self.parent_icon_loader = parent_icon_loader
         self.update_icon = None # To hold reference to the button icon
-        self.all_jobs_data = [] # To store the unfiltered job list
+        self.job_index = None # Shared in-memory index over all jobs, used for searching
         self._create_widgets()
         self._populate_jobs_table()
         self._update_status_button_state()
@@ -948,7 +949,8 @@ class TrackJobsView(FormBase):
         ttk.Label(search_frame, text="Search:",font="SegoeUI,10,bold").pack(side="left", padx=(0, 5))
         self.search_entry = ttk.Entry(search_frame)
         self.search_entry.pack(side="left", fill="x", expand=True)
-        self.search_entry.bind("<KeyRelease>", self._filter_jobs)
+        self._search_debouncer = Debouncer(self, self._filter_jobs)
+        self.search_entry.bind("<KeyRelease>", self._search_debouncer)
         ToolTip(search_frame, "Search For Jobs using Title Number, File Name or Client Name.")
         
         
@@ -958,7 +960,7 @@ class TrackJobsView(FormBase):
 
         # Updated columns
         columns = ("date", "task_type", "title_name", "title_number", "file_name", "client_name", "status", "assigned_to")
-        self.jobs_tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+        self.jobs_tree = VirtualTreeview(table_frame, columns=columns, show="headings")
         ToolTip(self.jobs_tree, "Select a Job to Update its Status .")
         
         self.jobs_tree.heading("date", text="Date")
@@ -980,6 +982,7 @@ class TrackJobsView(FormBase):
         self.jobs_tree.column("client_name", width=150, anchor=tk.W)
         self.jobs_tree.column("status", width=200, anchor=tk.W)
         self.jobs_tree.column("assigned_to", width=200, anchor=tk.W)
+        self.jobs_tree.enable_sorting()
 
         
         scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.jobs_tree.yview)
@@ -1027,13 +1030,32 @@ class TrackJobsView(FormBase):
         
     
     def _populate_jobs_table(self):
-        """Populates the table with all jobs, fetched with client info."""
-        for item in self.jobs_tree.get_children():
-            self.jobs_tree.delete(item)
-        
-        self.all_jobs_data = self.db_manager.get_all_jobs()
-        
-        for job in self.all_jobs_data:
+        """Refreshes the job index in the background (only changed jobs are re-read), then updates the table."""
+        self._update_status_button_state()
+        set_loading(self, True)
+
+        run_in_background(
+            self,
+            self.db_manager.get_survey_job_index,
+            key="jobs_table",
+            on_success=self._display_jobs,
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load jobs: {e}", parent=self),
+            on_finally=lambda: set_loading(self, False)
+        )
+
+    def _display_jobs(self, job_index):
+        """Fills the jobs table; runs on the Tk thread once the job index is up to date."""
+        self.job_index = job_index
+        # Keep any search the user typed while the jobs were loading
+        self._filter_jobs()
+            
+    def _filter_jobs(self, event=None):
+        """Filters the jobs table based on the search entry text, using the in-memory job index."""
+        if self.job_index is None:
+            return
+
+        rows = []
+        for job in self.job_index.search(self.search_entry.get()):
             # Display all relevant data, converted to uppercase for consistency
             values = (
                 job['timestamp'],
@@ -1046,38 +1068,8 @@ class TrackJobsView(FormBase):
                 job['assigned_username']
             )
             # We store the job_id in the item's `iid` so we can easily retrieve it later.
-            self.jobs_tree.insert("", tk.END, iid=job['job_id'], values=values)
-            
-    def _filter_jobs(self, event=None):
-        """Filters the jobs table based on the search entry text."""
-        search_text = self.search_entry.get().strip().lower()
-        
-        # Clear existing items
-        for item in self.jobs_tree.get_children():
-            self.jobs_tree.delete(item)
-            
-        if not search_text:
-            self._populate_jobs_table()
-            return
-            
-        for job in self.all_jobs_data:
-            # Search across multiple fields
-            if (search_text in str(job.get('title_number', '')).lower() or
-                search_text in str(job.get('client_name', '')).lower() or
-                search_text in str(job.get('file_name', '')).lower() or
-                search_text in str(job.get('title_name', '')).lower()):
-                
-                # Re-insert the filtered job
-                values = (
-                    job['timestamp'],
-                    job['job_description'].upper(),
-                    job['title_name'].upper(),
-                    job['title_number'].upper(),
-                    job['file_name'].upper(),
-                    job['client_name'].upper(),
-                    job['status'].upper()
-                )
-                self.jobs_tree.insert("", tk.END, iid=job['job_id'], values=values)
+            rows.append((job['job_id'], values))
+        reconcile_treeview(self.jobs_tree, rows)
     
     def _update_status_button_state(self, event=None):
         """Enables/disables the update button based on row selection and status."""
@@ -1113,7 +1105,7 @@ class TrackJobsView(FormBase):
         # Retrieve the job_id stored in the item's iid
         job_id = int(selected_item[0]) # Corrected line
         
-        selected_job_data = next((job for job in self.all_jobs_data if job['job_id'] == job_id), None)
+        selected_job_data = self.job_index.get(job_id) if self.job_index else None
 
         if not selected_job_data:
             messagebox.showerror("Error", "Could not find job data.")
@@ -2047,7 +2039,7 @@ class JobReportsView(FormBase):
         self._calendar_icon = None
         self._generate_report_icon = None
         self._last_preview_pdf = None
-        self._pdf_preview_img = None
+        self._report_job = None  # Preview rendering in a report worker process
 
         self._create_widgets()
         self._toggle_date_entries()
@@ -2120,28 +2112,23 @@ class JobReportsView(FormBase):
         report_preview_frame = ttk.LabelFrame(main_frame, text="Report Preview", padding="10")
         report_preview_frame.pack(fill="both", expand=True, pady=10)
 
-        # Create a canvas for scrollable PDF preview
-        canvas = tk.Canvas(report_preview_frame)
-        scrollbar = ttk.Scrollbar(report_preview_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
+        # Shown above the preview while a report is rendering
+        self.report_progress = ReportProgressBar(
+            main_frame, pack_options={'fill': 'x', 'pady': 5, 'before': report_preview_frame})
 
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
+        # Report name and job count under the pages
+        self.preview_info_label = ttk.Label(report_preview_frame, text="", font=("Helvetica", 9, "italic"),
+                                            foreground="gray", justify="center")
+        self.preview_info_label.pack(side="bottom", pady=(5, 0))
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # Scrollable PDF preview; only the pages in view are rendered
+        self.preview_canvas = PdfPreviewCanvas(report_preview_frame, bg="white")
+        scrollbar = ttk.Scrollbar(report_preview_frame, orient="vertical", command=self.preview_canvas.yview)
+        self.preview_canvas.configure(yscrollcommand=scrollbar.set)
 
-        canvas.pack(side="left", fill="both", expand=True)
+        self.preview_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        # Only PDF image preview inside scrollable frame
-        self.image_preview_label = ttk.Label(scrollable_frame)
-        self.image_preview_label.pack(fill="both", expand=True, pady=10)
-
 
 
     def _toggle_date_entries(self):
@@ -2203,177 +2190,68 @@ class JobReportsView(FormBase):
             return False
 
     def _generate_report(self):
+        if self._report_job is not None:
+            return  # A report is already being generated
         start_date, end_date = self._get_report_dates()
         if not start_date:
             return
 
         selected_status = self.job_status_var.get()
         db_status = selected_status if selected_status != "All" else None
+        report_name = f"Service Jobs Report ({selected_status})"
 
-        jobs = self.db_manager.get_service_jobs_for_report(
+        run_in_background(
+            self, self.db_manager.get_service_jobs_for_report, key="job_report_data",
+            on_success=lambda jobs: self._render_preview(report_name, jobs or [], start_date, end_date),
+            on_error=lambda e: messagebox.showerror("Error", f"Could not load jobs for the report:\n{e}"),
             start_date=start_date, end_date=end_date, status=db_status
         )
 
-        report_name = f"Service Jobs Report ({selected_status})"
-        pdf_bytes = self._generate_pdf_preview_bytes(
-            report_name, {'data': jobs}, self.report_type_var.get(), start_date, end_date
-        )
-
-        if pdf_bytes:
+    def _render_preview(self, report_name, jobs, start_date, end_date):
+        """Renders the report in a report worker process and shows it once it is ready."""
+        def on_success(pdf_bytes):
             self._last_preview_pdf = pdf_bytes
             self._show_pdf_preview(pdf_bytes, report_name, start_date, end_date, len(jobs))
-        else:
-            messagebox.showerror("Error", "Could not generate PDF preview.")
-
-    def _generate_pdf_preview_bytes(self, report_name, content, report_type, start_date, end_date):
-        if not _REPORTLAB_AVAILABLE:
-            return None
-
-        buffer = BytesIO()
-        try:
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            styles = getSampleStyleSheet()
-            story = []
-
-            # Header
-            logo_path = os.path.join(ICONS_DIR, "survey.png")
-            if os.path.exists(logo_path):
-                logo = RLImage(logo_path)
-                logo._restrictSize(1.2 * inch, 1.2 * inch)
-            else:
-                logo = Paragraph("", styles['Normal'])
-
-            header = Table([[logo, "NDIRITU MATHENGE & ASSOCIATES", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]],
-                           colWidths=[1.2 * inch, 3.5 * inch, 2 * inch])
-            header.setStyle(TableStyle([('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
-                                        ('FONTSIZE', (1, 0), (1, 0), 14),
-                                        ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
-                                        ('BOTTOMPADDING', (0, 0), (-1, -1), 12)]))
-            story.append(header)
-            story.append(Spacer(1, 12))
-
-            # Title
-            story.append(Paragraph(f"<b>{report_name.upper()}</b>", styles['Heading2']))
-            story.append(Paragraph(f"Period: {start_date} to {end_date}", styles['Normal']))
-            story.append(Spacer(1, 12))
-
-            # Data table
-            if content.get('data'):
-                headers = ["Job ID", "Payment ID", "Title Name", "Title Number", "Description",
-                           "Created", "Payment Date", "Job Status", "Payment Status", "Job Fee",
-                           "Amount Paid", "Balance"]
-
-                wrap_header = ParagraphStyle('wrap_header', fontSize=8, leading=10, alignment=1)
-                wrap_body = ParagraphStyle('wrap_body', fontSize=7, leading=9, alignment=0)
-
-                table_data = [[Paragraph(h, wrap_header) for h in headers]]
-
-                def fmt_date(val):
-                    if not val:
-                        return ""
-                    if isinstance(val, datetime):
-                        return val.strftime("%Y-%m-%d")
-                    return str(val).split(" ")[0]
-
-                for job in content['data']:
-                    row = [
-                        Paragraph(str(job.get('job_id', '') or ""), wrap_body),
-                        Paragraph(str(job.get('payment_id', '') or ""), wrap_body),
-                        Paragraph(str(job.get('title_name', '') or ""), wrap_body),
-                        Paragraph(str(job.get('title_number', '') or ""), wrap_body),
-                        Paragraph(str(job.get('job_description', '') or ""), wrap_body),
-                        Paragraph(fmt_date(job.get('job_created')), wrap_body),
-                        Paragraph(fmt_date(job.get('payment_date')), wrap_body),
-                        Paragraph(str(job.get('job_status', '') or ""), wrap_body),
-                        Paragraph(str(job.get('payment_status', '') or ""), wrap_body),
-                        Paragraph(str(job.get('job_fee', '') or ""), wrap_body),
-                        Paragraph(str(job.get('amount_paid', '') or ""), wrap_body),
-                        Paragraph(str(job.get('balance', '') or ""), wrap_body),
-                    ]
-                    table_data.append(row)
-
-                t = Table(table_data, repeatRows=1)
-                t.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 8),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 7),
-                    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('BOX', (0, 0), (-1, -1), 0.75, colors.black),
-                    ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-                    ('TOPPADDING', (0, 0), (-1, -1), 2),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                ]))
-                story.append(t)
-            else:
-                story.append(Paragraph("No jobs found for this period and status.", styles['Normal']))
 
-            # Footer
-            def add_page_number(canvas, doc):
-                page_num = canvas.getPageNumber()
-                canvas.setFont("Helvetica", 8)
-                canvas.drawRightString(7.5 * inch, 0.5 * inch, f"Page {page_num}")
+        def on_finally():
+            self._report_job = None
+            self.report_progress.finish()
 
-            doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
-            buffer.seek(0)
-            return buffer.getvalue()
-        except Exception as e:
-            print(f"PDF generation failed: {e}")
-            return None
+        callbacks = dict(
+            on_progress=self.report_progress.update_progress,
+            on_success=on_success,
+            on_error=lambda e: messagebox.showerror("Error", "Could not generate PDF preview."),
+            on_finally=on_finally
+        )
+        if len(jobs) > LARGE_REPORT_ROWS:
+            # Parts render in parallel; merging without a file path returns the PDF bytes
+            self._report_job = get_report_service().submit_chunked(
+                self, render_jobs_report_chunk, jobs_report_chunks(report_name, {'data': jobs}, start_date, end_date),
+                merge_pdf_chunks, None, discard_chunk=discard_pdf_chunk, **callbacks
+            )
+        else:
+            self._report_job = get_report_service().submit(
+                self, render_jobs_report_pdf, report_name, {'data': jobs}, start_date, end_date, **callbacks
+            )
+        self.report_progress.start(self._report_job, "Generating report preview...")
 
     def _show_pdf_preview(self, pdf_bytes, report_name, start_date, end_date, job_count):
-        """Render all pages of a generated PDF and display them stacked vertically."""
-
-        # Clear any previous preview images
-        for widget in self.image_preview_label.master.winfo_children():
-            widget.destroy()
-
+        """Shows the generated PDF; pages are rendered as they scroll into view."""
         try:
-            pdf_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-
-            if pdf_doc.page_count == 0:
-                ttk.Label(
-                    self.image_preview_label.master,
-                    text="⚠ PDF has no pages to preview."
-                ).pack(pady=10)
-                return
-
-            self._pdf_preview_imgs = []  # Keep references to prevent garbage collection
-
-            for page_num in range(pdf_doc.page_count):
-                page = pdf_doc[page_num]
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # High-resolution render
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-                # Resize large pages to fit window width
-                img.thumbnail((750, 950))
-                tk_img = ImageTk.PhotoImage(img)
-                self._pdf_preview_imgs.append(tk_img)
-
-                # Display each page image
-                label = ttk.Label(self.image_preview_label.master, image=tk_img)
-                label.pack(pady=8)
-
-            # Optional label showing basic info under all pages
-            ttk.Label(
-                self.image_preview_label.master,
-                text=f"{report_name}\nDate Range: {start_date} to {end_date} — {job_count} Jobs",
-                font=("Helvetica", 9, "italic"),
-                foreground="gray"
-            ).pack(pady=10)
-
+            self.preview_canvas.show_pdf(pdf_bytes)
         except Exception as e:
-            ttk.Label(
-                self.image_preview_label.master,
-                text=f"⚠ PDF preview unavailable.\n\nError: {e}"
-            ).pack(pady=10)
+            self.preview_canvas.delete("all")
+            self.preview_canvas.create_text(
+                10, 10, anchor="nw", text=f"⚠ PDF preview unavailable.\n\nError: {e}"
+            )
+            self.preview_info_label.config(text="")
+            return
 
+        if self.preview_canvas.page_count == 0:
+            self.preview_canvas.create_text(10, 10, anchor="nw", text="⚠ PDF has no pages to preview.")
+        self.preview_info_label.config(
+            text=f"{report_name}\nDate Range: {start_date} to {end_date} — {job_count} Jobs"
+        )
 
 
     def _save_report(self):
@@ -2415,6 +2293,7 @@ class PaymentReportsView(FormBase):
         self.report_type_var = tk.StringVar(self, value="daily")
         self.from_date_var = tk.StringVar(self, value=datetime.now().strftime("%Y-%m-%d"))
         self.to_date_var = tk.StringVar(self, value=datetime.now().strftime("%Y-%m-%d"))
+        self._export_job = None  # PDF export running in a report worker process
 
         self._create_widgets()
         self._toggle_date_entries()
@@ -2467,11 +2346,15 @@ class PaymentReportsView(FormBase):
 
         self.tree.pack(fill="both", expand=True, pady=10)
 
+        self.export_progress = ReportProgressBar(main_frame, pack_options={'fill': 'x', 'pady': 5, 'before': self.tree})
+
     def _export_to_pdf(self):
-        """Exports the payment report to a PDF file."""
+        """Exports the payment report to a PDF file, rendered in a report worker process."""
         if not _REPORTLAB_AVAILABLE:
             messagebox.showerror("Error", "ReportLab is not installed. Cannot export PDF.")
             return
+        if self._export_job is not None:
+            return  # An export is already running
 
         # Ask user where to save
         file_path = filedialog.asksaveasfilename(
@@ -2482,51 +2365,27 @@ class PaymentReportsView(FormBase):
         if not file_path:
             return
 
-        try:
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            elements = []
-
-            # Title
-            elements.append(Paragraph("Payment Sales Report", styles['Title']))
-            elements.append(Spacer(1, 12))
-
-            # Period info
-            period_text = f"Report Type: {self.report_type_var.get().capitalize()}"
-            if self.report_type_var.get() == "custom":
-                period_text += f" (From {self.from_date_var.get()} To {self.to_date_var.get()})"
-            elements.append(Paragraph(period_text, styles['Normal']))
-            elements.append(Spacer(1, 12))
-
-            # Table data
-            data = [["Date", "Gross Sales", "Net Sales"]]
-            for item in self.tree.get_children():
-                row = self.tree.item(item)['values']
-                data.append([
-                    str(row[0]),
-                    str(row[1]),
-                    str(row[2])
-                ])
-
-            table = Table(data, colWidths=[120, 150, 150])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
-            elements.append(table)
-
-            # Build PDF
-            doc.build(elements)
-            messagebox.showinfo("Success", f"Report exported successfully:\n{file_path}")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export report: {e}")
-
+        # Period info and table rows are read here, on the Tk thread
+        period_text = f"Report Type: {self.report_type_var.get().capitalize()}"
+        if self.report_type_var.get() == "custom":
+            period_text += f" (From {self.from_date_var.get()} To {self.to_date_var.get()})"
+        rows = [
+            [str(value) for value in self.tree.item(item)['values'][:3]]
+            for item in self.tree.get_children()
+        ]
+
+        def on_finally():
+            self._export_job = None
+            self.export_progress.finish()
+
+        self._export_job = get_report_service().submit(
+            self, render_payment_summary_pdf, file_path, period_text, rows,
+            on_progress=self.export_progress.update_progress,
+            on_success=lambda path: messagebox.showinfo("Success", f"Report exported successfully:\n{path}"),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to export report: {e}"),
+            on_finally=on_finally
+        )
+        self.export_progress.start(self._export_job, "Exporting report...")
 
     def _toggle_date_entries(self):
         state = "normal" if self.report_type_var.get() == "custom" else "disabled"
@@ -16,6 +16,8 @@ from tkcalendar import DateEntry
 # Import other forms using absolute imports relative to the project root
 from forms.client_form import ClientForm  # For adding new clients during transfer
 from forms.property_forms import AddPropertyForTransferForm
+from utils.background import Debouncer
+from utils.treeview_sync import reconcile_treeview
 
 # --- Module-level imports for ctypes, ensuring variables are always defined ---
 windll = None
@@ -32,6 +34,9 @@ if os.name == 'nt':
 # --- End of ctypes import block ---
 
 class PropertyTransferForm(tk.Toplevel):
+    # Most properties listed at once; searching narrows the list down further.
+    SEARCH_RESULT_LIMIT = 200
+
     def __init__(self, master, db_manager, refresh_callback, user_id=None, user_role=None, parent_icon_loader=None,
                  window_icon_name="transfer.png"):
         super().__init__(master)
@@ -152,13 +157,17 @@ class PropertyTransferForm(tk.Toplevel):
         ttk.Label(search_row_frame, text="Search Property:").grid(row=0, column=0, sticky="w", padx=5)
         self.property_search_entry = ttk.Entry(search_row_frame, width=30)
         self.property_search_entry.grid(row=0, column=1, sticky="ew", padx=5)
-        # Real-time search binding
-        self.property_search_entry.bind('<KeyRelease>', lambda e: self.search_properties(e))
+        # Real-time search binding, run once typing pauses
+        self._property_search_debouncer = Debouncer(self, self.search_properties)
+        self.property_search_entry.bind('<KeyRelease>', self._property_search_debouncer)
         
         # New "Add New Property" button
         self.add_prop_btn = ttk.Button(search_row_frame, text="Add New Property", image=self._add_property_icon,
                                         compound=tk.LEFT, command=self._open_add_new_property_form)
         self.add_prop_btn.grid(row=0, column=2, sticky="e", padx=5)
+        # Shown when the search matches more properties than are listed
+        self.property_limit_label = ttk.Label(search_row_frame, text="", foreground="gray")
+        self.property_limit_label.grid(row=1, column=0, columnspan=3, sticky="w", padx=5)
 
         prop_tree_frame = ttk.Frame(prop_selection_frame)
         prop_tree_frame.grid(row=1, column=0, columnspan=3, sticky="ew", pady=(5, 0))
@@ -331,26 +340,34 @@ class PropertyTransferForm(tk.Toplevel):
         self.agent_combobox['values'] = [agent['name'] for agent in self.all_agents]
 
     def search_properties(self, event=None):
-        for item in self.property_tree.get_children():
-            self.property_tree.delete(item)
+        """Lists the best matches for the search input, found through the database's full-text search."""
         search_query = self.property_search_entry.get().strip()
-        available_properties = self.db_manager.get_all_propertiesForTransfer_paginated(search_query=search_query)
-
-        if available_properties:
-            for prop in available_properties:
-                owner_display = prop.get('owner', 'N/A')
-                unique_iid = f"{prop['source_table']}-{prop['property_id']}"
-                status_display = prop.get('size', 'N/A')
-                self.property_tree.insert("", "end", values=(
-                    prop['property_id'],
-                    prop['title_deed_number'],
-                    prop['location'],
-                    status_display,
-                    owner_display
-                ), iid=unique_iid)
-        self.selected_property = None
-        self.lbl_selected_property.config(text="N/A")
-        self.lbl_current_owner.config(text="N/A")
+        # One extra row tells whether the list had to be cut short
+        available_properties = self.db_manager.get_all_propertiesForTransfer_paginated(
+            limit=self.SEARCH_RESULT_LIMIT + 1, search_query=search_query
+        ) or []
+        if len(available_properties) > self.SEARCH_RESULT_LIMIT:
+            available_properties = available_properties[:self.SEARCH_RESULT_LIMIT]
+            self.property_limit_label.config(
+                text=f"Showing the first {self.SEARCH_RESULT_LIMIT} properties. Refine your search to narrow the list.")
+        else:
+            self.property_limit_label.config(text="")
+
+        reconcile_treeview(self.property_tree, (
+            (f"{prop['source_table']}-{prop['property_id']}", (
+                prop['property_id'],
+                prop['title_deed_number'],
+                prop['location'],
+                prop.get('size', 'N/A'),
+                prop.get('owner', 'N/A')
+            ))
+            for prop in available_properties
+        ))
+        # Keep the chosen property if it is still listed
+        if not self.property_tree.focus() or not self.property_tree.exists(self.property_tree.focus()):
+            self.selected_property = None
+            self.lbl_selected_property.config(text="N/A")
+            self.lbl_current_owner.config(text="N/A")
 
     def _on_property_select(self, event):
         selected_item = self.property_tree.focus()
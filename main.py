@@ -15,10 +15,16 @@ import sys  # Used to get the executable path
 import logging  # For structured logging
 import os, shutil, zipfile, subprocess
 import platform
+import multiprocessing
 
 # from packaging.version import parse as parse_version # REMOVED: Causing import issues
 
 from utils.tooltips import ToolTip
+from utils.background import shutdown_executor, run_in_background, Debouncer
+from utils.report_jobs import shutdown_report_service
+from utils.virtual_treeview import VirtualTreeview
+from utils.treeview_sync import reconcile_treeview
+from utils.search_index import SEARCH_DISPLAY_LIMIT
 # Import your DatabaseManager
 from database import DatabaseManager
 from forms.main_menu_form import MainMenuForm
@@ -40,90 +46,97 @@ from forms.booking_form import BookingManagementApp
 #from forms.view_properties_to_transfer_form import ViewPropertiesToTransferForm
 
 
-db_manager = DatabaseManager()
-if not db_manager._get_connection():
-    messagebox.showerror(
-        "Database Connection Error",
-        "Could not connect to the MySQL database. Please ensure your MySQL server is running and the 'real_estate_db' database exists."
-    )
-    sys.exit(1) # Exit the application if the connection fails
-    
-print("\n--- Checking/Adding Default Users ---")
-
-# Add 'admin' user if they don't exist
-# We use db_manager.authenticate_user to check for existence and valid password (for a robust check)
-# If authenticate_user returns None, the user doesn't exist or password is wrong, so we can try adding them.
-admin_username = "admin"
-admin_password = "admin"  # This will be hashed by add_user
-admin_is_agent = "no"  # This is a flag to indicate the user is an admin
-
-if not db_manager.authenticate_user(admin_username, admin_password):
-    print(f"'{admin_username}' user not found or password incorrect. Attempting to add...")
-    admin_id = db_manager.add_user(admin_username, admin_password, admin_is_agent, "admin")
-    if admin_id:
-        print(f"Admin user '{admin_username}' added successfully with ID: {admin_id}")
+def _prepare_database():
+    """
+    Checks the MySQL connection and adds the default users. Runs only when main.py is
+    started as the application, not when a report worker process imports this module.
+    """
+    db_manager = DatabaseManager()
+    startup_conn = db_manager._get_connection()
+    if not startup_conn:
+        messagebox.showerror(
+            "Database Connection Error",
+            "Could not connect to the MySQL database. Please ensure your MySQL server is running and the 'real_estate_db' database exists."
+        )
+        sys.exit(1) # Exit the application if the connection fails
+    db_manager._release_connection(startup_conn)
+
+    print("\n--- Checking/Adding Default Users ---")
+
+    # Add 'admin' user if they don't exist
+    # We use db_manager.authenticate_user to check for existence and valid password (for a robust check)
+    # If authenticate_user returns None, the user doesn't exist or password is wrong, so we can try adding them.
+    admin_username = "admin"
+    admin_password = "admin"  # This will be hashed by add_user
+    admin_is_agent = "no"  # This is a flag to indicate the user is an admin
+
+    if not db_manager.authenticate_user(admin_username, admin_password):
+        print(f"'{admin_username}' user not found or password incorrect. Attempting to add...")
+        admin_id = db_manager.add_user(admin_username, admin_password, admin_is_agent, "admin")
+        if admin_id:
+            print(f"Admin user '{admin_username}' added successfully with ID: {admin_id}")
+        else:
+            print(f"Failed to add admin user '{admin_username}'. It might already exist with a different password.")
     else:
-        print(f"Failed to add admin user '{admin_username}'. It might already exist with a different password.")
-else:
-    print(f"Admin user '{admin_username}' already exists.")
-
-# Add 'property_manager' user if they don't exist
-pm_username = "pm"
-pm_password = "pm"
-pm_is_agent = "no"  # This is a flag to indicate the user is a property manager
-if not db_manager.authenticate_user(pm_username, pm_password):
-    print(f"'{pm_username}' user not found or password incorrect. Attempting to add...")
-    pm_id = db_manager.add_user(pm_username, pm_password, pm_is_agent, "property_manager")
-    if pm_id:
-        print(f"Property Manager user '{pm_username}' added successfully with ID: {pm_id}")
+        print(f"Admin user '{admin_username}' already exists.")
+
+    # Add 'property_manager' user if they don't exist
+    pm_username = "pm"
+    pm_password = "pm"
+    pm_is_agent = "no"  # This is a flag to indicate the user is a property manager
+    if not db_manager.authenticate_user(pm_username, pm_password):
+        print(f"'{pm_username}' user not found or password incorrect. Attempting to add...")
+        pm_id = db_manager.add_user(pm_username, pm_password, pm_is_agent, "property_manager")
+        if pm_id:
+            print(f"Property Manager user '{pm_username}' added successfully with ID: {pm_id}")
+        else:
+            print(f"Failed to add property manager user '{pm_username}'. It might already exist with a different password.")
     else:
-        print(f"Failed to add property manager user '{pm_username}'. It might already exist with a different password.")
-else:
-    print(f"Property Manager user '{pm_username}' already exists.")
-
-# Add 'surveyor' user if they don't exist
-sa_username = "sa"
-sa_password = "sa"
-sa_is_agent = "no"  # This is a flag to indicate the user is a sales agent
-if not db_manager.authenticate_user(sa_username, sa_password):
-    print(f"'{sa_username}' user not found or password incorrect. Attempting to add...")
-    sa_id = db_manager.add_user(sa_username, sa_password, sa_is_agent, "surveyor")
-    if sa_id:
-        print(f"Sales Agent user '{sa_username}' added successfully with ID: {sa_id}")
+        print(f"Property Manager user '{pm_username}' already exists.")
+
+    # Add 'surveyor' user if they don't exist
+    sa_username = "sa"
+    sa_password = "sa"
+    sa_is_agent = "no"  # This is a flag to indicate the user is a sales agent
+    if not db_manager.authenticate_user(sa_username, sa_password):
+        print(f"'{sa_username}' user not found or password incorrect. Attempting to add...")
+        sa_id = db_manager.add_user(sa_username, sa_password, sa_is_agent, "surveyor")
+        if sa_id:
+            print(f"Sales Agent user '{sa_username}' added successfully with ID: {sa_id}")
+        else:
+            print(f"Failed to add sales agent user '{sa_username}'. It might already exist with a different password.")
     else:
-        print(f"Failed to add sales agent user '{sa_username}'. It might already exist with a different password.")
-else:
-    print(f"Sales Agent user '{sa_username}' already exists.")
-
-# Add 'accountant' user if they don't exist
-acc_username = "acc"
-acc_password = "acc"
-acc_is_agent = "no"  # This is a flag to indicate the user is an accountant
-if not db_manager.authenticate_user(acc_username, acc_password):
-    print(f"'{acc_username}' user not found or password incorrect. Attempting to add...")
-    acc_id = db_manager.add_user(acc_username, acc_password, acc_is_agent, "accountant")
-    if acc_id:
-        print(f"Accountant user '{acc_username}' added successfully with ID: {acc_id}")
+        print(f"Sales Agent user '{sa_username}' already exists.")
+
+    # Add 'accountant' user if they don't exist
+    acc_username = "acc"
+    acc_password = "acc"
+    acc_is_agent = "no"  # This is a flag to indicate the user is an accountant
+    if not db_manager.authenticate_user(acc_username, acc_password):
+        print(f"'{acc_username}' user not found or password incorrect. Attempting to add...")
+        acc_id = db_manager.add_user(acc_username, acc_password, acc_is_agent, "accountant")
+        if acc_id:
+            print(f"Accountant user '{acc_username}' added successfully with ID: {acc_id}")
+        else:
+            print(f"Failed to add accountant user '{acc_username}'. It might already exist with a different password.")
     else:
-        print(f"Failed to add accountant user '{acc_username}'. It might already exist with a different password.")
-else:
-    print(f"Accountant user '{acc_username}' already exists.")
-
-print("--- Default User Setup Complete ---")
-
-# Add 'reception' user if they don't exist
-reception_username = "reception"
-reception_password = "reception"
-reception_is_agent = "no"  # This is a flag to indicate the user is a reception
-if not db_manager.authenticate_user(reception_username, reception_password):
-    print(f"'{reception_username}' user not found or password incorrect. Attempting to add...")
-    reception_id = db_manager.add_user(reception_username, reception_password, reception_is_agent, "reception")
-    if reception_id:
-        print(f"Reception user '{reception_username}' added successfully with ID: {reception_id}")
+        print(f"Accountant user '{acc_username}' already exists.")
+
+    print("--- Default User Setup Complete ---")
+
+    # Add 'reception' user if they don't exist
+    reception_username = "reception"
+    reception_password = "reception"
+    reception_is_agent = "no"  # This is a flag to indicate the user is a reception
+    if not db_manager.authenticate_user(reception_username, reception_password):
+        print(f"'{reception_username}' user not found or password incorrect. Attempting to add...")
+        reception_id = db_manager.add_user(reception_username, reception_password, reception_is_agent, "reception")
+        if reception_id:
+            print(f"Reception user '{reception_username}' added successfully with ID: {reception_id}")
+        else:
+            print(f"Failed to add reception user '{reception_username}'. It might already exist with a different password.")
     else:
-        print(f"Failed to add reception user '{reception_username}'. It might already exist with a different password.")
-else:
-    print(f"Reception user '{reception_username}' already exists.")
+        print(f"Reception user '{reception_username}' already exists.")
 
 # --- Global Constants ---
 # Define the current application version
@@ -399,7 +412,8 @@ class SurveySectionView(ttk.Frame):
         sn.pack(side="left", padx=(0, 10))
         self.client_search_entry = ttk.Entry(client_frame)
         self.client_search_entry.pack(side="left", expand=True, fill="x", padx=(0, 10))
-        self.client_search_entry.bind("<KeyRelease>", self._filter_clients)
+        self._search_debouncer = Debouncer(self, self._filter_clients)
+        self.client_search_entry.bind("<KeyRelease>", self._search_debouncer)
         ToolTip(self.client_search_entry, "Search For Existing Clients Using Name or Telephone Number.")
         
         # This button will now open the unified form
@@ -407,6 +421,9 @@ class SurveySectionView(ttk.Frame):
         btn=ttk.Button(client_frame, text="Add Client/File",command=self._open_add_client_and_file_form)
         btn.pack(side="left", padx=(10, 0))
         ToolTip(btn, "Create New Client File.")
+        # Shown when more client files match than are listed
+        self.client_search_limit_label = ttk.Label(client_frame, text="", foreground="gray")
+        self.client_search_limit_label.pack(side="left", padx=(10, 0))
 
         # Client Table
         client_table_frame = ttk.Frame(self)
@@ -508,33 +525,25 @@ class SurveySectionView(ttk.Frame):
 
     def populate_survey_overview(self):
         """Refreshes the data displayed in the view, including the client table."""
-        for item in self.client_tree.get_children():
-            self.client_tree.delete(item)
-        
-        # Assuming a new db_manager method that gets all files with client info joined
-        files_data = self.db_manager.get_all_client_files()
-        for file in files_data:
-            client_name = file['client_name'].upper()
-            file_name = file['file_name'].upper()
-            contact = file['telephone_number'].upper()
-            
-            self.client_tree.insert("", tk.END, values=(client_name,file_name,contact), 
-                                        tags=('client_row',), iid=file['file_id'])
-        
+        self._search_debouncer.cancel()
+        self._filter_clients()
         print("UI refreshed with all client files.")
 
     def _filter_clients(self, event=None):
-        """Filters the client treeview based on the text in the search entry."""
-        search_query = self.client_search_entry.get().lower()
-        
-        for item in self.client_tree.get_children():
-            self.client_tree.delete(item)
-
-        all_files = self.db_manager.get_all_client_files()
-        for file in all_files:
-            if search_query in file['client_name'].lower() or search_query in file['file_name'].lower() or search_query in file['telephone_number'].lower():
-                self.client_tree.insert("", tk.END, values=(file['client_name'], file['file_name'], file['telephone_number']),
-                                         tags=('client_row',), iid=file['file_id'])
+        """Shows the client files matching the search entry, looked up in the survey file index."""
+        # One extra row tells whether the list had to be cut short
+        files_data = self.db_manager.search_client_files(self.client_search_entry.get(), limit=SEARCH_DISPLAY_LIMIT + 1)
+        self.client_search_limit_label.config(
+            text=f"Showing the first {SEARCH_DISPLAY_LIMIT}, refine your search" if len(files_data) > SEARCH_DISPLAY_LIMIT else "")
+        files_data = files_data[:SEARCH_DISPLAY_LIMIT]
+
+        # Only files that were added, changed or filtered out touch the Treeview
+        reconcile_treeview(self.client_tree, (
+            (file['file_id'],
+             (file['client_name'].upper(), file['file_name'].upper(), file['telephone_number'].upper()),
+             ('client_row',))
+            for file in files_data
+        ))
 
 
     def _open_client_file_dashboard(self, event=None):
@@ -1078,8 +1087,13 @@ class ReceptionSectionView(ttk.Frame):
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        self.search_entry.bind("<KeyRelease>", self._filter_clients)
+        # Filter once typing pauses instead of on every key release.
+        self._search_debouncer = Debouncer(self, self._filter_clients)
+        self.search_entry.bind("<KeyRelease>", self._search_debouncer)
         ToolTip(self.search_entry, "Search For Clients Using Name or Phone Number.")
+        # Shown when more clients match than are listed
+        self.search_limit_label = ttk.Label(search_frame, text="", foreground="gray")
+        self.search_limit_label.pack(side=tk.LEFT, padx=(5, 0))
 
         self.add_client_button = ttk.Button(top_controls_frame, text="Add New Client",
                                              compound=tk.LEFT,
@@ -1101,13 +1115,14 @@ class ReceptionSectionView(ttk.Frame):
         list_frame = ttk.LabelFrame(tree_and_buttons_frame, text="Existing Clients",)
         list_frame.pack(fill="both", expand=True, pady=(0, 5))
 
-        self.tree = ttk.Treeview(list_frame, columns=("Name", "Telephone No", "Email"), show="headings")
+        self.tree = VirtualTreeview(list_frame, columns=("Name", "Telephone No", "Email"), show="headings")
         self.tree.heading("Name", text="CLIENT NAME")
         self.tree.heading("Telephone No", text="TELEPHONE NO")
         self.tree.heading("Email", text="ID NUMBER/PASSPORT NO")
         self.tree.column("Name", width=150)
         self.tree.column("Telephone No", width=100)
         self.tree.column("Email", width=150)
+        self.tree.enable_sorting()
         self.tree.pack(side="left", fill="both", expand=True)
         ToolTip(self.tree, "Double Click a Client to Add Daily Visit.")
 
@@ -1155,28 +1170,24 @@ class ReceptionSectionView(ttk.Frame):
 
     def _load_clients(self):
         """Clears and re-populates the client Treeview with basic client info."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        clients = self.db_manager.get_all_clients()
-        if clients:
-            for client in clients:
-                # Store the client_id as a tag for easy retrieval
-                self.tree.insert("", "end", values=(client['name'].upper(),
-                                                     client['telephone_number'].upper(),
-                                                     client['email'].upper()), tags=(client['client_id'], client['name']))
+        self._search_debouncer.cancel()
+        self._filter_clients()
     
-    def _filter_clients(self, event):
-        """Filters the client list in real-time based on search input."""
-        search_term = self.search_var.get().lower()
-        self.tree.delete(*self.tree.get_children())
-        clients = self.db_manager.get_all_clients()
-
-        if clients:
-            for client in clients:
-                client_id, name, telephone, email = client['client_id'], client['name'], client[
-                    'telephone_number'], client['email']
-                if search_term in str(client_id).lower() or search_term in name.lower() or search_term in telephone.lower() or search_term in email.lower():
-                    self.tree.insert("", "end", values=(name.upper(), telephone.upper(), email.upper()), tags=(client_id, name))
+    def _filter_clients(self, event=None):
+        """Shows the clients matching the search input, looked up in the in-memory client index."""
+        # One extra row tells whether the list had to be cut short
+        clients = self.db_manager.search_clients(self.search_var.get(), limit=SEARCH_DISPLAY_LIMIT + 1)
+        self.search_limit_label.config(
+            text=f"Showing the first {SEARCH_DISPLAY_LIMIT}, refine your search" if len(clients) > SEARCH_DISPLAY_LIMIT else "")
+        clients = clients[:SEARCH_DISPLAY_LIMIT]
+        # Rows are keyed by client_id so a refresh only touches clients that changed.
+        # The client_id is also stored as a tag for easy retrieval.
+        reconcile_treeview(self.tree, (
+            (client['client_id'],
+             (client['name'].upper(), client['telephone_number'].upper(), client['email'].upper()),
+             (client['client_id'], client['name']))
+            for client in clients
+        ))
 
     def _on_client_double_click(self, event):
         """Opens a new form to add daily visit details for a selected client."""
@@ -1435,6 +1446,8 @@ class RealEstateApp(tk.Tk):
         self.title("Real Estate Management System")
         self.geometry("1200x800")
         self.state('zoomed')
+        # Closing the window takes the same path as File > Exit, so queued activity logs are written
+        self.protocol("WM_DELETE_WINDOW", self.on_exit)
 
         self.db_manager = DatabaseManager()
         self.icon_images = {}  # Cache for PhotoImage objects
@@ -1773,6 +1786,8 @@ class RealEstateApp(tk.Tk):
             self._on_tab_change(None)  # Populate initial tab data
             # NEW: Check for updates right after successful login
             self.after(1000, self.check_for_updates)  # Check for updates 1 second after login
+            # Move activity logs past the retention period into the compressed archive
+            run_in_background(self, self.db_manager.archive_activity_logs)
         else:
             self.destroy()  # Exit application if login fails or is cancelled
 
@@ -2161,7 +2176,10 @@ class RealEstateApp(tk.Tk):
 
     def on_exit(self):
         if messagebox.askyesno("Exit Application", "Are you sure you want to exit?"):
-            # self.db_manager.close() # Close database connection
+            self.db_manager.flush_activity_log()  # Write queued activity log entries while MySQL is reachable
+            shutdown_executor()  # Drop queued background queries
+            shutdown_report_service()  # Stop report worker processes
+            self.db_manager.close()  # Close pooled database connections
             self.destroy()
 
     def logout(self):
@@ -2190,5 +2208,7 @@ class RealEstateApp(tk.Tk):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Report worker processes in the packaged executable
+    _prepare_database()
     app = RealEstateApp()
     app.mainloop()
@@ -0,0 +1,204 @@
+# real_estate_system/utils/activity_archive.py
+import gzip
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# One gzip-compressed JSON-lines file per archived month, e.g. activity_logs_2024-03.jsonl.gz
+_FILE_PATTERN = re.compile(r"^activity_logs_(\d{4})-(\d{2})\.jsonl\.gz$")
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Decoded months kept in memory, so paging back and forth across a few months stays cheap.
+CACHED_MONTHS = 4
+
+
+def _index_path(path):
+    # Beside each month file, the users and action types in it (see ActivityLogArchive._month_summary).
+    return path[:-len(".jsonl.gz")] + ".index.json"
+
+
+def month_start(value, months_back=0):
+    """Returns the first day (a datetime at midnight) of the month `months_back` months before `value`."""
+    month_index = value.year * 12 + value.month - 1 - months_back
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f"activity_logs_{month:%Y-%m}.jsonl.gz")
+
+
+def _to_record(row):
+    timestamp = row['timestamp']
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.strftime(_TIMESTAMP_FORMAT)
+    return {
+        'log_id': row['log_id'],
+        'timestamp': str(timestamp),
+        'user_id': row.get('user_id'),
+        'username': row.get('username'),
+        'action_type': row['action_type'],
+        'details': row.get('details'),
+    }
+
+
+def _from_record(record):
+    row = dict(record)
+    row['timestamp'] = datetime.strptime(record['timestamp'], _TIMESTAMP_FORMAT)
+    return row
+
+
+class ActivityLogArchive:
+    """
+    Activity log months moved out of MySQL, kept as compressed files in `archive_dir`.
+
+    Each month is written once by write_month (merging with a file left by an earlier,
+    interrupted run) and read back newest first by search, which applies the same
+    filters and (timestamp, log_id) keyset ordering as the activity log viewer.
+    The last CACHED_MONTHS months read are kept decoded so paging through them does
+    not decompress the files again for every page. A small index file per month lists
+    its users and action types, so filtered searches skip the months that cannot match
+    without opening them.
+    """
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+        self._cached = OrderedDict()  # path -> (mtime, rows sorted newest first), least recent first
+        self._summaries = {}  # path -> (mtime, user ids, action types)
+
+    def months(self):
+        """Returns the archived months as datetimes (first of the month), newest first."""
+        try:
+            names = os.listdir(self.archive_dir)
+        except OSError:
+            return []
+        months = []
+        for name in names:
+            match = _FILE_PATTERN.match(name)
+            if match:
+                months.append(datetime(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months, reverse=True)
+
+    def write_month(self, month, rows):
+        """Writes (or extends) the archive file for `month`. Returns the number of rows in it."""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = archive_path(self.archive_dir, month)
+        records = {record['log_id']: record for record in self._read_records(path)}
+        for row in rows:
+            records[row['log_id']] = _to_record(row)
+
+        temp_path = path + ".tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+            for record in sorted(records.values(), key=lambda r: (r['timestamp'], r['log_id'])):
+                archive.write(json.dumps(record) + "\n")
+        os.replace(temp_path, path)
+
+        summary = {
+            'archive_mtime': os.path.getmtime(path),
+            'user_ids': sorted({r['user_id'] for r in records.values() if r['user_id'] is not None}),
+            'action_types': sorted({r['action_type'] for r in records.values()}),
+        }
+        index_path = _index_path(path)
+        with open(index_path + ".tmp", 'w', encoding='utf-8') as index_file:
+            json.dump(summary, index_file)
+        os.replace(index_path + ".tmp", index_path)
+        return len(records)
+
+    def search(self, limit, user_id=None, action_type=None, start=None, end=None, before=None):
+        """
+        Returns up to `limit` archived entries, newest first, matching the filters.
+        `start`/`end` bound the timestamp half-open ([start, end)); `before` is a
+        (timestamp, log_id) keyset position, and only entries older than it are returned.
+        """
+        results = []
+        for month in self.months():
+            if end is not None and month >= end:
+                continue
+            if start is not None and month_start(month, -1) <= start:
+                break
+            if before is not None and month > before[0]:
+                continue
+            if (user_id or action_type) and not self._may_match(month, user_id, action_type):
+                continue
+            for row in self._month_rows(month):
+                if before is not None and (row['timestamp'], row['log_id']) >= before:
+                    continue
+                if user_id and row['user_id'] != user_id:
+                    continue
+                if action_type and row['action_type'] != action_type:
+                    continue
+                if start is not None and row['timestamp'] < start:
+                    continue
+                if end is not None and row['timestamp'] >= end:
+                    continue
+                results.append(dict(row))
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _may_match(self, month, user_id, action_type):
+        summary = self._month_summary(month)
+        if summary is None:
+            return True
+        user_ids, action_types = summary
+        return (not user_id or user_id in user_ids) and (not action_type or action_type in action_types)
+
+    def _month_summary(self, month):
+        """
+        Returns (user ids, action types) of the entries in `month`, or None if the file is gone.
+        Read from the month's index file; a month without a current one (written before
+        indexes existed, or rewritten by an interrupted run) is decoded once instead.
+        """
+        path = archive_path(self.archive_dir, month)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._lock:
+            summary = self._summaries.get(path)
+        if summary is not None and summary[0] == mtime:
+            return summary[1:]
+
+        try:
+            with open(_index_path(path), encoding='utf-8') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            index = None
+        if index is not None and index.get('archive_mtime') == mtime:
+            summary = (mtime, frozenset(index['user_ids']), frozenset(index['action_types']))
+        else:
+            rows = self._month_rows(month)
+            summary = (mtime, frozenset(row['user_id'] for row in rows if row['user_id'] is not None),
+                       frozenset(row['action_type'] for row in rows))
+        with self._lock:
+            self._summaries[path] = summary
+        return summary[1:]
+
+    def _month_rows(self, month):
+        path = archive_path(self.archive_dir, month)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return []
+        with self._lock:
+            cached = self._cached.get(path)
+            if cached is not None and cached[0] == mtime:
+                self._cached.move_to_end(path)
+                return cached[1]
+        rows = [_from_record(record) for record in self._read_records(path)]
+        rows.sort(key=lambda row: (row['timestamp'], row['log_id']), reverse=True)
+        with self._lock:
+            self._cached[path] = (mtime, rows)
+            self._cached.move_to_end(path)
+            while len(self._cached) > CACHED_MONTHS:
+                self._cached.popitem(last=False)
+        return rows
+
+    @staticmethod
+    def _read_records(path):
+        if not os.path.exists(path):
+            return []
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            return [json.loads(line) for line in archive if line.strip()]
@@ -0,0 +1,200 @@
+# real_estate_system/utils/activity_log.py
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+# Entries are written once this many are waiting, or FLUSH_INTERVAL_MS after the first one.
+BATCH_SIZE = 100
+FLUSH_INTERVAL_MS = 500
+# Seconds between attempts to replay the spool while MySQL is unreachable.
+RETRY_INTERVAL = 30
+
+_STOP = object()
+
+
+class ActivityLogWriter:
+    """
+    Writes activity log entries from a background thread so user actions never wait
+    on an audit INSERT.
+
+    Entries are queued in memory and handed to `write_batch` in groups of up to
+    `batch_size`, at most `flush_interval_ms` after the first one was queued.
+    `write_batch(entries)` must write every entry or raise; a batch that fails is
+    appended to a JSON-lines spool file and replayed, oldest first, once a later
+    write succeeds or RETRY_INTERVAL has passed. Entries are (timestamp, user_id,
+    action_type, details) tuples with the timestamp as a "%Y-%m-%d %H:%M:%S" string.
+    """
+
+    def __init__(self, write_batch, spool_path, batch_size=BATCH_SIZE, flush_interval_ms=FLUSH_INTERVAL_MS):
+        self.write_batch = write_batch
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._next_retry = 0.0  # Replay a spool left over from the last run straight away
+
+    def enqueue(self, entry):
+        """Queues one entry; returns immediately."""
+        if self._closed:
+            self._spool([entry])
+            return
+        self._ensure_started()
+        self._queue.put(tuple(entry))
+
+    def flush(self, timeout=5.0):
+        """
+        Blocks until every entry queued so far has been written or spooled.
+        Returns: True if the queue drained within `timeout` seconds.
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Flushes the queue and stops the writer thread. Later entries go straight to the spool."""
+        with self._lock:
+            thread = self._thread
+            self._closed = True
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            print("Activity log writer did not stop in time; unwritten entries are kept in memory only.",
+                  file=sys.stderr)
+
+    def pending_spool_entries(self):
+        """Returns the number of entries waiting in the spool file."""
+        try:
+            with open(self.spool_path, 'r', encoding='utf-8') as spool:
+                return sum(1 for line in spool if line.strip())
+        except OSError:
+            return 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+                # The thread is a daemon so it never holds the app open; however the
+                # interpreter exits, queued entries are still written or spooled first.
+                atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                if stop or waiters:
+                    # A flush or stop request writes what is queued without waiting out the interval.
+                    item = self._next_nowait()
+                    if item is None:
+                        break
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop and self._queue.empty():
+                return
+            if stop:
+                self._queue.put(_STOP)
+
+    def _next_nowait(self):
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _write(self, batch):
+        if os.path.exists(self.spool_path) and time.monotonic() >= self._next_retry:
+            if not self._replay_spool():
+                self._spool(batch)
+                return
+        elif os.path.exists(self.spool_path):
+            # Keep the spool in order while MySQL is still unreachable.
+            self._spool(batch)
+            return
+        if not batch:
+            return
+        try:
+            self.write_batch(batch)
+        except Exception as e:
+            print(f"Could not write {len(batch)} activity log entries, spooling them: {e}", file=sys.stderr)
+            self._spool(batch)
+
+    def _replay_spool(self):
+        """Writes the spooled entries in batches and removes the spool. Returns False if MySQL is still down."""
+        try:
+            with open(self.spool_path, 'r', encoding='utf-8') as spool:
+                entries = [tuple(json.loads(line)) for line in spool if line.strip()]
+        except (OSError, ValueError) as e:
+            print(f"Could not read activity log spool {self.spool_path}: {e}", file=sys.stderr)
+            self._next_retry = time.monotonic() + RETRY_INTERVAL
+            return False
+
+        written = 0
+        try:
+            for start in range(0, len(entries), self.batch_size):
+                self.write_batch(entries[start:start + self.batch_size])
+                written = start + self.batch_size
+        except Exception as e:
+            print(f"Activity log spool not replayed yet: {e}", file=sys.stderr)
+            self._rewrite_spool(entries[written:])
+            self._next_retry = time.monotonic() + RETRY_INTERVAL
+            return False
+        self._rewrite_spool([])
+        return True
+
+    def _spool(self, entries):
+        if not entries:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+            with open(self.spool_path, 'a', encoding='utf-8') as spool:
+                for entry in entries:
+                    spool.write(json.dumps(list(entry)) + "\n")
+        except OSError as e:
+            print(f"Could not spool activity log entries to {self.spool_path}: {e}", file=sys.stderr)
+
+    def _rewrite_spool(self, entries):
+        try:
+            if not entries:
+                os.remove(self.spool_path)
+                return
+            temp_path = self.spool_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as spool:
+                for entry in entries:
+                    spool.write(json.dumps(list(entry)) + "\n")
+            os.replace(temp_path, self.spool_path)
+        except OSError as e:
+            print(f"Could not update activity log spool {self.spool_path}: {e}", file=sys.stderr)
@@ -0,0 +1,236 @@
+# real_estate_system/utils/background.py
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# How often (ms) the Tk main loop checks for finished background calls.
+POLL_INTERVAL_MS = 30
+# How long (ms) typing has to pause before a search box refreshes its list.
+DEBOUNCE_MS = 250
+
+
+class BackgroundTask:
+    """Handle for a call submitted to the BackgroundExecutor."""
+
+    def __init__(self, widget, key, on_success, on_error, on_finally):
+        self.widget = widget
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_finally = on_finally
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Discards the result. The call itself is skipped if it has not started yet."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class BackgroundExecutor:
+    """
+    Runs blocking calls (typically DatabaseManager queries) on a thread pool and hands
+    the results back to the Tk main thread.
+
+    Worker threads never touch Tk. Finished calls are put on a queue that the main
+    thread drains with widget.after(), and the callbacks run there. Submitting a call
+    with a `key` cancels the previous call with the same key on the same widget, so
+    only the newest request for, say, a filtered list ever updates the view.
+    """
+
+    def __init__(self, max_workers=4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._latest = {}  # (id(widget), key) -> BackgroundTask
+        self._pending = set()  # Tasks whose result has not been delivered yet
+        self._poll_scheduled = False
+
+    def submit(self, widget, fn, *args, key=None, on_success=None, on_error=None, on_finally=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in the background.
+
+        on_success(result) or on_error(exception) is called on the Tk thread, followed by
+        on_finally(), unless the task was cancelled or `widget` was destroyed meanwhile.
+        Returns: The BackgroundTask, which can be cancelled.
+        """
+        task = BackgroundTask(widget, key, on_success, on_error, on_finally)
+        with self._lock:
+            if key is not None:
+                previous = self._latest.get((id(widget), key))
+                if previous is not None:
+                    previous.cancel()
+                self._latest[(id(widget), key)] = task
+            self._pending.add(task)
+
+        task.future = self._pool.submit(self._run, task, fn, args, kwargs)
+        task.future.add_done_callback(lambda future: self._on_future_done(task, future))
+        self._schedule_poll(widget)
+        return task
+
+    def cancel_all(self, widget):
+        """Cancels every pending call submitted for `widget`, e.g. when its window closes."""
+        with self._lock:
+            for (widget_id, key), task in list(self._latest.items()):
+                if widget_id == id(widget):
+                    task.cancel()
+                    del self._latest[(widget_id, key)]
+
+    def shutdown(self):
+        """Stops accepting work and drops queued calls. Running calls finish in the background."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, task, fn, args, kwargs):
+        if task.cancelled:
+            return None
+        return fn(*args, **kwargs)
+
+    def _on_future_done(self, task, future):
+        # Runs on the worker thread (or the caller's thread for a cancelled future); only queue it.
+        self._results.put((task, future))
+
+    def _schedule_poll(self, widget):
+        with self._lock:
+            if self._poll_scheduled:
+                return
+            self._poll_scheduled = True
+        try:
+            widget.after(POLL_INTERVAL_MS, lambda: self._drain(widget))
+        except Exception:
+            # The widget is already gone; let the next submit schedule polling again.
+            with self._lock:
+                self._poll_scheduled = False
+
+    def _drain(self, widget):
+        """Delivers finished calls on the Tk main thread."""
+        while True:
+            try:
+                task, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._pending.discard(task)
+                if task.key is not None and self._latest.get((id(task.widget), task.key)) is task:
+                    del self._latest[(id(task.widget), task.key)]
+            self._deliver(task, future)
+
+        with self._lock:
+            self._poll_scheduled = False
+            outstanding = bool(self._pending)
+        if outstanding:
+            # Keep polling while calls are in flight; fall back to any live widget.
+            poll_widget = widget if self._widget_alive(widget) else self._any_live_widget()
+            if poll_widget is not None:
+                self._schedule_poll(poll_widget)
+
+    def _deliver(self, task, future):
+        if task.cancelled or future.cancelled() or not self._widget_alive(task.widget):
+            return
+        try:
+            error = future.exception()
+            if error is None:
+                if task.on_success:
+                    task.on_success(future.result())
+            elif task.on_error:
+                task.on_error(error)
+            else:
+                print(f"Background call failed: {error}", file=sys.stderr)
+        finally:
+            if task.on_finally:
+                task.on_finally()
+
+    def _any_live_widget(self):
+        with self._lock:
+            tasks = list(self._pending)
+        for task in tasks:
+            if self._widget_alive(task.widget):
+                return task.widget
+        return None
+
+    @staticmethod
+    def _widget_alive(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the application-wide BackgroundExecutor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BackgroundExecutor()
+        return _executor
+
+
+def shutdown_executor():
+    """Shuts the application-wide executor down. Called when the application exits."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+def run_in_background(widget, fn, *args, **kwargs):
+    """Shortcut for get_executor().submit(widget, fn, *args, **kwargs)."""
+    return get_executor().submit(widget, fn, *args, **kwargs)
+
+
+class Debouncer:
+    """
+    Delays a callback until calls to it stop for `delay_ms`, e.g. so a list filters
+    once the user pauses typing instead of on every key release.
+
+    Usage:
+        self._search_debouncer = Debouncer(self, self._apply_search)
+        self.search_entry.bind("<KeyRelease>", self._search_debouncer)
+    """
+
+    def __init__(self, widget, callback, delay_ms=DEBOUNCE_MS):
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._after_id = None
+
+    def __call__(self, *args):
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def flush(self):
+        """Runs a pending callback immediately."""
+        if self._after_id is not None:
+            self.cancel()
+            self.callback()
+
+    def _fire(self):
+        self._after_id = None
+        try:
+            if not self.widget.winfo_exists():
+                return
+        except Exception:
+            return
+        self.callback()
+
+
+def set_loading(widget, loading):
+    """Shows or clears the busy cursor on a window while a background call is running."""
+    try:
+        widget.winfo_toplevel().config(cursor="watch" if loading else "")
+    except Exception:
+        pass
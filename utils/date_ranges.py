@@ -0,0 +1,25 @@
+# real_estate_system/utils/date_ranges.py
+from datetime import date, datetime, time, timedelta
+
+
+def start_of_day(value):
+    """Returns midnight at the start of `value`, a date, datetime or 'YYYY-MM-DD' string."""
+    if isinstance(value, datetime):
+        return datetime.combine(value.date(), time.min)
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    return datetime.strptime(str(value).strip()[:10], '%Y-%m-%d')
+
+
+def start_of_next_day(value):
+    """Returns midnight at the start of the day after `value`."""
+    return start_of_day(value) + timedelta(days=1)
+
+
+def day_range(start, end):
+    """
+    Returns (lower, upper) bounds covering the whole days from `start` to `end`, for a
+    half-open predicate `col >= lower AND col < upper`. Unlike DATE(col) BETWEEN ... it
+    leaves the column bare, so MySQL can answer it with an index range scan.
+    """
+    return start_of_day(start), start_of_next_day(end)
@@ -0,0 +1,194 @@
+# real_estate_system/utils/db_pool.py
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of MySQL connections.
+
+    Connections are handed out with acquire() and returned with release().
+    Idle connections older than `idle_timeout` seconds are closed, and a
+    connection that has been idle longer than `health_check_interval` seconds
+    is pinged before it is handed out again.
+    """
+
+    def __init__(self, db_config, max_size=5, idle_timeout=300, health_check_interval=30, acquire_timeout=10):
+        self.db_config = db_config
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, generation, last_used)
+        self._in_use = 0
+        self._generation = 0  # Bumped on reset() so stale connections are dropped on release
+
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'timeouts': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+            'health_check_failures': 0,
+            'idle_evictions': 0,
+        }
+
+    def configure(self, max_size=None, idle_timeout=None, health_check_interval=None, acquire_timeout=None):
+        """Updates the pool limits. Shrinking takes effect as connections are returned."""
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max(1, int(max_size))
+            if idle_timeout is not None:
+                self.idle_timeout = float(idle_timeout)
+            if health_check_interval is not None:
+                self.health_check_interval = float(health_check_interval)
+            if acquire_timeout is not None:
+                self.acquire_timeout = float(acquire_timeout)
+            self._lock.notify_all()
+
+    def acquire(self):
+        """
+        Returns an open connection, reusing an idle one when possible.
+        Blocks up to `acquire_timeout` seconds when the pool is exhausted.
+        Raises mysql.connector.Error if no connection could be obtained.
+        """
+        start = time.monotonic()
+        waited = False
+        with self._lock:
+            while True:
+                self._evict_idle_locked()
+                if self._idle:
+                    conn, generation, last_used = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_size:
+                    conn, generation, last_used = None, self._generation, None
+                    self._in_use += 1
+                    break
+
+                remaining = self.acquire_timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise mysql.connector.errors.PoolError(
+                        f"Timed out after {self.acquire_timeout}s waiting for a free database connection."
+                    )
+                waited = True
+                self._lock.wait(remaining)
+
+        # Connecting and pinging happen outside the lock so other threads are not blocked.
+        try:
+            if conn is not None and time.monotonic() - last_used >= self.health_check_interval:
+                if not self._is_healthy(conn):
+                    with self._lock:
+                        self._stats['health_check_failures'] += 1
+                    self._close(conn)
+                    conn = None
+            if conn is None:
+                conn = mysql.connector.connect(**self.db_config)
+                with self._lock:
+                    self._stats['connections_created'] += 1
+                    generation = self._generation
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        conn._pool_generation = generation
+        wait_time = time.monotonic() - start
+        with self._lock:
+            self._stats['checkouts'] += 1
+            if waited:
+                self._stats['waits'] += 1
+            self._stats['total_wait_time'] += wait_time
+            self._stats['max_wait_time'] = max(self._stats['max_wait_time'], wait_time)
+        return conn
+
+    def release(self, conn):
+        """Returns a connection to the pool, closing it if it is broken, stale or surplus."""
+        if conn is None:
+            return
+        keep = True
+        try:
+            if not conn.is_connected():
+                keep = False
+            elif conn.in_transaction:
+                # End any snapshot left open by a SELECT so the next user sees fresh data.
+                conn.rollback()
+        except Exception:
+            keep = False
+
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+            generation = getattr(conn, '_pool_generation', None)
+            if keep and generation == self._generation and len(self._idle) + self._in_use < self.max_size:
+                self._idle.append((conn, generation, time.monotonic()))
+                conn = None
+            self._lock.notify()
+        if conn is not None:
+            self._close(conn)
+
+    def reset(self, db_config=None):
+        """Closes all idle connections; connections in use are closed when released."""
+        with self._lock:
+            if db_config is not None:
+                self.db_config = db_config
+            self._generation += 1
+            idle = [entry[0] for entry in self._idle]
+            self._idle.clear()
+            self._lock.notify_all()
+        for conn in idle:
+            self._close(conn)
+
+    def close_all(self):
+        """Closes every idle connection. Used when the application shuts down."""
+        self.reset()
+
+    def stats(self):
+        """Returns a snapshot of the pool counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['in_use'] = self._in_use
+            snapshot['idle'] = len(self._idle)
+            snapshot['max_size'] = self.max_size
+        checkouts = snapshot['checkouts']
+        snapshot['avg_wait_time'] = snapshot['total_wait_time'] / checkouts if checkouts else 0.0
+        # Churn: the share of checkouts that had to open a brand-new connection.
+        snapshot['churn_ratio'] = snapshot['connections_created'] / checkouts if checkouts else 0.0
+        return snapshot
+
+    def _evict_idle_locked(self):
+        """Drops idle connections that exceeded idle_timeout. Caller must hold the lock."""
+        if not self._idle:
+            return
+        now = time.monotonic()
+        expired = []
+        # The deque is ordered oldest-first, so stop at the first fresh connection.
+        while self._idle and now - self._idle[0][2] >= self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+        if expired:
+            self._stats['idle_evictions'] += len(expired)
+            # Close on a helper thread: closing sends a packet and must not hold the lock.
+            threading.Thread(target=lambda: [self._close(c) for c in expired], daemon=True).start()
+
+    def _is_healthy(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._stats['connections_closed'] += 1
@@ -0,0 +1,36 @@
+# real_estate_system/utils/fulltext_search.py
+import re
+
+# InnoDB leaves words shorter than innodb_ft_min_token_size (3 by default) out of its
+# FULLTEXT indexes, so such words have to be matched some other way.
+MIN_TOKEN_LENGTH = 3
+
+# Relevance given to rows matched exactly by number (e.g. a project ID) so they rank
+# above any text match.
+EXACT_MATCH_SCORE = 1000000.0
+
+# The FULLTEXT parser splits words on anything that is not a letter, digit or underscore.
+_WORD_RE = re.compile(r"\w+")
+
+
+def split_search_terms(text):
+    """
+    Splits search input into lowercase words the way the FULLTEXT parser does.
+    Returns: (indexed_terms, short_terms). indexed_terms can be looked up in a FULLTEXT
+    index; short_terms are too short for it. Repeated words are dropped.
+    """
+    indexed_terms = []
+    short_terms = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        terms = indexed_terms if len(word) >= MIN_TOKEN_LENGTH else short_terms
+        if word not in terms:
+            terms.append(word)
+    return indexed_terms, short_terms
+
+
+def boolean_mode_query(terms):
+    """
+    Builds the search string for MATCH ... AGAINST (%s IN BOOLEAN MODE) in which every
+    term is required and may be the start of a longer word: ['kit', 'road'] -> '+kit* +road*'.
+    """
+    return " ".join(f"+{term}*" for term in terms)
@@ -0,0 +1,14 @@
+# real_estate_system/utils/installment_schedule.py
+from dateutil.relativedelta import relativedelta
+
+
+def generate_installment_schedule(start_date, duration_months, installment_amount):
+    """
+    Builds the monthly due dates for an installment plan.
+    The first installment falls due one month after `start_date`.
+    Returns: A list of (due_date, due_amount) tuples, one per month.
+    """
+    return [
+        (start_date + relativedelta(months=i + 1), installment_amount)
+        for i in range(max(0, int(duration_months)))
+    ]
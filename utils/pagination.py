@@ -0,0 +1,54 @@
+# real_estate_system/utils/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+
+def _to_json_value(value):
+    """Converts a sort-key value into something json can store without losing precision."""
+    if isinstance(value, Decimal):
+        return {'d': str(value)}
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'da': value.isoformat()}
+    return value
+
+
+def _from_json_value(value):
+    if isinstance(value, dict):
+        if 'd' in value:
+            return Decimal(value['d'])
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'da' in value:
+            return date.fromisoformat(value['da'])
+    return value
+
+
+def encode_cursor(sort_by, descending, last_value, last_id):
+    """
+    Builds an opaque keyset cursor pointing just past the row (last_value, last_id)
+    of a listing ordered by `sort_by`.
+    """
+    payload = [sort_by, bool(descending), _to_json_value(last_value), last_id]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor, sort_by, descending):
+    """
+    Returns (last_value, last_id) from a cursor made by encode_cursor, or None if the
+    cursor is empty, malformed, or was issued for a different sort order.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        cursor_sort_by, cursor_descending, last_value, last_id = payload
+    except (ValueError, TypeError):
+        return None
+    if cursor_sort_by != sort_by or cursor_descending != bool(descending):
+        return None
+    return _from_json_value(last_value), last_id
@@ -0,0 +1,222 @@
+# real_estate_system/utils/pdf_preview.py
+import bisect
+from collections import OrderedDict
+import tkinter as tk
+from PIL import Image, ImageTk
+
+from utils.background import Debouncer
+
+try:
+    import fitz  # PyMuPDF
+    _FITZ_AVAILABLE = True
+except ImportError:
+    _FITZ_AVAILABLE = False
+
+# Rendered pages kept as PhotoImages; older ones are dropped and re-rendered when scrolled back to.
+CACHE_PAGES = 8
+# Pages above and below the viewport rendered ahead of scrolling.
+PREFETCH_PAGES = 1
+PAGE_MARGIN = 10
+PAGE_GAP = 5
+# Resizing re-lays the pages out at the new width once the user stops dragging.
+RESIZE_DELAY_MS = 150
+_PAGE_TAG = "pdf_page"
+_WHEEL_EVENTS = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+
+
+class PdfPreviewCanvas(tk.Canvas):
+    """
+    A drop-in replacement for the tk.Canvas a PDF preview is drawn on that only renders
+    the pages in or next to the viewport, so a 200-page report opens instantly.
+
+    show_pdf() lays every page out as a placeholder sized to fit the canvas width and
+    renders pages with PyMuPDF straight at that zoom (no resampling) as they scroll into
+    view. At most `cache_pages` rendered pages are kept, least recently shown dropped
+    first. The PDF is read into memory, so the file can be overwritten while it is shown.
+    delete("all") also closes the document, so existing code that clears the canvas to
+    draw a message keeps working.
+    """
+
+    def __init__(self, master=None, cache_pages=CACHE_PAGES, prefetch_pages=PREFETCH_PAGES, **kw):
+        self._yscrollcommand = kw.pop('yscrollcommand', None)
+        super().__init__(master, **kw)
+        super().configure(yscrollcommand=self._on_yscroll)
+        self.cache_pages = cache_pages
+        self.prefetch_pages = prefetch_pages
+        self._doc = None
+        self._page_tops = []        # Canvas y of each page's top edge
+        self._page_zooms = []       # Zoom that fits each page to the layout width
+        self._images = OrderedDict()  # page index -> (PhotoImage, canvas item), least recently shown first
+        self._layout_width = None
+        self._render_after_id = None
+        self._resize_debouncer = Debouncer(self, self._relayout, RESIZE_DELAY_MS)
+
+        self.bind("<Configure>", self._on_configure, add="+")
+        for sequence in _WHEEL_EVENTS:
+            self.bind(sequence, self._on_mousewheel, add="+")
+
+    @property
+    def page_count(self):
+        return self._doc.page_count if self._doc is not None else 0
+
+    def show_pdf(self, source):
+        """
+        Shows a PDF given as a file path or bytes, scrolled to the top.
+        Returns: The number of pages.
+        """
+        if not _FITZ_AVAILABLE:
+            raise RuntimeError("PyMuPDF (fitz) is not installed. PDF preview is not available.")
+        self.delete("all")
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        else:
+            with open(source, 'rb') as pdf_file:
+                data = pdf_file.read()
+        self._doc = fitz.open(stream=data, filetype="pdf")
+        self._layout()
+        self.yview_moveto(0)
+        self._schedule_render()
+        return self._doc.page_count
+
+    def delete(self, *args):
+        if "all" in args:
+            self._close_document()
+        super().delete(*args)
+
+    def configure(self, cnf=None, **kw):
+        # Scrolling has to trigger rendering, so the native widget keeps our yscrollcommand.
+        handled = False
+        if isinstance(cnf, dict) and 'yscrollcommand' in cnf:
+            cnf = dict(cnf)
+            self._yscrollcommand = cnf.pop('yscrollcommand')
+            handled = True
+        if 'yscrollcommand' in kw:
+            self._yscrollcommand = kw.pop('yscrollcommand')
+            handled = True
+        if handled and not cnf and not kw:
+            return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def destroy(self):
+        self._resize_debouncer.cancel()
+        self._close_document()
+        super().destroy()
+
+    # --- Layout and rendering --------------------------------------------------------
+
+    def _layout(self):
+        """Draws a placeholder for every page at the current width and sets the scroll region."""
+        self._drop_images()
+        super().delete(_PAGE_TAG)
+        canvas_width = max(self.winfo_width(), 1)
+        self._layout_width = canvas_width
+        target_width = max(canvas_width - 2 * PAGE_MARGIN, 50)
+
+        self._page_tops = []
+        self._page_zooms = []
+        y = PAGE_MARGIN
+        for index in range(self._doc.page_count):
+            rect = self._doc.load_page(index).rect
+            zoom = target_width / rect.width if rect.width else 1.0
+            height = int(rect.height * zoom)
+            self._page_tops.append(y)
+            self._page_zooms.append(zoom)
+            self.create_rectangle(PAGE_MARGIN, y, PAGE_MARGIN + target_width, y + height,
+                                  outline="#cccccc", fill="white", tags=(_PAGE_TAG,))
+            self.create_text(PAGE_MARGIN + target_width / 2, y + height / 2, text=f"Page {index + 1}",
+                             fill="gray", tags=(_PAGE_TAG,))
+            y += height + PAGE_GAP
+        super().configure(scrollregion=(0, 0, canvas_width, y - PAGE_GAP + PAGE_MARGIN))
+
+    def _relayout(self):
+        if self._doc is None:
+            return
+        top = self.yview()[0]
+        self._layout()
+        self.yview_moveto(top)
+        self._schedule_render()
+
+    def _schedule_render(self):
+        if self._render_after_id is None and self._doc is not None:
+            self._render_after_id = self.after_idle(self._render_visible)
+
+    def _render_visible(self):
+        """Renders one missing page near the viewport per call, so scrolling stays responsive."""
+        self._render_after_id = None
+        if self._doc is None or not self._page_tops:
+            return
+        top = self.canvasy(0)
+        bottom = self.canvasy(self.winfo_height())
+        first = max(bisect.bisect_right(self._page_tops, top) - 1, 0)
+        last = max(bisect.bisect_right(self._page_tops, bottom) - 1, first)
+        visible = list(range(first, last + 1))
+        prefetch = [index for index in range(first - self.prefetch_pages, last + self.prefetch_pages + 1)
+                    if 0 <= index < self._doc.page_count and index not in visible]
+
+        wanted = visible + prefetch
+        for index in wanted:
+            if index in self._images:
+                self._images.move_to_end(index)
+        for index in wanted:
+            if index in self._images:
+                continue
+            self._render_page(index)
+            self._evict(keep=len(wanted))
+            self._schedule_render()
+            return
+
+    def _render_page(self, index):
+        zoom = self._page_zooms[index]
+        pix = self._doc.load_page(index).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        image = ImageTk.PhotoImage(Image.frombytes("RGB", [pix.width, pix.height], pix.samples), master=self)
+        item = self.create_image(PAGE_MARGIN, self._page_tops[index], image=image, anchor=tk.NW)
+        self._images[index] = (image, item)
+
+    def _evict(self, keep):
+        while len(self._images) > max(self.cache_pages, keep):
+            _index, (_image, item) = self._images.popitem(last=False)
+            super().delete(item)
+
+    def _drop_images(self):
+        for _image, item in self._images.values():
+            super().delete(item)
+        self._images.clear()
+
+    def _close_document(self):
+        if self._render_after_id is not None:
+            try:
+                self.after_cancel(self._render_after_id)
+            except tk.TclError:
+                pass
+            self._render_after_id = None
+        self._images.clear()
+        self._page_tops = []
+        self._page_zooms = []
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    # --- Events ------------------------------------------------------------------------
+
+    def _on_yscroll(self, first, last):
+        if self._yscrollcommand:
+            self._yscrollcommand(first, last)
+        self._schedule_render()
+
+    def _on_configure(self, event):
+        if self._doc is not None and event.width != self._layout_width:
+            self._resize_debouncer()
+        else:
+            self._schedule_render()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.yview_scroll(step, "units")
+        return "break"
@@ -0,0 +1,77 @@
+# real_estate_system/utils/query_cache.py
+import re
+import threading
+import time
+from collections import defaultdict
+
+# Matches the target table of INSERT/REPLACE/UPDATE/DELETE statements.
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+
+def tables_written_by(query):
+    """Returns the set of table names a write statement modifies (empty for reads)."""
+    match = _WRITE_TABLE_RE.match(query)
+    return {match.group(1).lower()} if match else set()
+
+
+class QueryCache:
+    """
+    A small in-process cache for query results.
+
+    Every table has a version counter that is bumped whenever a write to it is
+    committed. A cached value remembers the versions of the tables it was built
+    from and is discarded as soon as one of them changes or its TTL runs out.
+    """
+
+    def __init__(self, default_ttl=30):
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (value, table_versions, expires_at)
+        self._table_versions = defaultdict(int)
+
+    def table_versions(self, tables):
+        """Returns the current version of each table, as a tuple ordered like `tables`."""
+        with self._lock:
+            return tuple(self._table_versions[table] for table in tables)
+
+    def note_write(self, query):
+        """Bumps the version of the table a committed write statement touched."""
+        tables = tables_written_by(query)
+        if tables:
+            self.invalidate_tables(tables)
+
+    def invalidate_tables(self, tables):
+        with self._lock:
+            for table in tables:
+                self._table_versions[table.lower()] += 1
+
+    def get(self, key, tables):
+        """Returns the cached value for `key`, or None if it is missing, expired or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, versions, expires_at = entry
+            current = tuple(self._table_versions[table] for table in tables)
+            if time.monotonic() >= expires_at or versions != current:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, tables, versions=None, ttl=None):
+        """
+        Stores `value` under `key`. Pass the `versions` read with table_versions() before
+        the query ran so a write that lands while the query is running is not masked.
+        """
+        with self._lock:
+            if versions is None:
+                versions = tuple(self._table_versions[table] for table in tables)
+            expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+            self._entries[key] = (value, versions, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
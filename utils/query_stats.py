@@ -0,0 +1,182 @@
+# real_estate_system/utils/query_stats.py
+import logging
+import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket catches everything slower.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+
+def estimate_result_bytes(result):
+    """Roughly estimates how many bytes a fetched result carried over the wire."""
+    if result is None:
+        return 0
+    rows = result if isinstance(result, list) else [result]
+    total = 0
+    for row in rows:
+        values = row.values() if isinstance(row, dict) else row
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, (bytes, bytearray)):
+                total += len(value)
+            elif isinstance(value, str):
+                total += len(value.encode('utf-8', errors='ignore'))
+            elif isinstance(value, (int, float, Decimal)):
+                total += 8
+            elif isinstance(value, (datetime, date)):
+                total += 8
+            else:
+                total += len(str(value))
+    return total
+
+
+def describe_params(params):
+    """
+    Describes query parameters by count and type only, e.g. "2 (str, int)", so logs
+    never hold the values themselves (usernames, password hashes, client details).
+    """
+    if not params:
+        return "none"
+    if isinstance(params, dict):
+        types = (f"{name}: {type(value).__name__}" for name, value in params.items())
+    elif isinstance(params, (list, tuple)):
+        types = (type(value).__name__ for value in params)
+    else:
+        return type(params).__name__
+    return f"{len(params)} ({', '.join(types)})"
+
+
+class _MethodStats:
+    __slots__ = ('calls', 'errors', 'total_time', 'max_time', 'total_acquire_time',
+                 'total_rows', 'total_bytes', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.total_acquire_time = 0.0
+        self.total_rows = 0
+        self.total_bytes = 0
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+
+
+class QueryStats:
+    """
+    Collects per-method query metrics for DatabaseManager: call counts, latency
+    histograms, rows returned, bytes fetched and connection acquisition time.
+    Queries slower than `slow_threshold_ms` are written to a rotating log file with
+    only the count and types of their parameters (see describe_params), never the values.
+    """
+
+    def __init__(self, slow_log_path, slow_threshold_ms=500, max_log_bytes=1024 * 1024, backup_count=5):
+        self.slow_log_path = slow_log_path
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_log_bytes = max_log_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._methods = {}
+        self._slow_logger = None
+
+    def record(self, method, elapsed, acquire_time=0.0, rows=0, bytes_fetched=0, query=None, params=None, error=False):
+        """Adds one call of `method`. Times are in seconds."""
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.calls += 1
+            stats.errors += 1 if error else 0
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.total_acquire_time += acquire_time
+            stats.total_rows += rows or 0
+            stats.total_bytes += bytes_fetched or 0
+            for index, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    stats.histogram[index] += 1
+                    break
+
+        if self.slow_threshold_ms and elapsed_ms >= self.slow_threshold_ms:
+            self._log_slow_query(method, elapsed_ms, acquire_time * 1000, rows, query, params)
+
+    def snapshot(self):
+        """Returns a list of per-method summaries (times in ms)."""
+        with self._lock:
+            items = [(method, stats, list(stats.histogram)) for method, stats in self._methods.items()]
+        summaries = []
+        for method, stats, histogram in items:
+            calls = stats.calls or 1
+            summaries.append({
+                'method': method,
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'avg_ms': stats.total_time * 1000 / calls,
+                'p95_ms': self._percentile_ms(histogram, stats.calls, 0.95, stats.max_time * 1000),
+                'max_ms': stats.max_time * 1000,
+                'total_ms': stats.total_time * 1000,
+                'avg_acquire_ms': stats.total_acquire_time * 1000 / calls,
+                'avg_rows': stats.total_rows / calls,
+                'avg_bytes': stats.total_bytes / calls,
+                'histogram': histogram,
+            })
+        return summaries
+
+    def top_slowest(self, limit=20, key='avg_ms'):
+        return sorted(self.snapshot(), key=lambda s: s[key], reverse=True)[:limit]
+
+    def most_frequent(self, limit=20):
+        return sorted(self.snapshot(), key=lambda s: s['calls'], reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+    @staticmethod
+    def _percentile_ms(histogram, calls, fraction, max_ms):
+        """Upper bound of the histogram bucket that holds the given percentile."""
+        if not calls:
+            return 0.0
+        target = calls * fraction
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+            seen += count
+            if seen >= target:
+                return min(bound, max_ms)
+        return max_ms
+
+    def _log_slow_query(self, method, elapsed_ms, acquire_ms, rows, query, params):
+        logger = self._get_slow_logger()
+        if logger is None:
+            return
+        compact_query = " ".join((query or "").split())
+        logger.warning(
+            "%s took %.1f ms (connection wait %.1f ms, %s rows) | %s | params=%s",
+            method, elapsed_ms, acquire_ms, rows, compact_query, describe_params(params)
+        )
+
+    def _get_slow_logger(self):
+        if self._slow_logger is not None:
+            return self._slow_logger
+        with self._lock:
+            if self._slow_logger is None:
+                try:
+                    os.makedirs(os.path.dirname(self.slow_log_path), exist_ok=True)
+                    handler = RotatingFileHandler(
+                        self.slow_log_path, maxBytes=self.max_log_bytes,
+                        backupCount=self.backup_count, encoding='utf-8'
+                    )
+                    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                    logger = logging.getLogger("real_estate_system.slow_queries")
+                    logger.setLevel(logging.WARNING)
+                    logger.propagate = False
+                    logger.addHandler(handler)
+                    self._slow_logger = logger
+                except OSError as e:
+                    print(f"Could not open slow query log {self.slow_log_path}: {e}")
+                    self.slow_threshold_ms = 0  # Stop retrying on every slow query
+            return self._slow_logger
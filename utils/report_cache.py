@@ -0,0 +1,171 @@
+# real_estate_system/utils/report_cache.py
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+import uuid
+
+# Upper bound, in bytes, on the cached report rows and PDFs kept on disk.
+REPORT_CACHE_BYTES = 200 * 1024 * 1024
+# Seconds a cached report is served at most, bounding how long a change the data versions
+# do not capture (such as a client renamed on another workstation) can go unnoticed.
+REPORT_CACHE_TTL = 600
+
+_ROWS_SUFFIX = ".rows.pickle"
+_PDF_SUFFIX = ".pdf"
+
+
+class ReportCache:
+    """
+    Report query results and rendered PDFs kept on disk under `cache_dir`.
+
+    An entry is keyed on the report type, its date range and the data versions the
+    caller passes (QueryCache table versions plus a MySQL-side version), so a write
+    to the report's data leaves the old entry unreachable. QueryCache versions start
+    over with every process, so keys also hold a per-process token and files left by
+    an earlier run are never read, only pruned. Rows shared by several reports are
+    cached once, and each report's PDF key is linked to them (see link).
+    Files are evicted least recently used first once they take more than `max_bytes`.
+    """
+
+    def __init__(self, cache_dir, max_bytes=REPORT_CACHE_BYTES, ttl=REPORT_CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._token = uuid.uuid4().hex
+        self._created = {}  # key -> time.time() its rows were fetched
+
+    def key(self, report_type, start_date, end_date, versions):
+        raw = repr((self._token, report_type, str(start_date), str(end_date), tuple(versions)))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get_rows(self, key):
+        """Returns the cached rows for `key`, or None if they are missing or expired."""
+        if not self._fresh(key):
+            return None
+        path = self._path(key, _ROWS_SUFFIX)
+        try:
+            with open(path, 'rb') as rows_file:
+                rows = pickle.load(rows_file)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+        self._touch(path)
+        return rows
+
+    def put_rows(self, key, rows):
+        with self._lock:
+            self._created[key] = time.time()
+        self._write(key, _ROWS_SUFFIX, lambda f: pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def link(self, key, rows_key):
+        """
+        Makes `key` (one report's PDF) fresh for as long as the rows cached under
+        `rows_key`, which several reports share. A PDF rendered from an earlier copy of
+        those rows is dropped.
+        """
+        with self._lock:
+            created = self._created.get(rows_key)
+            if created is None or self._created.get(key) == created:
+                return
+            self._created[key] = created
+        self._remove(self._path(key, _PDF_SUFFIX))
+
+    def get_pdf(self, key):
+        """Returns the path of the cached PDF for `key`, or None. Copy the file, it may be evicted later."""
+        if not self._fresh(key):
+            return None
+        path = self._path(key, _PDF_SUFFIX)
+        if not os.path.exists(path):
+            return None
+        self._touch(path)
+        return path
+
+    def put_pdf(self, key, pdf_path):
+        """Stores a copy of the PDF rendered from the rows cached under `key`."""
+        if not self._fresh(key):
+            return
+        with open(pdf_path, 'rb') as source:
+            self._write(key, _PDF_SUFFIX, lambda f: shutil.copyfileobj(source, f))
+
+    def clear(self):
+        with self._lock:
+            self._created.clear()
+        for name in self._cache_files():
+            self._remove(os.path.join(self.cache_dir, name))
+
+    def _fresh(self, key):
+        with self._lock:
+            created = self._created.get(key)
+            if created is None:
+                return False
+            if time.time() - created < self.ttl:
+                return True
+            del self._created[key]
+        self._remove(self._path(key, _ROWS_SUFFIX))
+        self._remove(self._path(key, _PDF_SUFFIX))
+        return False
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _write(self, key, suffix, write):
+        path = self._path(key, suffix)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as cache_file:
+                write(cache_file)
+            os.replace(temp_path, path)
+        except (OSError, pickle.PickleError) as e:
+            print(f"Could not cache report {key}: {e}", file=sys.stderr)
+            self._remove(temp_path)
+            return
+        self._prune()
+
+    def _prune(self):
+        """Removes expired files, then the least recently used ones until the cache fits in max_bytes."""
+        now = time.time()
+        entries = []
+        for name in self._cache_files():
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime >= self.ttl:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _cache_files(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [name for name in names if name.endswith((_ROWS_SUFFIX, _PDF_SUFFIX, ".tmp"))]
+
+    @staticmethod
+    def _touch(path):
+        # The modification time doubles as the last-use time for eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
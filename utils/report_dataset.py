@@ -0,0 +1,225 @@
+# real_estate_system/utils/report_dataset.py
+from array import array
+from datetime import datetime
+from decimal import Decimal
+from itertools import compress
+
+# The sales reports that can be derived from a ReportDataset.
+REPORT_TYPES = ('sales', 'sold_properties', 'ongoing_payments', 'pending_instalments')
+
+# Stands in for NULL in the integer cent columns.
+_NULL_CENTS = -2 ** 63
+
+# Columns of DatabaseManager.get_report_dataset rows, by how they are stored.
+_CODED_COLUMNS = ('project_id', 'project_name', 'property_type', 'property_status', 'payment_mode', 'status')
+_CENT_COLUMNS = ('total_amount_paid', 'discount', 'balance')
+_FLOAT_COLUMNS = ('price', 'size')
+_LIST_COLUMNS = ('transaction_date', 'title_deed_number', 'location', 'client_name', 'client_contact_info')
+
+# Per-project totals of each report: total name -> dataset column summed.
+_REPORT_TOTALS = {
+    'sales': (('gross', 'price'), ('net', 'total_amount_paid')),
+    'sold_properties': (('paid', 'total_amount_paid'), ('pending', 'balance')),
+    'ongoing_payments': (('gross', 'price'), ('net', 'total_amount_paid')),
+    'pending_instalments': (),
+}
+
+# Output field -> dataset column, per report: the row fields each report's PDF reads.
+_REPORT_FIELDS = {
+    'sales': (
+        ('project_id', 'project_id'), ('project_name', 'project_name'),
+        ('title_deed_number', 'title_deed_number'), ('actual_price', 'price'),
+        ('amount_paid', 'total_amount_paid'), ('balance', 'balance'),
+        ('property_type', 'property_type'), ('client_name', 'client_name'),
+        ('transaction_date', 'transaction_date'), ('status', 'status'),
+    ),
+    'sold_properties': (
+        ('project_id', 'project_id'), ('project_name', 'project_name'),
+        ('title_deed_number', 'title_deed_number'), ('location', 'location'), ('size', 'size'),
+        ('date_sold', 'transaction_date'), ('total_amount_paid', 'total_amount_paid'),
+        ('balance', 'balance'), ('client_name', 'client_name'),
+    ),
+    'ongoing_payments': (
+        ('project_id', 'project_id'), ('project_name', 'project_name'),
+        ('transaction_id', 'transaction_id'), ('transaction_date', 'transaction_date'),
+        ('total_amount_paid', 'total_amount_paid'), ('discount', 'discount'), ('balance', 'balance'),
+        ('title_deed_number', 'title_deed_number'), ('original_price', 'price'),
+        ('client_name', 'client_name'), ('client_contact_info', 'client_contact_info'),
+        ('payment_mode', 'payment_mode'),
+    ),
+    'pending_instalments': (
+        ('project_id', 'project_id'), ('project_name', 'project_name'),
+        ('transaction_id', 'transaction_id'), ('transaction_date', 'transaction_date'),
+        ('total_amount_paid', 'total_amount_paid'), ('discount', 'discount'), ('balance', 'balance'),
+        ('title_deed_number', 'title_deed_number'), ('original_price', 'price'),
+        ('client_name', 'client_name'), ('client_contact_info', 'client_contact_info'),
+    ),
+}
+
+
+def _to_cents(value):
+    if value is None:
+        return _NULL_CENTS
+    return int((Decimal(str(value)) * 100).to_integral_value())
+
+
+def _from_cents(cents):
+    return None if cents == _NULL_CENTS else Decimal(cents).scaleb(-2)
+
+
+def _sql_equals(value, text):
+    # Matches MySQL's default collation: case-insensitive, trailing spaces ignored.
+    return isinstance(value, str) and value.rstrip().lower() == text
+
+
+class _CodedColumn:
+    """A low-cardinality column stored as integer codes into a list of distinct values."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = array('l')
+        self._index = {}
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def matching(self, predicate):
+        """Returns the set of codes whose value satisfies `predicate`."""
+        return {code for code, value in enumerate(self.values) if predicate(value)}
+
+    def __getstate__(self):
+        return {'values': self.values, 'codes': self.codes}
+
+    def __setstate__(self, state):
+        self.values = state['values']
+        self.codes = state['codes']
+        self._index = {value: code for code, value in enumerate(self.values)}
+
+
+class ReportDataset:
+    """
+    The joined transaction facts for one report period, held column by column:
+    repeated strings as integer codes, money as integer cents and prices and sizes
+    as doubles, so a large period stays compact in memory and in the report cache.
+
+    project_groups(report_type) derives any of REPORT_TYPES from it, filtering with
+    one pass over the code and cent columns and building dicts only for the rows kept.
+    The query orders rows by project, so the group-by is a split into runs of equal
+    project codes, and each project's totals are summed from the columns directly.
+    Rows carry the field names each report reads, with the value types MySQL returns.
+    """
+
+    def __init__(self):
+        self.fetched_at = datetime.now()
+        self.transaction_id = array('q')
+        self.has_project = array('b')
+        for name in _CODED_COLUMNS:
+            setattr(self, name, _CodedColumn())
+        for name in _CENT_COLUMNS:
+            setattr(self, name, array('q'))
+        for name in _FLOAT_COLUMNS:
+            setattr(self, name, array('d'))
+        for name in _LIST_COLUMNS:
+            setattr(self, name, [])
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds the dataset from the dict rows of DatabaseManager.get_report_dataset's query."""
+        dataset = cls()
+        for row in rows:
+            dataset.transaction_id.append(row['transaction_id'])
+            dataset.has_project.append(1 if row['has_project'] else 0)
+            for name in _CODED_COLUMNS:
+                getattr(dataset, name).append(row[name])
+            for name in _CENT_COLUMNS:
+                getattr(dataset, name).append(_to_cents(row[name]))
+            for name in _FLOAT_COLUMNS:
+                getattr(dataset, name).append(float(row[name] or 0))
+            for name in _LIST_COLUMNS:
+                getattr(dataset, name).append(row[name])
+        return dataset
+
+    def __len__(self):
+        return len(self.transaction_id)
+
+    def project_groups(self, report_type):
+        """
+        Returns the rows of one of REPORT_TYPES grouped by project, in project order, as
+        a list of dicts with project_id ('Unknown' when missing), project_name, rows (in
+        transaction date order) and totals: the row count plus the report's money totals
+        (see _REPORT_TOTALS) as Decimals.
+        """
+        mask = self._mask(report_type)
+        rows = self._rows(report_type, mask)
+        selected = list(compress(range(len(mask)), mask))
+        projects = list(compress(self.project_id.codes, mask))
+        groups = []
+        start = 0
+        for end in range(1, len(selected) + 1):
+            if end < len(selected) and projects[end] == projects[start]:
+                continue
+            indices = selected[start:end]
+            groups.append({
+                'project_id': self.project_id.values[projects[start]] or 'Unknown',
+                'project_name': self.project_name.values[self.project_name.codes[indices[0]]] or '',
+                'rows': rows[start:end],
+                'totals': self._totals(report_type, indices),
+            })
+            start = end
+        return groups
+
+    def _rows(self, report_type, mask):
+        columns = [(field, list(compress(self._values(column), mask))) for field, column in _REPORT_FIELDS[report_type]]
+        return [{field: values[i] for field, values in columns} for i in range(sum(mask))]
+
+    def _totals(self, report_type, indices):
+        # NULL amounts count as zero, like the report tables show them.
+        totals = {'count': len(indices)}
+        for name, column in _REPORT_TOTALS[report_type]:
+            values = getattr(self, column)
+            if column in _CENT_COLUMNS:
+                cents = sum(values[i] for i in indices if values[i] != _NULL_CENTS)
+                totals[name] = Decimal(cents).scaleb(-2)
+            else:
+                totals[name] = sum((Decimal(values[i]) for i in indices), Decimal('0.0'))
+        return totals
+
+    def _mask(self, report_type):
+        """One byte per row, 1 where the row belongs to the report."""
+        paid, balance = self.total_amount_paid, self.balance
+        if report_type == 'sales':
+            return bytearray(self.has_project)
+
+        if report_type == 'sold_properties':
+            sold = self.property_status.matching(lambda value: _sql_equals(value, 'sold'))
+            return bytearray(
+                1 if has_project and code in sold and cents == 0 else 0
+                for has_project, code, cents in zip(self.has_project, self.property_status.codes, balance)
+            )
+
+        instalments = self.payment_mode.matching(lambda value: _sql_equals(value, 'installments'))
+        if report_type == 'ongoing_payments':
+            return bytearray(
+                1 if code in instalments and cents > 0 and paid_cents > 0 else 0
+                for code, cents, paid_cents in zip(self.payment_mode.codes, balance, paid)
+            )
+        if report_type == 'pending_instalments':
+            return bytearray(
+                1 if has_project and code in instalments and cents > 0 else 0
+                for has_project, code, cents in zip(self.has_project, self.payment_mode.codes, balance)
+            )
+        raise ValueError(f"Unknown report type: {report_type}")
+
+    def _values(self, column):
+        """Iterates a column's values decoded back to the types MySQL returns."""
+        values = getattr(self, column)
+        if isinstance(values, _CodedColumn):
+            decoded = values.values
+            return (decoded[code] for code in values.codes)
+        if column in _CENT_COLUMNS:
+            return (_from_cents(cents) for cents in values)
+        return iter(values)
@@ -0,0 +1,383 @@
+# real_estate_system/utils/report_jobs.py
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.background import POLL_INTERVAL_MS
+
+# Rendering is CPU-bound, so it runs in worker processes rather than threads. Large
+# reports render their parts in parallel, so use a few cores but leave one for the UI.
+MAX_REPORT_WORKERS = min(4, max(2, (os.cpu_count() or 2) - 1))
+# Cancellation flags shared with the workers; a job uses slot job_id % CANCEL_SLOTS.
+CANCEL_SLOTS = 64
+# Seconds between progress messages a worker sends back.
+PROGRESS_INTERVAL = 0.1
+
+# Set in each worker process by _init_worker.
+_worker_updates = None
+_worker_cancel_flags = None
+
+
+class ReportCancelled(Exception):
+    """Raised inside a renderer when its report job has been cancelled."""
+
+
+class ReportProgress:
+    """
+    Handed to a renderer as its first argument. update() sends progress back to the
+    form and raises ReportCancelled once the job is cancelled, so a renderer stops at
+    its next progress point. Messages are throttled to one per PROGRESS_INTERVAL.
+    `part` tells the parts of a chunked report apart.
+    """
+
+    def __init__(self, job_id, part=0):
+        self.job_id = job_id
+        self.part = part
+        self._last_sent = 0.0
+
+    def update(self, done, total=None, message=None):
+        if _worker_cancel_flags is not None and _worker_cancel_flags[self.job_id % CANCEL_SLOTS]:
+            raise ReportCancelled()
+        now = time.monotonic()
+        if _worker_updates is None or (now - self._last_sent < PROGRESS_INTERVAL and done != total):
+            return
+        self._last_sent = now
+        _worker_updates.put((self.job_id, self.part, done, total, message))
+
+
+def _init_worker(updates, cancel_flags):
+    global _worker_updates, _worker_cancel_flags
+    _worker_updates = updates
+    _worker_cancel_flags = cancel_flags
+
+
+def _run_report(render, job_id, part, args, kwargs):
+    return render(ReportProgress(job_id, part), *args, **kwargs)
+
+
+class ReportJob:
+    """Handle for a report submitted to the ReportJobService."""
+
+    def __init__(self, service, job_id, widget, on_progress, on_success, on_error, on_finally):
+        self.service = service
+        self.job_id = job_id
+        self.widget = widget
+        self.on_progress = on_progress
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_finally = on_finally
+        self.futures = []
+        self.merge = None           # (render, args, kwargs) run on the part results of a chunked job
+        self.discard_chunk = None
+        self.part_progress = {}     # part -> (done, total) while the parts of a chunked job render
+        self.cancelled = False
+
+    def cancel(self):
+        """Stops the report: a queued job never starts, a running one stops at its next progress point."""
+        self.service.cancel(self)
+
+
+class ReportJobService:
+    """
+    Renders reports in a process pool so building a large PDF never blocks the Tk
+    main thread.
+
+    A renderer is a module-level function (it has to be picklable) called as
+    render(progress, *args, **kwargs) in a worker process; its arguments and result
+    must be picklable too, so renderers take plain rows and return a path or bytes.
+    Progress and results are delivered on the Tk thread by polling with widget.after():
+    on_progress(done, total, message) while the job runs, then on_success(result) or
+    on_error(exception). on_finally() runs afterwards, also for a cancelled job, as
+    long as the widget still exists. Jobs of a destroyed widget are cancelled.
+
+    submit_chunked() renders the parts of a large report in parallel and merges them
+    in one more worker; the job's progress is the sum of its parts.
+    """
+
+    def __init__(self, max_workers=MAX_REPORT_WORKERS):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool = None
+        self._updates = None
+        self._cancel_flags = None
+        self._jobs = {}  # job_id -> ReportJob not delivered yet
+        self._next_job_id = 0
+        self._poll_scheduled = False
+
+    def submit(self, widget, render, *args, on_progress=None, on_success=None, on_error=None, on_finally=None, **kwargs):
+        """
+        Starts render(progress, *args, **kwargs) in a worker process.
+        Returns: The ReportJob, which can be cancelled.
+        """
+        job = self._new_job(widget, on_progress, on_success, on_error, on_finally)
+        job.futures = [self._submit_task(render, job.job_id, 0, args, kwargs)]
+        self._schedule_poll(widget)
+        return job
+
+    def submit_chunked(self, widget, render_chunk, chunks, merge, *merge_args, on_progress=None, on_success=None,
+                       on_error=None, on_finally=None, discard_chunk=None, **merge_kwargs):
+        """
+        Starts render_chunk(progress, *chunk_args) for every tuple in `chunks`, in
+        parallel, then merge(progress, results, *merge_args, **merge_kwargs) with the
+        results in chunk order; on_success gets merge's result. If a part fails or the
+        job is cancelled, discard_chunk(result) is called on the Tk thread for every
+        part that did finish, so its temporary output can be removed.
+        Returns: The ReportJob, which can be cancelled.
+        """
+        job = self._new_job(widget, on_progress, on_success, on_error, on_finally)
+        job.merge = (merge, merge_args, merge_kwargs)
+        job.discard_chunk = discard_chunk
+        job.futures = [self._submit_task(render_chunk, job.job_id, part, tuple(chunk_args), {})
+                       for part, chunk_args in enumerate(chunks)]
+        self._schedule_poll(widget)
+        return job
+
+    def cancel(self, job):
+        with self._lock:
+            job.cancelled = True
+            if self._cancel_flags is not None:
+                self._cancel_flags[job.job_id % CANCEL_SLOTS] = 1
+        for future in job.futures:
+            future.cancel()
+
+    def cancel_all(self, widget):
+        """Cancels every report submitted for `widget`, e.g. when its window closes."""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.widget is widget]
+        for job in jobs:
+            job.cancel()
+
+    def shutdown(self):
+        """Cancels every job and stops the worker processes."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._jobs.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _new_job(self, widget, on_progress, on_success, on_error, on_finally):
+        with self._lock:
+            self._ensure_pool()
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._cancel_flags[job_id % CANCEL_SLOTS] = 0
+            job = ReportJob(self, job_id, widget, on_progress, on_success, on_error, on_finally)
+            self._jobs[job_id] = job
+        return job
+
+    def _submit_task(self, render, job_id, part, args, kwargs):
+        with self._lock:
+            pool = self._ensure_pool()
+        try:
+            return pool.submit(_run_report, render, job_id, part, args, kwargs)
+        except BrokenProcessPool:
+            # A worker died earlier; start a fresh pool and try once more.
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+                pool = self._ensure_pool()
+            return pool.submit(_run_report, render, job_id, part, args, kwargs)
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            # spawn everywhere, so workers never inherit a forked copy of Tk or the MySQL pool.
+            context = multiprocessing.get_context('spawn')
+            if self._updates is None:
+                self._updates = context.Queue()
+                self._cancel_flags = context.Array('b', CANCEL_SLOTS, lock=False)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context,
+                initializer=_init_worker, initargs=(self._updates, self._cancel_flags)
+            )
+        return self._pool
+
+    def _schedule_poll(self, widget):
+        with self._lock:
+            if self._poll_scheduled:
+                return
+            self._poll_scheduled = True
+        try:
+            widget.after(POLL_INTERVAL_MS, lambda: self._poll(widget))
+        except Exception:
+            with self._lock:
+                self._poll_scheduled = False
+
+    def _poll(self, widget):
+        """Delivers progress and finished jobs on the Tk main thread."""
+        while True:
+            try:
+                job_id, part, done, total, message = self._updates.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+            job = self._jobs.get(job_id)
+            if job is None or job.cancelled or not job.on_progress or not self._widget_alive(job.widget):
+                continue
+            if job.merge is not None and total:
+                # A part of a chunked job: report the rows of all parts together
+                job.part_progress[part] = (done, total)
+                done = sum(part_done for part_done, _ in job.part_progress.values())
+                total = sum(part_total for _, part_total in job.part_progress.values())
+            job.on_progress(done, total, message)
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not self._widget_alive(job.widget) and not job.cancelled:
+                job.cancel()
+            if not job.futures or not all(future.done() for future in job.futures):
+                continue
+            if job.merge is not None and not job.cancelled and self._succeeded(job.futures):
+                self._start_merge(job)
+                continue
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+            self._deliver(job)
+
+        with self._lock:
+            self._poll_scheduled = False
+            outstanding = list(self._jobs.values())
+        if outstanding:
+            poll_widget = widget if self._widget_alive(widget) else next(
+                (job.widget for job in outstanding if self._widget_alive(job.widget)), None)
+            if poll_widget is not None:
+                self._schedule_poll(poll_widget)
+
+    @staticmethod
+    def _succeeded(futures):
+        return all(not future.cancelled() and future.exception() is None for future in futures)
+
+    def _start_merge(self, job):
+        render, args, kwargs = job.merge
+        results = [future.result() for future in job.futures]
+        job.merge = None
+        job.discard_chunk = None  # The merge owns the parts now
+        try:
+            job.futures = [self._submit_task(render, job.job_id, 0, (results,) + tuple(args), kwargs)]
+        except Exception as e:
+            failed = Future()
+            failed.set_exception(e)
+            job.futures = [failed]
+
+    def _discard_chunks(self, job):
+        for future in job.futures:
+            if future.cancelled() or future.exception() is not None:
+                continue
+            try:
+                job.discard_chunk(future.result())
+            except Exception as e:
+                print(f"Could not discard report part: {e}", file=sys.stderr)
+
+    def _deliver(self, job):
+        if job.discard_chunk is not None:
+            self._discard_chunks(job)
+        if not self._widget_alive(job.widget):
+            return
+        try:
+            if job.cancelled or any(future.cancelled() for future in job.futures):
+                return
+            error = next((future.exception() for future in job.futures if future.exception() is not None), None)
+            if isinstance(error, ReportCancelled):
+                return
+            if isinstance(error, BrokenProcessPool):
+                with self._lock:
+                    self._pool = None  # Recreated by the next submit
+            if error is None:
+                if job.on_success:
+                    job.on_success(job.futures[0].result())
+            elif job.on_error:
+                job.on_error(error)
+            else:
+                print(f"Report job failed: {error}", file=sys.stderr)
+        finally:
+            if job.on_finally:
+                job.on_finally()
+
+    @staticmethod
+    def _widget_alive(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+
+
+class ReportProgressBar(ttk.Frame):
+    """
+    A status line, progress bar and Cancel button for a running ReportJob.
+    Hidden (pack_forget) until start() is called; pack it where it should appear
+    with the `pack_options` given to the constructor.
+    """
+
+    def __init__(self, master, pack_options=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.pack_options = pack_options or {'fill': 'x', 'pady': 5}
+        self.job = None
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.pack(side=tk.LEFT, padx=(0, 10))
+        self.bar = ttk.Progressbar(self, mode="indeterminate", length=220)
+        self.bar.pack(side=tk.LEFT, fill="x", expand=True)
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+
+    def start(self, job, message="Generating report..."):
+        self.job = job
+        self.status_label.config(text=message)
+        self.bar.config(mode="indeterminate", value=0)
+        self.bar.start(15)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.pack(**self.pack_options)
+
+    def update_progress(self, done, total=None, message=None):
+        """on_progress callback for ReportJobService.submit."""
+        if total:
+            if str(self.bar.cget("mode")) != "determinate":
+                self.bar.stop()
+                self.bar.config(mode="determinate")
+            self.bar.config(maximum=total, value=done)
+        if message:
+            self.status_label.config(text=message)
+        elif total:
+            self.status_label.config(text=f"Processed {done:,} of {total:,} rows")
+
+    def finish(self):
+        self.job = None
+        self.bar.stop()
+        self.pack_forget()
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.status_label.config(text="Cancelling...")
+            self.cancel_button.config(state=tk.DISABLED)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_report_service():
+    """Returns the application-wide ReportJobService, creating it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ReportJobService()
+        return _service
+
+
+def shutdown_report_service():
+    """Stops the report worker processes. Called when the application exits."""
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
+            _service = None
@@ -0,0 +1,857 @@
+# real_estate_system/utils/report_renderers.py
+"""
+PDF report renderers run by the ReportJobService in worker processes.
+
+Every renderer is a module-level function called as render(progress, ...) with
+plain, picklable rows fetched on the app side, and reports progress through
+`progress.update(done, total)` (which also stops it when the job is cancelled).
+Errors are raised, not shown, since worker processes have no UI.
+
+Reports with more than LARGE_REPORT_ROWS rows are rendered in large-report mode:
+the *_chunks() helpers split the rows into parts of at most CHUNK_ROWS rows, the
+render_*_chunk() renderers lay each part out in its own worker (so no ReportLab
+story ever holds more than CHUNK_ROWS rows), and merge_pdf_chunks() joins the parts
+into one PDF with continuous page numbers. See ReportJobService.submit_chunked.
+"""
+import os
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+from io import BytesIO
+
+try:
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.lib import colors
+    from reportlab.platypus import Image as RLImage, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+
+    _REPORTLAB_AVAILABLE = True
+except ImportError:
+    _REPORTLAB_AVAILABLE = False
+
+try:
+    import fitz  # PyMuPDF, used to merge the parts of a large report
+
+    _FITZ_AVAILABLE = True
+except ImportError:
+    _FITZ_AVAILABLE = False
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ICONS_DIR = os.path.join(BASE_DIR, 'assets', 'icons')
+
+# Reports with more rows than this are split into parts rendered in parallel.
+LARGE_REPORT_ROWS = 3000
+# Rows per part in large-report mode (a few dozen pages), which bounds each worker's memory.
+CHUNK_ROWS = 1000
+
+# Bottom page margin of each report's document, in points; merge_pdf_chunks numbers
+# pages inside it so the stamp never reaches the content frame.
+SALES_BOTTOM_MARGIN = 40
+JOBS_BOTTOM_MARGIN = 72  # SimpleDocTemplate's default
+STATEMENT_BOTTOM_MARGIN = 30
+
+
+def _require_reportlab():
+    if not _REPORTLAB_AVAILABLE:
+        raise RuntimeError("ReportLab library not available. Please install it (`pip install reportlab`).")
+
+
+def _build(progress, doc, story, on_page=None, message=None):
+    """
+    Builds `doc`, reporting each finished page; on_page(canvas, doc) is drawn on every page first.
+    `message`, if given, is shown instead of the page being laid out.
+    """
+    def page_done(canvas, doc):
+        if on_page is not None:
+            on_page(canvas, doc)
+        progress.update(canvas.getPageNumber(), message=message or f"Laying out page {canvas.getPageNumber()}...")
+
+    doc.build(story, onFirstPage=page_done, onLaterPages=page_done)
+
+
+class _RowCounter:
+    """Reports one progress step per table row."""
+
+    def __init__(self, progress, total):
+        self.progress = progress
+        self.total = total
+        self.done = 0
+
+    def advance(self):
+        self.done += 1
+        self.progress.update(self.done, self.total)
+
+
+def _chunk_path():
+    fd, path = tempfile.mkstemp(prefix="report_chunk_", suffix=".pdf")
+    os.close(fd)
+    return path
+
+
+def _build_chunk(progress, make_doc, story, index, count):
+    """Builds one part of a large report into a temporary file. Returns: its path."""
+    path = _chunk_path()
+    try:
+        _build(progress, make_doc(path), story, message=f"Laying out part {index + 1} of {count}...")
+    except BaseException:
+        discard_pdf_chunk(path)
+        raise
+    return path
+
+
+def _split_rows(rows, chunk_rows):
+    return [rows[start:start + chunk_rows] for start in range(0, len(rows), chunk_rows)] or [[]]
+
+
+def discard_pdf_chunk(path):
+    """Removes a part rendered by a render_*_chunk() renderer that is not going to be merged."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def merge_pdf_chunks(progress, chunk_paths, file_path=None, bottom_margin=JOBS_BOTTOM_MARGIN):
+    """
+    Joins the parts of a large report in order, numbers every page ("Page N of M")
+    and removes the part files. The numbers are drawn halfway down the document's
+    `bottom_margin`, below the content frame.
+    Returns: file_path, or the PDF as bytes when file_path is None.
+    """
+    if not _FITZ_AVAILABLE:
+        raise RuntimeError("PyMuPDF (fitz) is not installed. Large reports cannot be merged.")
+    merged = fitz.open()
+    try:
+        for index, path in enumerate(chunk_paths, start=1):
+            with fitz.open(path) as chunk:
+                merged.insert_pdf(chunk)
+            discard_pdf_chunk(path)
+            progress.update(index, len(chunk_paths), f"Merging part {index} of {len(chunk_paths)}...")
+
+        page_count = merged.page_count
+        for number, page in enumerate(merged, start=1):
+            text = f"Page {number} of {page_count}"
+            width = fitz.get_text_length(text, fontname="helv", fontsize=8)
+            # Bottom right; for the job report, where it draws its own page numbers
+            page.insert_text((page.rect.width - 72 - width, page.rect.height - bottom_margin / 2), text,
+                             fontname="helv", fontsize=8)
+
+        if file_path is None:
+            return merged.tobytes(garbage=3, deflate=True)
+        merged.save(file_path, garbage=3, deflate=True)
+        return file_path
+    finally:
+        merged.close()
+        for path in chunk_paths:
+            discard_pdf_chunk(path)
+
+
+# --- Sales reports (SalesReportsForm) ---------------------------------------------------
+
+_NO_SALES_DATA_MESSAGES = {
+    'sold': "No properties sold in this period.",
+    'ongoing': "No ongoing payments found in this period.",
+    'pending': "No pending instalments found in this period.",
+}
+
+
+def _sales_report_kind(report_name):
+    name = report_name.upper()
+    if "SALES" in name:
+        return 'sales'
+    if "SOLD" in name:
+        return 'sold'
+    if "ONGOING" in name:
+        return 'ongoing'
+    if "PENDING" in name or "INSTALMENT" in name:
+        return 'pending'
+    return None
+
+
+def _date_part(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return value.split(' ')[0] if isinstance(value, str) else "N/A"
+
+
+def _group_rows(groups):
+    return sum(len(group['rows']) for group in groups)
+
+
+def _sales_report_parts(kind, groups, chunk_rows=None):
+    """
+    Splits the project groups (ReportDataset.project_groups) into parts of at most
+    `chunk_rows` rows (one part when chunk_rows is None). A project split across parts
+    continues in the next one; its totals travel with its last segment.
+    Returns: A list of parts, each a list of segment dicts.
+    """
+    if kind is None or not groups:
+        return [[]]
+    chunk_rows = chunk_rows or _group_rows(groups)
+    parts = [[]]
+    part_rows = 0
+    for group in groups:
+        project_id, project_name = group['project_id'], group['project_name']
+        items = group['rows']
+        totals = group['totals']
+        offset = 0
+        while offset < len(items):
+            if part_rows >= chunk_rows:
+                parts.append([])
+                part_rows = 0
+            segment_rows = items[offset:offset + chunk_rows - part_rows]
+            parts[-1].append({
+                'project_id': project_id,
+                'project_name': project_name,
+                'rows': segment_rows,
+                'continued': offset > 0,
+                'totals': totals if offset + len(segment_rows) >= len(items) else None,
+            })
+            offset += len(segment_rows)
+            part_rows += len(segment_rows)
+    return parts
+
+
+def _sales_overall_totals(kind, parts):
+    overall = {'gross': Decimal('0.0'), 'net': Decimal('0.0'), 'paid': Decimal('0.0')}
+    for segments in parts:
+        for segment in segments:
+            for key, value in (segment['totals'] or {}).items():
+                if key in overall:
+                    overall[key] += value
+    return overall
+
+
+def _sales_row_cells(kind, item, wrap_style):
+    if kind == 'sales':
+        actual_price = Decimal(item.get('actual_price') or 0)
+        amount_paid = Decimal(item.get('amount_paid') or 0)
+        balance = Decimal(item.get('balance') or 0)
+        return [
+            Paragraph(item.get('client_name', 'N/A'), wrap_style),
+            Paragraph(item.get('title_deed_number', 'N/A'), wrap_style),
+            Paragraph(f"KES {actual_price:,.2f}", wrap_style),
+            Paragraph(f"KES {amount_paid:,.2f}", wrap_style),
+            Paragraph(f"KES {balance:,.2f}", wrap_style),
+            Paragraph(item.get('status', 'N/A').title(), wrap_style),
+        ]
+    if kind == 'sold':
+        paid_amt = Decimal(item.get('total_amount_paid') or 0)
+        balance_amt = Decimal(item.get('balance') or 0)
+        return [
+            Paragraph(_date_part(item.get('date_sold')), wrap_style),
+            Paragraph(item.get('title_deed_number', 'N/A'), wrap_style),
+            Paragraph(item.get('location', 'N/A'), wrap_style),
+            Paragraph(f"{item.get('size', 0):.4f}", wrap_style),
+            Paragraph(item.get('client_name', 'N/A'), wrap_style),
+            Paragraph(f"KES {paid_amt:,.2f}", wrap_style),
+            Paragraph(f"KES {balance_amt:,.2f}", wrap_style),
+        ]
+    if kind == 'ongoing':
+        original_price = Decimal(item.get('original_price') or 0)
+        paid = Decimal(item.get('total_amount_paid') or item.get('amount_paid') or 0)
+        balance = Decimal(item.get('balance') or 0)
+        return [
+            Paragraph(_date_part(item.get('transaction_date')), wrap_style),
+            Paragraph(item.get('client_name', 'N/A'), wrap_style),
+            Paragraph(item.get('title_deed_number', 'N/A'), wrap_style),
+            Paragraph(f"KES {original_price:,.2f}", wrap_style),
+            Paragraph(f"KES {paid:,.2f}", wrap_style),
+            Paragraph(f"KES {balance:,.2f}", wrap_style),
+        ]
+    return [
+        Paragraph(_date_part(item.get('transaction_date')), wrap_style),
+        Paragraph(item.get('client_name', 'N/A'), wrap_style),
+        Paragraph(item.get('title_deed_number', 'N/A'), wrap_style),
+        Paragraph(f"KES {item.get('original_price', 0):,.2f}", wrap_style),
+        Paragraph(f"KES {item.get('total_amount_paid', 0):,.2f}", wrap_style),
+        Paragraph(f"KES {item.get('balance', 0):,.2f}", wrap_style),
+    ]
+
+
+def _sales_project_table(kind, table_data):
+    if kind == 'sales':
+        table = Table(table_data, repeatRows=1, colWidths=[1.3 * inch, 1.2 * inch, 1.0 * inch, 1.0 * inch, 1.0 * inch, 1.0 * inch])
+        table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ]))
+        return table
+    if kind == 'sold':
+        col_widths = [0.8 * inch, 1.1 * inch, 1.1 * inch, 0.7 * inch, 1.3 * inch, 1 * inch, 1 * inch]
+    else:
+        col_widths = [0.8 * inch, 1.4 * inch, 1.1 * inch, 1 * inch, 1 * inch, 1 * inch]
+    table = Table(table_data, repeatRows=1, colWidths=col_widths)
+    table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ]))
+    return table
+
+
+def _sales_project_summary(kind, totals):
+    """Per-project summary table, or None for reports without one."""
+    if kind == 'sales':
+        summary_data = [
+            ["Total Properties:", f"{totals['count']}"],
+            ["Gross Sales:", f"KES {totals['gross']:,.2f}"],
+            ["Net Sales:", f"KES {totals['net']:,.2f}"],
+            ["Pending:", f"KES {totals['gross'] - totals['net']:,.2f}"]
+        ]
+        summary_table = Table(summary_data, colWidths=[1.5 * inch, 1.5 * inch])
+        summary_table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ]))
+        return summary_table
+    if kind == 'sold':
+        summary_data = [
+            ["Total Properties:", f"{totals['count']}"],
+            ["Total Paid:", f"KES {totals['paid']:,.2f}"],
+            ["Total Pending:", f"KES {totals['pending']:,.2f}"]
+        ]
+    elif kind == 'ongoing':
+        summary_data = [
+            ["Total Properties:", f"{totals['count']}"],
+            ["Gross Sales:", f"KES {totals['gross']:,.2f}"],
+            ["Net Sales:", f"KES {totals['net']:,.2f}"],
+            ["Pending:", f"KES {totals['gross'] - totals['net']:,.2f}"]
+        ]
+    else:
+        return None
+    summary_table = Table(summary_data, colWidths=[1.8 * inch, 1.5 * inch])
+    summary_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    return summary_table
+
+
+# Spacers (after the table, after the summary) each sales report has always used.
+_SALES_SPACING = {'sales': (6, 10), 'sold': (6, 10), 'ongoing': (10, 12), 'pending': (10, 0)}
+_SALES_HEADERS = {
+    'sales': ["Client", "Title Deed", "Actual Price", "Amount Paid", "Balance", "Status"],
+    'sold': ["Date", "Title Deed", "Location", "Size (Ha)", "Client", "Paid", "Balance"],
+    'ongoing': ["Date", "Client", "Title Deed", "Original Price", "Paid", "Balance"],
+    'pending': ["Date", "Client", "Title Deed", "Original Price", "Paid", "Balance Due"],
+}
+
+
+def _sales_doc(file_path):
+    return SimpleDocTemplate(file_path, pagesize=letter, topMargin=40, bottomMargin=SALES_BOTTOM_MARGIN,
+                             leftMargin=40, rightMargin=40)
+
+
+def _sales_report_story(report_name, kind, segments, start_date, end_date, counter, first, overall, has_data=True,
+                        as_of=None):
+    """
+    The story for one part of a sales report: the header on the first part, the
+    project segments, and the overall summary when `overall` is given (last part).
+    The header shows `as_of`, when the rows were read, defaulting to now.
+    """
+    styles = getSampleStyleSheet()
+    story = []
+
+    wrap_style = ParagraphStyle(
+        name="Wrapped",
+        fontName="Helvetica",
+        fontSize=8,
+        leading=10,
+        alignment=0  # Left align
+    )
+
+    if first:
+        # --- Header ---
+        logo_path = os.path.join(ICONS_DIR, "NEWCITY.png")
+        if os.path.exists(logo_path):
+            logo = RLImage(logo_path)
+            logo._restrictSize(1.2 * inch, 1.2 * inch)
+        else:
+            logo = Paragraph("NEW CITY REAL ESTATE", styles['Normal'])
+
+        header_table_data = [
+            [logo, "NEW CITY REAL ESTATE", (as_of or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")]
+        ]
+        header_table = Table(header_table_data, colWidths=[2.5 * inch, 2 * inch, 2 * inch])
+        header_table.setStyle(TableStyle([
+            ('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (1, 0), (1, 0), 14),
+            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+            ('FONTSIZE', (2, 0), (2, 0), 10),
+            ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ]))
+        story.append(header_table)
+        story.append(Spacer(1, 8))
+
+        # --- Report Title ---
+        story.append(Paragraph(f"<b>{report_name.upper()}</b>", styles['Heading2']))
+        story.append(Paragraph(f"Period: {start_date} to {end_date}", styles['Normal']))
+        story.append(Spacer(1, 12))
+
+    if kind is None:
+        return story
+    if not has_data and kind in _NO_SALES_DATA_MESSAGES:
+        story.append(Paragraph(_NO_SALES_DATA_MESSAGES[kind], styles['Normal']))
+        return story
+
+    # --- One section per project ---
+    after_table, after_summary = _SALES_SPACING[kind]
+    for segment in segments:
+        project_header = f"Project ID: {segment['project_id']}"
+        if segment['project_name']:
+            project_header += f" — Project Name: {segment['project_name']}"
+        if segment['continued']:
+            project_header += " (continued)"
+        story.append(Paragraph(f"<b>{project_header}</b>", styles['Heading3']))
+        story.append(Spacer(1, 6))
+
+        table_data = [list(_SALES_HEADERS[kind])]
+        for item in segment['rows']:
+            counter.advance()
+            table_data.append(_sales_row_cells(kind, item, wrap_style))
+        story.append(_sales_project_table(kind, table_data))
+        story.append(Spacer(1, after_table))
+
+        summary_table = _sales_project_summary(kind, segment['totals']) if segment['totals'] else None
+        if summary_table is not None:
+            story.append(summary_table)
+            story.append(Spacer(1, after_summary))
+
+    # --- Overall summary ---
+    if overall is not None and kind == 'sales':
+        story.append(Paragraph("<b>Overall Summary</b>", styles['Heading3']))
+        overall_summary = [
+            ["Total Gross Sales:", f"KES {overall['gross']:,.2f}"],
+            ["Total Net Sales:", f"KES {overall['net']:,.2f}"],
+            ["Total Pending:", f"KES {overall['gross'] - overall['net']:,.2f}"]
+        ]
+        overall_table = Table(overall_summary, colWidths=[1.8 * inch, 1.5 * inch])
+        overall_table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('BACKGROUND', (0, 0), (-1, -1), colors.beige),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ]))
+        story.append(overall_table)
+    elif overall is not None and kind == 'sold':
+        story.append(Spacer(1, 6))
+        story.append(Paragraph("<b>========================================</b>", styles['Normal']))
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"<b>Overall Total Paid: KES {overall['paid']:,.2f}</b>", styles['Heading3']))
+        story.append(Spacer(1, 10))
+    return story
+
+
+def render_sales_report_pdf(progress, file_path, report_name, content, start_date, end_date):
+    """
+    Writes one of the SalesReportsForm reports (sales, sold properties, ongoing payments
+    or pending instalments, chosen by `report_name`) to `file_path`. content['groups']
+    holds the rows grouped by project with their totals (ReportDataset.project_groups);
+    content['as_of'], if given, is when the rows were read.
+    Returns: file_path.
+    """
+    _require_reportlab()
+    groups = content.get('groups') or []
+    kind = _sales_report_kind(report_name)
+    parts = _sales_report_parts(kind, groups)
+    story = _sales_report_story(
+        report_name, kind, parts[0], start_date, end_date, _RowCounter(progress, _group_rows(groups)),
+        first=True, overall=_sales_overall_totals(kind, parts), has_data=bool(groups), as_of=content.get('as_of')
+    )
+    _build(progress, _sales_doc(file_path), story)
+    return file_path
+
+
+def sales_report_chunks(report_name, content, start_date, end_date, chunk_rows=CHUNK_ROWS):
+    """Splits a large sales report into the argument tuples for render_sales_report_chunk."""
+    kind = _sales_report_kind(report_name)
+    parts = _sales_report_parts(kind, content.get('groups') or [], chunk_rows)
+    overall = _sales_overall_totals(kind, parts)
+    return [
+        (report_name, segments, start_date, end_date, index, len(parts),
+         overall if index == len(parts) - 1 else None, content.get('as_of'))
+        for index, segments in enumerate(parts)
+    ]
+
+
+def render_sales_report_chunk(progress, report_name, segments, start_date, end_date, index, count, overall, as_of=None):
+    """Renders one part of a large sales report. Returns: the path of the part's PDF."""
+    _require_reportlab()
+    story = _sales_report_story(
+        report_name, _sales_report_kind(report_name), segments, start_date, end_date,
+        _RowCounter(progress, sum(len(segment['rows']) for segment in segments)),
+        first=index == 0, overall=overall, as_of=as_of
+    )
+    return _build_chunk(progress, _sales_doc, story, index, count)
+
+
+# --- Service jobs report (JobReportsView) ----------------------------------------------
+
+def _jobs_report_story(report_name, jobs, start_date, end_date, counter, first, has_data=True):
+    """The story for the jobs report, or for one part of it: the header on the first part, then the jobs table."""
+    styles = getSampleStyleSheet()
+    story = []
+
+    if first:
+        # Header
+        logo_path = os.path.join(ICONS_DIR, "survey.png")
+        if os.path.exists(logo_path):
+            logo = RLImage(logo_path)
+            logo._restrictSize(1.2 * inch, 1.2 * inch)
+        else:
+            logo = Paragraph("", styles['Normal'])
+
+        header = Table([[logo, "NDIRITU MATHENGE & ASSOCIATES", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]],
+                       colWidths=[1.2 * inch, 3.5 * inch, 2 * inch])
+        header.setStyle(TableStyle([('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
+                                    ('FONTSIZE', (1, 0), (1, 0), 14),
+                                    ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
+                                    ('BOTTOMPADDING', (0, 0), (-1, -1), 12)]))
+        story.append(header)
+        story.append(Spacer(1, 12))
+
+        # Title
+        story.append(Paragraph(f"<b>{report_name.upper()}</b>", styles['Heading2']))
+        story.append(Paragraph(f"Period: {start_date} to {end_date}", styles['Normal']))
+        story.append(Spacer(1, 12))
+
+    # Data table
+    if not has_data:
+        story.append(Paragraph("No jobs found for this period and status.", styles['Normal']))
+        return story
+
+    headers = ["Job ID", "Payment ID", "Title Name", "Title Number", "Description",
+               "Created", "Payment Date", "Job Status", "Payment Status", "Job Fee",
+               "Amount Paid", "Balance"]
+
+    wrap_header = ParagraphStyle('wrap_header', fontSize=8, leading=10, alignment=1)
+    wrap_body = ParagraphStyle('wrap_body', fontSize=7, leading=9, alignment=0)
+
+    table_data = [[Paragraph(h, wrap_header) for h in headers]]
+
+    def fmt_date(val):
+        if not val:
+            return ""
+        if isinstance(val, datetime):
+            return val.strftime("%Y-%m-%d")
+        return str(val).split(" ")[0]
+
+    for job in jobs:
+        counter.advance()
+        row = [
+            Paragraph(str(job.get('job_id', '') or ""), wrap_body),
+            Paragraph(str(job.get('payment_id', '') or ""), wrap_body),
+            Paragraph(str(job.get('title_name', '') or ""), wrap_body),
+            Paragraph(str(job.get('title_number', '') or ""), wrap_body),
+            Paragraph(str(job.get('job_description', '') or ""), wrap_body),
+            Paragraph(fmt_date(job.get('job_created')), wrap_body),
+            Paragraph(fmt_date(job.get('payment_date')), wrap_body),
+            Paragraph(str(job.get('job_status', '') or ""), wrap_body),
+            Paragraph(str(job.get('payment_status', '') or ""), wrap_body),
+            Paragraph(str(job.get('job_fee', '') or ""), wrap_body),
+            Paragraph(str(job.get('amount_paid', '') or ""), wrap_body),
+            Paragraph(str(job.get('balance', '') or ""), wrap_body),
+        ]
+        table_data.append(row)
+
+    t = Table(table_data, repeatRows=1)
+    t.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('BOX', (0, 0), (-1, -1), 0.75, colors.black),
+        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
+        ('LEFTPADDING', (0, 0), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ]))
+    story.append(t)
+    return story
+
+
+def _jobs_doc(target):
+    return SimpleDocTemplate(target, pagesize=letter, bottomMargin=JOBS_BOTTOM_MARGIN)
+
+
+def render_jobs_report_pdf(progress, report_name, content, start_date, end_date):
+    """
+    Renders the JobReportsView service jobs report.
+    Returns: The PDF as bytes.
+    """
+    _require_reportlab()
+    jobs = content.get('data') or []
+    buffer = BytesIO()
+    story = _jobs_report_story(report_name, jobs, start_date, end_date, _RowCounter(progress, len(jobs)),
+                               first=True, has_data=bool(jobs))
+
+    # Footer
+    def add_page_number(canvas, doc):
+        page_num = canvas.getPageNumber()
+        canvas.setFont("Helvetica", 8)
+        canvas.drawRightString(7.5 * inch, 0.5 * inch, f"Page {page_num}")
+
+    _build(progress, _jobs_doc(buffer), story, on_page=add_page_number)
+    return buffer.getvalue()
+
+
+def jobs_report_chunks(report_name, content, start_date, end_date, chunk_rows=CHUNK_ROWS):
+    """Splits a large jobs report into the argument tuples for render_jobs_report_chunk."""
+    parts = _split_rows(content.get('data') or [], chunk_rows)
+    return [(report_name, jobs, start_date, end_date, index, len(parts)) for index, jobs in enumerate(parts)]
+
+
+def render_jobs_report_chunk(progress, report_name, jobs, start_date, end_date, index, count):
+    """Renders one part of a large jobs report. Returns: the path of the part's PDF (page numbers are added by the merge)."""
+    _require_reportlab()
+    story = _jobs_report_story(report_name, jobs, start_date, end_date, _RowCounter(progress, len(jobs)),
+                               first=index == 0)
+    return _build_chunk(progress, _jobs_doc, story, index, count)
+
+
+# --- Payment summary (PaymentReportsView) ---------------------------------------------
+
+def render_payment_summary_pdf(progress, file_path, period_text, rows):
+    """
+    Writes the PaymentReportsView gross/net sales table. `rows` are the
+    (date, gross, net) values shown in the view.
+    Returns: file_path.
+    """
+    _require_reportlab()
+    doc = SimpleDocTemplate(file_path, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    # Title
+    elements.append(Paragraph("Payment Sales Report", styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    # Period info
+    elements.append(Paragraph(period_text, styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    # Table data
+    data = [["Date", "Gross Sales", "Net Sales"]]
+    for index, row in enumerate(rows, start=1):
+        data.append([str(row[0]), str(row[1]), str(row[2])])
+        progress.update(index, len(rows))
+
+    table = Table(data, colWidths=[120, 150, 150])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    elements.append(table)
+
+    _build(progress, doc, elements)
+    return file_path
+
+
+# --- Payment statement (PaymentHistoryForm) ---------------------------------------------
+
+def _statement_prices(details):
+    total_price = Decimal(str(details.get("price") or details.get("total_price") or 0))
+    discount = Decimal(str(details.get("discount") or 0))
+    return total_price, discount, total_price - discount
+
+
+def _statement_doc(file_path):
+    return SimpleDocTemplate(file_path, pagesize=A4, rightMargin=30, leftMargin=30, topMargin=30,
+                             bottomMargin=STATEMENT_BOTTOM_MARGIN)
+
+
+def _statement_story(transaction_id, details, history_data, opening_balance, counter, first, totals):
+    """
+    The story for a payment statement, or for one part of it. The running balance
+    starts at `opening_balance`; `totals` (total paid, closing balance) adds the
+    summary section and is only given for the last part.
+    """
+    styles = getSampleStyleSheet()
+    wrap_style = ParagraphStyle(
+        name="WrapStyle",
+        parent=styles["Normal"],
+        fontSize=9,
+        leading=11,
+        wordWrap="CJK",
+    )
+    elements = []
+
+    if first:
+        # --- 4. Header with logo ---
+        logo_path = os.path.join(ICONS_DIR, "NEWCITY.png")
+        if os.path.exists(logo_path):
+            logo = RLImage(logo_path)
+            logo._restrictSize(1.0 * inch, 1.0 * inch)
+        else:
+            logo = Paragraph("<b>NEW CITY REAL ESTATE</b>", styles["Normal"])
+
+        header_table = Table(
+            [[logo,
+            Paragraph("<b>NEW CITY REAL ESTATE</b>", styles["Title"]),
+            Paragraph(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), styles["Normal"])]],
+            colWidths=[80, 300, 120],
+        )
+        header_table.setStyle(TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("ALIGN", (2, 0), (2, 0), "RIGHT"),
+        ]))
+        elements.append(header_table)
+        elements.append(Spacer(1, 15))
+
+        # --- 5. Transaction summary ---
+        elements.append(Paragraph("<b>PAYMENT STATEMENT</b>", styles["Title"]))
+        elements.append(Spacer(1, 8))
+        elements.append(Paragraph(f"<b>Transaction ID:</b> {transaction_id}", styles["Normal"]))
+        elements.append(Paragraph(f"<b>Client Name:</b> {details.get('client_name', 'N/A')}", styles["Normal"]))
+        elements.append(Paragraph(f"<b>Contact:</b> {details.get('client_contact', 'N/A')}", styles["Normal"]))
+        elements.append(Paragraph(f"<b>Property:</b> {details.get('title_deed_number','')} — {details.get('location','')}", styles["Normal"]))
+        if details.get("project_name"):
+            elements.append(Paragraph(f"<b>Project:</b> {details['project_name']} (PLOT NO: {details.get('project_id')})", styles["Normal"]))
+        elements.append(Spacer(1, 10))
+
+    # --- 6. Payment table with running balance ---
+    table_data = [[
+        Paragraph("<b>Date</b>", wrap_style),
+        Paragraph("<b>Payment Mode</b>", wrap_style),
+        Paragraph("<b>Payment Reason</b>", wrap_style),
+        Paragraph("<b>Amount Paid (KES)</b>", wrap_style),
+        Paragraph("<b>Running Balance (KES)</b>", wrap_style),
+    ]]
+
+    running_balance = opening_balance
+
+    # Loop through all payments (oldest first)
+    for rec in history_data:
+        counter.advance()
+        amt = Decimal(str(rec.get("payment_amount", 0)))
+        running_balance -= amt
+
+        date_str = rec.get("payment_date")
+        if isinstance(date_str, datetime):
+            date_str = date_str.strftime("%Y-%m-%d %H:%M:%S")
+
+        table_data.append([
+            date_str or "—",
+            rec.get("payment_mode", ""),
+            rec.get("payment_reason", ""),
+            f"{float(amt):,.2f}",
+            f"{float(running_balance):,.2f}",
+        ])
+
+    # --- 7. Table styling ---
+    table = Table(table_data, colWidths=[120, 100, 160, 100, 100], repeatRows=1)
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2E86C1")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (3, 1), (4, -1), "RIGHT"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
+    ]))
+    elements.append(table)
+
+    if totals is None:
+        return elements
+    elements.append(Spacer(1, 15))
+
+    # --- 8. Totals / Summary section ---
+    total_price, discount, net_price = _statement_prices(details)
+    total_paid, balance = totals
+    summary_data = [
+        ["", "Total Property Price:", f"{float(total_price):,.2f} KES"],
+        ["", "Discounts Applied:", f"{float(discount):,.2f} KES"],
+        ["", "Net Payable:", f"{float(net_price):,.2f} KES"],
+        ["", "Total Amount Paid:", f"{float(total_paid):,.2f} KES"],
+        ["", "Outstanding Balance:", f"{float(balance):,.2f} KES"],
+    ]
+
+    summary_table = Table(summary_data, colWidths=[100, 200, 150])
+    summary_table.setStyle(TableStyle([
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+        ("FONTNAME", (1, 0), (-1, -1), "Helvetica-Bold"),
+        ("FONTSIZE", (1, 0), (-1, -1), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+    ]))
+    elements.append(summary_table)
+    elements.append(Spacer(1, 25))
+
+    elements.append(Paragraph(
+        "<i>This is a system-generated statement showing all payments made to date.</i>",
+        styles["Normal"]
+    ))
+    return elements
+
+
+def _statement_paid(history_data):
+    return sum((Decimal(str(rec.get("payment_amount", 0))) for rec in history_data), Decimal("0.00"))
+
+
+def render_payment_statement_pdf(progress, file_path, transaction_id, details, history_data):
+    """
+    Writes the PaymentHistoryForm payment statement with a running balance.
+    `history_data` is the aggregated payment history, oldest first.
+    Returns: file_path.
+    """
+    _require_reportlab()
+    net_price = _statement_prices(details)[2]
+    total_paid = _statement_paid(history_data)
+    elements = _statement_story(
+        transaction_id, details, history_data, net_price, _RowCounter(progress, len(history_data)),
+        first=True, totals=(total_paid, net_price - total_paid)
+    )
+
+    # --- 9. Build ---
+    _build(progress, _statement_doc(file_path), elements)
+    return file_path
+
+
+def payment_statement_chunks(transaction_id, details, history_data, chunk_rows=CHUNK_ROWS):
+    """
+    Splits a long payment statement into the argument tuples for
+    render_payment_statement_chunk, each with the running balance it opens with.
+    """
+    parts = _split_rows(history_data, chunk_rows)
+    balance = _statement_prices(details)[2]
+    total_paid = _statement_paid(history_data)
+    chunks = []
+    for index, rows in enumerate(parts):
+        last = index == len(parts) - 1
+        chunks.append((transaction_id, details, rows, balance, index, len(parts),
+                       (total_paid, balance - _statement_paid(rows)) if last else None))
+        balance -= _statement_paid(rows)
+    return chunks
+
+
+def render_payment_statement_chunk(progress, transaction_id, details, history_data, opening_balance, index, count, totals):
+    """Renders one part of a long payment statement. Returns: the path of the part's PDF."""
+    _require_reportlab()
+    elements = _statement_story(transaction_id, details, history_data, opening_balance,
+                                _RowCounter(progress, len(history_data)), first=index == 0, totals=totals)
+    return _build_chunk(progress, _statement_doc, elements, index, count)
@@ -0,0 +1,670 @@
+# real_estate_system/utils/schema_migrations.py
+"""
+Versioned schema migrations for the MySQL database.
+
+Each migration has a version number, a short description and a function that
+receives a cursor and applies the change. Applied versions are recorded in the
+schema_version table, so on startup only pending migrations run and a database
+that is already current costs a single SELECT.
+"""
+from collections import namedtuple
+
+import mysql.connector
+
+Migration = namedtuple('Migration', ['version', 'description', 'apply'])
+
+# MySQL error raised when a table does not exist.
+ER_NO_SUCH_TABLE = 1146
+
+# Advisory lock so two app instances starting together do not migrate at the same time.
+MIGRATION_LOCK_NAME = 'rems_schema_migration'
+MIGRATION_LOCK_TIMEOUT = 30
+
+
+def index_exists(cursor, table, index_name):
+    """Returns True if the given index already exists on the table."""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+        """,
+        (table, index_name)
+    )
+    return cursor.fetchone() is not None
+
+
+def create_index_if_missing(cursor, table, index_name, columns, kind=None):
+    """
+    Creates an index unless it already exists (MySQL has no CREATE INDEX IF NOT EXISTS).
+    `kind` is an optional index type such as 'FULLTEXT' or 'UNIQUE'.
+    """
+    if index_exists(cursor, table, index_name):
+        return
+    index_type = f"{kind} INDEX" if kind else "INDEX"
+    cursor.execute(f"CREATE {index_type} {index_name} ON {table} ({', '.join(columns)})")
+
+
+def column_type(cursor, table, column):
+    """Returns the data type of a column (e.g. 'int', 'varchar'), or None if it does not exist."""
+    cursor.execute(
+        """
+        SELECT data_type AS data_type FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """,
+        (table, column)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    data_type = row['data_type'] if isinstance(row, dict) else row[0]
+    if isinstance(data_type, (bytes, bytearray)):
+        data_type = data_type.decode('utf-8')
+    return data_type.lower()
+
+
+def foreign_key_exists(cursor, table, constraint_name):
+    """Returns True if the given foreign key constraint already exists on the table."""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.table_constraints
+        WHERE table_schema = DATABASE() AND table_name = %s
+          AND constraint_name = %s AND constraint_type = 'FOREIGN KEY'
+        LIMIT 1
+        """,
+        (table, constraint_name)
+    )
+    return cursor.fetchone() is not None
+
+
+# --- Migration 1: base tables ---
+BASE_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS system_settings (
+        setting_id INT AUTO_INCREMENT PRIMARY KEY,
+        setting_name VARCHAR(255) UNIQUE NOT NULL,
+        setting_value VARCHAR(255),
+        description TEXT,
+        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        updated_by_user_id VARCHAR(255),
+        updated_by_username VARCHAR(255)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INT PRIMARY KEY AUTO_INCREMENT,
+        username VARCHAR(255) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        is_agent VARCHAR(255) DEFAULT 'no',
+        role VARCHAR(255) DEFAULT 'user'
+
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS user_permissions (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        permission_name VARCHAR(255) NOT NULL,
+        is_granted BOOLEAN DEFAULT FALSE,
+        UNIQUE (user_id, permission_name),
+        FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS properties (
+        property_id INT PRIMARY KEY AUTO_INCREMENT,
+        property_type VARCHAR(255) NOT NULL,
+        title_deed_number VARCHAR(255) NOT NULL,
+        location VARCHAR(255) NOT NULL,
+        size FLOAT NOT NULL,
+        description TEXT,
+        owner VARCHAR(255) NOT NULL,
+        telephone_number VARCHAR(255) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        price FLOAT NOT NULL,
+        project_no VARCHAR(255) NOT NULL,
+        image_paths TEXT,
+        title_image_paths TEXT,
+        status VARCHAR(255) NOT NULL DEFAULT 'Available',
+        added_by_user_id INT,
+        project_id INT NOT NULL,
+        FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS propertiesForTransfer (
+        property_id INT PRIMARY KEY AUTO_INCREMENT,
+        title_deed_number VARCHAR(255) NOT NULL,
+        location VARCHAR(255) NOT NULL,
+        size FLOAT NOT NULL,
+        description TEXT,
+        owner VARCHAR(255) NOT NULL,
+        telephone_number VARCHAR(255) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        image_paths TEXT,
+        title_image_paths TEXT,
+        added_by_user_id INT,
+        FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS clients (
+        client_id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(255) NOT NULL,
+        telephone_number VARCHAR(255) NOT NULL UNIQUE,
+        email VARCHAR(255) NOT NULL,
+        status VARCHAR(255) NOT NULL DEFAULT 'active',
+        added_by_user_id INT,
+        FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS projects (
+        project_id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(255) NOT NULL,
+        added_by_user_id INT,
+        status VARCHAR(255) NOT NULL DEFAULT 'active',
+        sale_status VARCHAR(50) DEFAULT 'Available',
+        FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS daily_clients (
+    visit_id INT PRIMARY KEY AUTO_INCREMENT,
+    client_id INT NOT NULL,
+    purpose VARCHAR(255),
+    reason VARCHAR(255),
+    brought_by VARCHAR(255),
+    added_by_user_id INT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (client_id) REFERENCES clients(client_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS transactions (
+        transaction_id INT PRIMARY KEY AUTO_INCREMENT,
+        property_id INT NOT NULL,
+        client_id INT NOT NULL,
+        payment_mode VARCHAR(255) NOT NULL,
+        total_amount_paid DECIMAL(15, 2) NOT NULL,
+        discount DECIMAL(15, 2) DEFAULT 0.0,
+        balance DECIMAL(15, 2) DEFAULT 0.0,
+        brought_by VARCHAR(255),
+        transaction_date DATETIME NOT NULL,
+        receipt_path TEXT,
+        added_by_user_id INT,
+        FOREIGN KEY (property_id) REFERENCES properties(property_id),
+        FOREIGN KEY (client_id) REFERENCES clients(client_id),
+        FOREIGN KEY (added_by_user_id) REFERENCES users(user_id)
+    )
+    ''',
+
+    '''
+    CREATE TABLE IF NOT EXISTS proposed_lots (
+        lot_id INT PRIMARY KEY AUTO_INCREMENT,
+        parent_block_id INT NOT NULL,
+        size FLOAT NOT NULL,
+        location VARCHAR(255) NOT NULL,
+        surveyor_name VARCHAR(255) NOT NULL,
+        created_by VARCHAR(255) NOT NULL,
+        title_deed_number VARCHAR(255),
+        price VARCHAR(255) DEFAULT '0.0',
+        status VARCHAR(255) NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS property_transfers (
+        transfer_id INT PRIMARY KEY AUTO_INCREMENT,
+        property_id INT NOT NULL,
+        from_client_id INT,
+        to_client_id INT NOT NULL,
+        transfer_price FLOAT NOT NULL,
+        transfer_date DATE NOT NULL,
+        executed_by_user_id INT NOT NULL,
+        supervising_agent_id INT,
+        transfer_document_path TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (property_id) REFERENCES properties(property_id),
+        FOREIGN KEY (from_client_id) REFERENCES clients(client_id),
+        FOREIGN KEY (to_client_id) REFERENCES clients(client_id),
+        FOREIGN KEY (executed_by_user_id) REFERENCES users(user_id),
+        FOREIGN KEY (supervising_agent_id) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS agents (
+        agent_id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(255) NOT NULL,
+        status VARCHAR(255) DEFAULT 'active',
+        added_by VARCHAR(255) NOT NULL,
+        timestamp DATETIME NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS payment_plans (
+        plan_id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(255) NOT NULL,
+        deposit_percentage FLOAT NOT NULL,
+        duration_months INT NOT NULL,
+        interest_rate FLOAT NOT NULL,
+        created_by VARCHAR(255) NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS installment_plans (
+    plan_instance_id INT PRIMARY KEY AUTO_INCREMENT,
+    transaction_id INT NOT NULL,
+    payment_plan_id INT NOT NULL,
+    total_balance DECIMAL(15, 2) NOT NULL,
+    monthly_installment_amount DECIMAL(15, 4) NOT NULL,
+    start_date DATE NOT NULL,
+    FOREIGN KEY (transaction_id) REFERENCES transactions(transaction_id),
+    FOREIGN KEY (payment_plan_id) REFERENCES payment_plans(plan_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS installment_payments (
+    installment_id INT PRIMARY KEY AUTO_INCREMENT,
+    plan_instance_id INT NOT NULL,
+    due_date DATE NOT NULL,
+    due_amount DECIMAL(15, 2) NOT NULL,
+    paid_date DATETIME,
+    paid_amount DECIMAL(15, 2),
+    payment_status VARCHAR(50) NOT NULL DEFAULT 'Scheduled',
+    FOREIGN KEY (plan_instance_id) REFERENCES installment_plans(plan_instance_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS transactions_history (
+        history_id INT PRIMARY KEY AUTO_INCREMENT,
+        transaction_id INT NOT NULL,
+        installment_id INT NULL,
+        payment_amount DECIMAL(15, 2) NOT NULL,
+        payment_mode VARCHAR(255),
+        payment_reason VARCHAR(255),
+        payment_date DATETIME NOT NULL,
+        FOREIGN KEY (transaction_id) REFERENCES transactions(transaction_id),
+        FOREIGN KEY (installment_id) REFERENCES installment_payments(installment_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS service_clients (
+        client_id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(255) NOT NULL,
+        telephone_number VARCHAR(255) NOT NULL UNIQUE,
+        email VARCHAR(255) NOT NULL,
+        brought_by VARCHAR(255),
+        added_by VARCHAR(255) NOT NULL,
+        timestamp DATETIME NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS client_files (
+        file_id INT PRIMARY KEY AUTO_INCREMENT,
+        client_id INT NOT NULL,
+        file_name VARCHAR(255) NOT NULL,
+        added_by VARCHAR(255) NOT NULL,
+        timestamp DATETIME NOT NULL,
+        FOREIGN KEY (client_id) REFERENCES service_clients(client_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS service_jobs (
+        job_id INT PRIMARY KEY AUTO_INCREMENT,
+        file_id INT NOT NULL,
+        job_description TEXT,
+        title_name VARCHAR(255) NOT NULL,
+        title_number VARCHAR(255) NOT NULL,
+        fee FLOAT NOT NULL,
+        status VARCHAR(255) NOT NULL DEFAULT 'Ongoing',
+        added_by VARCHAR(255) NOT NULL,
+        brought_by VARCHAR(255) DEFAULT 'self',
+        assigned_to VARCHAR(255) NOT NULL,
+        task_type  VARCHAR(255) NOT NULL,
+        timestamp DATETIME NOT NULL,
+        FOREIGN KEY (file_id) REFERENCES client_files(file_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS service_payments (
+        payment_id INT PRIMARY KEY AUTO_INCREMENT,
+        job_id INT NOT NULL UNIQUE,
+        fee FLOAT NOT NULL,
+        amount FLOAT NOT NULL,
+        balance FLOAT NOT NULL,
+        payment_date VARCHAR(255) NOT NULL,
+        status VARCHAR(255) DEFAULT 'unpaid',
+        FOREIGN KEY (job_id) REFERENCES service_jobs(job_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS service_payments_history (
+        history_id INT PRIMARY KEY AUTO_INCREMENT,
+        payment_id INT NOT NULL,
+        payment_amount FLOAT NOT NULL,
+        payment_type VARCHAR(255),
+        payment_reason VARCHAR(255),
+        payment_date VARCHAR(255) NOT NULL,
+        FOREIGN KEY (payment_id) REFERENCES service_payments(payment_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS service_dispatch (
+        dispatch_id INT PRIMARY KEY AUTO_INCREMENT,
+        job_id INT NOT NULL,
+        dispatch_date DATE NOT NULL,
+        reason_for_dispatch TEXT,
+        collected_by VARCHAR(255),
+        collector_phone VARCHAR(255),
+        sign BLOB,
+        FOREIGN KEY (job_id) REFERENCES service_jobs(job_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS cancelled_jobs (
+        cancellation_id INT PRIMARY KEY AUTO_INCREMENT,
+        job_id INT NOT NULL,
+        reason TEXT NOT NULL,
+        refund_amount FLOAT NOT NULL,
+        cancelled_by INT NOT NULL,
+        cancellation_date DATETIME NOT NULL,
+        FOREIGN KEY (job_id) REFERENCES service_jobs(job_id),
+        FOREIGN KEY (cancelled_by) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS activity_logs (
+        log_id INT PRIMARY KEY AUTO_INCREMENT,
+        timestamp DATETIME NOT NULL,
+        user_id INT NOT NULL,
+        action_type VARCHAR(255) NOT NULL,
+        details TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS dispatch_titles (
+        dispatch_id INT AUTO_INCREMENT PRIMARY KEY,
+        property_id INT NOT NULL,
+        dispatch_date DATETIME NOT NULL,
+        reason_for_dispatch VARCHAR(255),
+        collected_by VARCHAR(255),
+        collector_phone VARCHAR(50),
+        sign LONGBLOB,
+        FOREIGN KEY (property_id) REFERENCES properties(property_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS title_movements (
+        movement_id INT PRIMARY KEY AUTO_INCREMENT,
+        property_id INT NOT NULL,
+        movement_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        movement_stage ENUM('Lawyer', 'Office', 'Dispatch') NOT NULL,
+        status VARCHAR(100) DEFAULT 'Pending',
+        lawyer_name VARCHAR(255),
+        remarks TEXT,
+        handled_by_user_id INT,
+        FOREIGN KEY (property_id) REFERENCES properties(property_id),
+        FOREIGN KEY (handled_by_user_id) REFERENCES users(user_id)
+    )
+    '''
+]
+
+
+def _create_base_tables(cursor):
+    for query in BASE_TABLES:
+        cursor.execute(query)
+
+
+# --- Migration 2: secondary indexes for the heaviest list and report queries ---
+SECONDARY_INDEXES = [
+    # get_all_properties_paginated: status filter + ORDER BY property_id DESC, and project joins.
+    ('properties', 'idx_properties_status_id', ['status', 'property_id']),
+    ('properties', 'idx_properties_project_status', ['project_id', 'status']),
+    ('properties', 'idx_properties_title_deed', ['title_deed_number']),
+    ('projects', 'idx_projects_status_name', ['status', 'name']),
+    # get_transactions_with_details and the sales reports: date ranges and payment mode.
+    ('transactions', 'idx_transactions_date', ['transaction_date']),
+    ('transactions', 'idx_transactions_mode_date', ['payment_mode', 'transaction_date']),
+    ('transactions', 'idx_transactions_balance_date', ['balance', 'transaction_date']),
+    # get_activity_logs: optional user/action filters, always ORDER BY timestamp DESC.
+    ('activity_logs', 'idx_activity_logs_timestamp', ['timestamp']),
+    ('activity_logs', 'idx_activity_logs_user_timestamp', ['user_id', 'timestamp']),
+    ('activity_logs', 'idx_activity_logs_action_timestamp', ['action_type', 'timestamp']),
+    # get_filtered_payments: status filter + ORDER BY payment_date DESC.
+    ('service_payments', 'idx_service_payments_status_date', ['status', 'payment_date']),
+    ('service_payments', 'idx_service_payments_date', ['payment_date']),
+    # Installment schedules are read per plan in due-date order.
+    ('installment_payments', 'idx_installment_payments_plan_due', ['plan_instance_id', 'due_date']),
+    ('installment_payments', 'idx_installment_payments_due_date', ['due_date']),
+    # Job lists filter on status and sort by creation time.
+    ('service_jobs', 'idx_service_jobs_status_timestamp', ['status', 'timestamp']),
+    ('service_jobs', 'idx_service_jobs_timestamp', ['timestamp']),
+    # Active client list ordered by name.
+    ('clients', 'idx_clients_status_name', ['status', 'name']),
+]
+
+
+def _create_secondary_indexes(cursor):
+    for table, index_name, columns in SECONDARY_INDEXES:
+        create_index_if_missing(cursor, table, index_name, columns)
+
+
+# --- Migration 3: FULLTEXT indexes for property search ---
+# DatabaseManager's MATCH() clauses must name exactly these columns, in this order.
+FULLTEXT_INDEXES = [
+    ('properties', 'ft_properties_search', ['title_deed_number', 'location', 'project_no', 'owner', 'description']),
+    ('propertiesForTransfer', 'ft_properties_for_transfer_search', ['title_deed_number', 'location', 'owner', 'description']),
+    ('projects', 'ft_projects_name', ['name']),
+]
+
+
+def _create_fulltext_indexes(cursor):
+    for table, index_name, columns in FULLTEXT_INDEXES:
+        create_index_if_missing(cursor, table, index_name, columns, kind='FULLTEXT')
+
+
+# --- Migration 4: integer user references ---
+# Columns that stored a user ID as text. They become INT columns of the same name.
+USER_ID_TEXT_COLUMNS = [
+    ('service_jobs', 'assigned_to'),
+    ('client_files', 'added_by'),
+    ('service_clients', 'added_by'),
+]
+
+# Columns that stored a username: (table, old column, new user ID column). The username
+# is joined in from users when these rows are read.
+USERNAME_COLUMNS = [
+    ('service_jobs', 'added_by', 'added_by_user_id'),
+    ('agents', 'added_by', 'added_by_user_id'),
+    ('payment_plans', 'created_by', 'created_by_user_id'),
+    ('proposed_lots', 'created_by', 'created_by_user_id'),
+]
+
+
+def _add_user_foreign_key(cursor, table, column):
+    """Indexes a user ID column and points it at users; deleting a user clears the reference."""
+    create_index_if_missing(cursor, table, f"idx_{table}_{column}", [column])
+    constraint_name = f"fk_{table}_{column}"
+    if not foreign_key_exists(cursor, table, constraint_name):
+        cursor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {constraint_name} "
+            f"FOREIGN KEY ({column}) REFERENCES users(user_id) ON DELETE SET NULL"
+        )
+
+
+def _convert_user_id_column(cursor, table, column):
+    # Each step checks what is already done, so an interrupted run can simply be repeated.
+    temp_column = f"{column}_user_id_tmp"
+    if column_type(cursor, table, column) != 'int':
+        if column_type(cursor, table, temp_column) is None:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {temp_column} INT NULL")
+        if column_type(cursor, table, column) is not None:
+            cursor.execute(
+                f"""
+                UPDATE {table} t
+                JOIN users u ON u.user_id = CAST(t.{column} AS UNSIGNED)
+                SET t.{temp_column} = u.user_id
+                WHERE t.{column} REGEXP '^[0-9]+$'
+                """
+            )
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        cursor.execute(f"ALTER TABLE {table} CHANGE COLUMN {temp_column} {column} INT NULL")
+    _add_user_foreign_key(cursor, table, column)
+
+
+def _replace_username_column(cursor, table, column, id_column):
+    if column_type(cursor, table, id_column) is None:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {id_column} INT NULL")
+    if column_type(cursor, table, column) is not None:
+        cursor.execute(
+            f"""
+            UPDATE {table} t
+            JOIN users u ON u.username = t.{column}
+            SET t.{id_column} = u.user_id
+            """
+        )
+        # Some rows stored the user ID when no username could be found for it.
+        cursor.execute(
+            f"""
+            UPDATE {table} t
+            JOIN users u ON u.user_id = CAST(t.{column} AS UNSIGNED)
+            SET t.{id_column} = u.user_id
+            WHERE t.{id_column} IS NULL AND t.{column} REGEXP '^[0-9]+$'
+            """
+        )
+        cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+    _add_user_foreign_key(cursor, table, id_column)
+
+
+def _convert_user_references(cursor):
+    for table, column in USER_ID_TEXT_COLUMNS:
+        _convert_user_id_column(cursor, table, column)
+    for table, column, id_column in USERNAME_COLUMNS:
+        _replace_username_column(cursor, table, column, id_column)
+
+
+# --- Migration 5: DATETIME payment dates and indexes for date-range reports ---
+# Date columns that were stored as 'YYYY-MM-DD HH:MM:SS' text.
+DATETIME_TEXT_COLUMNS = [
+    ('service_payments', 'payment_date'),
+    ('service_payments_history', 'payment_date'),
+]
+
+# Date columns the reports filter by range that migration 2 left unindexed.
+DATE_RANGE_INDEXES = [
+    ('service_payments_history', 'idx_service_payments_history_date', ['payment_date']),
+    ('service_dispatch', 'idx_service_dispatch_date', ['dispatch_date']),
+    ('cancelled_jobs', 'idx_cancelled_jobs_date', ['cancellation_date']),
+    ('daily_clients', 'idx_daily_clients_timestamp', ['timestamp']),
+]
+
+_DATE_ONLY_PATTERN = '^[0-9]{4}-[0-9]{2}-[0-9]{2}$'
+_DATETIME_PATTERN = '^[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}$'
+
+
+def _convert_datetime_text_column(cursor, table, column):
+    if column_type(cursor, table, column) == 'datetime':
+        return
+    # A bare date becomes midnight of that day.
+    cursor.execute(
+        f"UPDATE {table} SET {column} = CONCAT({column}, ' 00:00:00') WHERE {column} REGEXP %s",
+        (_DATE_ONLY_PATTERN,)
+    )
+    cursor.execute(
+        f"SELECT COUNT(*) AS invalid FROM {table} WHERE {column} NOT REGEXP %s",
+        (_DATETIME_PATTERN,)
+    )
+    row = cursor.fetchone()
+    invalid = row['invalid'] if isinstance(row, dict) else row[0]
+    if invalid:
+        # Refuse rather than silently losing payment dates; the migration is retried on next start.
+        raise mysql.connector.Error(
+            msg=f"{table}.{column} has {invalid} value(s) that are not dates; correct them before upgrading."
+        )
+    # MODIFY keeps the existing indexes on the column.
+    cursor.execute(f"ALTER TABLE {table} MODIFY COLUMN {column} DATETIME NOT NULL")
+
+
+def _convert_report_dates(cursor):
+    for table, column in DATETIME_TEXT_COLUMNS:
+        _convert_datetime_text_column(cursor, table, column)
+    for table, index_name, columns in DATE_RANGE_INDEXES:
+        create_index_if_missing(cursor, table, index_name, columns)
+
+
+# Ordered list of all migrations. Append new steps at the end with the next version number;
+# never edit or renumber a migration that has already shipped.
+MIGRATIONS = [
+    Migration(1, 'Create base tables', _create_base_tables),
+    Migration(2, 'Add secondary indexes for list and report queries', _create_secondary_indexes),
+    Migration(3, 'Add FULLTEXT indexes for property search', _create_fulltext_indexes),
+    Migration(4, 'Store user references as indexed integer foreign keys', _convert_user_references),
+    Migration(5, 'Store service payment dates as DATETIME and index report date columns', _convert_report_dates),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_current_version(cursor):
+    """
+    Returns the highest applied schema version, or 0 if the schema_version table
+    does not exist yet.
+    """
+    try:
+        cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+        row = cursor.fetchone()
+    except mysql.connector.Error as err:
+        if err.errno == ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    if not row:
+        return 0
+    version = row['version'] if isinstance(row, dict) else row[0]
+    return version or 0
+
+
+def run_migrations(conn, migrations=MIGRATIONS):
+    """
+    Applies every migration newer than the recorded schema version, in order.
+    Returns the list of versions that were applied (empty when already current).
+    """
+    cursor = conn.cursor(buffered=True)
+    try:
+        if get_current_version(cursor) >= migrations[-1].version:
+            return []
+
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT))
+        if not cursor.fetchone()[0]:
+            raise mysql.connector.Error(msg="Could not obtain the schema migration lock.")
+        try:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INT PRIMARY KEY,
+                    description VARCHAR(255) NOT NULL,
+                    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            # Re-read under the lock in case another instance migrated in the meantime.
+            current = get_current_version(cursor)
+            applied = []
+            for migration in migrations:
+                if migration.version <= current:
+                    continue
+                print(f"Applying schema migration {migration.version}: {migration.description}")
+                migration.apply(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (migration.version, migration.description)
+                )
+                conn.commit()
+                applied.append(migration.version)
+            return applied
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+            cursor.fetchone()
+    finally:
+        cursor.close()
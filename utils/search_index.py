@@ -0,0 +1,275 @@
+# real_estate_system/utils/search_index.py
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+
+# Separators used in the joined search text; they never occur in typed search terms.
+_FIELD_SEP = "\x1f"
+_RECORD_SEP = "\x1e"
+_MAX_CHAR = "\U0010ffff"
+
+# Rows changed since the joined search text was built are checked one by one; past
+# this many the text is rebuilt instead.
+MAX_PENDING_CHANGES = 500
+
+# Rows a search-as-you-type list shows at once; typing more narrows it down.
+SEARCH_DISPLAY_LIMIT = 500
+
+
+def _normalise(value):
+    return "" if value is None else str(value).lower()
+
+
+class SearchIndex:
+    """
+    An in-memory index over a list of row dicts for search-as-you-type lists.
+
+    The searchable fields of every row are lowercased once, when the row is added.
+    Prefix matches come from a sorted list of keys (bisect). Substring matches scan a
+    single joined string with str.find, so the loop runs in C rather than over every
+    row in Python. Rows can be upserted and removed one at a time; `version` holds the
+    change marker the contents correspond to, so callers can tell when a refresh is
+    due, and `loaded_at` / `checked_at` when it was last loaded in full and last
+    compared with the database. Results are ordered by `sort_field`, newest-first
+    style when `descending`.
+    """
+
+    def __init__(self, id_field, fields, sort_field=None, descending=False):
+        self.id_field = id_field
+        self.fields = tuple(fields)
+        self.sort_field = sort_field or self.fields[0]
+        self.descending = descending
+        self.version = None
+        self.loaded = False
+        self.loaded_at = None
+        self.checked_at = None
+        self._lock = threading.RLock()
+        self._rows = {}         # row id -> row dict
+        self._texts = {}        # row id -> lowercased fields joined by _FIELD_SEP
+        self._order = []        # sorted (sort key, row id)
+        self._prefix = []       # sorted (lowercased field value, row id)
+        self._blob = ""         # _texts of every row in _order order, joined by _RECORD_SEP
+        self._offsets = []      # start of each row's text inside _blob
+        self._blob_ids = []     # row id of each entry in _offsets
+        self._changed = set()   # ids upserted or removed since _blob was built
+
+    def __len__(self):
+        return len(self._rows)
+
+    def max_id(self, default=0):
+        """Returns the highest row id in the index, for fetching only rows added since."""
+        with self._lock:
+            return max(self._rows, default=default)
+
+    def load(self, rows, version=None):
+        """Replaces the whole contents of the index."""
+        with self._lock:
+            self._rows = {}
+            self._texts = {}
+            order = []
+            prefix = []
+            for row in rows:
+                row_id = row[self.id_field]
+                keys = self._keys_for(row)
+                self._rows[row_id] = row
+                self._texts[row_id] = _FIELD_SEP.join(keys)
+                order.append((self._sort_key(row), row_id))
+                prefix.extend((key, row_id) for key in keys if key)
+            order.sort()
+            prefix.sort()
+            self._order = order
+            self._prefix = prefix
+            self._rebuild_blob()
+            self.version = version
+            self.loaded = True
+            self.loaded_at = self.checked_at = time.time()
+
+    def upsert(self, row, version=None):
+        """Adds a row, or replaces the row with the same id."""
+        with self._lock:
+            row_id = row[self.id_field]
+            self._discard(row_id)
+            keys = self._keys_for(row)
+            self._rows[row_id] = row
+            self._texts[row_id] = _FIELD_SEP.join(keys)
+            insort(self._order, (self._sort_key(row), row_id))
+            for key in keys:
+                if key:
+                    insort(self._prefix, (key, row_id))
+            self._note_change(row_id)
+            if version is not None:
+                self.version = version
+
+    def remove(self, row_id, version=None):
+        with self._lock:
+            if self._discard(row_id):
+                self._note_change(row_id)
+            if version is not None:
+                self.version = version
+
+    def invalidate(self):
+        """Marks the index as needing a full reload."""
+        with self._lock:
+            self.loaded = False
+
+    def get(self, row_id):
+        return self._rows.get(row_id)
+
+    def all(self, limit=None):
+        """Returns every row in sort order."""
+        with self._lock:
+            order = self._ordered()
+            if limit is not None:
+                order = order[:limit]
+            return [self._rows[row_id] for _, row_id in order]
+
+    def prefix_search(self, term, limit=None):
+        """Returns rows where any field starts with `term`, in sort order."""
+        term = self._clean_term(term)
+        if not term:
+            return self.all(limit)
+        with self._lock:
+            ids, _prefix_ids = self._first_prefix_ids(term, limit)
+            return [self._rows[row_id] for row_id in ids]
+
+    def search(self, term, limit=None):
+        """
+        Returns rows where any field contains `term`. Rows with a field that starts with
+        `term` come first; each group is in sort order. An empty term returns every row.
+        """
+        term = self._clean_term(term)
+        if not term:
+            return self.all(limit)
+        with self._lock:
+            results, prefix_ids = self._first_prefix_ids(term, limit)
+            if limit is not None and len(results) >= limit:
+                return [self._rows[row_id] for row_id in results]
+
+            changed = self._changed
+            substring_ids = []
+            blob, offsets, blob_ids = self._blob, self._offsets, self._blob_ids
+            position = blob.find(term)
+            while position != -1:
+                index = bisect_right(offsets, position) - 1
+                row_id = blob_ids[index]
+                if row_id not in prefix_ids and row_id not in changed:
+                    substring_ids.append(row_id)
+                    if limit is not None and len(results) + len(substring_ids) >= limit:
+                        break
+                next_start = offsets[index + 1] if index + 1 < len(offsets) else len(blob)
+                position = blob.find(term, next_start)
+
+            # Rows changed since the joined text was built are checked directly.
+            changed_hits = [row_id for row_id in changed
+                            if row_id in self._texts and row_id not in prefix_ids
+                            and term in self._texts[row_id]]
+            if changed_hits:
+                substring_ids = self._sorted_ids(substring_ids + changed_hits)
+
+            results.extend(substring_ids)
+            return [self._rows[row_id] for row_id in results[:limit]]
+
+    def _keys_for(self, row):
+        return tuple(_normalise(row.get(field)) for field in self.fields)
+
+    def _sort_key(self, row):
+        return _normalise(row.get(self.sort_field))
+
+    @staticmethod
+    def _clean_term(term):
+        return _normalise(term).strip().replace(_FIELD_SEP, "").replace(_RECORD_SEP, "")
+
+    def _ordered(self):
+        return self._order[::-1] if self.descending else self._order
+
+    def _sorted_ids(self, ids):
+        return sorted(ids, key=lambda row_id: (self._sort_key(self._rows[row_id]), row_id),
+                      reverse=self.descending)
+
+    def _first_prefix_ids(self, term, limit):
+        """
+        Returns (the first `limit` ids of rows with a field starting with `term`, in sort
+        order, and the set of all such ids). A term with more than len(fields) * limit
+        prefix entries matches at least `limit` rows, so the sorted rows are walked and
+        checked directly instead, and the set is None.
+        """
+        prefix = self._prefix
+        start = bisect_left(prefix, (term,))
+        end = bisect_left(prefix, (term + _MAX_CHAR,), start)
+        if limit is None or end - start <= len(self.fields) * limit:
+            prefix_ids = self._prefix_ids(term)
+            return self._first_sorted(prefix_ids, limit), prefix_ids
+
+        first = []
+        field_start = _FIELD_SEP + term
+        texts = self._texts
+        for _key, row_id in (reversed(self._order) if self.descending else self._order):
+            text = texts[row_id]
+            if text.startswith(term) or field_start in text:
+                first.append(row_id)
+                if len(first) == limit:
+                    break
+        return first, None
+
+    def _first_sorted(self, ids, limit):
+        """
+        Returns the first `limit` of `ids` in sort order. A broad term can match most rows,
+        so rather than sorting them all this walks the already sorted _order until enough
+        are found.
+        """
+        if limit is None or len(ids) <= limit:
+            return self._sorted_ids(ids)
+        first = []
+        for _key, row_id in (reversed(self._order) if self.descending else self._order):
+            if row_id in ids:
+                first.append(row_id)
+                if len(first) == limit:
+                    break
+        return first
+
+    def _discard(self, row_id):
+        row = self._rows.pop(row_id, None)
+        if row is None:
+            return False
+        keys = self._texts.pop(row_id).split(_FIELD_SEP)
+        self._remove_sorted(self._order, (self._sort_key(row), row_id))
+        for key in keys:
+            if key:
+                self._remove_sorted(self._prefix, (key, row_id))
+        return True
+
+    @staticmethod
+    def _remove_sorted(items, item):
+        index = bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    def _prefix_ids(self, term):
+        ids = set()
+        prefix = self._prefix
+        index = bisect_left(prefix, (term,))
+        while index < len(prefix) and prefix[index][0].startswith(term):
+            ids.add(prefix[index][1])
+            index += 1
+        return ids
+
+    def _note_change(self, row_id):
+        self._changed.add(row_id)
+        if len(self._changed) > MAX_PENDING_CHANGES:
+            self._rebuild_blob()
+
+    def _rebuild_blob(self):
+        parts = []
+        offsets = []
+        blob_ids = []
+        position = 0
+        for _, row_id in self._ordered():
+            text = self._texts[row_id]
+            offsets.append(position)
+            blob_ids.append(row_id)
+            parts.append(text)
+            position += len(text) + 1
+        self._blob = _RECORD_SEP.join(parts)
+        self._offsets = offsets
+        self._blob_ids = blob_ids
+        self._changed = set()
@@ -0,0 +1,113 @@
+# real_estate_system/utils/signatures.py
+import io
+import threading
+import zlib
+from collections import OrderedDict
+
+from PIL import Image
+
+# Signature images larger than this (width, height) in pixels are scaled down before storing.
+MAX_SIGNATURE_SIZE = (1600, 1600)
+JPEG_QUALITY = 85
+
+# Marks a stored signature as zlib-compressed; rows written before compression hold the raw file.
+_COMPRESSED_PREFIX = b"RSZ1"
+
+# Upper bound, in bytes, on the decoded signatures kept in memory.
+SIGNATURE_CACHE_BYTES = 16 * 1024 * 1024
+
+
+def _downscale_image(data):
+    """
+    Scales a signature image down to MAX_SIGNATURE_SIZE. JPEGs stay JPEG; other image
+    formats are stored as PNG. PDFs and anything else PIL cannot read are returned as is.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception:
+        return data
+
+    image_format = image.format
+    too_large = image.width > MAX_SIGNATURE_SIZE[0] or image.height > MAX_SIGNATURE_SIZE[1]
+    if not too_large and image_format in ('PNG', 'JPEG'):
+        return data
+    if too_large:
+        image.thumbnail(MAX_SIGNATURE_SIZE, Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    if image_format == 'JPEG':
+        image.convert('RGB').save(output, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    else:
+        if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        image.save(output, 'PNG', optimize=True)
+    encoded = output.getvalue()
+    return encoded if len(encoded) < len(data) else data
+
+
+def encode_signature(data):
+    """Prepares an uploaded signature file for storage: downscaled if it is an image, then compressed."""
+    if not data:
+        return data
+    data = _downscale_image(bytes(data))
+    compressed = zlib.compress(data, 9)
+    if len(compressed) + len(_COMPRESSED_PREFIX) < len(data):
+        return _COMPRESSED_PREFIX + compressed
+    return data
+
+
+def decode_signature(blob):
+    """Returns the signature file stored by encode_signature (or an older, uncompressed row)."""
+    if not blob:
+        return blob
+    blob = bytes(blob)
+    if blob.startswith(_COMPRESSED_PREFIX):
+        return zlib.decompress(blob[len(_COMPRESSED_PREFIX):])
+    return blob
+
+
+class SignatureCache:
+    """
+    A least-recently-used cache of decoded signatures, bounded by their total size.
+    Each entry remembers the table version it was read at, so a later write to the
+    table makes it stale.
+    """
+
+    def __init__(self, max_bytes=SIGNATURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (data, version)
+        self._size = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, cached_version = entry
+            if cached_version != version:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key, data, version):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (data, version)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, key):
+        data, _ = self._entries.pop(key)
+        self._size -= len(data)
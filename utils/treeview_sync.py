@@ -0,0 +1,90 @@
+# real_estate_system/utils/treeview_sync.py
+from utils.virtual_treeview import VirtualTreeview, tree_values
+
+
+def reconcile_treeview(tree, rows):
+    """
+    Brings a flat ttk.Treeview (or VirtualTreeview) in line with `rows` without
+    clearing it first.
+
+    `rows` is an ordered iterable of (iid, values) or (iid, values, tags) tuples keyed
+    by primary key (client_id, file_id, job_id, ...). Items whose key disappeared are
+    deleted, new keys are inserted, and existing items are only updated or moved when
+    their values, tags or position changed. Untouched rows keep their selection and the
+    view keeps its scroll position. Rows repeating a key already seen are skipped.
+    A VirtualTreeview has its row store replaced in one set_rows() call instead, which
+    keeps the selection too and leaves ordering to its active sort, if any.
+
+    Returns: A dict counting the items inserted, updated, moved and deleted.
+    """
+    desired = []
+    seen = set()
+    for row in rows:
+        iid = str(row[0])
+        if iid in seen:
+            continue
+        seen.add(iid)
+        desired.append((iid, row[1], row[2] if len(row) > 2 else ()))
+
+    if isinstance(tree, VirtualTreeview):
+        return _reconcile_virtual(tree, desired, seen)
+
+    current = list(tree.get_children())
+    stale = [iid for iid in current if iid not in seen]
+    if stale:
+        tree.delete(*stale)
+        stale_set = set(stale)
+        current = [iid for iid in current if iid not in stale_set]
+    existing = set(current)
+    counts = {'inserted': 0, 'updated': 0, 'moved': 0, 'deleted': len(stale)}
+
+    # The children after the rows placed so far are the not yet placed ones of
+    # `current`, in order; `next_current` points at the first of them.
+    placed = set()
+    next_current = 0
+    for position, (iid, values, tags) in enumerate(desired):
+        while next_current < len(current) and current[next_current] in placed:
+            next_current += 1
+        placed.add(iid)
+        if iid not in existing:
+            tree.insert('', position, iid=iid, values=values, tags=tags)
+            counts['inserted'] += 1
+            continue
+
+        item = tree.item(iid)
+        if tree_values(item['values']) != tree_values(values) or tree_values(item['tags']) != tree_values(tags):
+            tree.item(iid, values=values, tags=tags)
+            counts['updated'] += 1
+        if current[next_current] == iid:
+            next_current += 1
+        else:
+            tree.move(iid, '', position)
+            counts['moved'] += 1
+    return counts
+
+
+def _reconcile_virtual(tree, desired, seen):
+    current = tree.get_children()
+    existing = {}
+    for iid in current:
+        item = tree.item(iid)
+        existing[iid] = (tree_values(item['values']), tree_values(item['tags']))
+    counts = {'inserted': 0, 'updated': 0, 'moved': 0,
+              'deleted': sum(1 for iid in current if iid not in seen)}
+
+    kept_order = [iid for iid in current if iid in seen]
+    kept_position = 0
+    for iid, values, tags in desired:
+        if iid not in existing:
+            counts['inserted'] += 1
+            continue
+        if existing[iid] != (tree_values(values), tree_values(tags)):
+            counts['updated'] += 1
+        if kept_order[kept_position] != iid:
+            counts['moved'] += 1
+        kept_position += 1
+
+    if tree.sort_column is not None:
+        counts['moved'] = 0  # The tree re-sorts its rows itself
+    tree.set_rows(desired)
+    return counts
@@ -0,0 +1,512 @@
+# real_estate_system/utils/virtual_treeview.py
+import itertools
+import tkinter as tk
+from tkinter import ttk
+
+# Pixels assumed for the heading row until the real row geometry is known.
+_HEADING_HEIGHT = 25
+_DEFAULT_ROW_HEIGHT = 20
+_NAVIGATION_KEYS = ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>")
+_WHEEL_EVENTS = ("<MouseWheel>", "<Button-4>", "<Button-5>")
+
+
+def _tk_value(value):
+    """Converts a value the way a ttk.Treeview round trip does (str, then int when it parses)."""
+    value = value if isinstance(value, str) else str(value)
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def tree_values(value):
+    """Normalises item values or tags to the list a ttk.Treeview hands back for them."""
+    return [_tk_value(v) for v in _as_list(value)]
+
+
+def _as_list(value):
+    """Item values or tags as the list given to Tk, unconverted (so '007' is drawn as '007')."""
+    if value in (None, ""):
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+class VirtualTreeview(ttk.Treeview):
+    """
+    A drop-in replacement for a flat ttk.Treeview that only creates Tk items for the
+    rows currently on screen, so lists with tens of thousands of rows load instantly.
+
+    insert(), delete(), item(), get_children(), selection(), focus(), see() and the other
+    item methods work on an in-memory row store, so existing code keeps its Treeview
+    calls. Rows keep their values as given and are drawn from those; item() and set()
+    hand them back converted the way a ttk.Treeview does. The visible window is re-rendered once per change, on idle. yview() and the
+    yscrollcommand scrollbar work in rows of the whole list, and enable_sorting() sorts
+    the list (not just the visible rows) from the column headings.
+    """
+
+    def __init__(self, master=None, **kw):
+        self._yscrollcommand = kw.pop('yscrollcommand', None)
+        super().__init__(master, **kw)
+        self._iids = []             # Row ids in display order (may hold deleted ids, see _compact)
+        self._rows = {}             # iid -> {'text', 'values', 'tags'}
+        self._pending_deletes = set()
+        self._auto_ids = itertools.count(1)
+        self._top = 0               # Index of the first rendered row
+        self._rendered = []         # Row ids currently inserted into the Tk widget
+        self._rendered_rows = {}    # iid -> row as last rendered
+        self._selection = []
+        self._focus_iid = ''
+        self._select_handlers = []
+        self._last_notified_selection = ()
+        self._render_after_id = None
+        self._sort_column = None
+        self._sort_descending = False
+        self._needs_sort = False
+        self._sortable_columns = ()
+
+        # Our bindings run before the Treeview class bindings so they can stop native scrolling.
+        tag = f"VirtualTreeview{id(self)}"
+        self.bindtags((str(self), tag) + tuple(t for t in self.bindtags() if t != str(self)))
+        for sequence in _WHEEL_EVENTS:
+            self.bind_class(tag, sequence, self._on_mousewheel)
+        for sequence in _NAVIGATION_KEYS:
+            self.bind_class(tag, sequence, self._on_navigation_key)
+        self.bind_class(tag, "<Configure>", lambda event: self._schedule_render())
+        super().bind("<<TreeviewSelect>>", self._on_native_select)
+
+    # --- Row store -------------------------------------------------------------------
+
+    def insert(self, parent, index, iid=None, **kw):
+        self._check_parent(parent)
+        if iid is None:
+            iid = f"V{next(self._auto_ids):06d}"
+            while iid in self._rows:
+                iid = f"V{next(self._auto_ids):06d}"
+        iid = str(iid)
+        if iid in self._rows:
+            raise tk.TclError(f'Item {iid} already exists')
+        if iid in self._pending_deletes or index != 'end':
+            self._compact()
+
+        self._rows[iid] = {'text': kw.get('text', ''), 'values': _as_list(kw.get('values')),
+                           'tags': _as_list(kw.get('tags'))}
+        if index == 'end':
+            self._iids.append(iid)
+        else:
+            self._iids.insert(int(index), iid)
+        self._needs_sort = self._sort_column is not None
+        self._schedule_render()
+        return iid
+
+    def set_rows(self, rows):
+        """
+        Replaces every row at once. `rows` holds (iid, values) or (iid, values, tags)
+        tuples. The selection and focus are kept for rows that are still present.
+        """
+        self._rows = {}
+        self._iids = []
+        self._pending_deletes = set()
+        for row in rows:
+            iid = str(row[0])
+            self._rows[iid] = {'text': '', 'values': _as_list(row[1]),
+                               'tags': _as_list(row[2] if len(row) > 2 else ())}
+            self._iids.append(iid)
+        self._forget_missing()
+        self._needs_sort = self._sort_column is not None
+        self._schedule_render()
+
+    def delete(self, *items):
+        items = self._flatten(items)
+        if not items:
+            return
+        if len(items) >= len(self._rows) and all(iid in self._rows for iid in items):
+            self._rows = {}
+            self._iids = []
+            self._pending_deletes = set()
+        else:
+            for iid in items:
+                if iid not in self._rows:
+                    raise tk.TclError(f'Item {iid} not found')
+                del self._rows[iid]
+                self._pending_deletes.add(iid)
+        self._forget_missing()
+        self._schedule_render()
+
+    def get_children(self, item=None):
+        if item:
+            return ()
+        self._compact()
+        return tuple(self._iids)
+
+    def exists(self, item):
+        return str(item) in self._rows
+
+    def index(self, item):
+        self._compact()
+        return self._iids.index(self._require(item))
+
+    def move(self, item, parent, index):
+        self._check_parent(parent)
+        item = self._require(item)
+        self._compact()
+        self._iids.remove(item)
+        self._iids.insert(len(self._iids) if index == 'end' else int(index), item)
+        self._schedule_render()
+
+    def next(self, item):
+        position = self.index(item) + 1
+        return self._iids[position] if position < len(self._iids) else ''
+
+    def prev(self, item):
+        position = self.index(item) - 1
+        return self._iids[position] if position >= 0 else ''
+
+    def parent(self, item):
+        return ''
+
+    def item(self, item, option=None, **kw):
+        row = self._rows.get(self._require(item))
+        if kw:
+            if 'values' in kw:
+                row['values'] = _as_list(kw['values'])
+                self._needs_sort = self._sort_column is not None
+            if 'tags' in kw:
+                row['tags'] = _as_list(kw['tags'])
+            if 'text' in kw:
+                row['text'] = kw['text']
+            self._schedule_render()
+            return None
+        data = {'text': row['text'], 'image': '', 'values': tree_values(row['values']) or '',
+                'open': 0, 'tags': tree_values(row['tags']) or ''}
+        return data[option] if option is not None else data
+
+    def set(self, item, column=None, value=None):
+        row = self._rows[self._require(item)]
+        columns = list(self['columns'])
+        if column is None:
+            return {col: _tk_value(row['values'][i]) for i, col in enumerate(columns) if i < len(row['values'])}
+        position = columns.index(column) if column in columns else int(str(column).lstrip('#')) - 1
+        if value is None:
+            return row['values'][position] if position < len(row['values']) else ''
+        values = list(row['values']) + [''] * (position + 1 - len(row['values']))
+        values[position] = value
+        self.item(item, values=values)
+
+    def row_count(self):
+        return len(self._rows)
+
+    @property
+    def sort_column(self):
+        """The column the rows are sorted by, or None when they keep insertion order."""
+        return self._sort_column
+
+    # --- Selection and focus ---------------------------------------------------------
+
+    def selection(self):
+        self._sync_from_native()
+        return tuple(self._selection)
+
+    def selection_set(self, *items):
+        self._change_selection(self._flatten(items))
+
+    def selection_add(self, *items):
+        items = [iid for iid in self._flatten(items) if iid not in self._selection]
+        self._change_selection(self._selection + items)
+
+    def selection_remove(self, *items):
+        items = set(self._flatten(items))
+        self._change_selection([iid for iid in self._selection if iid not in items])
+
+    def selection_toggle(self, *items):
+        selection = list(self._selection)
+        for iid in self._flatten(items):
+            if iid in selection:
+                selection.remove(iid)
+            else:
+                selection.append(iid)
+        self._change_selection(selection)
+
+    def focus(self, item=None):
+        if item is None:
+            self._sync_from_native()
+            return self._focus_iid
+        self._focus_iid = self._require(item) if item else ''
+        self._render()
+        return None
+
+    def see(self, item):
+        position = self.index(item)
+        capacity = self._capacity()
+        if position < self._top:
+            self._top = position
+        elif position >= self._top + capacity:
+            self._top = position - capacity + 1
+        self._render()
+
+    def bind(self, sequence=None, func=None, add=None):
+        # <<TreeviewSelect>> fires only when the selection over the whole list changes,
+        # not when scrolling re-creates the selected items.
+        if sequence == "<<TreeviewSelect>>" and func is not None:
+            if not add:
+                self._select_handlers = []
+            self._select_handlers.append(func)
+            return None
+        return super().bind(sequence, func, add)
+
+    def unbind(self, sequence, funcid=None):
+        if sequence == "<<TreeviewSelect>>":
+            self._select_handlers = []
+            return
+        super().unbind(sequence, funcid)
+
+    # --- Scrolling -------------------------------------------------------------------
+
+    def configure(self, cnf=None, **kw):
+        # The scrollbar follows the whole list, so the native widget never gets yscrollcommand.
+        handled = False
+        if isinstance(cnf, dict) and 'yscrollcommand' in cnf:
+            cnf = dict(cnf)
+            self._yscrollcommand = cnf.pop('yscrollcommand')
+            handled = True
+        if 'yscrollcommand' in kw:
+            self._yscrollcommand = kw.pop('yscrollcommand')
+            handled = True
+        if handled:
+            self._update_scrollbar()
+            if not cnf and not kw:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def yview(self, *args):
+        total = len(self._rows)
+        if not args:
+            return self._scroll_fractions()
+        capacity = self._capacity()
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self._top += step * capacity if args[2] == 'pages' else step
+        self._render()
+        return None
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.yview('scroll', step, 'units')
+        return "break"
+
+    def _on_navigation_key(self, event):
+        self._compact()
+        if not self._iids:
+            return "break"
+        capacity = self._capacity()
+        current = self._iids.index(self._focus_iid) if self._focus_iid in self._rows else -1
+        moves = {'Up': current - 1, 'Down': current + 1, 'Prior': current - capacity,
+                 'Next': current + capacity, 'Home': 0, 'End': len(self._iids) - 1}
+        target = max(0, min(len(self._iids) - 1, moves.get(event.keysym, current)))
+        iid = self._iids[target]
+        self._focus_iid = iid
+        self.selection_set(iid)
+        self.see(iid)
+        return "break"
+
+    # --- Sorting ---------------------------------------------------------------------
+
+    def enable_sorting(self, columns=None):
+        """Makes the headings of `columns` (default: all) sort the whole list when clicked."""
+        self._sortable_columns = tuple(columns or self['columns'])
+        for column in self._sortable_columns:
+            self.heading(column, command=lambda col=column: self.sort_by(
+                col, not self._sort_descending if col == self._sort_column else False))
+
+    def sort_by(self, column, descending=False):
+        """Sorts every row by `column`; numbers sort numerically, text case-insensitively."""
+        self._sort_column = column
+        self._sort_descending = descending
+        self._needs_sort = True
+        for col in self._sortable_columns or self['columns']:
+            text = self.heading(col)['text']
+            if text.endswith(" ▲") or text.endswith(" ▼"):
+                text = text[:-2]
+            if col == column:
+                text = f"{text} {'▼' if descending else '▲'}"
+            self.heading(col, text=text)
+        self._render()
+
+    def _apply_sort(self):
+        self._needs_sort = False
+        if self._sort_column is None:
+            return
+        self._compact()
+        position = list(self['columns']).index(self._sort_column)
+
+        def sort_key(iid):
+            values = self._rows[iid]['values']
+            value = values[position] if position < len(values) else ''
+            if isinstance(value, (int, float)):
+                return (0, value, '')
+            try:
+                return (0, float(str(value).replace(',', '')), '')
+            except ValueError:
+                return (1, 0, str(value).lower())
+
+        self._iids.sort(key=sort_key, reverse=self._sort_descending)
+
+    # --- Rendering -------------------------------------------------------------------
+
+    def _schedule_render(self):
+        if self._render_after_id is None:
+            self._render_after_id = self.after_idle(self._render)
+
+    def _render(self):
+        if self._render_after_id is not None:
+            try:
+                self.after_cancel(self._render_after_id)
+            except tk.TclError:
+                pass
+            self._render_after_id = None
+        if not self.winfo_exists():
+            return
+        self._compact()
+        if self._needs_sort:
+            self._apply_sort()
+
+        capacity = self._capacity()
+        total = len(self._iids)
+        self._top = max(0, min(self._top, total - capacity))
+        window = self._iids[self._top:self._top + capacity]
+
+        # Reuse the Tk items that stay on screen; only changed rows are touched.
+        window_set = set(window)
+        removed = [iid for iid in self._rendered if iid not in window_set]
+        if removed:
+            super().delete(*removed)
+            for iid in removed:
+                self._rendered_rows.pop(iid, None)
+        on_screen = set(self._rendered) - set(removed)
+        for position, iid in enumerate(window):
+            row = self._rows[iid]
+            options = {'text': row['text'], 'values': row['values'], 'tags': row['tags']}
+            if iid not in on_screen:
+                super().insert('', position, iid=iid, **options)
+            else:
+                if self._rendered_rows.get(iid) != options:
+                    super().item(iid, **options)
+                super().move(iid, '', position)
+            self._rendered_rows[iid] = {key: list(value) if isinstance(value, list) else value
+                                        for key, value in options.items()}
+        self._rendered = window
+        # Undo any native scrolling, e.g. Tk bringing a partly visible row into view.
+        super().yview('moveto', 0)
+
+        visible_selection = [iid for iid in self._selection if iid in window_set]
+        if set(super().selection()) != set(visible_selection):
+            super().selection_set(visible_selection)
+        if self._focus_iid in window_set:
+            super().focus(self._focus_iid)
+        elif super().focus():
+            try:
+                super().focus('')
+            except tk.TclError:
+                pass
+        self._update_scrollbar()
+
+    def _capacity(self):
+        try:
+            row_height = int(ttk.Style(self).lookup(self.cget('style') or 'Treeview', 'rowheight') or 0)
+        except (tk.TclError, ValueError):
+            row_height = 0
+        row_height = row_height or _DEFAULT_ROW_HEIGHT
+        height = self.winfo_height()
+        if height <= 1:
+            return max(1, int(self.cget('height')))
+        heading = max(_HEADING_HEIGHT, row_height + 5) if 'headings' in str(self.cget('show')) else 0
+        return max(1, (height - heading) // row_height)
+
+    def _scroll_fractions(self):
+        total = len(self._rows)
+        if not total:
+            return 0.0, 1.0
+        return self._top / total, min(1.0, (self._top + len(self._rendered)) / total)
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand:
+            self._yscrollcommand(*self._scroll_fractions())
+
+    def destroy(self):
+        if self._render_after_id is not None:
+            try:
+                self.after_cancel(self._render_after_id)
+            except tk.TclError:
+                pass
+            self._render_after_id = None
+        super().destroy()
+
+    # --- Helpers ---------------------------------------------------------------------
+
+    def _compact(self):
+        """Drops ids deleted one at a time; deferring this keeps delete-in-a-loop linear."""
+        if self._pending_deletes:
+            pending = self._pending_deletes
+            self._iids = [iid for iid in self._iids if iid not in pending]
+            self._pending_deletes = set()
+
+    def _forget_missing(self):
+        self._selection = [iid for iid in self._selection if iid in self._rows]
+        if self._focus_iid not in self._rows:
+            self._focus_iid = ''
+
+    def _change_selection(self, items):
+        for iid in items:
+            self._require(iid)
+        self._selection = list(dict.fromkeys(items))
+        self._render()
+        self.event_generate("<<TreeviewSelect>>", when="tail")
+
+    def _sync_from_native(self):
+        """Adopts selection and focus changes the user made by clicking on visible rows."""
+        if self._render_after_id is not None:
+            return  # The Tk items are about to be replaced; the row store is authoritative
+        rendered = set(self._rendered)
+        native = super().selection()
+        expected = [iid for iid in self._selection if iid in rendered]
+        if set(native) != set(expected):
+            self._selection = [iid for iid in native if iid in self._rows]
+        native_focus = super().focus()
+        if native_focus and native_focus in self._rows:
+            self._focus_iid = native_focus
+
+    def _on_native_select(self, event):
+        self._sync_from_native()
+        current = tuple(self._selection)
+        if current == self._last_notified_selection:
+            return
+        self._last_notified_selection = current
+        for handler in list(self._select_handlers):
+            handler(event)
+
+    def _require(self, item):
+        item = str(item)
+        if item not in self._rows:
+            raise tk.TclError(f'Item {item} not found')
+        return item
+
+    @staticmethod
+    def _check_parent(parent):
+        if parent not in ('', None):
+            raise tk.TclError("VirtualTreeview holds a flat list; rows cannot have a parent")
+
+    @staticmethod
+    def _flatten(items):
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            items = items[0]
+        return [str(iid) for iid in items]